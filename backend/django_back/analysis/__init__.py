@@ -3,5 +3,7 @@ Module d'analyse thématique des articles
 """
 
 from .theme_classifier import ThemeClassifier
+from .classification_pool import ClassificationPool
+from .llm_cache import LLMCache
 
-__all__ = ['ThemeClassifier']
+__all__ = ['ThemeClassifier', 'ClassificationPool', 'LLMCache']
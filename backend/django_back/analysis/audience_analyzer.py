@@ -1,84 +1,277 @@
 """
 Analyseur d'audience multi-plateformes
 Analyse séparée : Web, Facebook, Twitter
+Les métriques sont lues dans l'agrégat quotidien media_daily_stats
+(une ligne par média, plateforme et jour) et non dans les tables brutes.
+compute_audience calcule toutes les plateformes et plusieurs fenêtres
+(7/30/90 jours) en une seule lecture ; les analyses par plateforme en sont
+des extraits.
 """
 
 from datetime import datetime, timedelta
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable, Optional
 from database.db_manager import DatabaseManager
 
 
+# Colonnes de media_daily_stats sommées par fenêtre
+DAILY_SUMS = ('publications', 'likes', 'comments', 'shares', 'retweets',
+              'replies', 'quotes', 'impressions', 'engagement_total')
+
+# Métriques par plateforme : (volume, moyenne quotidienne, {métrique: colonne sommée}, compte du média)
+PLATFORM_METRICS = {
+    'web': ('total_articles', 'articles_par_jour_moyen', {}, None),
+    'facebook': ('total_posts', 'posts_par_jour_moyen', {
+        'total_likes': 'likes',
+        'total_comments': 'comments',
+        'total_shares': 'shares',
+        'engagement_total': 'engagement_total',
+    }, 'facebook_page'),
+    'twitter': ('total_tweets', 'tweets_par_jour_moyen', {
+        'total_retweets': 'retweets',
+        'total_replies': 'replies',
+        'total_likes': 'likes',
+        'total_quotes': 'quotes',
+        'total_impressions': 'impressions',
+        'engagement_total': 'engagement_total',
+    }, 'twitter_account'),
+}
+
+# Fenêtres demandées par le tableau de bord
+DEFAULT_WINDOWS = (7, 30, 90)
+
+
+class AudienceTable:
+    """
+    Résultat en colonnes de compute_audience : une ligne par média actif,
+    un tableau par métrique, pour chaque fenêtre et chaque plateforme
+    (web, facebook, twitter, global)
+    """
+    
+    def __init__(self, windows: Iterable[int], medias: Dict[str, List[Any]],
+                 metrics: Dict[int, Dict[str, Dict[str, List[Any]]]]):
+        """
+        Args:
+            windows: Fenêtres calculées (jours)
+            medias: Colonnes d'identité {'id', 'nom', 'url', 'facebook_page', 'twitter_account'}
+            metrics: {fenêtre: {plateforme: {métrique: colonne}}}
+        """
+        self.windows = tuple(windows)
+        self.medias = medias
+        self.metrics = metrics
+    
+    def __len__(self) -> int:
+        return len(self.medias['id'])
+    
+    def column(self, window: int, platform: str, metric: str) -> List[Any]:
+        """Colonne d'une métrique (une valeur par média, dans l'ordre de medias['id'])"""
+        return self.metrics[window][platform][metric]
+    
+    def rows(self, window: int, platform: str) -> List[Dict[str, Any]]:
+        """
+        Lignes d'une plateforme, au format des analyses par plateforme
+        
+        Args:
+            window: Fenêtre (jours), parmi self.windows
+            platform: 'web', 'facebook', 'twitter' ou 'global'
+        
+        Returns:
+            Liste triée (volume pour le web, engagement pour les réseaux, influence pour le global)
+        """
+        if platform == 'global':
+            platforms = {name: self._platform_rows(window, name) for name in PLATFORM_METRICS}
+            columns = self.metrics[window]['global']
+            results = []
+            for i in range(len(self)):
+                row = self._identity(i, None)
+                row.update({metric: values[i] for metric, values in columns.items()})
+                for name in PLATFORM_METRICS:
+                    row[name] = platforms[name].get(i)
+                results.append(row)
+            results.sort(key=lambda r: r['score_influence'], reverse=True)
+            return results
+        
+        results = list(self._platform_rows(window, platform).values())
+        sort_key = 'total_articles' if platform == 'web' else 'engagement_total'
+        results.sort(key=lambda r: r[sort_key], reverse=True)
+        return results
+    
+    def inactive(self, window: int, days_threshold: int) -> Dict[str, List[Dict[str, Any]]]:
+        """Médias sans publication depuis plus de days_threshold jours, par plateforme"""
+        return {
+            platform: [m for m in self.rows(window, platform)
+                       if m['jours_depuis_derniere_pub'] > days_threshold]
+            for platform in PLATFORM_METRICS
+        }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Représentation JSON (clés de fenêtre en texte)"""
+        return {
+            'windows': list(self.windows),
+            'medias': self.medias,
+            'metrics': {str(window): platforms for window, platforms in self.metrics.items()},
+        }
+    
+    def _identity(self, i: int, account: Optional[str]) -> Dict[str, Any]:
+        """Identité du média de la ligne i (avec le compte de la plateforme)"""
+        row = {'id': self.medias['id'][i], 'nom': self.medias['nom'][i], 'url': self.medias['url'][i]}
+        if account:
+            row[account] = self.medias[account][i]
+        return row
+    
+    def _platform_rows(self, window: int, platform: str) -> Dict[int, Dict[str, Any]]:
+        """Lignes {index: ligne} des médias suivis sur la plateforme"""
+        account = PLATFORM_METRICS[platform][3]
+        columns = self.metrics[window][platform]
+        rows = {}
+        for i in range(len(self)):
+            if account and self.medias[account][i] is None:
+                continue
+            row = self._identity(i, account)
+            row.update({metric: values[i] for metric, values in columns.items()})
+            rows[i] = row
+        return rows
+
+
 class AudienceAnalyzer:
     """Analyseur d'audience par plateforme"""
     
     def __init__(self, db: DatabaseManager):
         self.db = db
     
-    # ==================== AUDIENCE WEB ====================
+    @staticmethod
+    def _window_start(days: int) -> str:
+        """Premier jour (inclus) d'une fenêtre de N jours dans media_daily_stats"""
+        return (datetime.now() - timedelta(days=days)).date().isoformat()
     
-    def analyze_web_audience(self, days: int = 30) -> List[Dict[str, Any]]:
+    # ==================== CALCUL GROUPÉ ====================
+    
+    def compute_audience(self, windows: Iterable[int] = DEFAULT_WINDOWS) -> AudienceTable:
         """
-        Analyse de l'audience Web (articles)
+        Calculer l'audience de tous les médias actifs, sur toutes les plateformes
+        et pour plusieurs fenêtres, en une lecture de media_daily_stats
+        (agrégation conditionnelle par fenêtre) et une lecture de medias
+        
+        Args:
+            windows: Fenêtres en jours (ex: (7, 30, 90))
         
         Returns:
-            Liste des médias avec métriques web
+            AudienceTable (colonnes par fenêtre, plateforme et métrique)
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+        windows = tuple(sorted(set(windows)))
+        if not windows:
+            raise ValueError("Au moins une fenêtre est requise")
+        
+        params = {'now': datetime.now().isoformat(), 'debut': self._window_start(max(windows))}
+        selects = []
+        for w in windows:
+            params[f'w{w}'] = self._window_start(w)
+            in_window = f"jour >= :w{w}"
+            selects += [f"SUM(CASE WHEN {in_window} THEN {col} END) AS {col}_{w}" for col in DAILY_SUMS]
+            selects += [
+                f"COUNT(CASE WHEN {in_window} THEN 1 END) AS jours_{w}",
+                f"MIN(CASE WHEN {in_window} THEN premiere_publication END) AS premiere_{w}",
+                f"MAX(CASE WHEN {in_window} THEN derniere_publication END) AS derniere_{w}",
+                f"CAST((julianday(:now) - julianday(MAX(CASE WHEN {in_window} THEN derniere_publication END)))"
+                f" AS INTEGER) AS depuis_{w}",
+            ]
         
-        try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
-            now = datetime.now().isoformat()
+        with self.db.connection() as conn:
+            cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT 
-                    m.id,
-                    m.nom,
-                    m.url,
-                    COUNT(a.id) as total_articles,
-                    MAX(a.date_publication) as derniere_publication,
-                    MIN(a.date_publication) as premiere_publication,
-                    COUNT(DISTINCT DATE(a.date_publication)) as jours_avec_publication,
-                    CASE 
-                        WHEN MAX(a.date_publication) IS NULL THEN 999
-                        ELSE CAST((julianday(?) - julianday(MAX(a.date_publication))) AS INTEGER)
-                    END as jours_depuis_derniere_pub
-                FROM medias m
-                LEFT JOIN articles a ON m.id = a.media_id 
-                    AND a.date_publication >= ?
-                WHERE m.actif = 1
-                GROUP BY m.id, m.nom, m.url
-                ORDER BY total_articles DESC
-            """, (now, date_limit))
-            
-            results = []
+                SELECT id, nom, url, facebook_page, twitter_account
+                FROM medias
+                WHERE actif = 1
+                ORDER BY id
+            """)
+            medias = {key: [] for key in ('id', 'nom', 'url', 'facebook_page', 'twitter_account')}
             for row in cursor.fetchall():
-                # Calculer la moyenne quotidienne réelle
-                jours_avec_pub = row['jours_avec_publication'] or 0
-                total_articles = row['total_articles']
-                
-                if jours_avec_pub > 0:
-                    articles_par_jour_moyen = round(total_articles / jours_avec_pub, 2)
-                else:
-                    articles_par_jour_moyen = 0
+                for key in medias:
+                    medias[key].append(row[key])
+            
+            cursor.execute(f"""
+                SELECT media_id, plateforme, {', '.join(selects)}
+                FROM media_daily_stats
+                WHERE plateforme IN ('web', 'facebook', 'twitter')
+                  AND jour >= :debut AND publications > 0
+                GROUP BY media_id, plateforme
+            """, params)
+            stats = {(row['media_id'], row['plateforme']): row for row in cursor.fetchall()}
+        
+        metrics = {w: self._window_columns(w, medias, stats) for w in windows}
+        return AudienceTable(windows, medias, metrics)
+    
+    def _window_columns(self, w: int, medias: Dict[str, List[Any]],
+                        stats: Dict[tuple, Any]) -> Dict[str, Dict[str, List[Any]]]:
+        """Colonnes d'une fenêtre à partir des agrégats (média, plateforme)"""
+        media_ids = medias['id']
+        columns: Dict[str, Dict[str, List[Any]]] = {}
+        
+        for platform, (volume, per_day, sums, _) in PLATFORM_METRICS.items():
+            metric_names = [volume, *sums]
+            if platform != 'web':
+                metric_names.append('engagement_moyen')
+            metric_names += ['derniere_publication', 'jours_avec_publication', per_day,
+                             'jours_depuis_derniere_pub', 'statut']
+            if platform == 'web':
+                metric_names.insert(2, 'premiere_publication')
+            cols = {name: [] for name in metric_names}
+            
+            for media_id in media_ids:
+                row = stats.get((media_id, platform))
+                total = (row[f'publications_{w}'] or 0) if row else 0
+                jours = row[f'jours_{w}'] if row else 0
+                depuis = row[f'depuis_{w}'] if row and row[f'depuis_{w}'] is not None else 999
                 
-                results.append({
-                    'id': row['id'],
-                    'nom': row['nom'],
-                    'url': row['url'],
-                    'total_articles': total_articles,
-                    'derniere_publication': row['derniere_publication'],
-                    'premiere_publication': row['premiere_publication'],
-                    'jours_avec_publication': jours_avec_pub,
-                    'articles_par_jour_moyen': articles_par_jour_moyen,
-                    'jours_depuis_derniere_pub': row['jours_depuis_derniere_pub'],
-                    'statut': self._get_publication_status(row['jours_depuis_derniere_pub'])
-                })
+                cols[volume].append(total)
+                for metric, column in sums.items():
+                    cols[metric].append((row[f'{column}_{w}'] or 0) if row else 0)
+                if platform != 'web':
+                    engagement = (row[f'engagement_total_{w}'] or 0) if row else 0
+                    cols['engagement_moyen'].append(round(engagement / total, 2) if total else 0)
+                if platform == 'web':
+                    cols['premiere_publication'].append(row[f'premiere_{w}'] if row else None)
+                cols['derniere_publication'].append(row[f'derniere_{w}'] if row else None)
+                cols['jours_avec_publication'].append(jours)
+                cols[per_day].append(round(total / jours, 2) if jours else 0)
+                cols['jours_depuis_derniere_pub'].append(depuis)
+                cols['statut'].append(self._get_publication_status(depuis))
             
-            return results
+            columns[platform] = cols
         
-        finally:
-            conn.close()
+        # Score composite (40% volume, 60% engagement), plateformes suivies uniquement
+        total_publications, total_engagement, score_influence = [], [], []
+        for i in range(len(media_ids)):
+            publications = columns['web']['total_articles'][i]
+            engagement = 0
+            for platform in ('facebook', 'twitter'):
+                if medias[PLATFORM_METRICS[platform][3]][i] is not None:
+                    publications += columns[platform][PLATFORM_METRICS[platform][0]][i]
+                    engagement += columns[platform]['engagement_total'][i]
+            
+            score_volume = publications / 10  # Normaliser
+            score_engagement = engagement / 100  # Normaliser
+            total_publications.append(publications)
+            total_engagement.append(engagement)
+            score_influence.append(round((0.4 * score_volume) + (0.6 * score_engagement), 2))
+        
+        columns['global'] = {
+            'total_publications': total_publications,
+            'total_engagement': total_engagement,
+            'score_influence': score_influence,
+        }
+        return columns
+    
+    # ==================== AUDIENCE WEB ====================
+    
+    def analyze_web_audience(self, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Analyse de l'audience Web (articles)
+        
+        Returns:
+            Liste des médias avec métriques web
+        """
+        return self.compute_audience((days,)).rows(days, 'web')
     
     # ==================== AUDIENCE FACEBOOK ====================
     
@@ -89,72 +282,7 @@ class AudienceAnalyzer:
         Returns:
             Liste des médias avec métriques Facebook
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
-            now = datetime.now().isoformat()
-            
-            cursor.execute("""
-                SELECT 
-                    m.id,
-                    m.nom,
-                    m.url,
-                    m.facebook_page,
-                    COUNT(fp.id) as total_posts,
-                    SUM(fp.likes) as total_likes,
-                    SUM(fp.comments) as total_comments,
-                    SUM(fp.shares) as total_shares,
-                    SUM(fp.engagement_total) as engagement_total,
-                    ROUND(AVG(fp.engagement_total), 2) as engagement_moyen,
-                    MAX(fp.date_publication) as derniere_publication,
-                    COUNT(DISTINCT DATE(fp.date_publication)) as jours_avec_publication,
-                    CASE 
-                        WHEN MAX(fp.date_publication) IS NULL THEN 999
-                        ELSE CAST((julianday(?) - julianday(MAX(fp.date_publication))) AS INTEGER)
-                    END as jours_depuis_derniere_pub
-                FROM medias m
-                LEFT JOIN facebook_posts fp ON m.id = fp.media_id 
-                    AND fp.date_publication >= ?
-                WHERE m.actif = 1 AND m.facebook_page IS NOT NULL
-                GROUP BY m.id, m.nom, m.url, m.facebook_page
-                ORDER BY engagement_total DESC
-            """, (now, date_limit))
-            
-            results = []
-            for row in cursor.fetchall():
-                # Calculer la moyenne quotidienne réelle
-                jours_avec_pub = row['jours_avec_publication'] or 0
-                total_posts = row['total_posts'] or 0
-                
-                if jours_avec_pub > 0:
-                    posts_par_jour_moyen = round(total_posts / jours_avec_pub, 2)
-                else:
-                    posts_par_jour_moyen = 0
-                
-                results.append({
-                    'id': row['id'],
-                    'nom': row['nom'],
-                    'url': row['url'],
-                    'facebook_page': row['facebook_page'],
-                    'total_posts': total_posts,
-                    'total_likes': row['total_likes'] or 0,
-                    'total_comments': row['total_comments'] or 0,
-                    'total_shares': row['total_shares'] or 0,
-                    'engagement_total': row['engagement_total'] or 0,
-                    'engagement_moyen': row['engagement_moyen'] or 0,
-                    'derniere_publication': row['derniere_publication'],
-                    'jours_avec_publication': jours_avec_pub,
-                    'posts_par_jour_moyen': posts_par_jour_moyen,
-                    'jours_depuis_derniere_pub': row['jours_depuis_derniere_pub'],
-                    'statut': self._get_publication_status(row['jours_depuis_derniere_pub'])
-                })
-            
-            return results
-        
-        finally:
-            conn.close()
+        return self.compute_audience((days,)).rows(days, 'facebook')
     
     # ==================== AUDIENCE TWITTER ====================
     
@@ -165,76 +293,7 @@ class AudienceAnalyzer:
         Returns:
             Liste des médias avec métriques Twitter
         """
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
-            now = datetime.now().isoformat()
-            
-            cursor.execute("""
-                SELECT 
-                    m.id,
-                    m.nom,
-                    m.url,
-                    m.twitter_account,
-                    COUNT(tw.id) as total_tweets,
-                    SUM(tw.retweets) as total_retweets,
-                    SUM(tw.replies) as total_replies,
-                    SUM(tw.likes) as total_likes,
-                    SUM(tw.quotes) as total_quotes,
-                    SUM(tw.impressions) as total_impressions,
-                    SUM(tw.engagement_total) as engagement_total,
-                    ROUND(AVG(tw.engagement_total), 2) as engagement_moyen,
-                    MAX(tw.date_publication) as derniere_publication,
-                    COUNT(DISTINCT DATE(tw.date_publication)) as jours_avec_publication,
-                    CASE 
-                        WHEN MAX(tw.date_publication) IS NULL THEN 999
-                        ELSE CAST((julianday(?) - julianday(MAX(tw.date_publication))) AS INTEGER)
-                    END as jours_depuis_derniere_pub
-                FROM medias m
-                LEFT JOIN twitter_tweets tw ON m.id = tw.media_id 
-                    AND tw.date_publication >= ?
-                WHERE m.actif = 1 AND m.twitter_account IS NOT NULL
-                GROUP BY m.id, m.nom, m.url, m.twitter_account
-                ORDER BY engagement_total DESC
-            """, (now, date_limit))
-            
-            results = []
-            for row in cursor.fetchall():
-                # Calculer la moyenne quotidienne réelle
-                jours_avec_pub = row['jours_avec_publication'] or 0
-                total_tweets = row['total_tweets'] or 0
-                
-                if jours_avec_pub > 0:
-                    tweets_par_jour_moyen = round(total_tweets / jours_avec_pub, 2)
-                else:
-                    tweets_par_jour_moyen = 0
-                
-                results.append({
-                    'id': row['id'],
-                    'nom': row['nom'],
-                    'url': row['url'],
-                    'twitter_account': row['twitter_account'],
-                    'total_tweets': total_tweets,
-                    'total_retweets': row['total_retweets'] or 0,
-                    'total_replies': row['total_replies'] or 0,
-                    'total_likes': row['total_likes'] or 0,
-                    'total_quotes': row['total_quotes'] or 0,
-                    'total_impressions': row['total_impressions'] or 0,
-                    'engagement_total': row['engagement_total'] or 0,
-                    'engagement_moyen': row['engagement_moyen'] or 0,
-                    'derniere_publication': row['derniere_publication'],
-                    'jours_avec_publication': jours_avec_pub,
-                    'tweets_par_jour_moyen': tweets_par_jour_moyen,
-                    'jours_depuis_derniere_pub': row['jours_depuis_derniere_pub'],
-                    'statut': self._get_publication_status(row['jours_depuis_derniere_pub'])
-                })
-            
-            return results
-        
-        finally:
-            conn.close()
+        return self.compute_audience((days,)).rows(days, 'twitter')
     
     # ==================== ANALYSE GLOBALE ====================
     
@@ -245,52 +304,7 @@ class AudienceAnalyzer:
         Returns:
             Liste des médias avec métriques combinées
         """
-        web_data = {m['id']: m for m in self.analyze_web_audience(days)}
-        fb_data = {m['id']: m for m in self.analyze_facebook_audience(days)}
-        tw_data = {m['id']: m for m in self.analyze_twitter_audience(days)}
-        
-        # Combiner les données
-        all_media_ids = set(web_data.keys()) | set(fb_data.keys()) | set(tw_data.keys())
-        
-        results = []
-        for media_id in all_media_ids:
-            web = web_data.get(media_id, {})
-            fb = fb_data.get(media_id, {})
-            tw = tw_data.get(media_id, {})
-            
-            # Calculer le score d'influence composite
-            total_publications = (
-                web.get('total_articles', 0) +
-                fb.get('total_posts', 0) +
-                tw.get('total_tweets', 0)
-            )
-            
-            total_engagement = (
-                fb.get('engagement_total', 0) +
-                tw.get('engagement_total', 0)
-            )
-            
-            # Score composite (40% volume, 60% engagement)
-            score_volume = total_publications / 10  # Normaliser
-            score_engagement = total_engagement / 100  # Normaliser
-            score_influence = (0.4 * score_volume) + (0.6 * score_engagement)
-            
-            results.append({
-                'id': media_id,
-                'nom': web.get('nom') or fb.get('nom') or tw.get('nom'),
-                'url': web.get('url') or fb.get('url') or tw.get('url'),
-                'total_publications': total_publications,
-                'total_engagement': total_engagement,
-                'score_influence': round(score_influence, 2),
-                'web': web if web else None,
-                'facebook': fb if fb else None,
-                'twitter': tw if tw else None
-            })
-        
-        # Trier par score d'influence
-        results.sort(key=lambda x: x['score_influence'], reverse=True)
-        
-        return results
+        return self.compute_audience((days,)).rows(days, 'global')
     
     # ==================== UTILITAIRES ====================
     
@@ -323,17 +337,4 @@ class AudienceAnalyzer:
         Returns:
             Dictionnaire avec médias inactifs par plateforme
         """
-        web = [m for m in self.analyze_web_audience() 
-               if m['jours_depuis_derniere_pub'] > days_threshold]
-        
-        facebook = [m for m in self.analyze_facebook_audience() 
-                   if m['jours_depuis_derniere_pub'] > days_threshold]
-        
-        twitter = [m for m in self.analyze_twitter_audience() 
-                  if m['jours_depuis_derniere_pub'] > days_threshold]
-        
-        return {
-            'web': web,
-            'facebook': facebook,
-            'twitter': twitter
-        }
+        return self.compute_audience((30,)).inactive(30, days_threshold)
@@ -0,0 +1,129 @@
+"""
+Pool de classification concurrente pour ThemeClassifier
+Plusieurs requêtes Ollama en parallèle (alignées sur OLLAMA_NUM_PARALLEL),
+file d'attente bornée et écriture des résultats par lots
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .theme_classifier import ThemeClassifier
+
+
+def default_workers() -> int:
+    """Concurrence par défaut : OLLAMA_NUM_PARALLEL du serveur Ollama (4 sinon)"""
+    try:
+        return max(1, int(os.getenv('OLLAMA_NUM_PARALLEL', '4')))
+    except ValueError:
+        return 4
+
+
+class ClassificationPool:
+    """Classifie des articles en parallèle avec contre-pression et écriture par lots"""
+
+    def __init__(self, classifier: ThemeClassifier, workers: Optional[int] = None,
+                 queue_size: Optional[int] = None, batch_size: int = 20):
+        """
+        Initialise le pool
+
+        Args:
+            classifier: Classificateur (timeout par requête configuré sur le classificateur)
+            workers: Nombre de requêtes Ollama simultanées (OLLAMA_NUM_PARALLEL par défaut)
+            queue_size: Nombre maximum d'articles en attente ou en cours (2 x workers par défaut)
+            batch_size: Nombre de résultats transmis à on_batch en une fois
+        """
+        self.classifier = classifier
+        self.workers = workers or default_workers()
+        self.queue_size = max(self.workers, queue_size or self.workers * 2)
+        self.batch_size = max(1, batch_size)
+
+        # Plafond de requêtes Ollama en vol, partagé par les appels simultanés à run()
+        # (ex: plusieurs sites classifiés en même temps par la collecte multi-sites)
+        self._inflight = threading.BoundedSemaphore(self.workers)
+
+    def _classify_one(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Classifier un article (exécuté dans un worker)"""
+        with self._inflight:
+            result = self.classifier.classify_article(
+                article.get('titre', '') or '',
+                article.get('contenu', '') or ''
+            )
+        return {'article_id': article.get('id'), **result}
+
+    def run(self, articles: Iterable[Dict[str, Any]],
+            on_batch: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+            on_result: Optional[Callable[[int, Dict[str, Any], Optional[Dict[str, Any]], Optional[BaseException]], None]] = None) -> Dict[str, Any]:
+        """
+        Classifier tous les articles
+
+        Args:
+            articles: Articles (dictionnaires avec 'id', 'titre', 'contenu'), consommés au fil de l'eau
+            on_batch: Callback recevant chaque lot de résultats (ex: db.add_classifications_bulk)
+            on_result: Callback (rang, article, classification, erreur) appelé pour chaque article terminé
+
+        Returns:
+            Statistiques {'classified', 'errors', 'duration', 'articles_per_minute'}
+        """
+        # Contre-pression : l'itération des articles se bloque quand la file est pleine
+        slots = threading.BoundedSemaphore(self.queue_size)
+        done: "queue.Queue[tuple]" = queue.Queue()
+        stats = {'classified': 0, 'errors': 0}
+        batch: List[Dict[str, Any]] = []
+        submitted = 0
+        finished = 0
+        start = time.perf_counter()
+
+        def on_done(article: Dict[str, Any], future: Future):
+            slots.release()
+            done.put((article, future))
+
+        def drain(block: bool):
+            nonlocal finished
+            while finished < submitted:
+                try:
+                    article, future = done.get(block=block)
+                except queue.Empty:
+                    return
+                finished += 1
+
+                error = future.exception()
+                result = None
+                if error is None:
+                    result = future.result()
+                    batch.append(result)
+                    stats['classified'] += 1
+                else:
+                    stats['errors'] += 1
+
+                if on_result:
+                    on_result(finished, article, result, error)
+
+                if len(batch) >= self.batch_size:
+                    flush()
+
+        def flush():
+            if batch and on_batch:
+                on_batch(list(batch))
+            batch.clear()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='classify') as executor:
+            for article in articles:
+                while not slots.acquire(timeout=0.1):
+                    drain(block=False)
+                future = executor.submit(self._classify_one, article)
+                submitted += 1
+                future.add_done_callback(lambda f, a=article: on_done(a, f))
+                drain(block=False)
+
+            drain(block=True)
+
+        flush()
+
+        elapsed = time.perf_counter() - start
+        stats['duration'] = round(elapsed, 2)
+        stats['articles_per_minute'] = round(finished / (elapsed / 60), 1) if elapsed > 0 else 0.0
+        return stats
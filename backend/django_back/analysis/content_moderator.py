@@ -14,17 +14,24 @@ class ContentModerator:
     Analyseur de contenus sensibles utilisant Ollama
     """
     
-    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "mistral:latest"):
+    # Namespace et version du prompt dans le cache LLM (incrémenter si le prompt change)
+    CACHE_NAMESPACE = 'moderation'
+    PROMPT_VERSION = 1
+    
+    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "mistral:latest",
+                 cache=None):
         """
         Initialise le modérateur de contenu
         
         Args:
             ollama_url: URL de l'API Ollama
             model: Modèle Ollama à utiliser
+            cache: LLMCache optionnel (un texte déjà analysé n'est pas renvoyé à Ollama)
         """
         self.ollama_url = ollama_url
         self.model = model
         self.api_endpoint = f"{ollama_url}/api/generate"
+        self.cache = cache
     
     def check_ollama_status(self) -> bool:
         """
@@ -243,6 +250,79 @@ Réponds UNIQUEMENT au format JSON suivant:
         # Limiter la taille du texte pour l'analyse
         text_sample = text[:2000] if len(text) > 2000 else text
         
+        # Scores bruts du modèle : depuis le cache si ce texte a déjà été analysé
+        result = None
+        if self.cache is not None:
+            result = self.cache.get(self.CACHE_NAMESPACE, self.model, self.PROMPT_VERSION, text_sample)
+        
+        if result is None:
+            result = self._request_scores(text_sample)
+            if result is None:
+                return self._default_analysis_result()
+            if self.cache is not None:
+                self.cache.put(self.CACHE_NAMESPACE, self.model, self.PROMPT_VERSION, text_sample, result)
+        
+        try:
+            # Construire les détails
+            toxicity = {
+                'est_toxique': result.get('toxicity_score', 0) >= 6,
+                'score_toxicite': result.get('toxicity_score', 0),
+                'contexte': result.get('contexte', 'informatif')
+            }
+            
+            misinformation = {
+                'est_desinformation': result.get('misinformation_score', 0) >= 6,
+                'score_desinformation': result.get('misinformation_score', 0),
+                'sources_citees': result.get('sources_citees', False)
+            }
+            
+            sensitivity = {
+                'est_sensible': result.get('sensitivity_score', 0) >= 6,
+                'score_sensibilite': result.get('sensitivity_score', 0),
+                'traitement': result.get('traitement', 'factuel')
+            }
+            
+            # Calcul du score de risque
+            risk_score = (
+                result.get('toxicity_score', 0) * 0.4 +
+                result.get('misinformation_score', 0) * 0.4 +
+                result.get('sensitivity_score', 0) * 0.2
+            )
+            
+            risk_level = self._determine_risk_level(risk_score)
+            
+            should_flag = (
+                risk_score >= 7.0 or
+                result.get('toxicity_score', 0) >= 8.0 or
+                result.get('misinformation_score', 0) >= 8.0
+            )
+            
+            return {
+                'content_type': content_type,
+                'analyzed_at': datetime.now().isoformat(),
+                'toxicity': toxicity,
+                'misinformation': misinformation,
+                'sensitivity': sensitivity,
+                'risk_score': round(risk_score, 2),
+                'risk_level': risk_level,
+                'should_flag': should_flag,
+                'primary_issue': result.get('primary_issue', 'none'),
+                'text_length': len(text)
+            }
+        except Exception as e:
+            print(f"⚠️ Erreur parsing: {e}")
+            return self._default_analysis_result()
+    
+    def _request_scores(self, text_sample: str) -> Optional[Dict]:
+        """
+        Demander au modèle les scores bruts d'un texte
+        
+        Args:
+            text_sample: Texte (tronqué) à analyser
+            
+        Returns:
+            Scores JSON renvoyés par le modèle, None si la réponse est inexploitable
+        """
         # Analyse unifiée avec décision de l'IA sur le type principal
         prompt = f"""Tu es un modérateur de contenu pour un régulateur des médias au Burkina Faso.
 
@@ -282,60 +362,16 @@ Réponds UNIQUEMENT au format JSON:
             json_start = response.find('{')
             json_end = response.rfind('}') + 1
             if json_start != -1 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                result = json.loads(json_str)
-                
-                # Construire les détails
-                toxicity = {
-                    'est_toxique': result.get('toxicity_score', 0) >= 6,
-                    'score_toxicite': result.get('toxicity_score', 0),
-                    'contexte': result.get('contexte', 'informatif')
-                }
-                
-                misinformation = {
-                    'est_desinformation': result.get('misinformation_score', 0) >= 6,
-                    'score_desinformation': result.get('misinformation_score', 0),
-                    'sources_citees': result.get('sources_citees', False)
-                }
-                
-                sensitivity = {
-                    'est_sensible': result.get('sensitivity_score', 0) >= 6,
-                    'score_sensibilite': result.get('sensitivity_score', 0),
-                    'traitement': result.get('traitement', 'factuel')
-                }
-                
-                # Calcul du score de risque
-                risk_score = (
-                    result.get('toxicity_score', 0) * 0.4 +
-                    result.get('misinformation_score', 0) * 0.4 +
-                    result.get('sensitivity_score', 0) * 0.2
-                )
-                
-                risk_level = self._determine_risk_level(risk_score)
-                
-                should_flag = (
-                    risk_score >= 7.0 or
-                    result.get('toxicity_score', 0) >= 8.0 or
-                    result.get('misinformation_score', 0) >= 8.0
-                )
-                
-                return {
-                    'content_type': content_type,
-                    'analyzed_at': datetime.now().isoformat(),
-                    'toxicity': toxicity,
-                    'misinformation': misinformation,
-                    'sensitivity': sensitivity,
-                    'risk_score': round(risk_score, 2),
-                    'risk_level': risk_level,
-                    'should_flag': should_flag,
-                    'primary_issue': result.get('primary_issue', 'none'),
-                    'text_length': len(text)
-                }
-            else:
-                return self._default_analysis_result()
+                result = json.loads(response[json_start:json_end])
+                scores = [result.get(k, 0) for k in
+                          ('toxicity_score', 'misinformation_score', 'sensitivity_score')] \
+                    if isinstance(result, dict) else [None]
+                # Scores non numériques : réponse inexploitable (et non mise en cache)
+                if all(isinstance(v, (int, float)) for v in scores):
+                    return result
         except Exception as e:
             print(f"⚠️ Erreur parsing: {e}")
-            return self._default_analysis_result()
+        return None
     
     def _calculate_risk_score(self, toxicity: Dict, misinformation: Dict, sensitivity: Dict) -> float:
         """
@@ -0,0 +1,119 @@
+"""
+Cache persistant des résultats LLM (classification thématique, modération)
+Un même texte (dépêches AIB reprises par plusieurs médias, relances des scripts,
+légendes identiques sur Facebook et Twitter) n'est envoyé qu'une fois à Ollama
+"""
+
+import hashlib
+import json
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Optional
+
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_text(text: str) -> str:
+    """Normaliser un texte avant hachage (Unicode NFC, espaces consécutifs fusionnés)"""
+    text = unicodedata.normalize('NFC', text or '')
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+class LLMCache:
+    """Cache des résultats LLM indexé par empreinte (texte, modèle, version du prompt)"""
+
+    def __init__(self, db, max_entries: int = 50000):
+        """
+        Initialise le cache
+
+        Args:
+            db: Instance de DatabaseManager (table llm_cache)
+            max_entries: Nombre maximum d'entrées conservées (éviction LRU au-delà)
+        """
+        self.db = db
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, model: str, prompt_version: Any, text: str) -> str:
+        """
+        Calculer l'empreinte d'une entrée
+
+        Args:
+            namespace: Type d'analyse ('theme', 'moderation')
+            model: Modèle Ollama
+            prompt_version: Version du prompt (à incrémenter quand le prompt change)
+            text: Texte envoyé au modèle
+
+        Returns:
+            Empreinte sha256 hexadécimale
+        """
+        payload = '\x1f'.join((namespace, model, str(prompt_version), normalize_text(text)))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, namespace: str, model: str, prompt_version: Any, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Lire un résultat en cache
+
+        Returns:
+            Résultat mémorisé ou None (compté comme hit / miss)
+        """
+        key = self.make_key(namespace, model, prompt_version, text)
+        try:
+            raw = self.db.get_llm_cache(key)
+            result = json.loads(raw) if raw else None
+        except Exception as e:
+            print(f"⚠️ Erreur lecture cache LLM: {e}")
+            result = None
+
+        with self._lock:
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return result
+
+    def put(self, namespace: str, model: str, prompt_version: Any, text: str, result: Dict[str, Any]):
+        """Mémoriser un résultat (à n'appeler que pour une vraie réponse du modèle)"""
+        key = self.make_key(namespace, model, prompt_version, text)
+        try:
+            self.db.save_llm_cache(
+                key, namespace, model,
+                json.dumps(result, ensure_ascii=False),
+                max_entries=self.max_entries
+            )
+        except Exception as e:
+            print(f"⚠️ Erreur écriture cache LLM: {e}")
+
+    @property
+    def hit_rate(self) -> float:
+        """Taux de succès du cache depuis le démarrage (0 à 1)"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Statistiques du cache
+
+        Returns:
+            Dictionnaire {'hits', 'misses', 'hit_rate', 'entries'}
+        """
+        try:
+            entries = sum(s['entries'] for s in self.db.get_llm_cache_stats().values())
+        except Exception:
+            entries = None
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hit_rate, 3),
+            'entries': entries
+        }
+
+    def summary(self) -> str:
+        """Résumé lisible des compteurs (ex: pour les scripts)"""
+        return (f"♻️ Cache LLM: {self.hits} hits / {self.misses} misses "
+                f"({self.hit_rate * 100:.1f}% de succès)")
@@ -0,0 +1,201 @@
+"""
+Consommateur de la file de travaux (table job_queue)
+Les scrapers enregistrent les nouveaux articles à traiter ; la classification
+et la modération sont exécutées ici, indépendamment de la collecte
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .classification_pool import ClassificationPool
+
+
+# Types de travaux
+JOB_CLASSIFY = 'classify_article'
+JOB_MODERATE = 'moderate_article'
+
+# Une classification de secours (mots-clés) signale un Ollama indisponible ou une réponse
+# illisible : le travail est réessayé, et la classification de secours n'est enregistrée
+# qu'au dernier essai (l'article garde ainsi une catégorie)
+MODEL_METHOD = 'mistral_ollama'
+
+
+class LLMUnavailableError(RuntimeError):
+    """Le modèle n'a pas répondu : résultat de secours non enregistré, travail à réessayer"""
+
+
+def is_last_attempt(job: Dict[str, Any]) -> bool:
+    """Dernier essai du travail : un résultat de secours est alors conservé"""
+    return job['attempts'] >= job['max_attempts']
+
+
+class QueueConsumer:
+    """Traite les travaux de classification et de modération de la file"""
+
+    def __init__(self, db, classifier=None, moderator=None, workers: Optional[int] = None,
+                 batch_size: int = 20, visibility_timeout: int = 300, retry_delay: int = 30):
+        """
+        Initialise le consommateur
+
+        Args:
+            db: Instance de DatabaseManager
+            classifier: ThemeClassifier (travaux de classification ignorés si None)
+            moderator: ContentModerator (travaux de modération ignorés si None)
+            workers: Requêtes Ollama simultanées pour la classification
+            batch_size: Nombre de travaux réservés à la fois
+            visibility_timeout: Délai (secondes) avant qu'un travail réservé non terminé redevienne disponible
+            retry_delay: Délai (secondes) avant le premier nouvel essai d'un travail échoué
+        """
+        self.db = db
+        self.classifier = classifier
+        self.moderator = moderator
+        self.pool = ClassificationPool(classifier, workers=workers, batch_size=batch_size) if classifier else None
+        self.batch_size = max(1, batch_size)
+        self.visibility_timeout = visibility_timeout
+        self.retry_delay = retry_delay
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self.stats = {'classified': 0, 'moderated': 0, 'retried': 0, 'dead': 0}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def run_once(self) -> int:
+        """
+        Traiter un lot de travaux de chaque type
+
+        Returns:
+            Nombre de travaux réservés
+        """
+        claimed = 0
+        if self.pool:
+            claimed += self._process_classifications()
+        if self.moderator:
+            claimed += self._process_moderations()
+        return claimed
+
+    def run(self, stop_event: Optional[threading.Event] = None, drain: bool = False,
+            idle_sleep: float = 5.0) -> Dict[str, int]:
+        """
+        Consommer la file en boucle
+
+        Args:
+            stop_event: Événement d'arrêt (vérifié entre deux lots)
+            drain: S'arrêter dès que la file ne contient plus de travail disponible
+            idle_sleep: Attente (secondes) quand la file est vide
+
+        Returns:
+            Compteurs {'classified', 'moderated', 'retried', 'dead'}
+        """
+        while not (stop_event and stop_event.is_set()):
+            if self.run_once() > 0:
+                continue
+            if drain:
+                break
+            if stop_event:
+                stop_event.wait(idle_sleep)
+            else:
+                time.sleep(idle_sleep)
+        return self.stats
+
+    def start_background(self, idle_sleep: float = 2.0) -> threading.Thread:
+        """
+        Lancer le consommateur dans un thread (ex: pendant la collecte)
+
+        Args:
+            idle_sleep: Attente (secondes) quand la file est vide
+
+        Returns:
+            Thread du consommateur (arrêté par stop_background)
+        """
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self.run, kwargs={'stop_event': self._stop_event, 'idle_sleep': idle_sleep},
+            name='queue-consumer', daemon=True
+        )
+        self._thread.start()
+        return self._thread
+
+    def stop_background(self):
+        """Arrêter le thread du consommateur (le lot en cours est terminé)"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _process_classifications(self) -> int:
+        """Classifier un lot d'articles de la file"""
+        jobs = self.db.claim_jobs(JOB_CLASSIFY, self.worker_id, self.batch_size, self.visibility_timeout)
+        if not jobs:
+            return 0
+
+        job_by_article = {job['object_id']: job for job in jobs}
+        articles = self.db.get_articles_by_ids(list(job_by_article))
+
+        # Articles supprimés entre-temps : rien à faire
+        found = {article['id'] for article in articles}
+        self.db.complete_jobs(job['id'] for job in jobs if job['object_id'] not in found)
+
+        def on_batch(results: List[Dict[str, Any]]):
+            # Classifications de secours : travaux déjà différés par on_result, sauf au dernier essai
+            results = [r for r in results
+                       if r.get('methode') == MODEL_METHOD or is_last_attempt(job_by_article[r['article_id']])]
+            if not results:
+                return
+            # Retirer les travaux de la file dans la transaction qui enregistre leurs résultats
+            with self.db.connection():
+                self.db.add_classifications_bulk(results)
+                self.db.complete_jobs(job_by_article[r['article_id']]['id'] for r in results)
+            self.stats['classified'] += len(results)
+
+        def on_result(rank, article, result, error):
+            job = job_by_article[article['id']]
+            if error is None and result.get('methode') != MODEL_METHOD and not is_last_attempt(job):
+                error = LLMUnavailableError(f"classification de secours ({result.get('methode')})")
+            if error is not None:
+                self._fail(job, error)
+
+        self.pool.run(articles, on_batch=on_batch, on_result=on_result)
+        return len(jobs)
+
+    def _process_moderations(self) -> int:
+        """Modérer un lot d'articles de la file"""
+        jobs = self.db.claim_jobs(JOB_MODERATE, self.worker_id, self.batch_size, self.visibility_timeout)
+        if not jobs:
+            return 0
+
+        articles = {article['id']: article for article in
+                    self.db.get_articles_by_ids([job['object_id'] for job in jobs])}
+
+        for job in jobs:
+            article = articles.get(job['object_id'])
+            if article is None:
+                self.db.complete_jobs([job['id']])
+                continue
+
+            try:
+                text = f"{article['titre']}\n\n{article.get('contenu') or ''}"
+                analysis = self.moderator.analyze_content(text, 'article')
+                # Résultat par défaut (content_type 'unknown') : modèle indisponible ou réponse illisible,
+                # enregistré seulement au dernier essai
+                if (analysis.get('content_type') == 'unknown' and len(text.strip()) >= 10
+                        and not is_last_attempt(job)):
+                    raise LLMUnavailableError("analyse de modération par défaut")
+                with self.db.connection():
+                    self.db.add_content_moderation('article', article['id'], analysis)
+                    self.db.complete_jobs([job['id']])
+                self.stats['moderated'] += 1
+            except Exception as e:
+                self._fail(job, e)
+
+        return len(jobs)
+
+    def _fail(self, job: Dict[str, Any], error: BaseException):
+        """Différer un travail échoué ou le mettre en lettre morte"""
+        status = self.db.fail_job(job['id'], str(error) or error.__class__.__name__, self.retry_delay)
+        if status == 'dead':
+            self.stats['dead'] += 1
+            print(f"   ☠️ Travail {job['id']} abandonné après {job['attempts']} essais: {error}")
+        else:
+            self.stats['retried'] += 1
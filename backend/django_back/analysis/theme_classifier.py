@@ -6,6 +6,7 @@ Classification automatique des articles en catégories
 
 import requests
 import json
+import threading
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
@@ -24,17 +25,36 @@ class ThemeClassifier:
         'Autres'
     ]
     
-    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "mistral"):
+    # Namespace et version du prompt dans le cache LLM (incrémenter si le prompt change)
+    CACHE_NAMESPACE = 'theme'
+    PROMPT_VERSION = 1
+    
+    def __init__(self, ollama_url: str = "http://localhost:11434", model: str = "mistral",
+                 timeout: int = 30, cache=None):
         """
         Initialise le classificateur
         
         Args:
             ollama_url: URL du serveur Ollama
             model: Nom du modèle (mistral par défaut)
+            timeout: Timeout d'une requête de classification (secondes)
+            cache: LLMCache optionnel (un texte déjà classifié n'est pas renvoyé à Ollama)
         """
         self.ollama_url = ollama_url
         self.model = model
         self.api_url = f"{ollama_url}/api/generate"
+        self.timeout = timeout
+        self.cache = cache
+        
+        # Une session keep-alive par thread (classification parallèle)
+        self._local = threading.local()
+    
+    def _session(self) -> requests.Session:
+        """Session HTTP du thread courant"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
     
     def check_ollama_status(self) -> bool:
         """
@@ -64,6 +84,32 @@ class ThemeClassifier:
         # Tronquer le contenu si trop long
         text_to_analyze = f"{titre}\n\n{contenu[:2000]}"
         
+        if self.cache is not None:
+            cached = self.cache.get(self.CACHE_NAMESPACE, self.model, self.PROMPT_VERSION, text_to_analyze)
+            if cached is not None:
+                return cached
+        
+        classification = self._classify_with_ollama(titre, contenu, text_to_analyze)
+        
+        # Ne mémoriser que les vraies réponses du modèle (pas la classification de secours)
+        if self.cache is not None and classification.get('methode') == 'mistral_ollama':
+            self.cache.put(self.CACHE_NAMESPACE, self.model, self.PROMPT_VERSION,
+                           text_to_analyze, classification)
+        
+        return classification
+    
+    def _classify_with_ollama(self, titre: str, contenu: str, text_to_analyze: str) -> Dict[str, any]:
+        """
+        Interroger Ollama (classification de secours en cas d'échec)
+        
+        Args:
+            titre: Titre de l'article
+            contenu: Contenu de l'article
+            text_to_analyze: Texte tronqué inséré dans le prompt
+        
+        Returns:
+            Dictionnaire avec catégorie, confiance, et mots-clés
+        """
         # Prompt pour Mistral
         prompt = f"""Tu es un expert en classification d'articles de presse burkinabè.
 
@@ -98,7 +144,7 @@ Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
 
         try:
             # Appel à Ollama
-            response = requests.post(
+            response = self._session().post(
                 self.api_url,
                 json={
                     "model": self.model,
@@ -109,7 +155,7 @@ Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
                         "num_predict": 200,
                     }
                 },
-                timeout=30
+                timeout=self.timeout
             )
             
             if response.status_code != 200:
@@ -248,52 +294,59 @@ Réponds UNIQUEMENT au format JSON suivant (sans texte avant ou après) :
             'methode': 'keywords_fallback'
         }
     
-    def classify_batch(self, articles: List[Dict[str, str]], show_progress: bool = True) -> List[Dict[str, any]]:
+    def classify_batch(self, articles: List[Dict[str, str]], show_progress: bool = True,
+                       workers: Optional[int] = None) -> List[Optional[Dict[str, any]]]:
         """
-        Classifier un lot d'articles
+        Classifier un lot d'articles (requêtes Ollama en parallèle)
         
         Args:
             articles: Liste de dictionnaires avec 'titre' et 'contenu'
             show_progress: Afficher la progression
+            workers: Nombre de requêtes simultanées (OLLAMA_NUM_PARALLEL par défaut)
         
         Returns:
-            Liste des classifications
+            Liste alignée sur les articles : classification de chaque article,
+            None pour un article dont la classification a échoué
         """
-        results = []
+        from .classification_pool import ClassificationPool
+        
         total = len(articles)
         
         if show_progress:
             print(f"🤖 Classification de {total} articles...")
         
-        for i, article in enumerate(articles, 1):
-            if show_progress and i % 10 == 0:
-                print(f"   Progression: {i}/{total} articles")
-            
-            classification = self.classify_article(
-                article.get('titre', ''),
-                article.get('contenu', '')
-            )
-            
-            results.append({
-                'article_id': article.get('id'),
-                **classification
-            })
+        def on_result(done, article, classification, error):
+            if show_progress and done % 10 == 0:
+                print(f"   Progression: {done}/{total} articles")
+        
+        # Indexer les articles pour restituer l'ordre d'origine
+        indexed = [{**article, 'id': i} for i, article in enumerate(articles)]
+        results: List[Optional[Dict[str, any]]] = [None] * total
+        
+        def on_batch(batch):
+            for classification in batch:
+                i = classification['article_id']
+                results[i] = {**classification, 'article_id': articles[i].get('id')}
+        
+        pool = ClassificationPool(self, workers=workers)
+        pool.run(indexed, on_batch=on_batch, on_result=on_result)
         
         if show_progress:
             print(f"✅ Classification terminée")
         
         return results
     
-    def get_statistics(self, classifications: List[Dict[str, any]]) -> Dict[str, any]:
+    def get_statistics(self, classifications: List[Optional[Dict[str, any]]]) -> Dict[str, any]:
         """
         Obtenir des statistiques sur les classifications
         
         Args:
-            classifications: Liste des classifications
+            classifications: Liste des classifications (les None de classify_batch sont ignorés)
         
         Returns:
             Dictionnaire de statistiques
         """
+        classifications = [c for c in classifications if c is not None]
         if not classifications:
             return {}
         
@@ -0,0 +1,77 @@
+"""
+Cache des réponses des endpoints d'agrégation (audience, classement, catégories)
+Les réponses sont indexées sur l'endpoint, ses paramètres et la version des
+données (table data_version) : toute écriture d'un scraping ou d'une
+classification rend les entrées existantes caduques.
+Les réponses portent un ETag ; une requête If-None-Match reçoit un 304.
+"""
+
+import hashlib
+import json
+from functools import wraps
+from typing import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def _etag(data) -> str:
+    """ETag du contenu sérialisé"""
+    raw = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return f'"{hashlib.md5(raw).hexdigest()}"'
+
+
+def _if_none_match(request) -> Iterable[str]:
+    """ETags envoyés par le client (If-None-Match)"""
+    header = request.META.get('HTTP_IF_NONE_MATCH', '')
+    return [tag.strip().removeprefix('W/') for tag in header.split(',') if tag.strip()]
+
+
+def _with_etag(request, data, etag: str) -> Response:
+    """Réponse 200 avec ETag, ou 304 si le client a déjà ce contenu"""
+    if etag in _if_none_match(request):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response['ETag'] = etag
+    # Le navigateur revalide à chaque affichage (réponse 304 sans corps)
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def cache_response(db, *params: str, timeout: int = None):
+    """
+    Décorateur de méthode get d'une APIView : cache de la réponse et ETag
+
+    Le délai borne la durée de vie d'une entrée : les fenêtres « N derniers
+    jours » glissent même quand les données ne changent pas.
+
+    Args:
+        db: Instance de DatabaseManager (version des données)
+        params: Paramètres de requête qui font varier la réponse (ex: 'days')
+        timeout: Durée de vie d'une entrée (secondes, défaut: API_CACHE_TIMEOUT)
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            values = '&'.join(f"{name}={request.GET.get(name, '')}" for name in params)
+            key = f"api:{request.path}:{values}:v{db.get_data_version()}"
+
+            cached = cache.get(key)
+            if cached is not None:
+                data, etag = cached
+                return _with_etag(request, data, etag)
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            data = response.data
+            etag = _etag(data)
+            cache.set(key, (data, etag),
+                      timeout if timeout is not None else getattr(settings, 'API_CACHE_TIMEOUT', 300))
+            return _with_etag(request, data, etag)
+        return wrapper
+    return decorator
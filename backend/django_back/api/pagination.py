@@ -0,0 +1,90 @@
+"""
+Pagination par curseur des listes de l'API
+Le curseur encode la clé de tri de la dernière ligne renvoyée ; la page
+suivante est lue par l'index à partir de cette position (pas d'OFFSET)
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, Optional, Tuple
+
+from django.conf import settings
+from rest_framework.response import Response
+
+
+class InvalidCursor(ValueError):
+    """Curseur de pagination illisible"""
+
+
+def get_page_size(request, default: int = 100) -> int:
+    """
+    Taille de page demandée (?limit=), bornée par API_MAX_PAGE_SIZE
+
+    Args:
+        request: Requête DRF
+        default: Taille si limit est absent ou invalide
+
+    Returns:
+        Taille de page entre 1 et API_MAX_PAGE_SIZE
+    """
+    max_size = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+    try:
+        size = int(request.GET.get('limit', default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, max_size))
+
+
+def encode_cursor(after: Tuple[Any, int]) -> str:
+    """Encoder (valeur de tri, id) en curseur opaque"""
+    raw = json.dumps(list(after), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, int]]:
+    """
+    Décoder le curseur reçu (?cursor=)
+
+    Returns:
+        (valeur de tri, id), ou None pour la première page
+
+    Raises:
+        InvalidCursor: si le curseur n'a pas été produit par encode_cursor
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, last_id = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise InvalidCursor('Curseur de pagination invalide')
+
+    if (not isinstance(last_id, int) or isinstance(last_id, bool)
+            or not isinstance(value, (str, int, float, type(None)))):
+        raise InvalidCursor('Curseur de pagination invalide')
+    return value, last_id
+
+
+def paginated_response(request, data, next_after: Optional[Tuple[Any, int]]) -> Response:
+    """
+    Réponse d'une page de liste
+
+    Le corps reste la liste des éléments ; le curseur de la page suivante
+    est exposé dans les en-têtes X-Next-Cursor et Link (rel="next"),
+    absents sur la dernière page.
+
+    Args:
+        request: Requête DRF
+        data: Éléments de la page
+        next_after: Clé de la dernière ligne (None si dernière page)
+    """
+    response = Response(data)
+    if next_after is not None:
+        cursor = encode_cursor(next_after)
+        query = request.GET.copy()
+        query['cursor'] = cursor
+        next_url = request.build_absolute_uri(f"{request.path}?{query.urlencode()}")
+        response['X-Next-Cursor'] = cursor
+        response['Link'] = f'<{next_url}>; rel="next"'
+    return response
@@ -4,12 +4,10 @@ Scheduler pour l'automatisation du scraping
 
 import threading
 import time
-import subprocess
-import sys
 from datetime import datetime
-from pathlib import Path
 
 from database.db_manager import DatabaseManager
+from .task_runner import get_task_runner, TaskQueueFull
 
 
 class ScrapingScheduler:
@@ -72,7 +70,12 @@ class ScrapingScheduler:
             self._execute_scraping(schedule)
     
     def _execute_scraping(self, schedule: dict):
-        """Exécute le scraping automatique"""
+        """Lance le scraping automatique (exécuté en arrière-plan par le même exécuteur que l'API)"""
+        runner = get_task_runner(self.db)
+        if runner.pending >= runner.max_pending:
+            print("⏳ Scrapings déjà en file, lancement automatique reporté")
+            return
+        
         try:
             # Créer une tâche de scraping
             task_id = self.db.create_scraping_task('automatic', {
@@ -80,58 +83,23 @@ class ScrapingScheduler:
                 'days': schedule['days'],
                 'fb_posts': schedule['fb_posts'],
                 'tweets': schedule['tweets']
-            })
+            }, status='queued')
             
-            # Construire la commande
-            script_path = Path(__file__).parent.parent / 'scrape_with_social.py'
-            cmd = [
-                sys.executable,
-                str(script_path),
+            # Le script tient à jour la progression et les totaux de la tâche
+            runner.submit(task_id, [
                 '--all',
                 '--days', str(schedule['days']),
                 '--fb-posts', str(schedule['fb_posts']),
                 '--tweets', str(schedule['tweets'])
-            ]
-            
-            # Exécuter le scraping
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=600  # 10 minutes max
-            )
-            
-            if result.returncode == 0:
-                # Compter les résultats
-                days = schedule['days']
-                articles = self.db.get_recent_articles(days=days, limit=10000)
-                fb_posts = self.db.get_recent_facebook_posts(days=days, limit=10000)
-                tweets = self.db.get_recent_twitter_tweets(days=days, limit=10000)
-                
-                total_articles = len(articles)
-                total_fb_posts = len(fb_posts)
-                total_tweets = len(tweets)
-                
-                # Mettre à jour la tâche
-                self.db.update_scraping_task(
-                    task_id, 'completed',
-                    total_articles=total_articles,
-                    total_fb_posts=total_fb_posts,
-                    total_tweets=total_tweets
-                )
-                
-                print(f"✅ Scraping automatique terminé: {total_articles} articles, {total_fb_posts} posts FB, {total_tweets} tweets")
-            else:
-                error_msg = result.stderr or 'Erreur inconnue'
-                self.db.update_scraping_task(task_id, 'failed', error_message=error_msg)
-                print(f"❌ Échec du scraping automatique: {error_msg}")
+            ])
+            print(f"✅ Scraping automatique lancé (tâche {task_id})")
             
             # Mettre à jour last_run et next_run
             self.db.update_schedule_last_run()
             
-        except subprocess.TimeoutExpired:
-            self.db.update_scraping_task(task_id, 'failed', error_message='Timeout')
-            print("❌ Le scraping automatique a pris trop de temps")
+        except TaskQueueFull as e:
+            self.db.update_scraping_task(task_id, 'failed', error_message=str(e))
+            print(f"⏳ Lancement automatique reporté: {e}")
         except Exception as e:
             if 'task_id' in locals():
                 self.db.update_scraping_task(task_id, 'failed', error_message=str(e))
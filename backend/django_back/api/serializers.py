@@ -6,6 +6,17 @@ from rest_framework import serializers
 from datetime import datetime, timedelta
 
 
+class DynamicFieldsSerializer(serializers.Serializer):
+    """Serializer dont les champs renvoyés sont choisis à l'instanciation (fields=[...])"""
+    
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
 class MediaSerializer(serializers.Serializer):
     """Serializer pour les médias"""
     id = serializers.IntegerField(read_only=True)
@@ -19,7 +30,7 @@ class MediaSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(read_only=True)
 
 
-class ArticleSerializer(serializers.Serializer):
+class ArticleSerializer(DynamicFieldsSerializer):
     """Serializer pour les articles"""
     id = serializers.IntegerField(read_only=True)
     media_id = serializers.IntegerField()
@@ -37,6 +48,8 @@ class ArticleSerializer(serializers.Serializer):
     commentaires = serializers.IntegerField(default=0)
     scraped_at = serializers.DateTimeField(read_only=True)
     created_at = serializers.DateTimeField(read_only=True)
+    categorie = serializers.CharField(required=False, allow_null=True)
+    confiance = serializers.FloatField(required=False, allow_null=True)
 
 
 class ClassificationSerializer(serializers.Serializer):
@@ -0,0 +1,165 @@
+"""
+Exécution en arrière-plan des tâches de scraping déclenchées par l'API
+Le script scrape_with_social.py est lancé hors des threads de requête,
+avec un nombre borné d'exécutions simultanées et de tâches en attente
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import FrozenSet, List, Optional
+
+from django.conf import settings
+
+
+SCRIPT_PATH = Path(__file__).parent.parent / 'scrape_with_social.py'
+
+# Mise à jour de updated_at pendant l'exécution (secondes) : une tâche sans
+# mise à jour depuis HEARTBEAT_TIMEOUT n'est plus considérée comme active
+HEARTBEAT_INTERVAL = 60
+HEARTBEAT_TIMEOUT = 5 * HEARTBEAT_INTERVAL
+
+
+class TaskQueueFull(Exception):
+    """Trop de tâches de scraping en file ou en cours"""
+
+
+class ScrapingTaskRunner:
+    """Lance les tâches de scraping dans des processus séparés, sans bloquer l'API"""
+
+    def __init__(self, db, max_concurrent: int = 1, max_pending: int = 3, timeout: int = 4 * 3600):
+        """
+        Initialise l'exécuteur
+
+        Args:
+            db: Instance de DatabaseManager
+            max_concurrent: Nombre de scrapings exécutés simultanément
+            max_pending: Nombre maximum de tâches en file ou en cours (au-delà : TaskQueueFull)
+            timeout: Durée maximum (secondes) d'un scraping avant arrêt du processus
+        """
+        self.db = db
+        self.max_pending = max(1, max_pending)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_concurrent),
+                                            thread_name_prefix='scraping-task')
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._task_ids = set()
+
+        # Tâches laissées en file ou en cours par un processus précédent (redémarrage,
+        # rechargement automatique) : leur exécution a disparu avec lui
+        interrupted = db.fail_interrupted_scraping_tasks('Tâche interrompue (redémarrage du serveur)')
+        if interrupted:
+            print(f"[SCRAPING] {interrupted} tâche(s) interrompue(s) marquée(s) en échec")
+
+    @property
+    def pending(self) -> int:
+        """Nombre de tâches en file ou en cours"""
+        return self._pending
+
+    @property
+    def task_ids(self) -> FrozenSet[int]:
+        """Tâches en file ou en cours dans cet exécuteur"""
+        with self._lock:
+            return frozenset(self._task_ids)
+
+    def submit(self, task_id: int, args: List[str]):
+        """
+        Mettre une tâche en file (retour immédiat)
+
+        Args:
+            task_id: ID de la tâche (table scraping_tasks, statut 'queued')
+            args: Arguments de scrape_with_social.py (ex: ['--all', '--days', '7'])
+
+        Raises:
+            TaskQueueFull: si max_pending tâches sont déjà en file ou en cours
+        """
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise TaskQueueFull(f"{self._pending} tâches de scraping déjà en file ou en cours")
+            self._pending += 1
+            self._task_ids.add(task_id)
+
+        self._executor.submit(self._run, task_id, args)
+
+    def _run(self, task_id: int, args: List[str]):
+        """Exécuter le script (thread de l'exécuteur) et clore la tâche"""
+        cmd = [sys.executable, str(SCRIPT_PATH), *args, '--task-id', str(task_id)]
+        try:
+            self.db.update_scraping_task_progress(task_id, status='running')
+            print(f"[SCRAPING] Tâche {task_id}: {' '.join(cmd)}")
+
+            # La progression est écrite en base par le script lui-même
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                text=True,
+                encoding='utf-8',
+                errors='replace'  # Remplacer les caractères invalides
+            )
+            stderr = self._wait(task_id, process)
+            if stderr is None:
+                self.db.update_scraping_task(task_id, 'failed', error_message='Timeout')
+                return
+
+            print(f"[SCRAPING] Tâche {task_id}: code retour {process.returncode}")
+
+            if process.returncode != 0:
+                error_msg = (stderr or 'Erreur inconnue')[-2000:]
+                self.db.update_scraping_task(task_id, 'failed', error_message=error_msg)
+                return
+
+            # Script terminé sans avoir clos la tâche (ex: paramètres invalides)
+            task = self.db.get_scraping_task(task_id)
+            if task and task['status'] in ('queued', 'running'):
+                self.db.update_scraping_task(task_id, 'completed')
+
+        except Exception as e:
+            self.db.update_scraping_task(task_id, 'failed', error_message=str(e))
+        finally:
+            with self._lock:
+                self._pending -= 1
+                self._task_ids.discard(task_id)
+
+    def _wait(self, task_id: int, process: subprocess.Popen) -> Optional[str]:
+        """
+        Attendre la fin du script en signalant la tâche comme vivante
+
+        Returns:
+            Sortie d'erreur du script, None s'il a été arrêté après le timeout
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                _, stderr = process.communicate(
+                    timeout=max(0, min(HEARTBEAT_INTERVAL, deadline - time.monotonic()))
+                )
+                return stderr
+            except subprocess.TimeoutExpired:
+                if time.monotonic() >= deadline:
+                    process.kill()
+                    process.communicate()
+                    return None
+                self.db.update_scraping_task_progress(task_id)
+
+
+_runner: Optional[ScrapingTaskRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_task_runner(db) -> ScrapingTaskRunner:
+    """Récupérer l'exécuteur du processus (créé au premier appel)"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = ScrapingTaskRunner(
+                db,
+                max_concurrent=getattr(settings, 'SCRAPING_MAX_CONCURRENT_TASKS', 1),
+                max_pending=getattr(settings, 'SCRAPING_MAX_PENDING_TASKS', 3),
+                timeout=getattr(settings, 'SCRAPING_TASK_TIMEOUT', 4 * 3600)
+            )
+        return _runner
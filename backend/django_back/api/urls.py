@@ -7,7 +7,7 @@ from .views import (
     # Médias
     MediaListView, MediaDetailView,
     # Articles
-    ArticleListView,
+    ArticleListView, ArticleDetailView,
     # Classifications
     ClassificationListView, CategoryStatsView, WeeklyCategoryStatsView,
     # Facebook
@@ -15,12 +15,13 @@ from .views import (
     # Twitter
     TwitterTweetListView,
     # Audience
-    AudienceWebView, AudienceFacebookView, AudienceTwitterView,
+    AudienceView, AudienceWebView, AudienceFacebookView, AudienceTwitterView,
     AudienceGlobalView, InactiveMediasView,
     # Ranking
     MediaRankingView,
     # Scraping
     ScrapingTriggerView, ScrapingScheduleView, ScrapingHistoryView,
+    ScrapingTaskDetailView, scraping_task_stream,
     # Modération
     ModerationStatsView, FlaggedContentListView, ContentModerationView,
     # Stats
@@ -37,6 +38,7 @@ urlpatterns = [
     
     # Articles
     path('articles/', ArticleListView.as_view(), name='article-list'),
+    path('articles/<int:article_id>/', ArticleDetailView.as_view(), name='article-detail'),
     
     # Classifications
     path('classifications/', ClassificationListView.as_view(), name='classification-list'),
@@ -50,6 +52,7 @@ urlpatterns = [
     path('twitter/tweets/', TwitterTweetListView.as_view(), name='twitter-tweets'),
     
     # Audience
+    path('audience/', AudienceView.as_view(), name='audience'),
     path('audience/web/', AudienceWebView.as_view(), name='audience-web'),
     path('audience/facebook/', AudienceFacebookView.as_view(), name='audience-facebook'),
     path('audience/twitter/', AudienceTwitterView.as_view(), name='audience-twitter'),
@@ -63,6 +66,8 @@ urlpatterns = [
     path('scraping/trigger/', ScrapingTriggerView.as_view(), name='scraping-trigger'),
     path('scraping/schedule/', ScrapingScheduleView.as_view(), name='scraping-schedule'),
     path('scraping/history/', ScrapingHistoryView.as_view(), name='scraping-history'),
+    path('scraping/tasks/<int:task_id>/', ScrapingTaskDetailView.as_view(), name='scraping-task-detail'),
+    path('scraping/tasks/<int:task_id>/stream/', scraping_task_stream, name='scraping-task-stream'),
     
     # Modération
     path('moderation/stats/', ModerationStatsView.as_view(), name='moderation-stats'),
@@ -6,22 +6,28 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.decorators import api_view
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 
+import json
 import sys
 import os
+import threading
+import time
 
 # Ajouter le chemin parent pour importer les modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.db_manager import DatabaseManager
-from analysis.audience_analyzer import AudienceAnalyzer
+from database.db_manager import DatabaseManager, ARTICLE_LIST_FIELDS, ARTICLE_SUMMARY_FIELDS
+from analysis.audience_analyzer import AudienceAnalyzer, DEFAULT_WINDOWS
+from .task_runner import get_task_runner, TaskQueueFull, HEARTBEAT_TIMEOUT
+from .pagination import get_page_size, decode_cursor, paginated_response, InvalidCursor
+from .cache import cache_response
 from .serializers import (
     MediaSerializer, ArticleSerializer, ClassificationSerializer,
     FacebookPostSerializer, TwitterTweetSerializer,
     AudienceWebSerializer, AudienceFacebookSerializer, AudienceTwitterSerializer,
     AudienceGlobalSerializer, CategoryStatsSerializer, WeeklyCategoryStatsSerializer,
-    MediaRankingSerializer, ScrapingRequestSerializer, ScrapingResponseSerializer
+    MediaRankingSerializer, ScrapingRequestSerializer
 )
 
 
@@ -29,6 +35,13 @@ from .serializers import (
 db = DatabaseManager()
 analyzer = AudienceAnalyzer(db)
 
+# Flux de progression des tâches de scraping (server-sent events)
+SSE_POLL_INTERVAL = 1  # Lecture de la progression (secondes)
+SSE_HEARTBEAT = 15  # Commentaire keep-alive sans changement (secondes)
+SSE_MAX_DURATION = 25  # Durée d'un flux ; le client se reconnecte ensuite (secondes)
+SSE_MAX_STREAMS = 8  # Flux simultanés (un worker occupé par flux) ; au-delà : 429
+_sse_slots = threading.BoundedSemaphore(SSE_MAX_STREAMS)
+
 
 # ==================== MÉDIAS ====================
 
@@ -147,43 +160,40 @@ class MediaDetailView(APIView):
         
         try:
             # Mettre à jour le média
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            
-            update_fields = []
-            params = []
+            with db.connection() as conn:
+                cursor = conn.cursor()
             
-            if 'nom' in serializer.validated_data:
-                update_fields.append('nom = ?')
-                params.append(serializer.validated_data['nom'])
+                update_fields = []
+                params = []
             
-            if 'url' in serializer.validated_data:
-                update_fields.append('url = ?')
-                params.append(serializer.validated_data['url'])
+                if 'nom' in serializer.validated_data:
+                    update_fields.append('nom = ?')
+                    params.append(serializer.validated_data['nom'])
             
-            if 'type_site' in serializer.validated_data:
-                update_fields.append('type_site = ?')
-                params.append(serializer.validated_data['type_site'])
+                if 'url' in serializer.validated_data:
+                    update_fields.append('url = ?')
+                    params.append(serializer.validated_data['url'])
             
-            if 'facebook_page' in serializer.validated_data:
-                update_fields.append('facebook_page = ?')
-                params.append(serializer.validated_data['facebook_page'])
+                if 'type_site' in serializer.validated_data:
+                    update_fields.append('type_site = ?')
+                    params.append(serializer.validated_data['type_site'])
             
-            if 'twitter_account' in serializer.validated_data:
-                update_fields.append('twitter_account = ?')
-                params.append(serializer.validated_data['twitter_account'])
+                if 'facebook_page' in serializer.validated_data:
+                    update_fields.append('facebook_page = ?')
+                    params.append(serializer.validated_data['facebook_page'])
             
-            if 'actif' in serializer.validated_data:
-                update_fields.append('actif = ?')
-                params.append(serializer.validated_data['actif'])
+                if 'twitter_account' in serializer.validated_data:
+                    update_fields.append('twitter_account = ?')
+                    params.append(serializer.validated_data['twitter_account'])
             
-            if update_fields:
-                params.append(media_id)
-                query = f"UPDATE medias SET {', '.join(update_fields)} WHERE id = ?"
-                cursor.execute(query, params)
-                conn.commit()
+                if 'actif' in serializer.validated_data:
+                    update_fields.append('actif = ?')
+                    params.append(serializer.validated_data['actif'])
             
-            conn.close()
+                if update_fields:
+                    params.append(media_id)
+                    query = f"UPDATE medias SET {', '.join(update_fields)} WHERE id = ?"
+                    cursor.execute(query, params)
             
             # Récupérer le média mis à jour
             medias = db.get_all_medias(actif_only=False)
@@ -222,11 +232,9 @@ class MediaDetailView(APIView):
             )
         
         try:
-            conn = db.get_connection()
-            cursor = conn.cursor()
-            cursor.execute('DELETE FROM medias WHERE id = ?', (media_id,))
-            conn.commit()
-            conn.close()
+            with db.connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('DELETE FROM medias WHERE id = ?', (media_id,))
             
             return Response(
                 {'message': 'Média supprimé avec succès'},
@@ -246,35 +254,58 @@ class ArticleListView(APIView):
     """Liste des articles"""
     
     def get(self, request):
-        """GET /api/articles/?media_id=X&limit=100"""
+        """GET /api/articles/?media_id=X&limit=100&fields=summary&cursor=..."""
         media_id = request.GET.get('media_id')
-        limit = int(request.GET.get('limit', 100))
+        limit = get_page_size(request)
         days = int(request.GET.get('days', 7))
         
+        # Projection : summary (défaut), all (tous les champs de liste) ou liste de champs
+        fields = request.GET.get('fields', 'summary')
+        if fields == 'summary':
+            fields = list(ARTICLE_SUMMARY_FIELDS)
+        elif fields == 'all':
+            fields = list(ARTICLE_LIST_FIELDS)
+        else:
+            fields = [f.strip() for f in fields.split(',') if f.strip()]
+        
+        unknown = [f for f in fields if f not in ARTICLE_LIST_FIELDS]
+        if unknown or not fields:
+            return Response(
+                {
+                    'error': f"Champs invalides: {', '.join(unknown) or '(aucun)'}",
+                    'champs_disponibles': list(ARTICLE_LIST_FIELDS)
+                },
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            after = decode_cursor(request.GET.get('cursor'))
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
         if media_id:
-            articles = db.get_articles_by_media(int(media_id), limit=limit)
+            articles, next_after = db.get_articles_page(fields, media_id=int(media_id), limit=limit, after=after)
         else:
-            articles = db.get_recent_articles(days=days, limit=limit)
-        
-        serializer = ArticleSerializer([{
-            'id': a.id,
-            'media_id': a.media_id,
-            'titre': a.titre,
-            'contenu': a.contenu,
-            'extrait': a.extrait,
-            'url': a.url,
-            'auteur': a.auteur,
-            'date_publication': a.date_publication,
-            'image_url': a.image_url,
-            'categories': a.categories,
-            'tags': a.tags,
-            'source_type': a.source_type,
-            'vues': a.vues,
-            'commentaires': a.commentaires,
-            'scraped_at': a.scraped_at,
-            'created_at': a.created_at
-        } for a in articles], many=True)
+            articles, next_after = db.get_articles_page(fields, days=days, limit=limit, after=after)
         
+        serializer = ArticleSerializer(articles, many=True, fields=fields)
+        return paginated_response(request, serializer.data, next_after)
+
+
+class ArticleDetailView(APIView):
+    """Détails d'un article (contenu complet)"""
+    
+    def get(self, request, article_id):
+        """GET /api/articles/{id}/"""
+        article = db.get_article_detail(article_id)
+        
+        if not article:
+            return Response(
+                {'error': 'Article non trouvé'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        serializer = ArticleSerializer(article)
         return Response(serializer.data)
 
 
@@ -304,6 +335,7 @@ class ClassificationListView(APIView):
 class CategoryStatsView(APIView):
     """Statistiques par catégorie"""
     
+    @cache_response(db, 'days')
     def get(self, request):
         """GET /api/classifications/stats/?days=30"""
         days = int(request.GET.get('days', 30))
@@ -315,6 +347,7 @@ class CategoryStatsView(APIView):
 class WeeklyCategoryStatsView(APIView):
     """Statistiques hebdomadaires par catégorie"""
     
+    @cache_response(db, 'weeks')
     def get(self, request):
         """GET /api/classifications/weekly/?weeks=5"""
         weeks = int(request.GET.get('weeks', 5))
@@ -329,9 +362,9 @@ class FacebookPostListView(APIView):
     """Liste des posts Facebook"""
     
     def get(self, request):
-        """GET /api/facebook/posts/?media_id=X&limit=100"""
+        """GET /api/facebook/posts/?media_id=X&limit=100&cursor=..."""
         media_id = request.GET.get('media_id')
-        limit = int(request.GET.get('limit', 100))
+        limit = get_page_size(request)
         
         if not media_id:
             return Response(
@@ -339,9 +372,14 @@ class FacebookPostListView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        posts = db.get_facebook_posts_by_media(int(media_id), limit=limit)
+        try:
+            after = decode_cursor(request.GET.get('cursor'))
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        posts, next_after = db.get_facebook_posts_page(int(media_id), limit=limit, after=after)
         serializer = FacebookPostSerializer(posts, many=True)
-        return Response(serializer.data)
+        return paginated_response(request, serializer.data, next_after)
 
 
 # ==================== TWITTER ====================
@@ -350,9 +388,9 @@ class TwitterTweetListView(APIView):
     """Liste des tweets"""
     
     def get(self, request):
-        """GET /api/twitter/tweets/?media_id=X&limit=100"""
+        """GET /api/twitter/tweets/?media_id=X&limit=100&cursor=..."""
         media_id = request.GET.get('media_id')
-        limit = int(request.GET.get('limit', 100))
+        limit = get_page_size(request)
         
         if not media_id:
             return Response(
@@ -360,16 +398,44 @@ class TwitterTweetListView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        tweets = db.get_twitter_tweets_by_media(int(media_id), limit=limit)
+        try:
+            after = decode_cursor(request.GET.get('cursor'))
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        tweets, next_after = db.get_twitter_tweets_page(int(media_id), limit=limit, after=after)
         serializer = TwitterTweetSerializer(tweets, many=True)
-        return Response(serializer.data)
+        return paginated_response(request, serializer.data, next_after)
 
 
 # ==================== AUDIENCE ====================
 
+class AudienceView(APIView):
+    """Audience de toutes les plateformes, plusieurs fenêtres, en colonnes"""
+    
+    MAX_WINDOWS = 5
+    
+    @cache_response(db, 'windows')
+    def get(self, request):
+        """GET /api/audience/?windows=7,30,90"""
+        raw = request.GET.get('windows')
+        try:
+            windows = [int(w) for w in raw.split(',')] if raw else list(DEFAULT_WINDOWS)
+        except ValueError:
+            return Response({'error': 'windows doit être une liste de jours (ex: 7,30,90)'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        if not windows or len(windows) > self.MAX_WINDOWS or any(not 1 <= w <= 365 for w in windows):
+            return Response({'error': f'1 à {self.MAX_WINDOWS} fenêtres entre 1 et 365 jours'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(analyzer.compute_audience(windows).to_dict())
+
+
 class AudienceWebView(APIView):
     """Audience Web"""
     
+    @cache_response(db, 'days')
     def get(self, request):
         """GET /api/audience/web/?days=30"""
         days = int(request.GET.get('days', 30))
@@ -381,6 +447,7 @@ class AudienceWebView(APIView):
 class AudienceFacebookView(APIView):
     """Audience Facebook"""
     
+    @cache_response(db, 'days')
     def get(self, request):
         """GET /api/audience/facebook/?days=30"""
         days = int(request.GET.get('days', 30))
@@ -392,6 +459,7 @@ class AudienceFacebookView(APIView):
 class AudienceTwitterView(APIView):
     """Audience Twitter"""
     
+    @cache_response(db, 'days')
     def get(self, request):
         """GET /api/audience/twitter/?days=30"""
         days = int(request.GET.get('days', 30))
@@ -403,6 +471,7 @@ class AudienceTwitterView(APIView):
 class AudienceGlobalView(APIView):
     """Audience globale"""
     
+    @cache_response(db, 'days')
     def get(self, request):
         """GET /api/audience/global/?days=30"""
         days = int(request.GET.get('days', 30))
@@ -414,6 +483,7 @@ class AudienceGlobalView(APIView):
 class InactiveMediasView(APIView):
     """Médias inactifs"""
     
+    @cache_response(db, 'days_threshold')
     def get(self, request):
         """GET /api/audience/inactive/?days_threshold=7"""
         days_threshold = int(request.GET.get('days_threshold', 7))
@@ -426,6 +496,7 @@ class InactiveMediasView(APIView):
 class MediaRankingView(APIView):
     """Classement des médias"""
     
+    @cache_response(db, 'days')
     def get(self, request):
         """GET /api/ranking/?days=30"""
         days = int(request.GET.get('days', 30))
@@ -437,14 +508,10 @@ class MediaRankingView(APIView):
 # ==================== SCRAPING ====================
 
 class ScrapingTriggerView(APIView):
-    """Déclencher un scraping"""
+    """Déclencher un scraping (exécuté en arrière-plan)"""
     
     def post(self, request):
-        """POST /api/scraping/trigger/"""
-        import subprocess
-        import sys
-        from pathlib import Path
-        
+        """POST /api/scraping/trigger/ -> 202 {task_id}"""
         serializer = ScrapingRequestSerializer(data=request.data)
         
         if not serializer.is_valid():
@@ -455,9 +522,51 @@ class ScrapingTriggerView(APIView):
         
         data = serializer.validated_data
         
+        # Construire les arguments du script
+        if data.get('all'):
+            args = ['--all']
+        elif data.get('url'):
+            args = ['--url', data['url']]
+        else:
+            return Response(
+                {'error': 'Spécifiez --url ou --all'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if data.get('days'):
+            args.extend(['--days', str(data['days'])])
+        if data.get('fb_posts'):
+            args.extend(['--fb-posts', str(data['fb_posts'])])
+        if data.get('tweets'):
+            args.extend(['--tweets', str(data['tweets'])])
+        if data.get('skip_facebook'):
+            args.append('--skip-facebook')
+        if data.get('skip_twitter'):
+            args.append('--skip-twitter')
+        
+        parameters = dict(data)
+        
+        # Créé au premier appel : clôt les tâches laissées par un processus précédent
+        runner = get_task_runner(db)
+        
+        # Clics répétés : renvoyer la tâche identique déjà en file ou en cours
+        active = db.get_active_scraping_task(parameters, live_task_ids=runner.task_ids,
+                                             max_idle=HEARTBEAT_TIMEOUT)
+        if active:
+            return Response(
+                self._accepted(active['id'], 'Un scraping identique est déjà en cours'),
+                status=status.HTTP_202_ACCEPTED
+            )
+        
+        if runner.pending >= runner.max_pending:
+            return Response(
+                {'error': 'Trop de scrapings en file, réessayez plus tard'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
+            )
+        
         try:
             # Créer une tâche de scraping (convertir en dict normal pour JSON)
-            task_id = db.create_scraping_task('manual', dict(data))
+            task_id = db.create_scraping_task('manual', parameters, status='queued')
         except Exception as e:
             return Response(
                 {'error': f'Erreur lors de la création de la tâche: {str(e)}'},
@@ -465,98 +574,120 @@ class ScrapingTriggerView(APIView):
             )
         
         try:
-            # Construire la commande
-            script_path = Path(__file__).parent.parent / 'scrape_with_social.py'
-            cmd = [sys.executable, str(script_path)]
-            
-            if data.get('all'):
-                cmd.append('--all')
-            elif data.get('url'):
-                cmd.extend(['--url', data['url']])
-            else:
-                db.update_scraping_task(task_id, 'failed', error_message='Paramètres invalides')
-                return Response(
-                    {'error': 'Spécifiez --url ou --all'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            if data.get('days'):
-                cmd.extend(['--days', str(data['days'])])
-            if data.get('fb_posts'):
-                cmd.extend(['--fb-posts', str(data['fb_posts'])])
-            if data.get('tweets'):
-                cmd.extend(['--tweets', str(data['tweets'])])
-            if data.get('skip_facebook'):
-                cmd.append('--skip-facebook')
-            if data.get('skip_twitter'):
-                cmd.append('--skip-twitter')
-            
-            # Exécuter le scraping
-            print(f"[SCRAPING] Commande: {' '.join(cmd)}")
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='replace',  # Remplacer les caractères invalides
-                timeout=18000000000  # 30 minutes max
-            )
-            
-            print(f"[SCRAPING] Return code: {result.returncode}")
-            if result.stdout:
-                print(f"[SCRAPING] STDOUT: {result.stdout[:500]}")
-            if result.stderr:
-                print(f"[SCRAPING] STDERR: {result.stderr[:500]}")
-            
-            if result.returncode == 0:
-                # Compter les résultats
-                days = data.get('days', 7)
-                articles = db.get_recent_articles(days=days, limit=10000)
-                fb_posts = db.get_recent_facebook_posts(days=days, limit=10000) if not data.get('skip_facebook') else []
-                tweets = db.get_recent_twitter_tweets(days=days, limit=10000) if not data.get('skip_twitter') else []
-                
-                total_articles = len(articles)
-                total_fb_posts = len(fb_posts)
-                total_tweets = len(tweets)
-                
-                # Mettre à jour la tâche
-                db.update_scraping_task(
-                    task_id, 'completed',
-                    total_articles=total_articles,
-                    total_fb_posts=total_fb_posts,
-                    total_tweets=total_tweets
-                )
-                
-                response_data = {
-                    'status': 'success',
-                    'message': 'Scraping terminé avec succès',
-                    'total_articles': total_articles,
-                    'total_fb_posts': total_fb_posts,
-                    'total_tweets': total_tweets
-                }
-                
-                response_serializer = ScrapingResponseSerializer(response_data)
-                return Response(response_serializer.data, status=status.HTTP_200_OK)
-            else:
-                error_msg = result.stderr or 'Erreur inconnue'
-                db.update_scraping_task(task_id, 'failed', error_message=error_msg)
-                return Response(
-                    {'error': error_msg},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-        
-        except subprocess.TimeoutExpired:
-            db.update_scraping_task(task_id, 'failed', error_message='Timeout')
+            runner.submit(task_id, args)
+        except TaskQueueFull as e:
+            db.update_scraping_task(task_id, 'failed', error_message=str(e))
             return Response(
-                {'error': 'Le scraping a pris trop de temps'},
-                status=status.HTTP_408_REQUEST_TIMEOUT
+                {'error': 'Trop de scrapings en file, réessayez plus tard'},
+                status=status.HTTP_429_TOO_MANY_REQUESTS
             )
-        except Exception as e:
-            db.update_scraping_task(task_id, 'failed', error_message=str(e))
+        
+        return Response(
+            self._accepted(task_id, 'Scraping lancé en arrière-plan'),
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @staticmethod
+    def _accepted(task_id: int, message: str) -> dict:
+        """Réponse 202 : identifiant et URLs de suivi de la tâche"""
+        return {
+            'status': 'accepted',
+            'message': message,
+            'task_id': task_id,
+            'task_url': f'/api/scraping/tasks/{task_id}/',
+            'stream_url': f'/api/scraping/tasks/{task_id}/stream/'
+        }
+
+
+class ScrapingTaskDetailView(APIView):
+    """État et progression d'une tâche de scraping"""
+    
+    def get(self, request, task_id):
+        """GET /api/scraping/tasks/<id>/"""
+        task = db.get_scraping_task(task_id)
+        
+        if not task:
             return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': 'Tâche non trouvée'},
+                status=status.HTTP_404_NOT_FOUND
             )
+        
+        return Response(task)
+
+
+def scraping_task_stream(request, task_id):
+    """
+    GET /api/scraping/tasks/<id>/stream/
+    Progression en server-sent events (un événement à chaque changement, fin à la clôture)
+    Chaque flux dure au plus SSE_MAX_DURATION secondes : le client se reconnecte
+    automatiquement (champ retry). Au-delà de SSE_MAX_STREAMS flux simultanés,
+    réponse 429 : le client interroge alors /api/scraping/tasks/<id>/
+    Vue Django simple : la négociation de contenu DRF refuserait text/event-stream
+    """
+    if request.method != 'GET':
+        return JsonResponse({'error': 'Méthode non autorisée'}, status=405)
+    
+    if not db.get_scraping_task(task_id):
+        return JsonResponse({'error': 'Tâche non trouvée'}, status=404)
+    
+    if not _sse_slots.acquire(blocking=False):
+        return JsonResponse(
+            {'error': 'Trop de flux de progression ouverts, interroger la tâche périodiquement'},
+            status=429
+        )
+    
+    def events():
+        last_payload = None
+        last_sent = time.monotonic()
+        deadline = last_sent + SSE_MAX_DURATION
+        
+        yield f"retry: {SSE_POLL_INTERVAL * 1000:.0f}\n\n"
+        
+        while time.monotonic() < deadline:
+            task = db.get_scraping_task(task_id)
+            if task is None:
+                return
+            
+            payload = json.dumps(task, default=str)
+            if payload != last_payload:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last_payload = payload
+                last_sent = time.monotonic()
+            elif time.monotonic() - last_sent >= SSE_HEARTBEAT:
+                # Commentaire SSE : garde la connexion ouverte derrière un proxy
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            
+            if task['status'] in ('completed', 'failed'):
+                yield f"event: done\ndata: {payload}\n\n"
+                return
+            
+            time.sleep(SSE_POLL_INTERVAL)
+    
+    response = StreamingHttpResponse(_SSEStream(events()), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Pas de mise en tampon par nginx
+    return response
+
+
+class _SSEStream:
+    """
+    Flux SSE qui libère sa place à la fermeture de la réponse
+    (Django appelle close() en fin de réponse, même si le flux n'a pas été lu)
+    """
+    
+    def __init__(self, events):
+        self.events = events
+        self.released = False
+    
+    def __iter__(self):
+        return self.events
+    
+    def close(self):
+        self.events.close()
+        if not self.released:
+            self.released = True
+            _sse_slots.release()
 
 
 class ScrapingScheduleView(APIView):
@@ -628,28 +759,12 @@ class ScrapingHistoryView(APIView):
 
 @api_view(['GET'])
 def stats_overview(request):
-    """Vue d'ensemble des statistiques"""
+    """Vue d'ensemble des statistiques (compteurs SQL, aucun contenu chargé)"""
     days = int(request.GET.get('days', 30))
     
-    # Compter les médias
-    medias = db.get_all_medias()
-    
-    # Compter les articles récents
-    articles = db.get_recent_articles(days=days, limit=10000)
-    
-    # Statistiques par catégorie
-    category_stats = db.get_category_stats(days=days)
-    
-    # Classement
-    ranking = db.get_media_ranking_with_twitter(days=days)
-    
-    stats = {
-        'total_medias': len(medias),
-        'total_articles': len(articles),
-        'total_categories': len(category_stats),
-        'top_media': ranking[0] if ranking else None,
-        'period_days': days
-    }
+    stats = db.get_overview_counts(days=days)
+    stats['top_media'] = db.get_top_media(days=days)
+    stats['period_days'] = days
     
     return Response(stats)
 
@@ -669,12 +784,17 @@ class FlaggedContentListView(APIView):
     """Liste des contenus signalés"""
     
     def get(self, request):
-        """GET /api/moderation/flagged/?content_type=article&limit=50"""
+        """GET /api/moderation/flagged/?content_type=article&limit=50&cursor=..."""
         content_type = request.GET.get('content_type')
-        limit = int(request.GET.get('limit', 50))
+        limit = get_page_size(request, default=50)
+        
+        try:
+            after = decode_cursor(request.GET.get('cursor'))
+        except InvalidCursor as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        flagged = db.get_flagged_contents(content_type=content_type, limit=limit)
-        return Response(flagged)
+        flagged, next_after = db.get_flagged_contents_page(content_type=content_type, limit=limit, after=after)
+        return paginated_response(request, flagged, next_after)
 
 
 class ContentModerationView(APIView):
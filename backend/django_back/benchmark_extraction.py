@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Benchmark de l'extraction des articles : ancienne extraction (un select_one
+par sélecteur et par champ, suppression des balises dans le document)
+contre l'extraction en un seul parcours (scrapers/article_extractor.py),
+sur le corpus de benchmark_parsers.py. Les champs extraits doivent être identiques.
+Mesure aussi l'extraction avec les modèles de site (sélecteurs appris par domaine).
+"""
+
+import argparse
+import os
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+
+from scrapers.article_extractor import (
+    ArticleExtractor, SiteTemplate, TITLE_SELECTORS, TITLE_META, TITLE_TAG, DATE_META_SELECTORS, DATE_TIME,
+    DATE_TEXT_SELECTORS, CONTENT_SELECTORS, RSS_CONTENT_SELECTORS, PARAGRAPH_FALLBACK,
+    AUTHOR_META, AUTHOR_SELECTORS, IMAGE_META, IMAGE_SELECTORS, REMOVED_TAGS,
+    parse_french_date, date_from_url
+)
+from scrapers.html_parser import HTMLNode, available_backends, parse_html
+from benchmark_parsers import load_corpus
+
+from dateutil import parser as date_parser
+
+
+# Ancienne extraction, conservée pour comparaison
+
+def legacy_extract(doc: HTMLNode, url: str, base_url: str) -> Dict[str, object]:
+    """Champs d'un article : chaque sélecteur parcourt le document (SmartHTMLScraper)"""
+    return {
+        'titre': legacy_title(doc),
+        'date': legacy_date(doc, url),
+        'contenu': legacy_content(doc, CONTENT_SELECTORS) or '',
+        'auteur': legacy_author(doc),
+        'image': legacy_image(doc, base_url),
+    }
+
+
+def legacy_title(doc: HTMLNode) -> Optional[str]:
+    for selector in TITLE_SELECTORS:
+        elem = doc.select_one(selector)
+        if elem:
+            titre = elem.text(strip=True)
+            if titre and len(titre) > 10:
+                return titre
+    meta_title = doc.select_one(TITLE_META)
+    if meta_title and meta_title.attr('content'):
+        return meta_title.attr('content')
+    title_tag = doc.select_one(TITLE_TAG)
+    if title_tag:
+        return title_tag.text(strip=True).split('|')[0].split('-')[0].strip()
+    return None
+
+
+def legacy_date(doc: HTMLNode, url: str):
+    for selector in DATE_META_SELECTORS:
+        elem = doc.select_one(selector)
+        if elem and elem.attr('content'):
+            try:
+                return date_parser.parse(elem.attr('content'))
+            except:
+                pass
+    time_elem = doc.select_one(DATE_TIME)
+    if time_elem:
+        try:
+            return date_parser.parse(time_elem.attr('datetime'))
+        except:
+            pass
+    for selector in DATE_TEXT_SELECTORS:
+        elem = doc.select_one(selector)
+        if elem:
+            date_obj = parse_french_date(elem.text(strip=True))
+            if date_obj:
+                return date_obj
+    return date_from_url(url)
+
+
+def legacy_content(doc: HTMLNode, selectors: List[str], max_length: Optional[int] = 5000,
+                   paragraph_fallback: bool = False) -> Optional[str]:
+    for selector in selectors:
+        elem = doc.select_one(selector)
+        if elem:
+            elem.remove(REMOVED_TAGS)
+            content = elem.text(separator='\n', strip=True)
+            if content and len(content) > 100:
+                return content[:max_length] if max_length else content
+    if paragraph_fallback:
+        article_elem = doc.select_one(PARAGRAPH_FALLBACK)
+        if article_elem:
+            paragraphs = article_elem.select('p')
+            text = '\n\n'.join([p.text(strip=True) for p in paragraphs if len(p.text(strip=True)) > 20])
+            if len(text) > 100:
+                return text
+    return None
+
+
+def legacy_author(doc: HTMLNode) -> Optional[str]:
+    meta_author = doc.select_one(AUTHOR_META)
+    if meta_author and meta_author.attr('content'):
+        return meta_author.attr('content')
+    for selector in AUTHOR_SELECTORS:
+        elem = doc.select_one(selector)
+        if elem:
+            author = elem.text(strip=True)
+            if author and len(author) < 100:
+                return author
+    return None
+
+
+def legacy_image(doc: HTMLNode, base_url: str) -> Optional[str]:
+    og_image = doc.select_one(IMAGE_META)
+    if og_image and og_image.attr('content'):
+        return og_image.attr('content')
+    for selector in IMAGE_SELECTORS:
+        img = doc.select_one(selector)
+        if img and img.attr('src'):
+            return urljoin(base_url, img.attr('src'))
+    return None
+
+
+def best_time(func, corpus: List[Dict[str, str]], backend: str, repeat: int) -> float:
+    """
+    Meilleur temps (secondes) de `repeat` passages de func(page, doc, rss_doc) sur toutes les pages,
+    hors parsing : les documents sont parsés avant chaque passage (l'ancienne extraction les modifie)
+    """
+    best = None
+    for _ in range(repeat):
+        docs = [(parse_html(page['html'], backend), parse_html(page['html'], backend)) for page in corpus]
+        start = time.perf_counter()
+        for page, (doc, rss_doc) in zip(corpus, docs):
+            func(page, doc, rss_doc)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de l\'extraction des articles')
+    parser.add_argument('--corpus', default='data/html_corpus',
+                       help='Dossier du corpus (constitué par benchmark_parsers.py --fetch N)')
+    parser.add_argument('--backends', help='Moteurs à mesurer, séparés par des virgules (défaut: tous les installés)')
+    parser.add_argument('--repeat', type=int, default=3, help='Répétitions (meilleur temps)')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(os.path.join(args.corpus, 'index.json')):
+        print(f"❌ Corpus introuvable: {args.corpus} (le constituer avec benchmark_parsers.py --fetch N)")
+        return
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"❌ Corpus vide: {args.corpus}")
+        return
+
+    backends = args.backends.split(',') if args.backends else available_backends()
+    missing = [name for name in backends if name not in available_backends()]
+    if missing:
+        print(f"❌ Moteur(s) non installé(s): {', '.join(missing)}")
+        return
+
+    extractors: Dict[str, ArticleExtractor] = {}
+    rss_extractor = ArticleExtractor(content_selectors=RSS_CONTENT_SELECTORS,
+                                     content_max_length=None, paragraph_fallback=True)
+    for page in corpus:
+        parsed = urlparse(page['url'])
+        page['base_url'] = f"{parsed.scheme}://{parsed.netloc}"
+        if page['base_url'] not in extractors:
+            extractors[page['base_url']] = ArticleExtractor(page['base_url'])
+
+    def run_legacy(page, doc, rss_doc):
+        fields = legacy_extract(doc, page['url'], page['base_url'])
+        fields['contenu_rss'] = legacy_content(rss_doc, RSS_CONTENT_SELECTORS,
+                                               max_length=None, paragraph_fallback=True)
+        return fields
+
+    def run_single_pass(page, doc, rss_doc):
+        fields = extractors[page['base_url']].extract(doc, page['url'])
+        rss_page = rss_extractor.collect(rss_doc, ('contenu',))
+        fields['contenu_rss'] = rss_extractor.content(rss_page) or None
+        return fields
+
+    def run_article(page, doc, rss_doc, template: Optional[SiteTemplate] = None):
+        return extractors[page['base_url']].extract(doc, page['url'], template)
+
+    print("\n" + "="*60)
+    print("📊 BENCHMARK DE L'EXTRACTION")
+    print("="*60 + "\n")
+    print(f"📄 {len(corpus)} pages\n")
+
+    for backend in backends:
+        # Deux documents par page : article (SmartHTMLScraper) et contenu d'un article RSS
+        legacy_time = best_time(run_legacy, corpus, backend, args.repeat)
+        new_time = best_time(run_single_pass, corpus, backend, args.repeat)
+
+        same: Dict[str, int] = {}
+        differences = []
+        for page in corpus:
+            docs = [parse_html(page['html'], backend) for _ in range(4)]
+            expected, got = run_legacy(page, *docs[:2]), run_single_pass(page, *docs[2:])
+            for field, value in expected.items():
+                if got[field] == value:
+                    same[field] = same.get(field, 0) + 1
+                elif len(differences) < 5:
+                    differences.append((page['url'], field, value, got[field]))
+
+        # Modèles appris sur un premier passage, puis requêtés directement
+        templates = {base_url: SiteTemplate() for base_url in extractors}
+        for page in corpus:
+            run_article(page, parse_html(page['html'], backend), None, templates[page['base_url']])
+        article_time = best_time(run_article, corpus, backend, args.repeat)
+        template_time = best_time(lambda page, doc, rss_doc: run_article(page, doc, rss_doc, templates[page['base_url']]),
+                                  corpus, backend, args.repeat)
+        template_same = sum(
+            run_article(page, parse_html(page['html'], backend), None)
+            == run_article(page, parse_html(page['html'], backend), None, templates[page['base_url']])
+            for page in corpus
+        )
+
+        print(f"⚙️ {backend}: extraction {legacy_time * 1000:.0f} ms → {new_time * 1000:.0f} ms "
+              f"({legacy_time / new_time if new_time > 0 else 0:.1f}x)")
+        print("   🎯 Identique: " + ', '.join(
+            f"{field} {same.get(field, 0) * 100 / len(corpus):.0f}%"
+            for field in ('titre', 'date', 'contenu', 'auteur', 'image', 'contenu_rss')
+        ))
+        for url, field, expected, got in differences:
+            print(f"   ⚠️ {url} [{field}]: {str(expected)[:60]!r} au lieu de {str(got)[:60]!r}")
+        print(f"   🧩 Modèles de site: {article_time * 1000:.0f} ms → {template_time * 1000:.0f} ms "
+              f"({article_time / template_time if template_time > 0 else 0:.1f}x), "
+              f"articles identiques {template_same * 100 / len(corpus):.0f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark du repérage des liens d'articles sur les pages d'accueil : ancienne
+boucle (un nœud, un urljoin, un urlparse et une liste de patterns par lien)
+contre le classement compilé (scrapers/link_classifier.py). Pages d'accueil du
+corpus de benchmark_parsers.py et page d'accueil synthétique de plusieurs
+milliers de liens. Les liens trouvés doivent être identiques.
+"""
+
+import argparse
+import os
+import random
+import re
+import time
+from typing import Dict, List
+from urllib.parse import urljoin, urlparse
+
+from scrapers.html_parser import HTMLNode, available_backends, parse_html
+from scrapers.link_classifier import EXCLUDED_PATTERNS, LinkClassifier
+from benchmark_parsers import load_corpus
+
+
+SYNTHETIC_BASE_URL = 'https://www.lefaso.net'
+
+
+# Ancien repérage, conservé pour comparaison
+
+def legacy_article_links(doc: HTMLNode, base_url: str, max_links: int) -> List[str]:
+    """Liens d'articles : chaque lien est résolu et testé (SmartHTMLScraper.find_article_links)"""
+    domain = urlparse(base_url).netloc
+    links = []
+    seen_urls = set()
+    for link in doc.select('a[href]'):
+        if len(links) >= max_links:
+            break
+        href = link.attr('href')
+        if not href:
+            continue
+        full_url = urljoin(base_url, href)
+        if urlparse(full_url).netloc != domain:
+            continue
+        if full_url in seen_urls:
+            continue
+        if legacy_is_article_url(full_url):
+            links.append(full_url)
+            seen_urls.add(full_url)
+    return links
+
+
+def legacy_is_article_url(url: str) -> bool:
+    url_lower = url.lower()
+    for pattern in EXCLUDED_PATTERNS:
+        if pattern in url_lower:
+            return False
+    if re.search(r'/\d{4}(/\d{2})?/?$', url):
+        return False
+    path = urlparse(url).path.strip('/')
+    if not path:
+        return False
+    if re.search(r'/\d{4}/', url):
+        segments = [s for s in path.split('/') if s]
+        for i, segment in enumerate(segments):
+            if re.match(r'^\d{4}$', segment):
+                return i < len(segments) - 1
+    return True
+
+
+def synthetic_homepage(links: int, seed: int = 42) -> str:
+    """Page d'accueil d'un portail : articles, rubriques, archives, médias, liens externes et doublons"""
+    rng = random.Random(seed)
+    kinds = [
+        lambda n: f'/spip.php?article{n}',
+        lambda n: f'/{2020 + n % 6}/{n % 12 + 1:02d}/{n % 28 + 1:02d}/titre-article-{n}/',
+        lambda n: f'{SYNTHETIC_BASE_URL}/actualite/politique/article-{n}.html',
+        lambda n: f'article-relatif-{n}',
+        lambda n: f'/category/rubrique-{n % 15}/',
+        lambda n: f'/tag/mot-cle-{n % 40}/',
+        lambda n: f'/{2020 + n % 6}/{n % 12 + 1:02d}/',
+        lambda n: f'/wp-content/uploads/photo-{n}.JPG',
+        lambda n: f'/page/{n % 30}/',
+        lambda n: f'https://www.facebook.com/partage-{n}',
+        lambda n: f'/article-{n}/#respond',
+        lambda n: '/contact',
+        lambda n: '/',
+        lambda n: f'#section-{n % 10}',
+    ]
+    anchors = []
+    for i in range(links):
+        # Une partie des liens est répétée (menus, blocs "à la une" et "les plus lus")
+        n = rng.randrange(links // 3) if rng.random() < 0.4 else i
+        anchors.append(f'<li><a href="{rng.choice(kinds)(n)}">Lien {i}</a></li>')
+    return f"<html><body><nav><ul>{''.join(anchors)}</ul></nav></body></html>"
+
+
+def best_time(func, pages: List[Dict[str, object]], repeat: int) -> float:
+    """Meilleur temps (secondes) de `repeat` passages de func(page) sur toutes les pages"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in pages:
+            func(page)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du repérage des liens d\'articles')
+    parser.add_argument('--corpus', default='data/html_corpus',
+                       help='Dossier du corpus (constitué par benchmark_parsers.py --fetch N)')
+    parser.add_argument('--links', type=int, default=2000, help='Liens de la page d\'accueil synthétique')
+    parser.add_argument('--max-links', type=int, default=100, help='Nombre maximum de liens d\'articles par page')
+    parser.add_argument('--backends', help='Moteurs à mesurer, séparés par des virgules (défaut: tous les installés)')
+    parser.add_argument('--repeat', type=int, default=5, help='Répétitions (meilleur temps)')
+
+    args = parser.parse_args()
+
+    pages = [{'url': SYNTHETIC_BASE_URL, 'html': synthetic_homepage(args.links)}]
+    if os.path.exists(os.path.join(args.corpus, 'index.json')):
+        pages += [page for page in load_corpus(args.corpus) if page['kind'] == 'homepage']
+
+    backends = args.backends.split(',') if args.backends else available_backends()
+    missing = [name for name in backends if name not in available_backends()]
+    if missing:
+        print(f"❌ Moteur(s) non installé(s): {', '.join(missing)}")
+        return
+
+    print("\n" + "="*60)
+    print("📊 BENCHMARK DU REPÉRAGE DES LIENS")
+    print("="*60 + "\n")
+    print(f"📄 {len(pages)} pages d'accueil (dont 1 synthétique de {args.links} liens)\n")
+
+    for page in pages:
+        parsed = urlparse(page['url'])
+        page['base_url'] = f"{parsed.scheme}://{parsed.netloc}"
+
+    for backend in backends:
+        # Documents parsés hors mesure
+        for page in pages:
+            page['doc'] = parse_html(page['html'], backend)
+
+        def run_legacy(page):
+            return legacy_article_links(page['doc'], page['base_url'], args.max_links)
+
+        def run_classifier(page):
+            # Un classement par site, comme SmartHTMLScraper
+            classifier = LinkClassifier(page['base_url'])
+            return classifier.article_links(page['doc'].select_attr('a[href]', 'href'), args.max_links)
+
+        legacy_time = best_time(run_legacy, pages, args.repeat)
+        new_time = best_time(run_classifier, pages, args.repeat)
+
+        same = sum(run_legacy(page) == run_classifier(page) for page in pages)
+        found = sum(len(run_classifier(page)) for page in pages)
+
+        print(f"⚙️ {backend}: repérage {legacy_time * 1000:.1f} ms → {new_time * 1000:.1f} ms "
+              f"({legacy_time / new_time if new_time > 0 else 0:.1f}x), {found} liens d'articles")
+        print(f"   🎯 Pages identiques: {same * 100 / len(pages):.0f}%")
+
+
+if __name__ == '__main__':
+    main()
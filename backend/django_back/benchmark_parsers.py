@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Benchmark des moteurs de parsing HTML (scrapers/html_parser.py) sur un corpus
+de pages enregistrées : pages d'accueil et pages articles des médias suivis.
+Mesure le temps de parsing et d'extraction (titre, date, contenu, auteur,
+image, liens) et compare les valeurs extraites à celles de html.parser.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from database.db_manager import DatabaseManager
+from scrapers.html_parser import available_backends, parse_html
+from scrapers.smart_html_scraper import SmartHTMLScraper
+
+
+# Moteur de référence : l'analyseur historique des scrapers
+REFERENCE_BACKEND = 'bs4'
+
+ARTICLE_FIELDS = ['titre', 'date', 'contenu', 'auteur', 'image']
+
+
+def build_corpus(db: DatabaseManager, corpus_dir: str, pages_per_media: int) -> List[Dict[str, str]]:
+    """
+    Enregistrer la page d'accueil et des pages articles de chaque média actif
+
+    Returns:
+        Index du corpus : [{'file', 'url', 'kind'}]
+    """
+    os.makedirs(corpus_dir, exist_ok=True)
+    index = []
+
+    def save(url: str, html: str, kind: str):
+        name = f"{urlparse(url).netloc}_{hashlib.md5(url.encode('utf-8')).hexdigest()[:12]}.html"
+        with open(os.path.join(corpus_dir, name), 'w', encoding='utf-8') as f:
+            f.write(html)
+        index.append({'file': name, 'url': url, 'kind': kind})
+
+    for media in db.get_medias_for_web_scraping():
+        print(f"📥 {media.nom}: {media.url}")
+        scraper = SmartHTMLScraper(media.url)
+        homepage = scraper.fetcher.fetch(scraper.base_url)
+        if not homepage.ok:
+            print(f"   ⚠️ Page d'accueil indisponible: {homepage.error}")
+            continue
+        save(scraper.base_url, homepage.text, 'homepage')
+
+        links = scraper.find_article_links(parse_html(homepage.text), max_links=pages_per_media)
+        for url, page in zip(links, scraper.fetcher.fetch_many(links)):
+            if page.ok:
+                save(url, page.text, 'article')
+        scraper.fetcher.close()
+
+    with open(os.path.join(corpus_dir, 'index.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    return index
+
+
+def load_corpus(corpus_dir: str) -> List[Dict[str, str]]:
+    """Charger l'index du corpus et le HTML de chaque page"""
+    with open(os.path.join(corpus_dir, 'index.json'), encoding='utf-8') as f:
+        index = json.load(f)
+    for page in index:
+        with open(os.path.join(corpus_dir, page['file']), encoding='utf-8') as f:
+            page['html'] = f.read()
+    return index
+
+
+def extract(scraper: SmartHTMLScraper, page: Dict[str, str], backend: str) -> Dict[str, object]:
+    """Valeurs extraites d'une page avec un moteur"""
+    doc = parse_html(page['html'], backend)
+    if page['kind'] == 'homepage':
+        return {'liens': [link.attr('href') for link in doc.select('a[href]')]}
+
+    fields = scraper.extractor.extract(doc, page['url'])
+    fields['date'] = fields['date'].isoformat() if fields['date'] else None
+    return fields
+
+
+def best_time(func, corpus: List[Dict[str, str]], repeat: int) -> float:
+    """Meilleur temps (secondes) de `repeat` passages de func sur toutes les pages"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for page in corpus:
+            func(page)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark des moteurs de parsing HTML')
+    parser.add_argument('--corpus', default='data/html_corpus', help='Dossier du corpus de pages')
+    parser.add_argument('--fetch', type=int, metavar='N',
+                       help='Constituer le corpus : page d\'accueil et N articles par média actif')
+    parser.add_argument('--backends', help='Moteurs à mesurer, séparés par des virgules (défaut: tous les installés)')
+    parser.add_argument('--repeat', type=int, default=3, help='Répétitions (meilleur temps)')
+
+    args = parser.parse_args()
+
+    if args.fetch:
+        corpus = build_corpus(DatabaseManager(), args.corpus, args.fetch)
+        print(f"✅ {len(corpus)} pages enregistrées dans {args.corpus}\n")
+
+    if not os.path.exists(os.path.join(args.corpus, 'index.json')):
+        print(f"❌ Corpus introuvable: {args.corpus} (le constituer avec --fetch N)")
+        return
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"❌ Corpus vide: {args.corpus}")
+        return
+
+    backends = args.backends.split(',') if args.backends else available_backends()
+    missing = [name for name in backends if name not in available_backends()]
+    if missing:
+        print(f"❌ Moteur(s) non installé(s): {', '.join(missing)}")
+        return
+
+    articles = sum(1 for page in corpus if page['kind'] == 'article')
+    size = sum(len(page['html']) for page in corpus) / 1024 / 1024
+
+    print("\n" + "="*60)
+    print("📊 BENCHMARK DES MOTEURS HTML")
+    print("="*60 + "\n")
+    print(f"📄 {len(corpus)} pages ({len(corpus) - articles} pages d'accueil, {articles} articles), {size:.1f} Mo\n")
+
+    scrapers: Dict[str, SmartHTMLScraper] = {}
+    for page in corpus:
+        parsed = urlparse(page['url'])
+        base_url = f"{parsed.scheme}://{parsed.netloc}"
+        if base_url not in scrapers:
+            scrapers[base_url] = SmartHTMLScraper(base_url)
+        page['scraper'] = scrapers[base_url]
+
+    reference: Optional[List[Dict[str, object]]] = None
+    if REFERENCE_BACKEND in available_backends():
+        reference = [extract(page['scraper'], page, REFERENCE_BACKEND) for page in corpus]
+
+    timings = {}
+    for backend in backends:
+        parse_time = best_time(lambda page: parse_html(page['html'], backend), corpus, args.repeat)
+        total_time = best_time(lambda page: extract(page['scraper'], page, backend), corpus, args.repeat)
+        timings[backend] = total_time
+
+        print(f"⚙️ {backend}: parsing {parse_time * 1000:.0f} ms, "
+              f"parsing + extraction {total_time * 1000:.0f} ms "
+              f"({total_time * 1000 / len(corpus):.1f} ms/page)")
+
+        if reference is None or backend == REFERENCE_BACKEND:
+            continue
+
+        # Valeurs identiques à celles du moteur de référence, par champ
+        results = [extract(page['scraper'], page, backend) for page in corpus]
+        same: Dict[str, int] = {}
+        total: Dict[str, int] = {}
+        for expected, got in zip(reference, results):
+            for field, value in expected.items():
+                total[field] = total.get(field, 0) + 1
+                same[field] = same.get(field, 0) + (got[field] == value)
+        print("   🎯 Identique à html.parser: " + ', '.join(
+            f"{field} {same[field] * 100 / total[field]:.0f}%" for field in ARTICLE_FIELDS + ['liens'] if field in total
+        ))
+
+    if REFERENCE_BACKEND in timings:
+        print()
+        for backend, elapsed in timings.items():
+            if backend != REFERENCE_BACKEND and elapsed > 0:
+                print(f"⚡ {backend}: x{timings[REFERENCE_BACKEND] / elapsed:.1f} par rapport à html.parser")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmark du classement des médias : ancienne requête (jointures articles ×
+posts × tweets) contre le classement par agrégats de plateforme
+(DatabaseManager.get_media_ranking_with_twitter)
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from database.db_manager import DatabaseManager
+
+
+# Ancienne requête, conservée pour comparaison
+LEGACY_RANKING_SQL = """
+    SELECT
+        m.id,
+        m.nom,
+        COUNT(DISTINCT a.id) as total_articles,
+        COUNT(DISTINCT fp.id) as total_posts_facebook,
+        COUNT(DISTINCT tw.id) as total_tweets,
+        COALESCE(SUM(fp.engagement_total), 0) + COALESCE(SUM(tw.engagement_total), 0) as engagement_total
+    FROM medias m
+    LEFT JOIN articles a ON m.id = a.media_id AND a.date_publication >= :since
+    LEFT JOIN facebook_posts fp ON m.id = fp.media_id AND fp.date_publication >= :since
+    LEFT JOIN twitter_tweets tw ON m.id = tw.media_id AND tw.date_publication >= :since
+    WHERE m.actif = 1
+    GROUP BY m.id, m.nom
+    ORDER BY engagement_total DESC, total_articles DESC
+"""
+
+# Lignes intermédiaires produites par les jointures de l'ancienne requête
+LEGACY_JOIN_ROWS_SQL = """
+    SELECT COUNT(*)
+    FROM medias m
+    LEFT JOIN articles a ON m.id = a.media_id AND a.date_publication >= :since
+    LEFT JOIN facebook_posts fp ON m.id = fp.media_id AND fp.date_publication >= :since
+    LEFT JOIN twitter_tweets tw ON m.id = tw.media_id AND tw.date_publication >= :since
+    WHERE m.actif = 1
+"""
+
+
+def seed_database(db: DatabaseManager, medias: int, articles: int, posts: int, tweets: int, days: int):
+    """Remplir une base de test : pour chaque média, N articles, posts et tweets sur la période"""
+    random.seed(42)
+    now = datetime.now()
+
+    def random_date() -> str:
+        return (now - timedelta(seconds=random.randint(0, (days - 1) * 86400))).isoformat()
+
+    with db.connection() as conn:
+        conn.execute("UPDATE medias SET actif = 0")
+        for m in range(medias):
+            cursor = conn.execute(
+                "INSERT INTO medias (nom, url, facebook_page, twitter_account) VALUES (?, ?, ?, ?)",
+                (f"Média {m + 1}", f"https://media{m + 1}.example", f"page{m + 1}", f"compte{m + 1}")
+            )
+            media_id = cursor.lastrowid
+
+            conn.executemany("""
+                INSERT INTO articles (media_id, titre, url, date_publication, source_type)
+                VALUES (?, ?, ?, ?, 'benchmark')
+            """, [(media_id, f"Article {i}", f"https://media{m + 1}.example/{i}", random_date())
+                  for i in range(articles)])
+
+            conn.executemany("""
+                INSERT INTO facebook_posts (media_id, post_id, date_publication, likes, comments, shares, engagement_total)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(media_id, f"{m}_{i}", random_date(), 10, 2, 1, 13) for i in range(posts)])
+
+            conn.executemany("""
+                INSERT INTO twitter_tweets (media_id, tweet_id, date_publication, retweets, replies, likes, quotes, engagement_total)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(media_id, f"{m}_{i}", random_date(), 3, 1, 5, 1, 10) for i in range(tweets)])
+
+
+def best_time(func, repeat: int):
+    """Exécuter func `repeat` fois, retourner (meilleur temps en secondes, dernier résultat)"""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark du classement des médias')
+    parser.add_argument('--db', help='Base existante à mesurer (défaut: base temporaire générée)')
+    parser.add_argument('--medias', type=int, default=1, help='Médias générés')
+    parser.add_argument('--articles', type=int, default=500, help='Articles par média')
+    parser.add_argument('--posts', type=int, default=300, help='Posts Facebook par média')
+    parser.add_argument('--tweets', type=int, default=300, help='Tweets par média')
+    parser.add_argument('--days', type=int, default=30, help='Période du classement (jours)')
+    parser.add_argument('--repeat', type=int, default=1, help='Répétitions par requête (meilleur temps)')
+    parser.add_argument('--skip-legacy', action='store_true',
+                       help='Ne pas exécuter l\'ancienne requête (trop lente sur de gros volumes)')
+
+    args = parser.parse_args()
+
+    if args.db:
+        db = DatabaseManager(args.db)
+    else:
+        tmp_dir = tempfile.mkdtemp(prefix='media_scan_bench_')
+        db = DatabaseManager(os.path.join(tmp_dir, 'benchmark.db'))
+        print(f"🔧 Génération: {args.medias} média(s) × {args.articles} articles, "
+              f"{args.posts} posts, {args.tweets} tweets")
+        seed_database(db, args.medias, args.articles, args.posts, args.tweets, args.days)
+
+    since_raw = (datetime.now() - timedelta(days=args.days)).isoformat()
+    since_day = (datetime.now() - timedelta(days=args.days)).date().isoformat()
+
+    print("\n" + "="*60)
+    print("📊 BENCHMARK DU CLASSEMENT")
+    print("="*60 + "\n")
+
+    with db.connection() as conn:
+        rollup_rows = conn.execute(
+            "SELECT COUNT(*) FROM media_daily_stats WHERE jour >= ?", (since_day,)
+        ).fetchone()[0]
+        legacy_rows = None
+        if not args.skip_legacy:
+            legacy_rows = conn.execute(LEGACY_JOIN_ROWS_SQL, {'since': since_raw}).fetchone()[0]
+
+    new_time, ranking = best_time(lambda: db.get_media_ranking_with_twitter(args.days), args.repeat)
+    print(f"✅ Agrégats par plateforme: {new_time * 1000:.1f} ms, "
+          f"{rollup_rows} lignes d'agrégat quotidien lues")
+
+    if args.skip_legacy:
+        return
+
+    def run_legacy():
+        with db.connection() as conn:
+            return [dict(row) for row in conn.execute(LEGACY_RANKING_SQL, {'since': since_raw}).fetchall()]
+
+    legacy_time, legacy = best_time(run_legacy, args.repeat)
+    legacy_rows_str = f"{legacy_rows:,}".replace(',', ' ')
+    print(f"🐢 Ancienne requête: {legacy_time * 1000:.1f} ms, {legacy_rows_str} lignes intermédiaires")
+
+    if new_time > 0:
+        print(f"⚡ Gain: x{legacy_time / new_time:.0f}")
+
+    # Écarts d'engagement dus au produit des jointures
+    expected = {row['id']: row['engagement_total'] for row in ranking}
+    inflated = [(row['nom'], row['engagement_total'], expected.get(row['id'], 0))
+                for row in legacy if row['engagement_total'] != expected.get(row['id'], 0)]
+
+    if inflated:
+        print(f"\n⚠️ Engagement faussé par l'ancienne requête pour {len(inflated)} média(s):")
+        for nom, wrong, right in inflated[:10]:
+            print(f"   • {nom}: {wrong} au lieu de {right}")
+    else:
+        print("\n✅ Engagements identiques")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Vérification des plans d'exécution des requêtes de DatabaseManager
+Chaque méthode est exécutée avec un traçage des requêtes SQL réellement
+envoyées à SQLite ; EXPLAIN QUERY PLAN est appliqué à chacune.
+Les requêtes critiques (listes, tableaux de bord, file de travaux) font
+échouer la vérification si elles parcourent une table entière.
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+from typing import Callable, Dict, List, Set, Tuple
+
+from database.db_manager import DatabaseManager
+from analysis.audience_analyzer import AudienceAnalyzer
+
+
+# Petites tables : un parcours complet est moins coûteux qu'un index
+SMALL_TABLES = {'medias', 'scraping_schedule', 'data_version'}
+
+# Requêtes critiques : (libellé, appel, tables dont le parcours est autorisé)
+# Un parcours autorisé est un parcours d'index ordonné interrompu par LIMIT
+HOT_QUERIES: List[Tuple[str, Callable[[DatabaseManager], object], Set[str]]] = [
+    ('get_articles_by_media', lambda db: db.get_articles_by_media(1), set()),
+    ('get_recent_articles', lambda db: db.get_recent_articles(days=7), set()),
+    ('get_articles_page (média)', lambda db: db.get_articles_page(media_id=1, days=30), set()),
+    ('get_articles_page (suivante)', lambda db: db.get_articles_page(after=('2024-01-01', 10)), set()),
+    ('get_article_detail', lambda db: db.get_article_detail(1), set()),
+    ('get_articles_by_ids', lambda db: db.get_articles_by_ids([1, 2, 3]), set()),
+    ('get_existing_article_urls', lambda db: db.get_existing_article_urls(['https://a.example/1']), set()),
+    ('get_unclassified_articles', lambda db: db.get_unclassified_articles(10), {'articles'}),
+    ('get_articles_by_category', lambda db: db.get_articles_by_category('Politique'), set()),
+    ('get_category_stats', lambda db: db.get_category_stats(30), set()),
+    ('get_weekly_category_stats', lambda db: db.get_weekly_category_stats(5), set()),
+    ('get_overview_counts', lambda db: db.get_overview_counts(30), set()),
+    ('get_facebook_posts_by_media', lambda db: db.get_facebook_posts_by_media(1), set()),
+    ('get_facebook_posts_page', lambda db: db.get_facebook_posts_page(1, after=('2024-01-01', 10)), set()),
+    ('get_recent_facebook_posts', lambda db: db.get_recent_facebook_posts(days=7), set()),
+    ('get_twitter_tweets_by_media', lambda db: db.get_twitter_tweets_by_media(1), set()),
+    ('get_twitter_tweets_page', lambda db: db.get_twitter_tweets_page(1, after=('2024-01-01', 10)), set()),
+    ('get_recent_twitter_tweets', lambda db: db.get_recent_twitter_tweets(days=7), set()),
+    ('get_media_ranking_with_twitter', lambda db: db.get_media_ranking_with_twitter(30), set()),
+    ('compute_audience', lambda db: AudienceAnalyzer(db).compute_audience((7, 30, 90)), set()),
+    ('refresh_media_metrics', lambda db: db.refresh_media_metrics(1, 30), set()),
+    ('get_flagged_contents', lambda db: db.get_flagged_contents(), set()),
+    ('get_flagged_contents (type)', lambda db: db.get_flagged_contents('article'), set()),
+    ('get_flagged_contents_page', lambda db: db.get_flagged_contents_page(after=(5.0, 10)), set()),
+    ('get_content_moderation', lambda db: db.get_content_moderation('article', 1), set()),
+    ('get_scraping_tasks', lambda db: db.get_scraping_tasks(), {'scraping_tasks'}),
+    ('get_active_scraping_task', lambda db: db.get_active_scraping_task({'all': True}), set()),
+    ('get_llm_cache', lambda db: db.get_llm_cache('cle'), set()),
+    ('get_site_template', lambda db: db.get_site_template('www.example.bf'), set()),
+    ('claim_jobs', lambda db: db.claim_jobs('classify_article', 'check', 10), set()),
+]
+
+# Agrégats sur une table entière par construction : plans affichés, non vérifiés
+REPORTED_QUERIES: List[Tuple[str, Callable[[DatabaseManager], object]]] = [
+    ('get_classification_stats', lambda db: db.get_classification_stats()),
+    ('get_moderation_stats', lambda db: db.get_moderation_stats()),
+    ('get_scraping_stats', lambda db: db.get_scraping_stats()),
+    ('get_job_queue_stats', lambda db: db.get_job_queue_stats()),
+    ('get_llm_cache_stats', lambda db: db.get_llm_cache_stats()),
+    ('compact_media_metrics', lambda db: db.compact_media_metrics()),
+]
+
+SCAN_RE = re.compile(r'^SCAN (?:TABLE )?(\S+)')
+SUBQUERY_RE = re.compile(r'^(?:MATERIALIZE|CO-ROUTINE) (\S+)')
+ALIAS_RE = re.compile(r'\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?', re.IGNORECASE)
+SQL_KEYWORDS = {'WHERE', 'ON', 'JOIN', 'LEFT', 'INNER', 'CROSS', 'GROUP', 'ORDER', 'LIMIT', 'USING', 'SET'}
+
+
+def trace_statements(db: DatabaseManager, call: Callable[[DatabaseManager], object]) -> List[str]:
+    """Exécuter un appel et retourner les requêtes SQL envoyées (paramètres inclus)"""
+    statements = []
+    with db.connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            call(db)
+        finally:
+            conn.set_trace_callback(None)
+        conn.rollback()
+    return [sql for sql in statements
+            if sql.lstrip().split(None, 1)[0].upper() in ('SELECT', 'WITH', 'UPDATE', 'DELETE')]
+
+
+def query_plan(db: DatabaseManager, sql: str) -> List[str]:
+    """Lignes de EXPLAIN QUERY PLAN d'une requête"""
+    with db.connection() as conn:
+        return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+
+def table_aliases(sql: str) -> Dict[str, str]:
+    """Correspondance alias -> table des clauses FROM / JOIN"""
+    aliases = {}
+    for table, alias in ALIAS_RE.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def full_scans(sql: str, plan: List[str], allowed: Set[str]) -> List[str]:
+    """Parcours complets de tables dans un plan (hors sous-requêtes, petites tables et parcours autorisés)"""
+    subqueries = {m.group(1) for m in map(SUBQUERY_RE.match, plan) if m}
+    aliases = table_aliases(sql)
+    scans = []
+    for detail in plan:
+        match = SCAN_RE.match(detail)
+        if not match or match.group(1) in ('CONSTANT', *subqueries) or match.group(1).startswith('('):
+            continue
+        if aliases.get(match.group(1), match.group(1)) in SMALL_TABLES | allowed:
+            continue
+        scans.append(detail)
+    return scans
+
+
+def check(db: DatabaseManager, verbose: bool = False) -> Dict[str, List[str]]:
+    """
+    Vérifier les plans des requêtes critiques
+
+    Returns:
+        {libellé: parcours complets} des requêtes en échec
+    """
+    failures = {}
+
+    for label, call, allowed in HOT_QUERIES:
+        problems = []
+        for sql in trace_statements(db, call):
+            plan = query_plan(db, sql)
+            scans = full_scans(sql, plan, allowed)
+            problems += scans
+            if verbose or scans:
+                print_plan(label, sql, plan)
+
+        if problems:
+            failures[label] = problems
+            print(f"❌ {label}: {'; '.join(problems)}")
+        else:
+            print(f"✅ {label}")
+
+    if verbose:
+        for label, call in REPORTED_QUERIES:
+            for sql in trace_statements(db, call):
+                print_plan(f"{label} (non vérifié)", sql, query_plan(db, sql))
+
+    return failures
+
+
+def print_plan(label: str, sql: str, plan: List[str]):
+    """Afficher une requête et son plan"""
+    print(f"\n--- {label}")
+    print('    ' + ' '.join(sql.split())[:300])
+    for detail in plan:
+        print(f"    → {detail}")
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vérifier les plans d\'exécution des requêtes critiques')
+    parser.add_argument('--db', help='Base à vérifier, mise au schéma courant à l\'ouverture '
+                                     '(défaut: base temporaire)')
+    parser.add_argument('--verbose', action='store_true',
+                       help='Afficher le plan de chaque requête, y compris les agrégats non vérifiés')
+
+    args = parser.parse_args()
+
+    if args.db:
+        db = DatabaseManager(args.db)
+    else:
+        db = DatabaseManager(os.path.join(tempfile.mkdtemp(prefix='media_scan_plans_'), 'plans.db'))
+
+    print("\n" + "="*60)
+    print("🔍 PLANS D'EXÉCUTION")
+    print("="*60 + "\n")
+
+    failures = check(db, verbose=args.verbose)
+
+    if failures:
+        print(f"\n❌ {len(failures)} requête(s) critique(s) avec parcours complet")
+        sys.exit(1)
+
+    print(f"\n✅ {len(HOT_QUERIES)} requêtes critiques sans parcours complet")
+
+
+if __name__ == '__main__':
+    main()
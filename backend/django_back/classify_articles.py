@@ -7,6 +7,8 @@ Utilise Mistral via Ollama pour la classification thématique
 import argparse
 from database.db_manager import DatabaseManager
 from analysis.theme_classifier import ThemeClassifier
+from analysis.classification_pool import ClassificationPool, default_workers
+from analysis.llm_cache import LLMCache
 
 
 def main():
@@ -17,6 +19,12 @@ def main():
                        help='Reclassifier tous les articles (même déjà classifiés)')
     parser.add_argument('--stats', action='store_true',
                        help='Afficher uniquement les statistiques')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                       help='Requêtes Ollama simultanées (défaut: OLLAMA_NUM_PARALLEL ou 4)')
+    parser.add_argument('--timeout', type=int, default=60,
+                       help='Timeout d\'une requête de classification (secondes)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignorer le cache LLM (toujours interroger Ollama)')
     
     args = parser.parse_args()
     
@@ -50,7 +58,8 @@ def main():
     
     # Initialiser le classificateur
     print("🤖 Initialisation du classificateur Mistral...")
-    classifier = ThemeClassifier()
+    cache = None if args.no_cache else LLMCache(db)
+    classifier = ThemeClassifier(timeout=args.timeout, cache=cache)
     
     # Vérifier Ollama
     if not classifier.check_ollama_status():
@@ -81,49 +90,38 @@ def main():
     print("🚀 CLASSIFICATION EN COURS")
     print("="*60 + "\n")
     
-    classified_count = 0
-    errors = 0
-    
-    for i, article in enumerate(articles, 1):
-        try:
-            print(f"[{i}/{len(articles)}] {article['titre'][:60]}...")
-            
-            # Classifier
-            result = classifier.classify_article(
-                article['titre'],
-                article['contenu'] or ''
-            )
-            
-            # Sauvegarder
-            db.add_classification(
-                article_id=article['id'],
-                categorie=result['categorie'],
-                confiance=result['confiance'],
-                mots_cles=result.get('mots_cles', []),
-                justification=result.get('justification', ''),
-                methode=result.get('methode', 'mistral_ollama')
-            )
-            
+    print(f"⚙️ {args.workers} requêtes simultanées, timeout {args.timeout}s\n")
+    
+    def on_result(i, article, result, error):
+        print(f"[{i}/{len(articles)}] {article['titre'][:60]}...")
+        
+        if error is not None:
+            print(f"   ❌ Erreur: {error}")
+        else:
             print(f"   ✅ {result['categorie']} (confiance: {result['confiance']:.2f})")
             if result.get('mots_cles'):
                 print(f"   🔑 Mots-clés: {', '.join(result['mots_cles'][:3])}")
-            
-            classified_count += 1
-        
-        except Exception as e:
-            print(f"   ❌ Erreur: {e}")
-            errors += 1
         
         print()
     
+    # Classifier en parallèle, sauvegarder par lots
+    pool = ClassificationPool(classifier, workers=args.workers)
+    run_stats = pool.run(articles, on_batch=db.add_classifications_bulk, on_result=on_result)
+    
+    classified_count = run_stats['classified']
+    errors = run_stats['errors']
+    
     # Résumé
     print("="*60)
     print("📊 RÉSUMÉ")
     print("="*60 + "\n")
     
     print(f"✅ Articles classifiés: {classified_count}")
+    print(f"⏱️ Durée: {run_stats['duration']:.1f}s ({run_stats['articles_per_minute']} articles/minute)")
     if errors > 0:
         print(f"❌ Erreurs: {errors}")
+    if cache is not None:
+        print(cache.summary())
     
     # Statistiques finales
     print("\n" + "="*60)
@@ -0,0 +1,90 @@
+"""
+Pool de connexions SQLite partagé entre threads
+Les connexions sont configurées une seule fois (WAL, pragmas, busy timeout)
+puis réutilisées par l'API, le scheduler et les scrapers
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+
+# Pragmas appliqués à chaque nouvelle connexion
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',         # Lecteurs et écrivain simultanés
+    'synchronous': 'NORMAL',       # Sûr en WAL, un fsync par checkpoint au lieu d'un par commit
+    'busy_timeout': 30000,         # Attendre le verrou (ms) au lieu de "database is locked"
+    'temp_store': 'MEMORY',
+    'mmap_size': 268435456,        # 256 Mo de lecture mappée en mémoire
+    'cache_size': -20000,          # ~20 Mo de cache de pages par connexion
+}
+
+
+class ConnectionPool:
+    """Pool thread-safe de connexions SQLite configurées"""
+
+    def __init__(self, db_path: str, max_idle: int = 8, pragmas: Optional[Dict] = None):
+        """
+        Initialise le pool
+
+        Args:
+            db_path: Chemin vers le fichier de base de données
+            max_idle: Nombre maximum de connexions inactives conservées
+            pragmas: Pragmas à appliquer (par défaut DEFAULT_PRAGMAS)
+        """
+        self.db_path = db_path
+        self.pragmas = DEFAULT_PRAGMAS if pragmas is None else pragmas
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue(maxsize=max(1, max_idle))
+
+    def create_connection(self) -> sqlite3.Connection:
+        """
+        Créer une connexion configurée (hors pool)
+
+        Returns:
+            Connexion SQLite avec row_factory et pragmas configurés
+        """
+        busy_timeout = self.pragmas.get('busy_timeout', 30000)
+        conn = sqlite3.connect(self.db_path, timeout=busy_timeout / 1000, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for name, value in self.pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        """Emprunter une connexion (réutilisée si possible, sinon créée)"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self.create_connection()
+
+    def release(self, conn: sqlite3.Connection):
+        """Rendre une connexion au pool (fermée si le pool est plein)"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            self._idle.put_nowait(conn)
+        except (queue.Full, sqlite3.Error):
+            conn.close()
+
+    def close_all(self):
+        """Fermer toutes les connexions inactives"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> ConnectionPool:
+    """Récupérer le pool associé à un fichier de base (un seul par processus)"""
+    key = os.path.abspath(db_path)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = ConnectionPool(db_path)
+        return _pools[key]
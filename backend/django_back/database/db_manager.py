@@ -5,11 +5,242 @@ Gestionnaire de base de données SQLite
 import sqlite3
 import json
 import os
+import re
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Set, Tuple
 from pathlib import Path
 
 from .models import Article, Media
+from .connection_pool import get_pool
+
+
+# Nombre maximum de paramètres par clause IN (limite SQLite : 999)
+SQL_IN_CHUNK_SIZE = 900
+
+
+# Longueur de l'extrait calculé quand un article n'en a pas
+ARTICLE_EXCERPT_LENGTH = 300
+
+# Champs disponibles dans les listes d'articles (expression SQL de chaque champ)
+# Le contenu complet n'est servi que par le détail d'un article
+ARTICLE_LIST_FIELDS = {
+    'id': 'id',
+    'media_id': 'media_id',
+    'titre': 'titre',
+    'extrait': f"COALESCE(NULLIF(extrait, ''), substr(contenu, 1, {ARTICLE_EXCERPT_LENGTH}))",
+    'url': 'url',
+    'auteur': 'auteur',
+    'date_publication': 'date_publication',
+    'image_url': 'image_url',
+    'categories': 'categories',
+    'tags': 'tags',
+    'source_type': 'source_type',
+    'vues': 'vues',
+    'commentaires': 'commentaires',
+    'scraped_at': 'scraped_at',
+    'created_at': 'created_at',
+    'categorie': '(SELECT categorie FROM classifications WHERE article_id = articles.id)',
+}
+
+# Projection par défaut des listes d'articles
+ARTICLE_SUMMARY_FIELDS = (
+    'id', 'media_id', 'titre', 'url', 'auteur', 'date_publication',
+    'extrait', 'categorie', 'vues', 'commentaires',
+)
+
+
+# Champs des modèles d'extraction par domaine (colonnes selecteur_<champ> de site_templates)
+SITE_TEMPLATE_FIELDS = ('titre', 'date', 'contenu', 'auteur', 'image')
+
+
+SCHEMA_PATH = Path(__file__).parent / 'schema.sql'
+
+
+# Colonnes ajoutées après la création initiale des tables
+# (appliquées automatiquement aux bases existantes, voir migrate_db.py)
+COLUMN_MIGRATIONS = [
+    ('content_moderation', 'toxicity_details', 'TEXT'),
+    ('content_moderation', 'misinformation_details', 'TEXT'),
+    ('content_moderation', 'sensitivity_details', 'TEXT'),
+    ('content_moderation', 'primary_issue', "TEXT DEFAULT 'none'"),
+    ('medias', 'rss_feed_url', 'TEXT'),
+    ('medias', 'rss_checked_at', 'TIMESTAMP'),
+    ('medias', 'wp_api_url', 'TEXT'),
+    ('medias', 'wp_api_checked_at', 'TIMESTAMP'),
+    ('medias', 'sitemap_url', 'TEXT'),
+    ('medias', 'sitemap_checked_at', 'TIMESTAMP'),
+    ('scraping_tasks', 'sites_total', 'INTEGER DEFAULT 0'),
+    ('scraping_tasks', 'sites_done', 'INTEGER DEFAULT 0'),
+    ('scraping_tasks', 'current_media', 'TEXT'),
+    ('scraping_tasks', 'updated_at', 'TIMESTAMP'),
+    ('media_metrics', 'dernier_article_id', 'INTEGER DEFAULT 0'),
+    ('media_metrics', 'derniere_collecte', 'TIMESTAMP'),
+    ('media_metrics', 'updated_at', 'TIMESTAMP'),
+]
+
+
+def apply_column_migrations(conn: sqlite3.Connection) -> List[str]:
+    """
+    Ajouter les colonnes manquantes aux tables existantes
+    
+    Args:
+        conn: Connexion SQLite
+    
+    Returns:
+        Liste des colonnes ajoutées ("table.colonne")
+    """
+    added = []
+    existing: Dict[str, List[str]] = {}
+    
+    for table, column, column_type in COLUMN_MIGRATIONS:
+        if table not in existing:
+            existing[table] = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        
+        # Table absente : elle sera créée complète par schema.sql
+        if not existing[table] or column in existing[table]:
+            continue
+        
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        existing[table].append(column)
+        added.append(f"{table}.{column}")
+    
+    conn.commit()
+    return added
+
+
+# Index remplacés par le plan d'index de schema.sql (voir check_query_plans.py) :
+# doublons d'une contrainte UNIQUE, préfixes d'un index composite, index sans requête
+OBSOLETE_INDEXES = [
+    'idx_articles_url',  # UNIQUE(url)
+    'idx_medias_url',  # UNIQUE(url)
+    'idx_classifications_article',  # UNIQUE(article_id)
+    'idx_classifications_categorie',  # idx_classifications_categorie_article
+    'idx_facebook_posts_media',  # idx_facebook_posts_media_date
+    'idx_twitter_tweets_media',  # idx_twitter_tweets_media_date
+    'idx_media_metrics_media',  # idx_media_metrics_snapshot
+    'idx_moderation_content',  # UNIQUE(content_type, content_id)
+    'idx_moderation_flag',  # idx_moderation_flagged
+    'idx_moderation_risk',  # idx_moderation_flagged
+    'idx_moderation_toxic',
+    'idx_moderation_misinfo',
+]
+
+SCHEMA_INDEX_RE = re.compile(
+    r"CREATE (?:UNIQUE )?INDEX IF NOT EXISTS (\w+) ON (\w+)\s*\([^;]*\);", re.IGNORECASE
+)
+
+
+def apply_index_plan(conn: sqlite3.Connection) -> Tuple[List[str], List[str]]:
+    """
+    Appliquer le plan d'index à une base existante : créer les index de
+    schema.sql absents (tables existantes uniquement), supprimer OBSOLETE_INDEXES
+    
+    Args:
+        conn: Connexion SQLite
+    
+    Returns:
+        (index créés, index supprimés)
+    """
+    existing = {row[0]: row[1] for row in conn.execute(
+        "SELECT name, type FROM sqlite_master WHERE type IN ('table', 'index')"
+    )}
+    
+    created = []
+    for match in SCHEMA_INDEX_RE.finditer(SCHEMA_PATH.read_text(encoding='utf-8')):
+        name, table = match.group(1), match.group(2)
+        if name in existing or existing.get(table) != 'table':
+            continue
+        conn.execute(match.group(0))
+        created.append(name)
+    
+    dropped = []
+    for name in OBSOLETE_INDEXES:
+        if existing.get(name) == 'index':
+            conn.execute(f"DROP INDEX {name}")
+            dropped.append(name)
+    
+    conn.commit()
+    return created, dropped
+
+
+# Sources de l'agrégat quotidien media_daily_stats : (plateforme, table, métriques sommées)
+# Les triggers de schema.sql maintiennent ces mêmes sommes à chaque écriture
+DAILY_STATS_SOURCES = [
+    ('web', 'articles', []),
+    ('facebook', 'facebook_posts', ['likes', 'comments', 'shares', 'engagement_total']),
+    ('twitter', 'twitter_tweets', ['retweets', 'replies', 'likes', 'quotes', 'impressions', 'engagement_total']),
+]
+
+
+def rebuild_media_daily_stats(conn: sqlite3.Connection) -> int:
+    """
+    Reconstruire entièrement l'agrégat quotidien media_daily_stats
+    (remplissage d'une base existante, réparation après import direct)
+    
+    Args:
+        conn: Connexion SQLite
+    
+    Returns:
+        Nombre de lignes (média, plateforme, jour) écrites
+    """
+    conn.execute("DELETE FROM media_daily_stats")
+    
+    total = 0
+    for plateforme, table, metrics in DAILY_STATS_SOURCES:
+        columns = ''.join(f", {m}" for m in metrics)
+        sums = ''.join(f", COALESCE(SUM({m}), 0)" for m in metrics)
+        cursor = conn.execute(f"""
+            INSERT INTO media_daily_stats (
+                media_id, plateforme, jour, publications{columns},
+                premiere_publication, derniere_publication
+            )
+            SELECT media_id, ?, DATE(date_publication), COUNT(*){sums},
+                   MIN(date_publication), MAX(date_publication)
+            FROM {table}
+            WHERE date_publication IS NOT NULL
+            GROUP BY media_id, DATE(date_publication)
+        """, (plateforme,))
+        total += cursor.rowcount
+    
+    conn.commit()
+    return total
+
+
+# Métriques d'un snapshot media_metrics (mêmes clés que get_media_ranking_with_twitter)
+MEDIA_METRICS_COLUMNS = (
+    'total_articles', 'total_posts_facebook', 'total_tweets',
+    'total_likes_fb', 'total_comments_fb', 'total_shares_fb', 'engagement_total_fb',
+    'total_retweets', 'total_replies', 'total_likes_tw', 'total_quotes',
+    'total_impressions', 'engagement_total_tw',
+    'engagement_total', 'engagement_moyen',
+)
+
+# Rétention des snapshots media_metrics (voir compact_media_metrics)
+MEDIA_METRICS_KEEP_DAYS = 90  # Tous les snapshots des N derniers jours
+MEDIA_METRICS_MAX_AGE_DAYS = 730  # Au-delà : supprimés (entre les deux : un par mois)
+
+
+def dedupe_media_metrics(conn: sqlite3.Connection) -> int:
+    """
+    Supprimer les snapshots media_metrics en double (même média et même période),
+    en gardant le plus récent ; préalable à l'index unique de schema.sql
+    
+    Args:
+        conn: Connexion SQLite
+    
+    Returns:
+        Nombre de snapshots supprimés
+    """
+    cursor = conn.execute("""
+        DELETE FROM media_metrics WHERE id NOT IN (
+            SELECT MAX(id) FROM media_metrics
+            GROUP BY media_id, periode_debut, periode_fin
+        )
+    """)
+    conn.commit()
+    return cursor.rowcount
 
 
 class DatabaseManager:
@@ -27,23 +258,43 @@ class DatabaseManager:
         # Créer le dossier data s'il n'existe pas
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
         
+        # Pool de connexions partagé par toutes les instances du processus
+        self.pool = get_pool(db_path)
+        self._local = threading.local()
+        
         # Initialiser la base de données
         self._init_database()
     
     def _init_database(self):
         """Initialise la base de données avec le schéma"""
-        schema_path = Path(__file__).parent / 'schema.sql'
-        
-        if not schema_path.exists():
-            raise FileNotFoundError(f"Schema file not found: {schema_path}")
+        if not SCHEMA_PATH.exists():
+            raise FileNotFoundError(f"Schema file not found: {SCHEMA_PATH}")
         
-        with open(schema_path, 'r', encoding='utf-8') as f:
+        with open(SCHEMA_PATH, 'r', encoding='utf-8') as f:
             schema = f.read()
         
-        conn = self.get_connection()
-        try:
+        with self.connection() as conn:
+            # Mettre à niveau les tables existantes avant d'appliquer le schéma
+            apply_column_migrations(conn)
+            
+            daily_stats_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'media_daily_stats'"
+            ).fetchone() is not None
+            
+            # Snapshots accumulés avant l'index unique (média, période) : dédoublonner
+            if conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'media_metrics'"
+            ).fetchone() and not conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_media_metrics_snapshot'"
+            ).fetchone():
+                dedupe_media_metrics(conn)
+            
             conn.executescript(schema)
-            conn.commit()
+            apply_index_plan(conn)
+            
+            # Agrégat quotidien créé sur une base existante : le remplir
+            if not daily_stats_exists:
+                rebuild_media_daily_stats(conn)
             
             # Initialiser le média AIB par défaut si la table est vide
             cursor = conn.cursor()
@@ -55,21 +306,105 @@ class DatabaseManager:
                     INSERT INTO medias (nom, url, type_site, twitter_account)
                     VALUES ('AIB', 'https://www.aib.media', 'wordpress', 'AibBurkina')
                 """)
-                conn.commit()
                 print("✅ Média AIB initialisé automatiquement")
-        finally:
-            conn.close()
     
     def get_connection(self) -> sqlite3.Connection:
         """
-        Crée une nouvelle connexion à la base de données
+        Crée une nouvelle connexion à la base de données (hors pool)
+        A fermer par l'appelant ; préférer connection() dans le code applicatif
         
         Returns:
+            Connexion SQLite avec row_factory et pragmas configurés
+        """
+        return self.pool.create_connection()
+    
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Emprunter une connexion du pool le temps d'un bloc with
+        Commit à la sortie du bloc, rollback en cas d'exception.
+        Les blocs imbriqués d'un même thread partagent la connexion
+        et la transaction du bloc le plus externe.
+        
+        Yields:
             Connexion SQLite avec row_factory configuré
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            yield conn
+            return
+        
+        conn = self.pool.acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+            if conn.in_transaction:
+                conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self.pool.release(conn)
+    
+    def _keyset_page(self, table: str, conditions: List[str], params: List[Any], sort_column: str,
+                     limit: int, after: Optional[Tuple[Any, int]] = None, columns: str = '*'
+                     ) -> Tuple[List[sqlite3.Row], Optional[Tuple[Any, int]]]:
+        """
+        Lire une page triée par (sort_column DESC, id DESC) à partir d'un curseur
+        La position est retrouvée par l'index (pas d'OFFSET) : chaque page coûte
+        autant que la première. Les lignes sans valeur de tri viennent en dernier.
+        
+        Args:
+            table: Table interrogée
+            conditions: Filtres SQL combinés par AND
+            params: Paramètres des filtres
+            sort_column: Colonne de tri (décroissant, départagé par l'id)
+            limit: Taille de la page
+            after: (valeur de tri, id) de la dernière ligne de la page précédente
+            columns: Colonnes lues (doivent inclure id et sort_column)
+        
+        Returns:
+            (lignes, curseur de la page suivante ou None)
+        """
+        def fetch(seek: List[str], seek_params: List[Any], order: str, count: int) -> List[sqlite3.Row]:
+            cursor.execute(f"""
+                SELECT {columns} FROM {table}
+                WHERE {' AND '.join(conditions + seek)}
+                ORDER BY {order}
+                LIMIT ?
+            """, [*params, *seek_params, count])
+            return cursor.fetchall()
+        
+        # Une ligne de plus pour savoir s'il reste une page
+        wanted = limit + 1
+        rows = []
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            if after is None:
+                rows = fetch([f"{sort_column} IS NOT NULL"], [],
+                             f"{sort_column} DESC, id DESC", wanted)
+            elif after[0] is not None:
+                value, last_id = after
+                rows = fetch([f"{sort_column} <= ?", f"({sort_column} < ? OR id < ?)"],
+                             [value, value, last_id], f"{sort_column} DESC, id DESC", wanted)
+            
+            # Puis les lignes sans valeur de tri, par id décroissant
+            if len(rows) < wanted:
+                seek, seek_params = [f"{sort_column} IS NULL"], []
+                if after is not None and after[0] is None:
+                    seek.append("id < ?")
+                    seek_params.append(after[1])
+                rows += fetch(seek, seek_params, "id DESC", wanted - len(rows))
+        
+        if len(rows) <= limit:
+            return rows, None
+        
+        rows = rows[:limit]
+        return rows, (rows[-1][sort_column], rows[-1]['id'])
     
     # ==================== MÉDIAS ====================
     
@@ -88,10 +423,9 @@ class DatabaseManager:
         Returns:
             ID du média
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 INSERT INTO medias (nom, url, type_site, facebook_page, twitter_account)
                 VALUES (?, ?, ?, ?, ?)
@@ -102,25 +436,18 @@ class DatabaseManager:
                     twitter_account = excluded.twitter_account
             """, (nom, url, type_site, facebook_page, twitter_account))
             
-            media_id = cursor.lastrowid
-            
-            # Si c'était un UPDATE, récupérer l'ID existant
-            if media_id == 0:
-                cursor.execute("SELECT id FROM medias WHERE url = ?", (url,))
-                media_id = cursor.fetchone()[0]
+            # lastrowid n'est pas mis à jour par la branche UPDATE de l'upsert (il garderait
+            # celui d'une insertion précédente sur la connexion du pool) : relire l'ID par l'URL
+            cursor.execute("SELECT id FROM medias WHERE url = ?", (url,))
+            media_id = cursor.fetchone()[0]
             
-            conn.commit()
             return media_id
-        
-        finally:
-            conn.close()
     
     def get_media_by_url(self, url: str) -> Optional[Media]:
         """Récupérer un média par son URL"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("SELECT * FROM medias WHERE url = ?", (url,))
             row = cursor.fetchone()
             
@@ -137,16 +464,12 @@ class DatabaseManager:
                     created_at=row['created_at']
                 )
             return None
-        
-        finally:
-            conn.close()
     
     def get_all_medias(self, actif_only: bool = True) -> List[Media]:
         """Récupérer tous les médias"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             if actif_only:
                 cursor.execute("SELECT * FROM medias WHERE actif = 1 ORDER BY nom")
             else:
@@ -167,32 +490,119 @@ class DatabaseManager:
                 ))
             
             return medias
-        
-        finally:
-            conn.close()
     
     def update_media_last_scrape(self, media_id: int):
         """Met à jour la date de dernière collecte d'un média"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 UPDATE medias 
                 SET derniere_collecte = CURRENT_TIMESTAMP
                 WHERE id = ?
             """, (media_id,))
-            conn.commit()
+    
+    def get_media_rss_feed(self, media_id: int, ttl_hours: int = 24) -> Optional[str]:
+        """
+        Récupérer le flux RSS mémorisé pour un média
         
-        finally:
-            conn.close()
+        Args:
+            media_id: ID du média
+            ttl_hours: Durée de validité du résultat de la dernière détection
+        
+        Returns:
+            URL du flux, '' si le site n'a pas de flux, None si inconnu ou expiré
+        """
+        return self._get_media_source(media_id, 'rss_feed_url', 'rss_checked_at', ttl_hours)
+    
+    def set_media_rss_feed(self, media_id: int, feed_url: Optional[str]):
+        """
+        Mémoriser le résultat de la détection du flux RSS d'un média
+        
+        Args:
+            media_id: ID du média
+            feed_url: URL du flux trouvé, ou None/'' si le site n'a pas de flux
+        """
+        self._set_media_source(media_id, 'rss_feed_url', 'rss_checked_at', feed_url)
+    
+    def get_media_wp_api(self, media_id: int, ttl_hours: int = 24) -> Optional[str]:
+        """
+        Récupérer l'API REST WordPress mémorisée pour un média
+        
+        Args:
+            media_id: ID du média
+            ttl_hours: Durée de validité du résultat de la dernière détection
+        
+        Returns:
+            URL de la liste des articles de l'API, '' si le site n'en a pas, None si inconnu ou expiré
+        """
+        return self._get_media_source(media_id, 'wp_api_url', 'wp_api_checked_at', ttl_hours)
+    
+    def set_media_wp_api(self, media_id: int, api_url: Optional[str]):
+        """
+        Mémoriser le résultat de la détection de l'API REST WordPress d'un média
+        
+        Args:
+            media_id: ID du média
+            api_url: URL de la liste des articles de l'API, ou None/'' si le site n'en a pas
+        """
+        self._set_media_source(media_id, 'wp_api_url', 'wp_api_checked_at', api_url)
+    
+    def get_media_sitemap(self, media_id: int, ttl_hours: int = 24) -> Optional[str]:
+        """
+        Récupérer le sitemap mémorisé pour un média
+        
+        Args:
+            media_id: ID du média
+            ttl_hours: Durée de validité du résultat de la dernière détection
+        
+        Returns:
+            URL du sitemap, '' si le site n'en a pas, None si inconnu ou expiré
+        """
+        return self._get_media_source(media_id, 'sitemap_url', 'sitemap_checked_at', ttl_hours)
+    
+    def set_media_sitemap(self, media_id: int, sitemap_url: Optional[str]):
+        """
+        Mémoriser le résultat de la détection du sitemap d'un média
+        
+        Args:
+            media_id: ID du média
+            sitemap_url: URL du sitemap trouvé, ou None/'' si le site n'en a pas
+        """
+        self._set_media_source(media_id, 'sitemap_url', 'sitemap_checked_at', sitemap_url)
+    
+    def _get_media_source(self, media_id: int, url_column: str, checked_column: str,
+                          ttl_hours: int) -> Optional[str]:
+        """Source détectée (flux, API, sitemap) d'un média si la détection n'a pas expiré"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute(f"""
+                SELECT {url_column} FROM medias
+                WHERE id = ?
+                  AND {checked_column} IS NOT NULL
+                  AND {checked_column} >= datetime('now', ?)
+            """, (media_id, f'-{ttl_hours} hours'))
+            row = cursor.fetchone()
+            return row[url_column] if row else None
+    
+    def _set_media_source(self, media_id: int, url_column: str, checked_column: str,
+                          source_url: Optional[str]):
+        """Mémoriser le résultat de la détection d'une source d'un média ('' = aucune)"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute(f"""
+                UPDATE medias 
+                SET {url_column} = ?, {checked_column} = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (source_url or '', media_id))
     
     def get_medias_with_facebook(self, actif_only: bool = True) -> List[Media]:
         """Récupérer tous les médias ayant une page Facebook configurée"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             query = "SELECT * FROM medias WHERE facebook_page IS NOT NULL AND facebook_page != ''"
             if actif_only:
                 query += " AND actif = 1"
@@ -215,16 +625,12 @@ class DatabaseManager:
                 ))
             
             return medias
-        
-        finally:
-            conn.close()
     
     def get_medias_with_twitter(self, actif_only: bool = True) -> List[Media]:
         """Récupérer tous les médias ayant un compte Twitter configuré"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             query = "SELECT * FROM medias WHERE twitter_account IS NOT NULL AND twitter_account != ''"
             if actif_only:
                 query += " AND actif = 1"
@@ -247,16 +653,12 @@ class DatabaseManager:
                 ))
             
             return medias
-        
-        finally:
-            conn.close()
     
     def get_medias_for_web_scraping(self, actif_only: bool = True) -> List[Media]:
         """Récupérer tous les médias pour le scraping web (ayant une URL valide)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             query = "SELECT * FROM medias WHERE url IS NOT NULL AND url != ''"
             if actif_only:
                 query += " AND actif = 1"
@@ -279,12 +681,19 @@ class DatabaseManager:
                 ))
             
             return medias
-        
-        finally:
-            conn.close()
     
     # ==================== ARTICLES ====================
     
+    # Requête d'insertion commune à add_article et add_articles_bulk
+    _INSERT_ARTICLE_SQL = """
+        INSERT INTO articles (
+            media_id, titre, contenu, extrait, url, auteur,
+            date_publication, image_url, categories, tags,
+            source_type, vues, commentaires
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO NOTHING
+    """
+    
     def add_article(self, article: Article) -> int:
         """
         Ajoute un article à la base de données
@@ -295,59 +704,97 @@ class DatabaseManager:
         Returns:
             ID de l'article inséré, ou 0 si déjà existant
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
-            cursor.execute("""
-                INSERT INTO articles (
-                    media_id, titre, contenu, extrait, url, auteur,
-                    date_publication, image_url, categories, tags,
-                    source_type, vues, commentaires
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(url) DO NOTHING
-            """, (
-                article.media_id,
-                article.titre,
-                article.contenu,
-                article.extrait,
-                article.url,
-                article.auteur,
-                article.date_publication,
-                article.image_url,
-                json.dumps(article.categories) if article.categories else None,
-                json.dumps(article.tags) if article.tags else None,
-                article.source_type,
-                article.vues,
-                article.commentaires
-            ))
+            try:
+                cursor.execute(self._INSERT_ARTICLE_SQL, self._article_params(article))
             
-            article_id = cursor.lastrowid
-            conn.commit()
+                # URL déjà en base (DO NOTHING) : lastrowid serait celui d'une insertion précédente
+                if cursor.rowcount == 0:
+                    return 0
+                
+                return cursor.lastrowid
+        
+            except sqlite3.IntegrityError:
+                return 0
+    
+    def add_articles_bulk(self, articles: List[Article]) -> List[int]:
+        """
+        Ajoute plusieurs articles en une seule transaction
+        Les URLs déjà en base (ou en double dans le lot) sont ignorées
+        
+        Args:
+            articles: Liste d'instances d'Article
             
-            return article_id
+        Returns:
+            IDs des articles réellement insérés, dans l'ordre du lot
+        """
+        if not articles:
+            return []
         
-        except sqlite3.IntegrityError:
-            return 0
+        urls = list(dict.fromkeys(article.url for article in articles))
         
-        finally:
-            conn.close()
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            # Verrou d'écriture dès le début : lecture des existants et insertion atomiques
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            
+            existing = set()
+            for start in range(0, len(urls), SQL_IN_CHUNK_SIZE):
+                chunk = urls[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"SELECT url FROM articles WHERE url IN ({placeholders})", chunk)
+                existing.update(row['url'] for row in cursor.fetchall())
+            
+            cursor.executemany(
+                self._INSERT_ARTICLE_SQL,
+                [self._article_params(article) for article in articles if article.url not in existing]
+            )
+            
+            # Récupérer les IDs des nouvelles URLs
+            new_urls = [url for url in urls if url not in existing]
+            ids_by_url = {}
+            for start in range(0, len(new_urls), SQL_IN_CHUNK_SIZE):
+                chunk = new_urls[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"SELECT id, url FROM articles WHERE url IN ({placeholders})", chunk)
+                ids_by_url.update((row['url'], row['id']) for row in cursor.fetchall())
+            
+            return [ids_by_url[url] for url in new_urls if url in ids_by_url]
+    
+    @staticmethod
+    def _article_params(article: Article) -> tuple:
+        """Paramètres d'insertion d'un article"""
+        return (
+            article.media_id,
+            article.titre,
+            article.contenu,
+            article.extrait,
+            article.url,
+            article.auteur,
+            article.date_publication,
+            article.image_url,
+            json.dumps(article.categories) if article.categories else None,
+            json.dumps(article.tags) if article.tags else None,
+            article.source_type,
+            article.vues,
+            article.commentaires
+        )
     
     def get_article_by_url(self, url: str) -> Optional[Article]:
         """Récupérer un article par son URL"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("SELECT * FROM articles WHERE url = ?", (url,))
             row = cursor.fetchone()
             
             if row:
                 return self._row_to_article(row)
             return None
-        
-        finally:
-            conn.close()
     
     def article_exists(self, url: str) -> bool:
         """
@@ -359,22 +806,42 @@ class DatabaseManager:
         Returns:
             True si l'article existe, False sinon
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("SELECT 1 FROM articles WHERE url = ? LIMIT 1", (url,))
             return cursor.fetchone() is not None
+    
+    def get_existing_article_urls(self, urls: Iterable[str]) -> Set[str]:
+        """
+        Vérifier en une fois quelles URLs d'articles sont déjà en base
         
-        finally:
-            conn.close()
+        Args:
+            urls: URLs candidates
+            
+        Returns:
+            Ensemble des URLs déjà présentes dans la table articles
+        """
+        urls = list(dict.fromkeys(u for u in urls if u))
+        if not urls:
+            return set()
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            existing = set()
+            for start in range(0, len(urls), SQL_IN_CHUNK_SIZE):
+                chunk = urls[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"SELECT url FROM articles WHERE url IN ({placeholders})", chunk)
+                existing.update(row['url'] for row in cursor.fetchall())
+            return existing
     
     def get_articles_by_media(self, media_id: int, limit: int = 100) -> List[Article]:
         """Récupérer les articles d'un média"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT * FROM articles 
                 WHERE media_id = ?
@@ -383,16 +850,12 @@ class DatabaseManager:
             """, (media_id, limit))
             
             return [self._row_to_article(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
     
     def get_recent_articles(self, days: int = 7, limit: int = 100) -> List[Article]:
         """Récupérer les articles récents"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             date_limit = (datetime.now() - timedelta(days=days)).isoformat()
             
             cursor.execute("""
@@ -403,9 +866,56 @@ class DatabaseManager:
             """, (date_limit, limit))
             
             return [self._row_to_article(row) for row in cursor.fetchall()]
+    
+    def get_articles_page(self, fields: Iterable[str] = ARTICLE_SUMMARY_FIELDS,
+                          media_id: Optional[int] = None, days: Optional[int] = None,
+                          limit: int = 100, after: Optional[Tuple[str, int]] = None
+                          ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """
+        Récupérer une page d'articles, les plus récents d'abord
+        Seules les colonnes des champs demandés sont lues.
         
-        finally:
-            conn.close()
+        Args:
+            fields: Champs renvoyés (clés de ARTICLE_LIST_FIELDS)
+            media_id: Filtrer sur un média (optionnel)
+            days: Limiter aux N derniers jours (optionnel)
+            limit: Taille de la page
+            after: Curseur renvoyé avec la page précédente
+        
+        Returns:
+            (articles, curseur de la page suivante ou None)
+        
+        Raises:
+            ValueError: si un champ demandé n'existe pas
+        """
+        fields = list(dict.fromkeys(fields))
+        unknown = [f for f in fields if f not in ARTICLE_LIST_FIELDS]
+        if unknown:
+            raise ValueError(f"Champs inconnus: {', '.join(unknown)}")
+        
+        # id et date_publication portent le curseur
+        selected = dict.fromkeys(['id', 'date_publication', *fields])
+        columns = ', '.join(f"{ARTICLE_LIST_FIELDS[f]} AS {f}" for f in selected)
+        
+        conditions, params = [], []
+        if media_id is not None:
+            conditions.append("media_id = ?")
+            params.append(media_id)
+        if days is not None:
+            conditions.append("date_publication >= ?")
+            params.append(self._date_limit(days))
+        
+        rows, next_after = self._keyset_page('articles', conditions, params,
+                                             'date_publication', limit, after, columns)
+        
+        articles = []
+        for row in rows:
+            article = {f: row[f] for f in fields}
+            for key in ('categories', 'tags'):
+                if key in article:
+                    article[key] = json.loads(article[key]) if article[key] else []
+            articles.append(article)
+        return articles, next_after
     
     def _row_to_article(self, row: sqlite3.Row) -> Article:
         """Convertit une ligne SQL en objet Article"""
@@ -433,19 +943,13 @@ class DatabaseManager:
     def add_scraping_log(self, media_id: int, status: str, methode: str, 
                         articles_collectes: int = 0, message: str = ""):
         """Ajoute un log de scraping"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 INSERT INTO scraping_logs (media_id, status, methode, articles_collectes, message)
                 VALUES (?, ?, ?, ?, ?)
             """, (media_id, status, methode, articles_collectes, message))
-            
-            conn.commit()
-        
-        finally:
-            conn.close()
     
     # ==================== CLASSIFICATIONS ====================
     
@@ -453,10 +957,9 @@ class DatabaseManager:
                           mots_cles: List[str] = None, justification: str = "",
                           methode: str = "mistral_ollama"):
         """Ajoute une classification thématique"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 INSERT INTO classifications (
                     article_id, categorie, confiance, mots_cles, justification, methode
@@ -476,18 +979,54 @@ class DatabaseManager:
                 justification,
                 methode
             ))
+    
+    def add_classifications_bulk(self, classifications: List[Dict[str, Any]]) -> int:
+        """
+        Ajoute ou met à jour plusieurs classifications en une seule transaction
+        
+        Args:
+            classifications: Dictionnaires avec 'article_id', 'categorie', 'confiance',
+                             'mots_cles', 'justification' et 'methode'
             
-            conn.commit()
+        Returns:
+            Nombre de classifications enregistrées
+        """
+        rows = [
+            (
+                c['article_id'],
+                c['categorie'],
+                c['confiance'],
+                json.dumps(c['mots_cles']) if c.get('mots_cles') else None,
+                c.get('justification', ''),
+                c.get('methode', 'mistral_ollama')
+            )
+            for c in classifications if c.get('article_id') is not None
+        ]
+        
+        if not rows:
+            return 0
         
-        finally:
-            conn.close()
+        with self.connection() as conn:
+            conn.executemany("""
+                INSERT INTO classifications (
+                    article_id, categorie, confiance, mots_cles, justification, methode
+                ) VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(article_id) DO UPDATE SET
+                    categorie = excluded.categorie,
+                    confiance = excluded.confiance,
+                    mots_cles = excluded.mots_cles,
+                    justification = excluded.justification,
+                    methode = excluded.methode,
+                    created_at = CURRENT_TIMESTAMP
+            """, rows)
+        
+        return len(rows)
     
     def get_classification(self, article_id: int) -> Optional[Dict[str, Any]]:
         """Récupère la classification d'un article"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT * FROM classifications WHERE article_id = ?
             """, (article_id,))
@@ -505,16 +1044,12 @@ class DatabaseManager:
                     'created_at': row['created_at']
                 }
             return None
-        
-        finally:
-            conn.close()
     
     def get_articles_by_category(self, categorie: str, limit: int = 100) -> List[Dict[str, Any]]:
         """Récupère les articles d'une catégorie"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT a.*, c.categorie, c.confiance
                 FROM articles a
@@ -534,44 +1069,38 @@ class DatabaseManager:
                 })
             
             return results
-        
-        finally:
-            conn.close()
     
     def get_category_stats(self, days: int = 30) -> List[Dict[str, Any]]:
         """Statistiques par catégorie"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             date_limit = (datetime.now() - timedelta(days=days)).isoformat()
             
+            # CROSS JOIN : partir des articles de la période (idx_articles_date)
+            # plutôt que de parcourir toutes les classifications par catégorie
             cursor.execute("""
                 SELECT 
                     c.categorie,
                     COUNT(*) as total,
                     AVG(c.confiance) as confiance_moyenne
-                FROM classifications c
-                JOIN articles a ON c.article_id = a.id
+                FROM articles a
+                CROSS JOIN classifications c ON c.article_id = a.id
                 WHERE a.date_publication >= ?
                 GROUP BY c.categorie
                 ORDER BY total DESC
             """, (date_limit,))
             
             return [dict(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
     
     def get_weekly_category_stats(self, weeks: int = 5) -> List[Dict[str, Any]]:
         """
         Statistiques hebdomadaires par catégorie
         Retourne les données groupées par semaine et par catégorie
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             # Calculer la date de début (nombre de semaines * 7 jours)
             date_limit = (datetime.now() - timedelta(weeks=weeks)).isoformat()
             
@@ -580,17 +1109,14 @@ class DatabaseManager:
                     strftime('%Y-%W', a.date_publication) as semaine,
                     c.categorie,
                     COUNT(*) as total
-                FROM classifications c
-                JOIN articles a ON c.article_id = a.id
+                FROM articles a
+                CROSS JOIN classifications c ON c.article_id = a.id
                 WHERE a.date_publication >= ?
                 GROUP BY semaine, c.categorie
                 ORDER BY semaine, c.categorie
             """, (date_limit,))
             
             return [dict(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
     
     # ==================== FACEBOOK ====================
     
@@ -598,12 +1124,11 @@ class DatabaseManager:
                          url: str, image_url: str = None, date_publication: str = None,
                          likes: int = 0, comments: int = 0, shares: int = 0) -> int:
         """Ajoute ou met à jour un post Facebook"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        engagement_total = likes + comments + shares
+            engagement_total = likes + comments + shares
         
-        try:
             cursor.execute("""
                 INSERT INTO facebook_posts (
                     media_id, post_id, message, url, image_url, date_publication,
@@ -620,20 +1145,60 @@ class DatabaseManager:
                 likes, comments, shares, engagement_total
             ))
             
-            post_id_db = cursor.lastrowid
-            conn.commit()
+            # Relire l'ID : lastrowid n'est pas fiable après la branche UPDATE de l'upsert
+            cursor.execute("SELECT id FROM facebook_posts WHERE post_id = ?", (post_id,))
+            return cursor.fetchone()[0]
+    
+    def add_facebook_posts_bulk(self, media_id: int, posts: List[Dict[str, Any]]) -> int:
+        """
+        Ajoute ou met à jour plusieurs posts Facebook en une seule transaction
+        
+        Args:
+            media_id: ID du média
+            posts: Posts tels que renvoyés par FacebookScraper.scrape_page
             
-            return post_id_db
+        Returns:
+            Nombre de posts enregistrés
+        """
+        rows = []
+        for post in posts:
+            if not post.get('post_id'):
+                continue
+            likes = post.get('likes') or 0
+            comments = post.get('comments') or 0
+            shares = post.get('shares') or 0
+            rows.append((
+                media_id, post['post_id'], post.get('message', ''), post.get('url', ''),
+                post.get('image_url'), post.get('date_publication'),
+                likes, comments, shares, likes + comments + shares
+            ))
         
-        finally:
-            conn.close()
-    
-    def get_facebook_posts_by_media(self, media_id: int, limit: int = 100) -> List[Dict[str, Any]]:
-        """Récupère les posts Facebook d'un média"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        if not rows:
+            return 0
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.executemany("""
+                INSERT INTO facebook_posts (
+                    media_id, post_id, message, url, image_url, date_publication,
+                    likes, comments, shares, engagement_total
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(post_id) DO UPDATE SET
+                    likes = excluded.likes,
+                    comments = excluded.comments,
+                    shares = excluded.shares,
+                    engagement_total = excluded.engagement_total,
+                    scraped_at = CURRENT_TIMESTAMP
+            """, rows)
+            
+            return len(rows)
+    
+    def get_facebook_posts_by_media(self, media_id: int, limit: int = 100) -> List[Dict[str, Any]]:
+        """Récupère les posts Facebook d'un média"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT * FROM facebook_posts
                 WHERE media_id = ?
@@ -642,16 +1207,20 @@ class DatabaseManager:
             """, (media_id, limit))
             
             return [dict(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
+    
+    def get_facebook_posts_page(self, media_id: int, limit: int = 100,
+                                after: Optional[Tuple[str, int]] = None
+                                ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """Récupère une page de posts Facebook d'un média (voir get_articles_page)"""
+        rows, next_after = self._keyset_page('facebook_posts', ["media_id = ?"], [media_id],
+                                             'date_publication', limit, after)
+        return [dict(row) for row in rows], next_after
     
     def get_recent_facebook_posts(self, days: int = 7, limit: int = 500):
         """Récupère les posts Facebook récents"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             date_limit = (datetime.now() - timedelta(days=days)).isoformat()
             
             cursor.execute("""
@@ -672,111 +1241,54 @@ class DatabaseManager:
                     self.date_publication = row['date_publication']
             
             return [FacebookPost(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
     
     def calculate_media_metrics(self, media_id: int, days: int = 30) -> Optional[Dict[str, Any]]:
-        """Calcule les métriques d'un média"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        """
+        Calcule les métriques Facebook d'un média (snapshot media_metrics, voir refresh_media_metrics)
         
-        try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
-            periode_debut = date_limit
-            periode_fin = datetime.now().isoformat()
-            
-            # Compter les articles
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM articles
-                WHERE media_id = ? AND date_publication >= ?
-            """, (media_id, date_limit))
-            
-            total_articles = cursor.fetchone()['total']
-            
-            # Métriques Facebook
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_posts,
-                    SUM(likes) as total_likes,
-                    SUM(comments) as total_comments,
-                    SUM(shares) as total_shares,
-                    SUM(engagement_total) as engagement_total,
-                    AVG(engagement_total) as engagement_moyen
-                FROM facebook_posts
-                WHERE media_id = ? AND date_publication >= ?
-            """, (media_id, date_limit))
-            
-            fb_row = cursor.fetchone()
-            
-            metrics = {
-                'media_id': media_id,
-                'periode_debut': periode_debut,
-                'periode_fin': periode_fin,
-                'total_articles': total_articles,
-                'total_posts_facebook': fb_row['total_posts'] or 0,
-                'total_likes': fb_row['total_likes'] or 0,
-                'total_comments': fb_row['total_comments'] or 0,
-                'total_shares': fb_row['total_shares'] or 0,
-                'engagement_total': fb_row['engagement_total'] or 0,
-                'engagement_moyen': fb_row['engagement_moyen'] or 0
-            }
-            
-            # Sauvegarder les métriques
-            cursor.execute("""
-                INSERT INTO media_metrics (
-                    media_id, periode_debut, periode_fin,
-                    total_articles, total_posts_facebook,
-                    total_likes, total_comments, total_shares,
-                    engagement_total, engagement_moyen
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                media_id, periode_debut, periode_fin,
-                metrics['total_articles'], metrics['total_posts_facebook'],
-                metrics['total_likes'], metrics['total_comments'], metrics['total_shares'],
-                metrics['engagement_total'], metrics['engagement_moyen']
-            ))
-            
-            conn.commit()
-            
-            return metrics
+        Args:
+            media_id: ID du média
+            days: Nombre de jours
         
-        finally:
-            conn.close()
+        Returns:
+            Métriques articles + Facebook de la période
+        """
+        metrics = self.refresh_media_metrics(media_id, days)
+        posts = metrics['total_posts_facebook']
+        
+        return {
+            'media_id': media_id,
+            'periode_debut': metrics['periode_debut'],
+            'periode_fin': metrics['periode_fin'],
+            'total_articles': metrics['total_articles'],
+            'total_posts_facebook': posts,
+            'total_likes': metrics['total_likes_fb'],
+            'total_comments': metrics['total_comments_fb'],
+            'total_shares': metrics['total_shares_fb'],
+            'engagement_total': metrics['engagement_total_fb'],
+            'engagement_moyen': round(metrics['engagement_total_fb'] / posts, 2) if posts else 0
+        }
     
     def get_media_ranking(self, days: int = 30) -> List[Dict[str, Any]]:
-        """Classement des médias par engagement"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
-            
-            cursor.execute("""
-                SELECT 
-                    m.id,
-                    m.nom,
-                    m.url,
-                    COUNT(DISTINCT a.id) as total_articles,
-                    COUNT(DISTINCT fp.id) as total_posts_facebook,
-                    COALESCE(SUM(fp.likes), 0) as total_likes,
-                    COALESCE(SUM(fp.comments), 0) as total_comments,
-                    COALESCE(SUM(fp.shares), 0) as total_shares,
-                    COALESCE(SUM(fp.engagement_total), 0) as engagement_total,
-                    COALESCE(AVG(fp.engagement_total), 0) as engagement_moyen
-                FROM medias m
-                LEFT JOIN articles a ON m.id = a.media_id AND a.date_publication >= ?
-                LEFT JOIN facebook_posts fp ON m.id = fp.media_id AND fp.date_publication >= ?
-                WHERE m.actif = 1
-                GROUP BY m.id, m.nom, m.url
-                ORDER BY engagement_total DESC, total_articles DESC
-            """, (date_limit, date_limit))
-            
-            return [dict(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
+        """Classement des médias par engagement Facebook (voir get_media_ranking_with_twitter)"""
+        ranking = []
+        for row in self.get_media_ranking_with_twitter(days):
+            posts = row['total_posts_facebook']
+            ranking.append({
+                'id': row['id'],
+                'nom': row['nom'],
+                'url': row['url'],
+                'total_articles': row['total_articles'],
+                'total_posts_facebook': posts,
+                'total_likes': row['total_likes_fb'],
+                'total_comments': row['total_comments_fb'],
+                'total_shares': row['total_shares_fb'],
+                'engagement_total': row['engagement_total_fb'],
+                'engagement_moyen': round(row['engagement_total_fb'] / posts, 2) if posts else 0
+            })
+        
+        ranking.sort(key=lambda r: (r['engagement_total'], r['total_articles']), reverse=True)
+        return ranking
     
     # ==================== TWITTER ====================
     
@@ -785,12 +1297,11 @@ class DatabaseManager:
                          retweets: int = 0, replies: int = 0, likes: int = 0,
                          quotes: int = 0, impressions: int = 0) -> int:
         """Ajoute ou met à jour un tweet"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        engagement_total = retweets + replies + likes + quotes
+            engagement_total = retweets + replies + likes + quotes
         
-        try:
             cursor.execute("""
                 INSERT INTO twitter_tweets (
                     media_id, tweet_id, text, url, image_url, date_publication,
@@ -809,20 +1320,64 @@ class DatabaseManager:
                 retweets, replies, likes, quotes, impressions, engagement_total
             ))
             
-            tweet_id_db = cursor.lastrowid
-            conn.commit()
+            # Relire l'ID : lastrowid n'est pas fiable après la branche UPDATE de l'upsert
+            cursor.execute("SELECT id FROM twitter_tweets WHERE tweet_id = ?", (tweet_id,))
+            return cursor.fetchone()[0]
+    
+    def add_twitter_tweets_bulk(self, media_id: int, tweets: List[Dict[str, Any]]) -> int:
+        """
+        Ajoute ou met à jour plusieurs tweets en une seule transaction
+        
+        Args:
+            media_id: ID du média
+            tweets: Tweets tels que renvoyés par TwitterScraper.scrape_user
             
-            return tweet_id_db
+        Returns:
+            Nombre de tweets enregistrés
+        """
+        rows = []
+        for tweet in tweets:
+            if not tweet.get('tweet_id'):
+                continue
+            retweets = tweet.get('retweets') or 0
+            replies = tweet.get('replies') or 0
+            likes = tweet.get('likes') or 0
+            quotes = tweet.get('quotes') or 0
+            rows.append((
+                media_id, tweet['tweet_id'], tweet.get('text', ''), tweet.get('url', ''),
+                tweet.get('image_url'), tweet.get('date_publication'),
+                retweets, replies, likes, quotes, tweet.get('impressions') or 0,
+                retweets + replies + likes + quotes
+            ))
         
-        finally:
-            conn.close()
+        if not rows:
+            return 0
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.executemany("""
+                INSERT INTO twitter_tweets (
+                    media_id, tweet_id, text, url, image_url, date_publication,
+                    retweets, replies, likes, quotes, impressions, engagement_total
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(tweet_id) DO UPDATE SET
+                    retweets = excluded.retweets,
+                    replies = excluded.replies,
+                    likes = excluded.likes,
+                    quotes = excluded.quotes,
+                    impressions = excluded.impressions,
+                    engagement_total = excluded.engagement_total,
+                    scraped_at = CURRENT_TIMESTAMP
+            """, rows)
+            
+            return len(rows)
     
     def get_twitter_tweets_by_media(self, media_id: int, limit: int = 100) -> List[Dict[str, Any]]:
         """Récupère les tweets d'un média"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT * FROM twitter_tweets
                 WHERE media_id = ?
@@ -831,16 +1386,20 @@ class DatabaseManager:
             """, (media_id, limit))
             
             return [dict(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
+    
+    def get_twitter_tweets_page(self, media_id: int, limit: int = 100,
+                                after: Optional[Tuple[str, int]] = None
+                                ) -> Tuple[List[Dict[str, Any]], Optional[Tuple[str, int]]]:
+        """Récupère une page de tweets d'un média (voir get_articles_page)"""
+        rows, next_after = self._keyset_page('twitter_tweets', ["media_id = ?"], [media_id],
+                                             'date_publication', limit, after)
+        return [dict(row) for row in rows], next_after
     
     def get_recent_twitter_tweets(self, days: int = 7, limit: int = 500):
         """Récupère les tweets récents"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             date_limit = (datetime.now() - timedelta(days=days)).isoformat()
             
             cursor.execute("""
@@ -861,161 +1420,97 @@ class DatabaseManager:
                     self.date_publication = row['date_publication']
             
             return [TwitterTweet(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
     
     def calculate_media_metrics_with_twitter(self, media_id: int, days: int = 30) -> Optional[Dict[str, Any]]:
-        """Calcule les métriques d'un média (articles + Facebook + Twitter)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        """
+        Calcule les métriques d'un média (articles + Facebook + Twitter)
+        Snapshot media_metrics mis à jour de façon incrémentale, voir refresh_media_metrics
         
-        try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
-            periode_debut = date_limit
-            periode_fin = datetime.now().isoformat()
-            
-            # Compter les articles
-            cursor.execute("""
-                SELECT COUNT(*) as total
-                FROM articles
-                WHERE media_id = ? AND date_publication >= ?
-            """, (media_id, date_limit))
-            
-            total_articles = cursor.fetchone()['total']
-            
-            # Métriques Facebook
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_posts,
-                    SUM(likes) as total_likes,
-                    SUM(comments) as total_comments,
-                    SUM(shares) as total_shares,
-                    SUM(engagement_total) as engagement_total
-                FROM facebook_posts
-                WHERE media_id = ? AND date_publication >= ?
-            """, (media_id, date_limit))
-            
-            fb_row = cursor.fetchone()
-            
-            # Métriques Twitter
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_tweets,
-                    SUM(retweets) as total_retweets,
-                    SUM(replies) as total_replies,
-                    SUM(likes) as total_likes,
-                    SUM(quotes) as total_quotes,
-                    SUM(impressions) as total_impressions,
-                    SUM(engagement_total) as engagement_total
-                FROM twitter_tweets
-                WHERE media_id = ? AND date_publication >= ?
-            """, (media_id, date_limit))
-            
-            tw_row = cursor.fetchone()
-            
-            # Calculer l'engagement total
-            engagement_fb = fb_row['engagement_total'] or 0
-            engagement_tw = tw_row['engagement_total'] or 0
-            engagement_total = engagement_fb + engagement_tw
-            
-            total_posts = (fb_row['total_posts'] or 0) + (tw_row['total_tweets'] or 0)
-            engagement_moyen = engagement_total / total_posts if total_posts > 0 else 0
-            
-            metrics = {
-                'media_id': media_id,
-                'periode_debut': periode_debut,
-                'periode_fin': periode_fin,
-                'total_articles': total_articles,
-                'total_posts_facebook': fb_row['total_posts'] or 0,
-                'total_tweets': tw_row['total_tweets'] or 0,
-                'total_likes_fb': fb_row['total_likes'] or 0,
-                'total_comments_fb': fb_row['total_comments'] or 0,
-                'total_shares_fb': fb_row['total_shares'] or 0,
-                'engagement_total_fb': engagement_fb,
-                'total_retweets': tw_row['total_retweets'] or 0,
-                'total_replies': tw_row['total_replies'] or 0,
-                'total_likes_tw': tw_row['total_likes'] or 0,
-                'total_quotes': tw_row['total_quotes'] or 0,
-                'total_impressions': tw_row['total_impressions'] or 0,
-                'engagement_total_tw': engagement_tw,
-                'engagement_total': engagement_total,
-                'engagement_moyen': engagement_moyen
-            }
-            
-            # Sauvegarder les métriques
-            cursor.execute("""
-                INSERT INTO media_metrics (
-                    media_id, periode_debut, periode_fin,
-                    total_articles, total_posts_facebook, total_tweets,
-                    total_likes_fb, total_comments_fb, total_shares_fb, engagement_total_fb,
-                    total_retweets, total_replies, total_likes_tw, total_quotes,
-                    total_impressions, engagement_total_tw,
-                    engagement_total, engagement_moyen
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                media_id, periode_debut, periode_fin,
-                metrics['total_articles'], metrics['total_posts_facebook'], metrics['total_tweets'],
-                metrics['total_likes_fb'], metrics['total_comments_fb'], metrics['total_shares_fb'],
-                metrics['engagement_total_fb'],
-                metrics['total_retweets'], metrics['total_replies'], metrics['total_likes_tw'],
-                metrics['total_quotes'], metrics['total_impressions'], metrics['engagement_total_tw'],
-                metrics['engagement_total'], metrics['engagement_moyen']
-            ))
-            
-            conn.commit()
-            
-            return metrics
+        Args:
+            media_id: ID du média
+            days: Nombre de jours
         
-        finally:
-            conn.close()
+        Returns:
+            Métriques de la période
+        """
+        return self.refresh_media_metrics(media_id, days)
     
-    def get_media_ranking_with_twitter(self, days: int = 30) -> List[Dict[str, Any]]:
-        """Classement des médias par engagement (Facebook + Twitter)"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def get_media_ranking_with_twitter(self, days: int = 30, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Classement des médias par engagement (Facebook + Twitter), puis nombre d'articles
         
-        try:
-            date_limit = (datetime.now() - timedelta(days=days)).isoformat()
+        Chaque plateforme est agrégée séparément par média (agrégat quotidien
+        media_daily_stats) avant la jointure sur medias : une ligne par média,
+        sans produit articles × posts × tweets qui gonflerait les sommes.
+        
+        Args:
+            days: Période (jours calendaires, jour de début inclus)
+            limit: Nombre de médias retournés (tous si None)
+        
+        Returns:
+            Liste de dictionnaires (voir MediaRankingSerializer)
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
             
             cursor.execute("""
-                SELECT 
+                WITH web AS (
+                    SELECT media_id, SUM(publications) AS total
+                    FROM media_daily_stats
+                    WHERE plateforme = 'web' AND jour >= :since
+                    GROUP BY media_id
+                ),
+                fb AS (
+                    SELECT media_id, SUM(publications) AS total, SUM(likes) AS likes,
+                           SUM(comments) AS comments, SUM(shares) AS shares,
+                           SUM(engagement_total) AS engagement
+                    FROM media_daily_stats
+                    WHERE plateforme = 'facebook' AND jour >= :since
+                    GROUP BY media_id
+                ),
+                tw AS (
+                    SELECT media_id, SUM(publications) AS total, SUM(retweets) AS retweets,
+                           SUM(replies) AS replies, SUM(likes) AS likes, SUM(quotes) AS quotes,
+                           SUM(impressions) AS impressions, SUM(engagement_total) AS engagement
+                    FROM media_daily_stats
+                    WHERE plateforme = 'twitter' AND jour >= :since
+                    GROUP BY media_id
+                )
+                SELECT
                     m.id,
                     m.nom,
                     m.url,
-                    COUNT(DISTINCT a.id) as total_articles,
-                    COUNT(DISTINCT fp.id) as total_posts_facebook,
-                    COUNT(DISTINCT tw.id) as total_tweets,
-                    COALESCE(SUM(fp.likes), 0) as total_likes_fb,
-                    COALESCE(SUM(fp.comments), 0) as total_comments_fb,
-                    COALESCE(SUM(fp.shares), 0) as total_shares_fb,
-                    COALESCE(SUM(fp.engagement_total), 0) as engagement_total_fb,
-                    COALESCE(SUM(tw.retweets), 0) as total_retweets,
-                    COALESCE(SUM(tw.replies), 0) as total_replies,
-                    COALESCE(SUM(tw.likes), 0) as total_likes_tw,
-                    COALESCE(SUM(tw.quotes), 0) as total_quotes,
-                    COALESCE(SUM(tw.impressions), 0) as total_impressions,
-                    COALESCE(SUM(tw.engagement_total), 0) as engagement_total_tw,
-                    COALESCE(SUM(fp.engagement_total), 0) + COALESCE(SUM(tw.engagement_total), 0) as engagement_total,
-                    CASE 
-                        WHEN (COUNT(DISTINCT fp.id) + COUNT(DISTINCT tw.id)) > 0 
-                        THEN (COALESCE(SUM(fp.engagement_total), 0) + COALESCE(SUM(tw.engagement_total), 0)) / 
-                             (COUNT(DISTINCT fp.id) + COUNT(DISTINCT tw.id))
-                        ELSE 0 
-                    END as engagement_moyen
+                    COALESCE(web.total, 0) AS total_articles,
+                    COALESCE(fb.total, 0) AS total_posts_facebook,
+                    COALESCE(tw.total, 0) AS total_tweets,
+                    COALESCE(fb.likes, 0) AS total_likes_fb,
+                    COALESCE(fb.comments, 0) AS total_comments_fb,
+                    COALESCE(fb.shares, 0) AS total_shares_fb,
+                    COALESCE(fb.engagement, 0) AS engagement_total_fb,
+                    COALESCE(tw.retweets, 0) AS total_retweets,
+                    COALESCE(tw.replies, 0) AS total_replies,
+                    COALESCE(tw.likes, 0) AS total_likes_tw,
+                    COALESCE(tw.quotes, 0) AS total_quotes,
+                    COALESCE(tw.impressions, 0) AS total_impressions,
+                    COALESCE(tw.engagement, 0) AS engagement_total_tw,
+                    COALESCE(fb.engagement, 0) + COALESCE(tw.engagement, 0) AS engagement_total,
+                    CASE
+                        WHEN COALESCE(fb.total, 0) + COALESCE(tw.total, 0) > 0
+                        THEN ROUND(CAST(COALESCE(fb.engagement, 0) + COALESCE(tw.engagement, 0) AS REAL) /
+                                   (COALESCE(fb.total, 0) + COALESCE(tw.total, 0)), 2)
+                        ELSE 0
+                    END AS engagement_moyen
                 FROM medias m
-                LEFT JOIN articles a ON m.id = a.media_id AND a.date_publication >= ?
-                LEFT JOIN facebook_posts fp ON m.id = fp.media_id AND fp.date_publication >= ?
-                LEFT JOIN twitter_tweets tw ON m.id = tw.media_id AND tw.date_publication >= ?
+                LEFT JOIN web ON web.media_id = m.id
+                LEFT JOIN fb ON fb.media_id = m.id
+                LEFT JOIN tw ON tw.media_id = m.id
                 WHERE m.actif = 1
-                GROUP BY m.id, m.nom, m.url
                 ORDER BY engagement_total DESC, total_articles DESC
-            """, (date_limit, date_limit, date_limit))
+                LIMIT :limit
+            """, {'since': (datetime.now() - timedelta(days=days)).date().isoformat(),
+                  'limit': -1 if limit is None else limit})
             
             return [dict(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
     
     # ==================== CONTENT MODERATION ====================
     
@@ -1031,10 +1526,9 @@ class DatabaseManager:
         Returns:
             ID de l'analyse
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             import json
             
             toxicity = analysis.get('toxicity', {})
@@ -1089,11 +1583,7 @@ class DatabaseManager:
                 'mistral:latest'
             ))
             
-            conn.commit()
             return cursor.lastrowid
-            
-        finally:
-            conn.close()
     
     def get_content_moderation(self, content_type: str, content_id: int) -> Optional[dict]:
         """
@@ -1106,10 +1596,9 @@ class DatabaseManager:
         Returns:
             Dict avec l'analyse ou None
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT * FROM content_moderation
                 WHERE content_type = ? AND content_id = ?
@@ -1134,9 +1623,6 @@ class DatabaseManager:
                     'analyzed_at': row['analyzed_at']
                 }
             return None
-            
-        finally:
-            conn.close()
     
     def get_flagged_contents(self, content_type: Optional[str] = None, limit: int = 100) -> List[dict]:
         """
@@ -1149,10 +1635,9 @@ class DatabaseManager:
         Returns:
             Liste des contenus signalés
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             if content_type:
                 cursor.execute("""
                     SELECT * FROM content_moderation
@@ -1168,39 +1653,60 @@ class DatabaseManager:
                     LIMIT ?
                 """, (limit,))
             
-            results = []
-            for row in cursor.fetchall():
-                # Parser les détails JSON
-                toxicity_details = json.loads(row['toxicity_details']) if row['toxicity_details'] else {}
-                misinformation_details = json.loads(row['misinformation_details']) if row['misinformation_details'] else {}
-                sensitivity_details = json.loads(row['sensitivity_details']) if row['sensitivity_details'] else {}
-                
-                # Utiliser le primary_issue de la base de données (décidé par l'IA)
-                try:
-                    primary_issue = row['primary_issue'] if row['primary_issue'] else 'none'
-                except (KeyError, IndexError):
-                    primary_issue = 'none'
-                
-                results.append({
-                    'id': row['id'],
-                    'content_type': row['content_type'],
-                    'content_id': row['content_id'],
-                    'risk_score': row['risk_score'],
-                    'risk_level': row['risk_level'],
-                    'is_toxic': bool(row['is_toxic']),
-                    'is_misinformation': bool(row['is_misinformation']),
-                    'is_sensitive': bool(row['is_sensitive']),
-                    'analyzed_at': row['analyzed_at'],
-                    'toxicity_details': toxicity_details,
-                    'misinformation_details': misinformation_details,
-                    'sensitivity_details': sensitivity_details,
-                    'primary_issue': primary_issue
-                })
-            
-            return results
-            
-        finally:
-            conn.close()
+            return [self._row_to_flagged_content(row) for row in cursor.fetchall()]
+    
+    def get_flagged_contents_page(self, content_type: Optional[str] = None, limit: int = 50,
+                                  after: Optional[Tuple[float, int]] = None
+                                  ) -> Tuple[List[dict], Optional[Tuple[float, int]]]:
+        """
+        Récupère une page de contenus signalés, les plus risqués d'abord
+        
+        Args:
+            content_type: Type de contenu à filtrer (optionnel)
+            limit: Taille de la page
+            after: Curseur renvoyé avec la page précédente
+        
+        Returns:
+            (contenus signalés, curseur de la page suivante ou None)
+        """
+        conditions, params = ["should_flag = 1"], []
+        if content_type:
+            conditions.append("content_type = ?")
+            params.append(content_type)
+        
+        rows, next_after = self._keyset_page('content_moderation', conditions, params,
+                                             'risk_score', limit, after)
+        return [self._row_to_flagged_content(row) for row in rows], next_after
+    
+    @staticmethod
+    def _row_to_flagged_content(row: sqlite3.Row) -> dict:
+        """Convertit une ligne de content_moderation en contenu signalé"""
+        # Parser les détails JSON
+        toxicity_details = json.loads(row['toxicity_details']) if row['toxicity_details'] else {}
+        misinformation_details = json.loads(row['misinformation_details']) if row['misinformation_details'] else {}
+        sensitivity_details = json.loads(row['sensitivity_details']) if row['sensitivity_details'] else {}
+        
+        # Utiliser le primary_issue de la base de données (décidé par l'IA)
+        try:
+            primary_issue = row['primary_issue'] if row['primary_issue'] else 'none'
+        except (KeyError, IndexError):
+            primary_issue = 'none'
+        
+        return {
+            'id': row['id'],
+            'content_type': row['content_type'],
+            'content_id': row['content_id'],
+            'risk_score': row['risk_score'],
+            'risk_level': row['risk_level'],
+            'is_toxic': bool(row['is_toxic']),
+            'is_misinformation': bool(row['is_misinformation']),
+            'is_sensitive': bool(row['is_sensitive']),
+            'analyzed_at': row['analyzed_at'],
+            'toxicity_details': toxicity_details,
+            'misinformation_details': misinformation_details,
+            'sensitivity_details': sensitivity_details,
+            'primary_issue': primary_issue
+        }
     
     def get_moderation_stats(self) -> dict:
         """
@@ -1209,10 +1715,9 @@ class DatabaseManager:
         Returns:
             Dict avec les statistiques
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT 
                     COUNT(*) as total_analyzed,
@@ -1233,9 +1738,6 @@ class DatabaseManager:
                 'total_sensitive': row['total_sensitive'] or 0,
                 'avg_risk_score': round(row['avg_risk_score'] or 0, 2)
             }
-            
-        finally:
-            conn.close()
     
     # ==================== STATISTIQUES ====================
     
@@ -1246,10 +1748,9 @@ class DatabaseManager:
         Returns:
             Dict avec les statistiques
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             # Total articles
             cursor.execute("SELECT COUNT(*) as total FROM articles")
             total_articles = cursor.fetchone()['total']
@@ -1295,9 +1796,103 @@ class DatabaseManager:
                 'articles_par_source': articles_par_source,
                 'derniers_logs': derniers_logs
             }
-            
-        finally:
-            conn.close()
+    
+    def _date_limit(self, days: Optional[int]) -> Optional[str]:
+        """Date de début d'une période de N jours (None = toute la base)"""
+        if days is None:
+            return None
+        return (datetime.now() - timedelta(days=days)).isoformat()
+    
+    def count_medias(self, actif_only: bool = True) -> int:
+        """Compter les médias (actifs par défaut)"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            if actif_only:
+                cursor.execute("SELECT COUNT(*) FROM medias WHERE actif = 1")
+            else:
+                cursor.execute("SELECT COUNT(*) FROM medias")
+            return cursor.fetchone()[0]
+    
+    def count_articles(self, days: Optional[int] = None) -> int:
+        """Compter les articles publiés sur les N derniers jours (tous si None)"""
+        return self._count_since('articles', days)
+    
+    def count_facebook_posts(self, days: Optional[int] = None) -> int:
+        """Compter les posts Facebook publiés sur les N derniers jours (tous si None)"""
+        return self._count_since('facebook_posts', days)
+    
+    def count_twitter_tweets(self, days: Optional[int] = None) -> int:
+        """Compter les tweets publiés sur les N derniers jours (tous si None)"""
+        return self._count_since('twitter_tweets', days)
+    
+    def _count_since(self, table: str, days: Optional[int]) -> int:
+        """COUNT(*) sur date_publication (colonne indexée)"""
+        date_limit = self._date_limit(days)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            if date_limit is None:
+                cursor.execute(f"SELECT COUNT(*) FROM {table}")
+            else:
+                cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE date_publication >= ?", (date_limit,))
+            return cursor.fetchone()[0]
+    
+    def count_categories(self, days: int = 30) -> int:
+        """Compter les catégories représentées parmi les articles des N derniers jours"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("""
+                SELECT COUNT(DISTINCT c.categorie)
+                FROM articles a
+                CROSS JOIN classifications c ON c.article_id = a.id
+                WHERE a.date_publication >= ?
+            """, (self._date_limit(days),))
+            return cursor.fetchone()[0]
+    
+    def get_overview_counts(self, days: int = 30) -> Dict[str, int]:
+        """
+        Compteurs du tableau de bord en une seule requête
+        
+        Args:
+            days: Période (jours) pour les contenus publiés
+        
+        Returns:
+            Dictionnaire {'total_medias', 'total_articles', 'total_fb_posts',
+            'total_tweets', 'total_categories', 'total_classified'}
+        """
+        date_limit = self._date_limit(days)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM medias WHERE actif = 1) AS total_medias,
+                    (SELECT COUNT(*) FROM articles WHERE date_publication >= :since) AS total_articles,
+                    (SELECT COUNT(*) FROM facebook_posts WHERE date_publication >= :since) AS total_fb_posts,
+                    (SELECT COUNT(*) FROM twitter_tweets WHERE date_publication >= :since) AS total_tweets,
+                    (SELECT COUNT(DISTINCT c.categorie) FROM articles a
+                     CROSS JOIN classifications c ON c.article_id = a.id
+                     WHERE a.date_publication >= :since) AS total_categories,
+                    (SELECT COUNT(*) FROM articles a
+                     CROSS JOIN classifications c ON c.article_id = a.id
+                     WHERE a.date_publication >= :since) AS total_classified
+            """, {'since': date_limit})
+            return dict(cursor.fetchone())
+    
+    def get_top_media(self, days: int = 30) -> Optional[Dict[str, Any]]:
+        """
+        Média en tête du classement (engagement Facebook + Twitter, puis nombre d'articles)
+        
+        Args:
+            days: Période (jours)
+        
+        Returns:
+            Ligne de get_media_ranking_with_twitter ou None
+        """
+        ranking = self.get_media_ranking_with_twitter(days, limit=1)
+        return ranking[0] if ranking else None
     
     def get_unclassified_articles(self, limit: int = 100) -> List[Dict[str, Any]]:
         """
@@ -1309,10 +1904,9 @@ class DatabaseManager:
         Returns:
             Liste de dictionnaires contenant les articles
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT a.id, a.titre, a.contenu, a.date_publication
                 FROM articles a
@@ -1323,9 +1917,6 @@ class DatabaseManager:
             """, (limit,))
             
             return [dict(row) for row in cursor.fetchall()]
-        
-        finally:
-            conn.close()
     
     def get_article(self, article_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -1337,10 +1928,9 @@ class DatabaseManager:
         Returns:
             Dictionnaire contenant l'article ou None
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
                 SELECT id, media_id, titre, contenu, url, date_publication, source_type
                 FROM articles
@@ -1349,34 +1939,89 @@ class DatabaseManager:
             
             row = cursor.fetchone()
             return dict(row) if row else None
-        
-        finally:
-            conn.close()
     
-    def get_classification_stats(self) -> Dict[str, Any]:
+    def get_article_detail(self, article_id: int) -> Optional[Dict[str, Any]]:
         """
-        Récupère les statistiques de classification
+        Récupère un article complet (contenu inclus) avec sa classification
+        
+        Args:
+            article_id: ID de l'article
         
         Returns:
-            Dictionnaire avec les statistiques
+            Dictionnaire de l'article ou None
         """
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            # Total articles
-            cursor.execute("SELECT COUNT(*) as total FROM articles")
-            total_articles = cursor.fetchone()['total']
+        with self.connection() as conn:
+            cursor = conn.cursor()
             
-            # Articles classifiés
             cursor.execute("""
-                SELECT COUNT(DISTINCT article_id) as total 
-                FROM classifications
-            """)
-            total_classifies = cursor.fetchone()['total']
+                SELECT a.*, c.categorie, c.confiance
+                FROM articles a
+                LEFT JOIN classifications c ON c.article_id = a.id
+                WHERE a.id = ?
+            """, (article_id,))
             
-            # Par catégorie
-            cursor.execute("""
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            article = dict(row)
+            article['categories'] = json.loads(row['categories']) if row['categories'] else []
+            article['tags'] = json.loads(row['tags']) if row['tags'] else []
+            return article
+    
+    def get_articles_by_ids(self, article_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Récupère plusieurs articles par leurs IDs (requêtes groupées)
+        
+        Args:
+            article_ids: IDs des articles
+            
+        Returns:
+            Liste de dictionnaires, dans l'ordre des IDs demandés
+        """
+        ids = list(dict.fromkeys(article_ids))
+        if not ids:
+            return []
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            by_id = {}
+            for start in range(0, len(ids), SQL_IN_CHUNK_SIZE):
+                chunk = ids[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"""
+                    SELECT id, media_id, titre, contenu, url, date_publication, source_type
+                    FROM articles
+                    WHERE id IN ({placeholders})
+                """, chunk)
+                by_id.update((row['id'], dict(row)) for row in cursor.fetchall())
+            
+            return [by_id[i] for i in ids if i in by_id]
+    
+    def get_classification_stats(self) -> Dict[str, Any]:
+        """
+        Récupère les statistiques de classification
+        
+        Returns:
+            Dictionnaire avec les statistiques
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            # Total articles
+            cursor.execute("SELECT COUNT(*) as total FROM articles")
+            total_articles = cursor.fetchone()['total']
+            
+            # Articles classifiés
+            cursor.execute("""
+                SELECT COUNT(DISTINCT article_id) as total 
+                FROM classifications
+            """)
+            total_classifies = cursor.fetchone()['total']
+            
+            # Par catégorie
+            cursor.execute("""
                 SELECT categorie, COUNT(*) as total, AVG(confiance) as confiance
                 FROM classifications
                 GROUP BY categorie
@@ -1406,18 +2051,14 @@ class DatabaseManager:
                 'confiance_par_categorie': confiance_par_categorie,
                 'par_methode': par_methode
             }
-        
-        finally:
-            conn.close()
     
     # ==================== SCRAPING SCHEDULE ====================
     
     def get_scraping_schedule(self) -> Optional[Dict[str, Any]]:
         """Récupérer la configuration de l'automatisation"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("SELECT * FROM scraping_schedule ORDER BY id DESC LIMIT 1")
             row = cursor.fetchone()
             
@@ -1435,18 +2076,14 @@ class DatabaseManager:
                     'updated_at': row['updated_at']
                 }
             return None
-        
-        finally:
-            conn.close()
     
     def create_or_update_scraping_schedule(self, enabled: bool, frequency: str, 
                                            days: int = 7, fb_posts: int = 10, 
                                            tweets: int = 10) -> Dict[str, Any]:
         """Créer ou mettre à jour la configuration de l'automatisation"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             # Calculer next_run basé sur la fréquence
             now = datetime.now()
             if frequency == 'hourly':
@@ -1479,7 +2116,6 @@ class DatabaseManager:
                 """, (enabled, frequency, days, fb_posts, tweets, next_run.isoformat()))
                 schedule_id = cursor.lastrowid
             
-            conn.commit()
             
             # Retourner la config mise à jour
             cursor.execute("SELECT * FROM scraping_schedule WHERE id = ?", (schedule_id,))
@@ -1497,25 +2133,17 @@ class DatabaseManager:
                 'created_at': row['created_at'],
                 'updated_at': row['updated_at']
             }
-        
-        finally:
-            conn.close()
     
     def delete_scraping_schedule(self):
         """Supprimer la configuration de l'automatisation"""
-        conn = self.get_connection()
-        try:
+        with self.connection() as conn:
             conn.execute("DELETE FROM scraping_schedule")
-            conn.commit()
-        finally:
-            conn.close()
     
     def update_schedule_last_run(self):
         """Mettre à jour last_run et calculer next_run"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("SELECT * FROM scraping_schedule LIMIT 1")
             schedule = cursor.fetchone()
             
@@ -1537,78 +2165,176 @@ class DatabaseManager:
                     SET last_run = ?, next_run = ?, updated_at = CURRENT_TIMESTAMP
                     WHERE id = ?
                 """, (now.isoformat(), next_run.isoformat(), schedule['id']))
-                conn.commit()
-        
-        finally:
-            conn.close()
     
     # ==================== SCRAPING TASKS ====================
     
-    def create_scraping_task(self, task_type: str, parameters: Dict[str, Any] = None) -> int:
-        """Créer une nouvelle tâche de scraping"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def create_scraping_task(self, task_type: str, parameters: Dict[str, Any] = None,
+                             status: str = 'running') -> int:
+        """Créer une nouvelle tâche de scraping ('queued' si exécutée plus tard)"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             cursor.execute("""
-                INSERT INTO scraping_tasks (type, status, parameters)
-                VALUES (?, 'running', ?)
-            """, (task_type, json.dumps(parameters) if parameters else None))
-            conn.commit()
+                INSERT INTO scraping_tasks (type, status, parameters, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, (task_type, status, json.dumps(parameters) if parameters else None))
             return cursor.lastrowid
-        
-        finally:
-            conn.close()
     
     def update_scraping_task(self, task_id: int, status: str, 
-                            total_articles: int = 0, total_fb_posts: int = 0, 
-                            total_tweets: int = 0, error_message: str = None):
-        """Mettre à jour une tâche de scraping"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+                            total_articles: Optional[int] = None, total_fb_posts: Optional[int] = None, 
+                            total_tweets: Optional[int] = None, error_message: str = None):
+        """Mettre à jour une tâche de scraping (totaux non fournis conservés)"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             completed_at = datetime.now().isoformat() if status in ['completed', 'failed'] else None
             
             cursor.execute("""
                 UPDATE scraping_tasks 
-                SET status = ?, completed_at = ?, total_articles = ?, 
-                    total_fb_posts = ?, total_tweets = ?, error_message = ?
+                SET status = ?, completed_at = ?,
+                    total_articles = COALESCE(?, total_articles),
+                    total_fb_posts = COALESCE(?, total_fb_posts),
+                    total_tweets = COALESCE(?, total_tweets),
+                    error_message = ?, updated_at = CURRENT_TIMESTAMP
                 WHERE id = ?
             """, (status, completed_at, total_articles, total_fb_posts, total_tweets, 
                   error_message, task_id))
-            conn.commit()
+    
+    def update_scraping_task_progress(self, task_id: int, sites_done: Optional[int] = None,
+                                      sites_total: Optional[int] = None,
+                                      current_media: Optional[str] = None,
+                                      total_articles: Optional[int] = None,
+                                      total_fb_posts: Optional[int] = None,
+                                      total_tweets: Optional[int] = None,
+                                      status: Optional[str] = None):
+        """
+        Mettre à jour la progression d'une tâche en cours (valeurs non fournies conservées)
         
-        finally:
-            conn.close()
+        Args:
+            task_id: ID de la tâche
+            sites_done: Nombre de médias terminés
+            sites_total: Nombre de médias à traiter
+            current_media: Dernier média traité
+            total_articles: Articles enregistrés jusqu'ici
+            total_fb_posts: Posts Facebook enregistrés jusqu'ici
+            total_tweets: Tweets enregistrés jusqu'ici
+            status: Nouveau statut (ex: 'running' au démarrage d'une tâche en file)
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("""
+                UPDATE scraping_tasks
+                SET sites_done = COALESCE(?, sites_done),
+                    sites_total = COALESCE(?, sites_total),
+                    current_media = COALESCE(?, current_media),
+                    total_articles = COALESCE(?, total_articles),
+                    total_fb_posts = COALESCE(?, total_fb_posts),
+                    total_tweets = COALESCE(?, total_tweets),
+                    status = COALESCE(?, status),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (sites_done, sites_total, current_media, total_articles,
+                  total_fb_posts, total_tweets, status, task_id))
+    
+    @staticmethod
+    def _scraping_task_to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """Convertir une ligne de scraping_tasks en dictionnaire"""
+        return {
+            'id': row['id'],
+            'type': row['type'],
+            'status': row['status'],
+            'started_at': row['started_at'],
+            'completed_at': row['completed_at'],
+            'total_articles': row['total_articles'],
+            'total_fb_posts': row['total_fb_posts'],
+            'total_tweets': row['total_tweets'],
+            'error_message': row['error_message'],
+            'sites_total': row['sites_total'],
+            'sites_done': row['sites_done'],
+            'current_media': row['current_media'],
+            'updated_at': row['updated_at']
+        }
+    
+    def get_scraping_task(self, task_id: int) -> Optional[Dict[str, Any]]:
+        """Récupérer une tâche de scraping (avec sa progression)"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("SELECT * FROM scraping_tasks WHERE id = ?", (task_id,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            task = self._scraping_task_to_dict(row)
+            task['parameters'] = json.loads(row['parameters']) if row['parameters'] else None
+            return task
+    
+    def get_active_scraping_task(self, parameters: Dict[str, Any] = None,
+                                 live_task_ids: Iterable[int] = (),
+                                 max_idle: int = 300) -> Optional[Dict[str, Any]]:
+        """
+        Récupérer une tâche en file ou en cours lancée avec les mêmes paramètres
+        Une tâche n'est active que si l'exécuteur la suit encore ou si sa progression
+        a été mise à jour récemment : une ligne laissée par un processus arrêté est ignorée
+        
+        Args:
+            parameters: Paramètres de la tâche (comparés après sérialisation JSON)
+            live_task_ids: Tâches suivies par l'exécuteur du processus
+            max_idle: Délai (secondes) sans mise à jour au-delà duquel une tâche non suivie est ignorée
+        
+        Returns:
+            Tâche active la plus récente ou None
+        """
+        live_task_ids = list(live_task_ids)
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute(f"""
+                SELECT * FROM scraping_tasks
+                WHERE status IN ('queued', 'running') AND parameters IS ?
+                  AND (updated_at >= datetime('now', ?)
+                       OR id IN ({','.join('?' * len(live_task_ids))}))
+                ORDER BY id DESC
+                LIMIT 1
+            """, (json.dumps(parameters) if parameters else None, f'-{int(max_idle)} seconds',
+                  *live_task_ids))
+            row = cursor.fetchone()
+            return self._scraping_task_to_dict(row) if row else None
+    
+    def fail_interrupted_scraping_tasks(self, error_message: str) -> int:
+        """
+        Clore en échec les tâches restées en file ou en cours (exécuteur précédent arrêté)
+        
+        Args:
+            error_message: Message d'erreur enregistré sur les tâches
+        
+        Returns:
+            Nombre de tâches closes
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("""
+                UPDATE scraping_tasks
+                SET status = 'failed', completed_at = ?, error_message = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE status IN ('queued', 'running')
+            """, (datetime.now().isoformat(), error_message))
+            return cursor.rowcount
     
     def get_scraping_tasks(self, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
         """Récupérer l'historique des tâches de scraping"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.connection() as conn:
+            cursor = conn.cursor()
         
-        try:
             # Récupérer les tâches
             cursor.execute("""
                 SELECT * FROM scraping_tasks 
                 ORDER BY started_at DESC 
                 LIMIT ? OFFSET ?
             """, (limit, offset))
-            rows = cursor.fetchall()
-            
-            tasks = []
-            for row in rows:
-                tasks.append({
-                    'id': row['id'],
-                    'type': row['type'],
-                    'status': row['status'],
-                    'started_at': row['started_at'],
-                    'completed_at': row['completed_at'],
-                    'total_articles': row['total_articles'],
-                    'total_fb_posts': row['total_fb_posts'],
-                    'total_tweets': row['total_tweets'],
-                    'error_message': row['error_message']
-                })
+            tasks = [self._scraping_task_to_dict(row) for row in cursor.fetchall()]
             
             # Compter le total
             cursor.execute("SELECT COUNT(*) as total FROM scraping_tasks")
@@ -1618,17 +2344,633 @@ class DatabaseManager:
                 'tasks': tasks,
                 'total': total
             }
+    
+    # ==================== CACHE HTTP ====================
+    
+    def get_http_validators(self, url: str) -> Optional[Dict[str, str]]:
+        """
+        Récupérer les validateurs HTTP mémorisés pour une URL
         
-        finally:
-            conn.close()
+        Args:
+            url: URL de la ressource (flux RSS, page d'accueil...)
+        
+        Returns:
+            Dictionnaire {'etag', 'last_modified'} ou None
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("""
+                SELECT etag, last_modified FROM http_cache WHERE url = ?
+            """, (url,))
+            row = cursor.fetchone()
+            return dict(row) if row else None
     
+    def save_http_validators(self, validators: Dict[str, Dict[str, Optional[str]]]):
+        """
+        Mémoriser les validateurs HTTP de plusieurs URLs
+        
+        Args:
+            validators: Dictionnaire {url: {'etag': ..., 'last_modified': ...}}
+        """
+        if not validators:
+            return
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.executemany("""
+                INSERT INTO http_cache (url, etag, last_modified, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    updated_at = CURRENT_TIMESTAMP
+            """, [
+                (url, v.get('etag'), v.get('last_modified'))
+                for url, v in validators.items()
+            ])
+    
+    # ==================== MODÈLES D'EXTRACTION ====================
+    
+    def get_site_template(self, domaine: str) -> Optional[Dict[str, Optional[str]]]:
+        """
+        Récupérer le modèle d'extraction appris pour un domaine
+        
+        Args:
+            domaine: Domaine du site (ex: www.aib.media)
+        
+        Returns:
+            Dictionnaire {champ: sélecteur ou None} ou None si aucun modèle
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute(f"""
+                SELECT {', '.join(f'selecteur_{field}' for field in SITE_TEMPLATE_FIELDS)}
+                FROM site_templates WHERE domaine = ?
+            """, (domaine,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return {field: row[f'selecteur_{field}'] for field in SITE_TEMPLATE_FIELDS}
+    
+    def save_site_template(self, domaine: str, selectors: Dict[str, Optional[str]]):
+        """
+        Enregistrer le modèle d'extraction d'un domaine
+        
+        Args:
+            domaine: Domaine du site
+            selectors: Dictionnaire {champ: sélecteur} (champs absents : NULL)
+        """
+        columns = [f'selecteur_{field}' for field in SITE_TEMPLATE_FIELDS]
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute(f"""
+                INSERT INTO site_templates (domaine, {', '.join(columns)}, updated_at)
+                VALUES (?, {', '.join('?' for _ in columns)}, CURRENT_TIMESTAMP)
+                ON CONFLICT(domaine) DO UPDATE SET
+                    {', '.join(f'{column} = excluded.{column}' for column in columns)},
+                    updated_at = CURRENT_TIMESTAMP
+            """, (domaine, *(selectors.get(field) for field in SITE_TEMPLATE_FIELDS)))
+    
+    # ==================== CACHE LLM ====================
+    
+    def get_llm_cache(self, cache_key: str) -> Optional[str]:
+        """
+        Lire un résultat LLM mis en cache (et le marquer comme récemment utilisé)
+        
+        Args:
+            cache_key: Empreinte calculée par LLMCache
+        
+        Returns:
+            JSON du résultat ou None si absent
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("SELECT result FROM llm_cache WHERE cache_key = ?", (cache_key,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            
+            cursor.execute("""
+                UPDATE llm_cache
+                SET hits = hits + 1, last_used_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+                WHERE cache_key = ?
+            """, (cache_key,))
+            return row['result']
+    
+    def save_llm_cache(self, cache_key: str, namespace: str, model: str, result: str,
+                       max_entries: Optional[int] = None) -> int:
+        """
+        Mettre en cache un résultat LLM, en évinçant les entrées les moins
+        récemment utilisées au-delà de max_entries
+        
+        Args:
+            cache_key: Empreinte calculée par LLMCache
+            namespace: Type d'analyse ('theme', 'moderation')
+            model: Modèle Ollama ayant produit le résultat
+            result: JSON du résultat
+            max_entries: Nombre maximum d'entrées conservées (None = illimité)
+        
+        Returns:
+            Nombre d'entrées évincées
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("""
+                INSERT INTO llm_cache (cache_key, namespace, model, result, last_used_at)
+                VALUES (?, ?, ?, ?, strftime('%Y-%m-%d %H:%M:%f', 'now'))
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    result = excluded.result,
+                    last_used_at = excluded.last_used_at
+            """, (cache_key, namespace, model, result))
+            
+            if not max_entries:
+                return 0
+            
+            cursor.execute("SELECT COUNT(*) FROM llm_cache")
+            excess = cursor.fetchone()[0] - max_entries
+            if excess <= 0:
+                return 0
+            
+            # Évincer 10% de marge pour ne pas recompter à chaque insertion
+            excess += max_entries // 10
+            cursor.execute("""
+                DELETE FROM llm_cache WHERE cache_key IN (
+                    SELECT cache_key FROM llm_cache ORDER BY last_used_at ASC LIMIT ?
+                )
+            """, (excess,))
+            return cursor.rowcount
+    
+    def get_llm_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Statistiques du cache LLM par type d'analyse
+        
+        Returns:
+            Dictionnaire {namespace: {'entries', 'hits'}}
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("""
+                SELECT namespace, COUNT(*) AS entries, COALESCE(SUM(hits), 0) AS hits
+                FROM llm_cache
+                GROUP BY namespace
+            """)
+            return {
+                row['namespace']: {'entries': row['entries'], 'hits': row['hits']}
+                for row in cursor.fetchall()
+            }
+    
+    # ==================== FILE DE TRAVAUX ====================
+    
+    def enqueue_jobs(self, job_type: str, object_ids: Iterable[int], max_attempts: int = 5) -> int:
+        """
+        Ajouter des travaux à la file (un travail déjà en file pour un objet est ignoré)
+        
+        Args:
+            job_type: Type de travail ('classify_article', 'moderate_article')
+            object_ids: IDs des objets à traiter
+            max_attempts: Nombre d'essais avant mise en lettre morte
+        
+        Returns:
+            Nombre de travaux ajoutés
+        """
+        ids = list(dict.fromkeys(object_ids))
+        if not ids:
+            return 0
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            before = conn.total_changes
+        
+            cursor.executemany("""
+                INSERT OR IGNORE INTO job_queue (job_type, object_id, max_attempts)
+                VALUES (?, ?, ?)
+            """, [(job_type, object_id, max_attempts) for object_id in ids])
+            
+            return conn.total_changes - before
+    
+    def claim_jobs(self, job_type: str, worker_id: str, limit: int = 20,
+                   visibility_timeout: int = 300) -> List[Dict[str, Any]]:
+        """
+        Réserver des travaux disponibles pour un consommateur
+        Un travail réservé puis non terminé dans le délai de visibilité
+        (consommateur arrêté en cours de route) redevient disponible
+        
+        Args:
+            job_type: Type de travail
+            worker_id: Identifiant du consommateur
+            limit: Nombre maximum de travaux réservés
+            visibility_timeout: Délai (secondes) avant qu'un travail réservé redevienne disponible
+        
+        Returns:
+            Liste de travaux {'id', 'object_id', 'attempts', 'max_attempts'}
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            # Verrou d'écriture : deux consommateurs ne réservent jamais le même travail
+            if not conn.in_transaction:
+                cursor.execute("BEGIN IMMEDIATE")
+            
+            # Travaux abandonnés ayant épuisé leurs essais : lettre morte
+            cursor.execute("""
+                UPDATE job_queue
+                SET status = 'dead', locked_by = NULL, locked_until = NULL,
+                    last_error = COALESCE(last_error, 'Délai de visibilité dépassé')
+                WHERE job_type = ? AND status = 'running'
+                  AND locked_until <= CURRENT_TIMESTAMP AND attempts >= max_attempts
+            """, (job_type,))
+            
+            cursor.execute("""
+                SELECT id, object_id, attempts, max_attempts
+                FROM job_queue
+                WHERE job_type = ?
+                  AND ((status = 'pending' AND available_at <= CURRENT_TIMESTAMP)
+                       OR (status = 'running' AND locked_until <= CURRENT_TIMESTAMP))
+                ORDER BY id
+                LIMIT ?
+            """, (job_type, limit))
+            jobs = [dict(row) for row in cursor.fetchall()]
+            if not jobs:
+                return []
+            
+            cursor.executemany("""
+                UPDATE job_queue
+                SET status = 'running', attempts = attempts + 1, locked_by = ?,
+                    locked_until = datetime('now', ?)
+                WHERE id = ?
+            """, [(worker_id, f'+{int(visibility_timeout)} seconds', job['id']) for job in jobs])
+            
+            for job in jobs:
+                job['attempts'] += 1
+            return jobs
+    
+    def complete_jobs(self, job_ids: Iterable[int]) -> int:
+        """
+        Retirer de la file des travaux terminés
+        
+        Args:
+            job_ids: IDs des travaux
+        
+        Returns:
+            Nombre de travaux retirés
+        """
+        ids = list(dict.fromkeys(job_ids))
+        if not ids:
+            return 0
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            removed = 0
+            for start in range(0, len(ids), SQL_IN_CHUNK_SIZE):
+                chunk = ids[start:start + SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"DELETE FROM job_queue WHERE id IN ({placeholders})", chunk)
+                removed += cursor.rowcount
+            return removed
+    
+    def fail_job(self, job_id: int, error: str, base_delay: int = 30) -> str:
+        """
+        Enregistrer l'échec d'un travail : nouvel essai différé (backoff exponentiel)
+        ou lettre morte une fois les essais épuisés
+        
+        Args:
+            job_id: ID du travail
+            error: Message d'erreur
+            base_delay: Délai (secondes) avant le deuxième essai, doublé à chaque échec
+        
+        Returns:
+            Nouveau statut ('pending' ou 'dead')
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("SELECT attempts, max_attempts FROM job_queue WHERE id = ?", (job_id,))
+            row = cursor.fetchone()
+            if not row:
+                return 'dead'
+            
+            if row['attempts'] >= row['max_attempts']:
+                cursor.execute("""
+                    UPDATE job_queue
+                    SET status = 'dead', locked_by = NULL, locked_until = NULL, last_error = ?
+                    WHERE id = ?
+                """, (error, job_id))
+                return 'dead'
+            
+            delay = base_delay * 2 ** max(0, row['attempts'] - 1)
+            cursor.execute("""
+                UPDATE job_queue
+                SET status = 'pending', locked_by = NULL, locked_until = NULL, last_error = ?,
+                    available_at = datetime('now', ?)
+                WHERE id = ?
+            """, (error, f'+{int(delay)} seconds', job_id))
+            return 'pending'
+    
+    def requeue_dead_jobs(self, job_type: Optional[str] = None) -> int:
+        """
+        Remettre en file les travaux en lettre morte (essais remis à zéro)
+        
+        Args:
+            job_type: Type de travail (tous si None)
+        
+        Returns:
+            Nombre de travaux remis en file
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            query = """
+                UPDATE job_queue
+                SET status = 'pending', attempts = 0, available_at = CURRENT_TIMESTAMP
+                WHERE status = 'dead'
+            """
+            params = []
+            if job_type:
+                query += " AND job_type = ?"
+                params.append(job_type)
+            
+            cursor.execute(query, params)
+            return cursor.rowcount
+    
+    def get_job_queue_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Nombre de travaux par type et par statut
+        
+        Returns:
+            Dictionnaire {job_type: {'pending', 'running', 'dead'}}
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+        
+            cursor.execute("""
+                SELECT job_type, status, COUNT(*) AS count
+                FROM job_queue
+                GROUP BY job_type, status
+            """)
+            
+            stats = {}
+            for row in cursor.fetchall():
+                counts = stats.setdefault(row['job_type'], {'pending': 0, 'running': 0, 'dead': 0})
+                counts[row['status']] = row['count']
+            return stats
+    
+    # ==================== SNAPSHOTS DE MÉTRIQUES ====================
+    
+    def refresh_media_metrics(self, media_id: int, days: int = 30) -> Dict[str, Any]:
+        """
+        Mettre à jour le snapshot media_metrics d'un média sur les N derniers jours
+        
+        Un seul snapshot par (média, période) : la période va du jour J-N au jour J,
+        les appels d'une même journée mettent à jour la même ligne. Seules les
+        données collectées depuis le snapshot précédent sont relues :
+        - articles (jamais modifiés après insertion) : ajout des articles dont
+          l'id dépasse le dernier article compté
+        - posts et tweets (métriques réécrites à chaque collecte, scraped_at
+          rafraîchi) : si l'un d'eux a été collecté depuis le snapshot, les
+          sommes de la période sont relues dans media_daily_stats (au plus
+          une ligne par jour et par plateforme) ; ajouter les lignes collectées
+          compterait deux fois un post mis à jour
+        Sans nouvelle collecte, le snapshot est retourné sans aucune écriture.
+        
+        Args:
+            media_id: ID du média
+            days: Nombre de jours de la période
+        
+        Returns:
+            Métriques (clés de MEDIA_METRICS_COLUMNS, media_id, periode_debut, periode_fin)
+        """
+        now = datetime.now()
+        periode_debut = (now - timedelta(days=days)).date().isoformat()
+        periode_fin = now.date().isoformat()
+        period = {'media_id': media_id, 'debut': periode_debut, 'fin': periode_fin}
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM media_metrics
+                WHERE media_id = :media_id AND periode_debut = :debut AND periode_fin = :fin
+            """, period)
+            row = cursor.fetchone()
+            snapshot = dict(row) if row else None
+            
+            # Filigranes actuels : dernier article, dernière collecte sociale
+            cursor.execute("""
+                SELECT
+                    COALESCE((SELECT MAX(id) FROM articles WHERE media_id = :media_id), 0) AS dernier_article_id,
+                    MAX(COALESCE((SELECT MAX(scraped_at) FROM facebook_posts WHERE media_id = :media_id), ''),
+                        COALESCE((SELECT MAX(scraped_at) FROM twitter_tweets WHERE media_id = :media_id), ''))
+                        AS derniere_collecte
+            """, period)
+            current = cursor.fetchone()
+            
+            web_changed = snapshot is None or current['dernier_article_id'] > (snapshot['dernier_article_id'] or 0)
+            social_changed = snapshot is None or current['derniere_collecte'] > (snapshot['derniere_collecte'] or '')
+            
+            if not web_changed and not social_changed:
+                return self._metrics_from_snapshot(snapshot)
+            
+            metrics = {column: snapshot[column] for column in MEDIA_METRICS_COLUMNS} if snapshot else {}
+            dernier_article_id = snapshot['dernier_article_id'] if snapshot else 0
+            derniere_collecte = snapshot['derniere_collecte'] if snapshot else None
+            
+            # Chaque lecture lit ses sommes et son filigrane dans la même requête
+            if snapshot is None:
+                cursor.execute("""
+                    SELECT
+                        COALESCE(SUM(publications), 0) AS total_articles,
+                        COALESCE((SELECT MAX(id) FROM articles WHERE media_id = :media_id), 0) AS dernier_article_id
+                    FROM media_daily_stats
+                    WHERE media_id = :media_id AND plateforme = 'web' AND jour BETWEEN :debut AND :fin
+                """, period)
+                web = cursor.fetchone()
+                metrics['total_articles'] = web['total_articles']
+                dernier_article_id = web['dernier_article_id']
+            elif web_changed:
+                cursor.execute("""
+                    SELECT
+                        COALESCE(SUM(DATE(date_publication) BETWEEN :debut AND :fin), 0) AS nouveaux,
+                        MAX(id) AS dernier_article_id
+                    FROM articles
+                    WHERE media_id = :media_id AND id > :dernier_article_id
+                """, {**period, 'dernier_article_id': dernier_article_id})
+                web = cursor.fetchone()
+                if web['dernier_article_id'] is not None:
+                    metrics['total_articles'] += web['nouveaux']
+                    dernier_article_id = web['dernier_article_id']
+            
+            if social_changed:
+                cursor.execute("""
+                    SELECT
+                        COALESCE(SUM(CASE WHEN plateforme = 'facebook' THEN publications END), 0) AS total_posts_facebook,
+                        COALESCE(SUM(CASE WHEN plateforme = 'facebook' THEN likes END), 0) AS total_likes_fb,
+                        COALESCE(SUM(CASE WHEN plateforme = 'facebook' THEN comments END), 0) AS total_comments_fb,
+                        COALESCE(SUM(CASE WHEN plateforme = 'facebook' THEN shares END), 0) AS total_shares_fb,
+                        COALESCE(SUM(CASE WHEN plateforme = 'facebook' THEN engagement_total END), 0) AS engagement_total_fb,
+                        COALESCE(SUM(CASE WHEN plateforme = 'twitter' THEN publications END), 0) AS total_tweets,
+                        COALESCE(SUM(CASE WHEN plateforme = 'twitter' THEN retweets END), 0) AS total_retweets,
+                        COALESCE(SUM(CASE WHEN plateforme = 'twitter' THEN replies END), 0) AS total_replies,
+                        COALESCE(SUM(CASE WHEN plateforme = 'twitter' THEN likes END), 0) AS total_likes_tw,
+                        COALESCE(SUM(CASE WHEN plateforme = 'twitter' THEN quotes END), 0) AS total_quotes,
+                        COALESCE(SUM(CASE WHEN plateforme = 'twitter' THEN impressions END), 0) AS total_impressions,
+                        COALESCE(SUM(CASE WHEN plateforme = 'twitter' THEN engagement_total END), 0) AS engagement_total_tw,
+                        MAX(COALESCE((SELECT MAX(scraped_at) FROM facebook_posts WHERE media_id = :media_id), ''),
+                            COALESCE((SELECT MAX(scraped_at) FROM twitter_tweets WHERE media_id = :media_id), ''))
+                            AS derniere_collecte,
+                        datetime('now', '-1 second') AS seconde_precedente
+                    FROM media_daily_stats
+                    WHERE media_id = :media_id AND plateforme IN ('facebook', 'twitter')
+                      AND jour BETWEEN :debut AND :fin
+                """, period)
+                social = dict(cursor.fetchone())
+                
+                # scraped_at est à la seconde : une collecte de la seconde en cours
+                # pourrait suivre cette lecture, elle reste donc au-delà du filigrane
+                derniere_collecte = min(social.pop('derniere_collecte'), social.pop('seconde_precedente'))
+                metrics.update(social)
+            
+            metrics['engagement_total'] = metrics['engagement_total_fb'] + metrics['engagement_total_tw']
+            publications = metrics['total_posts_facebook'] + metrics['total_tweets']
+            metrics['engagement_moyen'] = round(metrics['engagement_total'] / publications, 2) if publications else 0
+            
+            columns = ', '.join(MEDIA_METRICS_COLUMNS)
+            placeholders = ', '.join(f":{column}" for column in MEDIA_METRICS_COLUMNS)
+            updates = ', '.join(f"{column} = excluded.{column}" for column in MEDIA_METRICS_COLUMNS)
+            cursor.execute(f"""
+                INSERT INTO media_metrics (
+                    media_id, periode_debut, periode_fin, {columns},
+                    dernier_article_id, derniere_collecte, updated_at
+                ) VALUES (
+                    :media_id, :debut, :fin, {placeholders},
+                    :dernier_article_id, :derniere_collecte, CURRENT_TIMESTAMP
+                )
+                ON CONFLICT(media_id, periode_debut, periode_fin) DO UPDATE SET
+                    {updates},
+                    dernier_article_id = excluded.dernier_article_id,
+                    derniere_collecte = excluded.derniere_collecte,
+                    updated_at = excluded.updated_at
+            """, {**period, **metrics, 'dernier_article_id': dernier_article_id,
+                  'derniere_collecte': derniere_collecte})
+            
+            return {'media_id': media_id, 'periode_debut': periode_debut, 'periode_fin': periode_fin, **metrics}
+    
+    @staticmethod
+    def _metrics_from_snapshot(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Métriques d'une ligne media_metrics (sans les filigranes)"""
+        return {
+            'media_id': snapshot['media_id'],
+            'periode_debut': snapshot['periode_debut'],
+            'periode_fin': snapshot['periode_fin'],
+            **{column: snapshot[column] for column in MEDIA_METRICS_COLUMNS}
+        }
+    
+    def refresh_all_media_metrics(self, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Mettre à jour les snapshots de tous les médias actifs (une transaction)
+        
+        Args:
+            days: Nombre de jours de la période
+        
+        Returns:
+            Métriques de chaque média
+        """
+        with self.connection():
+            return [self.refresh_media_metrics(media.id, days) for media in self.get_all_medias(actif_only=True)]
+    
+    def get_media_metrics_history(self, media_id: int, days: int = 30) -> List[Dict[str, Any]]:
+        """
+        Historique des snapshots d'un média pour une durée de période
+        
+        Args:
+            media_id: ID du média
+            days: Nombre de jours des périodes
+        
+        Returns:
+            Snapshots du plus récent au plus ancien
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("""
+                SELECT * FROM media_metrics
+                WHERE media_id = ?
+                  AND CAST(ROUND(julianday(periode_fin) - julianday(periode_debut)) AS INTEGER) = ?
+                ORDER BY periode_fin DESC
+            """, (media_id, days))
+            return [self._metrics_from_snapshot(dict(row)) for row in cursor.fetchall()]
+    
+    def compact_media_metrics(self, keep_days: int = MEDIA_METRICS_KEEP_DAYS,
+                              max_age_days: int = MEDIA_METRICS_MAX_AGE_DAYS) -> int:
+        """
+        Politique de rétention des snapshots media_metrics :
+        - période terminée dans les keep_days derniers jours : tous conservés
+        - plus ancienne : un seul par média, durée de période et mois (le dernier du mois)
+        - plus ancienne que max_age_days : supprimés
+        
+        Args:
+            keep_days: Nombre de jours pendant lesquels tous les snapshots sont conservés
+            max_age_days: Âge maximum d'un snapshot (jours)
+        
+        Returns:
+            Nombre de snapshots supprimés
+        """
+        now = datetime.now()
+        keep_limit = (now - timedelta(days=keep_days)).date().isoformat()
+        age_limit = (now - timedelta(days=max_age_days)).date().isoformat()
+        
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM media_metrics WHERE periode_fin < ?", (age_limit,))
+            deleted = cursor.rowcount
+            
+            cursor.execute("""
+                DELETE FROM media_metrics WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, ROW_NUMBER() OVER (
+                            PARTITION BY media_id,
+                                CAST(ROUND(julianday(periode_fin) - julianday(periode_debut)) AS INTEGER),
+                                strftime('%Y-%m', periode_fin)
+                            ORDER BY periode_fin DESC, id DESC
+                        ) AS rang
+                        FROM media_metrics
+                        WHERE periode_fin < ?
+                    )
+                    WHERE rang > 1
+                )
+            """, (keep_limit,))
+            return deleted + cursor.rowcount
+    
+    # ==================== VERSION DES DONNÉES ====================
+    
+    def get_data_version(self) -> int:
+        """
+        Version courante des données (médias, articles, classifications, posts, tweets)
+        Incrémentée par les triggers de schema.sql à chaque écriture ;
+        sert de clé d'invalidation aux caches de réponses de l'API.
+        
+        Returns:
+            Numéro de version
+        """
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("SELECT version FROM data_version WHERE id = 1")
+            row = cursor.fetchone()
+            return row['version'] if row else 0
+
     # ==================== UTILITAIRES ====================
     
     def vacuum(self):
         """Optimise la base de données"""
-        conn = self.get_connection()
-        try:
+        with self.connection() as conn:
             conn.execute("VACUUM")
-            conn.commit()
-        finally:
-            conn.close()
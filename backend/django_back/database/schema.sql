@@ -10,6 +10,12 @@ CREATE TABLE IF NOT EXISTS medias (
     twitter_account TEXT,  -- Nom du compte Twitter (sans @)
     actif BOOLEAN DEFAULT 1,
     derniere_collecte TIMESTAMP,
+    rss_feed_url TEXT,  -- Flux RSS détecté ('' = aucun flux, NULL = inconnu)
+    rss_checked_at TIMESTAMP,  -- Date de la dernière détection du flux
+    wp_api_url TEXT,  -- API REST WordPress détectée ('' = aucune, NULL = inconnue)
+    wp_api_checked_at TIMESTAMP,  -- Date de la dernière détection de l'API
+    sitemap_url TEXT,  -- Sitemap détecté ('' = aucun, NULL = inconnu)
+    sitemap_checked_at TIMESTAMP,  -- Date de la dernière détection du sitemap
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -28,7 +34,7 @@ CREATE TABLE IF NOT EXISTS articles (
     tags TEXT,  -- JSON array
     
     -- Métadonnées de scraping
-    source_type TEXT NOT NULL,  -- wordpress_api, html_scraping
+    source_type TEXT NOT NULL,  -- wordpress_api, rss_feed, html_scraping
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     -- Engagement
@@ -45,7 +51,7 @@ CREATE TABLE IF NOT EXISTS scraping_logs (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     media_id INTEGER,
     status TEXT NOT NULL,  -- success, error, partial
-    methode TEXT,  -- wordpress_api, html_scraping
+    methode TEXT,  -- wordpress_api, rss_feed, html_scraping
     articles_collectes INTEGER DEFAULT 0,
     message TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -152,7 +158,12 @@ CREATE TABLE IF NOT EXISTS media_metrics (
     score_engagement REAL DEFAULT 0,  -- Basé sur interactions sociales
     score_influence REAL DEFAULT 0,  -- Score composite final
     
+    -- Filigranes du snapshot (mise à jour incrémentale, voir refresh_media_metrics)
+    dernier_article_id INTEGER DEFAULT 0,  -- Dernier article compté
+    derniere_collecte TIMESTAMP,  -- scraped_at des posts/tweets déjà comptés
+    
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP,
     
     FOREIGN KEY (media_id) REFERENCES medias(id) ON DELETE CASCADE
 );
@@ -160,22 +171,29 @@ CREATE TABLE IF NOT EXISTS media_metrics (
 -- Index pour améliorer les performances
 CREATE INDEX IF NOT EXISTS idx_articles_media ON articles(media_id);
 CREATE INDEX IF NOT EXISTS idx_articles_date ON articles(date_publication);
-CREATE INDEX IF NOT EXISTS idx_articles_url ON articles(url);
 CREATE INDEX IF NOT EXISTS idx_articles_scraped ON articles(scraped_at);
-CREATE INDEX IF NOT EXISTS idx_medias_url ON medias(url);
 CREATE INDEX IF NOT EXISTS idx_logs_media ON scraping_logs(media_id);
 CREATE INDEX IF NOT EXISTS idx_logs_date ON scraping_logs(created_at);
-CREATE INDEX IF NOT EXISTS idx_classifications_article ON classifications(article_id);
-CREATE INDEX IF NOT EXISTS idx_classifications_categorie ON classifications(categorie);
+-- Articles d'une catégorie (get_articles_by_category) et statistiques par catégorie, sans lire la table
+CREATE INDEX IF NOT EXISTS idx_classifications_categorie_article ON classifications(categorie, article_id, confiance);
 CREATE INDEX IF NOT EXISTS idx_entites_article ON entites(article_id);
 CREATE INDEX IF NOT EXISTS idx_entites_type ON entites(type);
-CREATE INDEX IF NOT EXISTS idx_facebook_posts_media ON facebook_posts(media_id);
 CREATE INDEX IF NOT EXISTS idx_facebook_posts_date ON facebook_posts(date_publication);
-CREATE INDEX IF NOT EXISTS idx_twitter_tweets_media ON twitter_tweets(media_id);
 CREATE INDEX IF NOT EXISTS idx_twitter_tweets_date ON twitter_tweets(date_publication);
-CREATE INDEX IF NOT EXISTS idx_media_metrics_media ON media_metrics(media_id);
 CREATE INDEX IF NOT EXISTS idx_media_metrics_periode ON media_metrics(periode_debut, periode_fin);
 
+-- Un snapshot de métriques par (média, période), mis à jour sur place
+CREATE UNIQUE INDEX IF NOT EXISTS idx_media_metrics_snapshot ON media_metrics(media_id, periode_debut, periode_fin);
+
+-- Posts et tweets collectés depuis le dernier snapshot d'un média
+CREATE INDEX IF NOT EXISTS idx_facebook_posts_media_scraped ON facebook_posts(media_id, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_twitter_tweets_media_scraped ON twitter_tweets(media_id, scraped_at);
+
+-- Pagination par curseur des listes d'un média (media_id, date_publication DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_articles_media_date ON articles(media_id, date_publication);
+CREATE INDEX IF NOT EXISTS idx_facebook_posts_media_date ON facebook_posts(media_id, date_publication);
+CREATE INDEX IF NOT EXISTS idx_twitter_tweets_media_date ON twitter_tweets(media_id, date_publication);
+
 -- ==================== TABLE: CONTENT_MODERATION ====================
 -- Stocke les analyses de modération de contenu (détection de toxicité, fake news, etc.)
 CREATE TABLE IF NOT EXISTS content_moderation (
@@ -225,11 +243,9 @@ CREATE TABLE IF NOT EXISTS content_moderation (
     UNIQUE(content_type, content_id)
 );
 
-CREATE INDEX IF NOT EXISTS idx_moderation_content ON content_moderation(content_type, content_id);
-CREATE INDEX IF NOT EXISTS idx_moderation_risk ON content_moderation(risk_score DESC);
-CREATE INDEX IF NOT EXISTS idx_moderation_flag ON content_moderation(should_flag);
-CREATE INDEX IF NOT EXISTS idx_moderation_toxic ON content_moderation(is_toxic);
-CREATE INDEX IF NOT EXISTS idx_moderation_misinfo ON content_moderation(is_misinformation);
+-- Pagination par curseur des contenus signalés (risk_score DESC, id DESC)
+CREATE INDEX IF NOT EXISTS idx_moderation_flagged ON content_moderation(should_flag, risk_score);
+CREATE INDEX IF NOT EXISTS idx_moderation_flagged_type ON content_moderation(content_type, should_flag, risk_score);
 
 -- ==================== TABLE: SCRAPING_SCHEDULE ====================
 -- Configuration de l'automatisation du scraping
@@ -251,16 +267,413 @@ CREATE TABLE IF NOT EXISTS scraping_schedule (
 CREATE TABLE IF NOT EXISTS scraping_tasks (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     type TEXT NOT NULL,  -- 'manual', 'scheduled'
-    status TEXT NOT NULL,  -- 'running', 'completed', 'failed'
+    status TEXT NOT NULL,  -- 'queued', 'running', 'completed', 'failed'
     started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     completed_at TIMESTAMP,
     total_articles INTEGER DEFAULT 0,
     total_fb_posts INTEGER DEFAULT 0,
     total_tweets INTEGER DEFAULT 0,
     error_message TEXT,
-    parameters TEXT  -- JSON des paramètres utilisés
+    parameters TEXT,  -- JSON des paramètres utilisés
+    sites_total INTEGER DEFAULT 0,  -- Progression : médias à traiter
+    sites_done INTEGER DEFAULT 0,  -- Progression : médias terminés
+    current_media TEXT,  -- Progression : dernier média traité
+    updated_at TIMESTAMP  -- Dernière mise à jour de la progression
 );
 
 CREATE INDEX IF NOT EXISTS idx_scraping_tasks_status ON scraping_tasks(status);
 CREATE INDEX IF NOT EXISTS idx_scraping_tasks_type ON scraping_tasks(type);
 CREATE INDEX IF NOT EXISTS idx_scraping_tasks_started ON scraping_tasks(started_at DESC);
+
+-- ==================== TABLE: HTTP_CACHE ====================
+-- Validateurs HTTP par URL (requêtes conditionnelles If-None-Match / If-Modified-Since)
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,  -- En-tête ETag de la dernière réponse 200
+    last_modified TEXT,  -- En-tête Last-Modified de la dernière réponse 200
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ==================== TABLE: SITE_TEMPLATES ====================
+-- Modèles d'extraction appris par domaine : sélecteur qui a fonctionné pour chaque champ
+-- (requêté directement sur les pages suivantes, recherche générique s'il ne correspond plus)
+CREATE TABLE IF NOT EXISTS site_templates (
+    domaine TEXT PRIMARY KEY,  -- Domaine du site (ex: www.aib.media)
+    selecteur_titre TEXT,
+    selecteur_date TEXT,
+    selecteur_contenu TEXT,
+    selecteur_auteur TEXT,
+    selecteur_image TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ==================== TABLE: LLM_CACHE ====================
+-- Résultats des appels LLM (classification, modération) indexés par empreinte du texte
+CREATE TABLE IF NOT EXISTS llm_cache (
+    cache_key TEXT PRIMARY KEY,  -- sha256(namespace | modèle | version du prompt | texte normalisé)
+    namespace TEXT NOT NULL,  -- 'theme', 'moderation'
+    model TEXT NOT NULL,
+    result TEXT NOT NULL,  -- JSON du résultat
+    hits INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_used_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used_at);
+
+-- ==================== TABLE: JOB_QUEUE ====================
+-- File de travaux durable (classification, modération) alimentée par les scrapers
+CREATE TABLE IF NOT EXISTS job_queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_type TEXT NOT NULL,  -- 'classify_article', 'moderate_article'
+    object_id INTEGER NOT NULL,  -- ID de l'objet à traiter (article)
+    status TEXT DEFAULT 'pending',  -- pending, running, dead
+    attempts INTEGER DEFAULT 0,
+    max_attempts INTEGER DEFAULT 5,
+    available_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,  -- Pas de traitement avant cette date (backoff)
+    locked_until TIMESTAMP,  -- Fin du délai de visibilité d'un travail en cours
+    locked_by TEXT,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE(job_type, object_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_job_queue_claim ON job_queue(job_type, status, available_at);
+
+-- ==================== TABLE: DATA_VERSION ====================
+-- Compteur incrémenté (par triggers) à chaque écriture des données agrégées
+-- par l'API : les réponses mises en cache sont indexées sur cette version
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_medias_ins_version AFTER INSERT ON medias
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_medias_upd_version AFTER UPDATE ON medias
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_medias_del_version AFTER DELETE ON medias
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_ins_version AFTER INSERT ON articles
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_upd_version AFTER UPDATE ON articles
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_del_version AFTER DELETE ON articles
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_classifications_ins_version AFTER INSERT ON classifications
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_classifications_upd_version AFTER UPDATE ON classifications
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_classifications_del_version AFTER DELETE ON classifications
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facebook_posts_ins_version AFTER INSERT ON facebook_posts
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facebook_posts_upd_version AFTER UPDATE ON facebook_posts
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facebook_posts_del_version AFTER DELETE ON facebook_posts
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_twitter_tweets_ins_version AFTER INSERT ON twitter_tweets
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_twitter_tweets_upd_version AFTER UPDATE ON twitter_tweets
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_twitter_tweets_del_version AFTER DELETE ON twitter_tweets
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+END;
+
+-- ==================== TABLE: MEDIA_DAILY_STATS ====================
+-- Agrégat quotidien par média et par plateforme (web, facebook, twitter),
+-- tenu à jour par triggers à chaque écriture d'article, de post ou de tweet.
+-- Les analyses d'audience somment au plus (médias × jours) lignes.
+-- Reconstruction complète : rebuild_media_daily_stats() (migrate_db.py)
+CREATE TABLE IF NOT EXISTS media_daily_stats (
+    media_id INTEGER NOT NULL,
+    plateforme TEXT NOT NULL,  -- web, facebook, twitter
+    jour DATE NOT NULL,  -- DATE(date_publication)
+    publications INTEGER DEFAULT 0,
+    likes INTEGER DEFAULT 0,
+    comments INTEGER DEFAULT 0,
+    shares INTEGER DEFAULT 0,
+    retweets INTEGER DEFAULT 0,
+    replies INTEGER DEFAULT 0,
+    quotes INTEGER DEFAULT 0,
+    impressions INTEGER DEFAULT 0,
+    engagement_total INTEGER DEFAULT 0,
+    premiere_publication TIMESTAMP,
+    derniere_publication TIMESTAMP,
+    PRIMARY KEY (media_id, plateforme, jour)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_media_daily_stats_jour ON media_daily_stats(plateforme, jour);
+
+-- articles -> media_daily_stats ('web')
+CREATE TRIGGER IF NOT EXISTS trg_articles_ins_daily AFTER INSERT ON articles
+BEGIN
+    INSERT INTO media_daily_stats (media_id, plateforme, jour, publications, premiere_publication, derniere_publication)
+    SELECT NEW.media_id, 'web', DATE(NEW.date_publication), 1, NEW.date_publication, NEW.date_publication
+    WHERE NEW.date_publication IS NOT NULL
+    ON CONFLICT (media_id, plateforme, jour) DO UPDATE SET
+        publications = publications + 1,
+        premiere_publication = MIN(COALESCE(premiere_publication, excluded.premiere_publication), excluded.premiere_publication),
+        derniere_publication = MAX(COALESCE(derniere_publication, excluded.derniere_publication), excluded.derniere_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_del_daily AFTER DELETE ON articles
+WHEN OLD.date_publication IS NOT NULL
+BEGIN
+    UPDATE media_daily_stats SET
+        publications = publications - 1,
+        premiere_publication = (SELECT MIN(date_publication) FROM articles WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication)),
+        derniere_publication = (SELECT MAX(date_publication) FROM articles WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication))
+    WHERE media_id = OLD.media_id AND plateforme = 'web' AND jour = DATE(OLD.date_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_articles_move_daily AFTER UPDATE OF media_id, date_publication ON articles
+WHEN OLD.media_id IS NOT NEW.media_id OR OLD.date_publication IS NOT NEW.date_publication
+BEGIN
+    UPDATE media_daily_stats SET
+        publications = publications - 1,
+        premiere_publication = (SELECT MIN(date_publication) FROM articles WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication)),
+        derniere_publication = (SELECT MAX(date_publication) FROM articles WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication))
+    WHERE media_id = OLD.media_id AND plateforme = 'web' AND jour = DATE(OLD.date_publication)
+        AND OLD.date_publication IS NOT NULL;
+    INSERT INTO media_daily_stats (media_id, plateforme, jour, publications, premiere_publication, derniere_publication)
+    SELECT NEW.media_id, 'web', DATE(NEW.date_publication), 1, NEW.date_publication, NEW.date_publication
+    WHERE NEW.date_publication IS NOT NULL
+    ON CONFLICT (media_id, plateforme, jour) DO UPDATE SET
+        publications = publications + 1,
+        premiere_publication = MIN(COALESCE(premiere_publication, excluded.premiere_publication), excluded.premiere_publication),
+        derniere_publication = MAX(COALESCE(derniere_publication, excluded.derniere_publication), excluded.derniere_publication);
+END;
+
+-- facebook_posts -> media_daily_stats ('facebook')
+CREATE TRIGGER IF NOT EXISTS trg_facebook_posts_ins_daily AFTER INSERT ON facebook_posts
+BEGIN
+    INSERT INTO media_daily_stats (media_id, plateforme, jour, publications, likes, comments, shares, engagement_total, premiere_publication, derniere_publication)
+    SELECT NEW.media_id, 'facebook', DATE(NEW.date_publication), 1, COALESCE(NEW.likes, 0), COALESCE(NEW.comments, 0), COALESCE(NEW.shares, 0), COALESCE(NEW.engagement_total, 0), NEW.date_publication, NEW.date_publication
+    WHERE NEW.date_publication IS NOT NULL
+    ON CONFLICT (media_id, plateforme, jour) DO UPDATE SET
+        publications = publications + 1,
+        likes = likes + excluded.likes,
+        comments = comments + excluded.comments,
+        shares = shares + excluded.shares,
+        engagement_total = engagement_total + excluded.engagement_total,
+        premiere_publication = MIN(COALESCE(premiere_publication, excluded.premiere_publication), excluded.premiere_publication),
+        derniere_publication = MAX(COALESCE(derniere_publication, excluded.derniere_publication), excluded.derniere_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facebook_posts_del_daily AFTER DELETE ON facebook_posts
+WHEN OLD.date_publication IS NOT NULL
+BEGIN
+    UPDATE media_daily_stats SET
+        publications = publications - 1,
+        likes = likes - COALESCE(OLD.likes, 0),
+        comments = comments - COALESCE(OLD.comments, 0),
+        shares = shares - COALESCE(OLD.shares, 0),
+        engagement_total = engagement_total - COALESCE(OLD.engagement_total, 0),
+        premiere_publication = (SELECT MIN(date_publication) FROM facebook_posts WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication)),
+        derniere_publication = (SELECT MAX(date_publication) FROM facebook_posts WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication))
+    WHERE media_id = OLD.media_id AND plateforme = 'facebook' AND jour = DATE(OLD.date_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facebook_posts_move_daily AFTER UPDATE OF media_id, date_publication ON facebook_posts
+WHEN OLD.media_id IS NOT NEW.media_id OR OLD.date_publication IS NOT NEW.date_publication
+BEGIN
+    UPDATE media_daily_stats SET
+        publications = publications - 1,
+        likes = likes - COALESCE(OLD.likes, 0),
+        comments = comments - COALESCE(OLD.comments, 0),
+        shares = shares - COALESCE(OLD.shares, 0),
+        engagement_total = engagement_total - COALESCE(OLD.engagement_total, 0),
+        premiere_publication = (SELECT MIN(date_publication) FROM facebook_posts WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication)),
+        derniere_publication = (SELECT MAX(date_publication) FROM facebook_posts WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication))
+    WHERE media_id = OLD.media_id AND plateforme = 'facebook' AND jour = DATE(OLD.date_publication)
+        AND OLD.date_publication IS NOT NULL;
+    INSERT INTO media_daily_stats (media_id, plateforme, jour, publications, likes, comments, shares, engagement_total, premiere_publication, derniere_publication)
+    SELECT NEW.media_id, 'facebook', DATE(NEW.date_publication), 1, COALESCE(NEW.likes, 0), COALESCE(NEW.comments, 0), COALESCE(NEW.shares, 0), COALESCE(NEW.engagement_total, 0), NEW.date_publication, NEW.date_publication
+    WHERE NEW.date_publication IS NOT NULL
+    ON CONFLICT (media_id, plateforme, jour) DO UPDATE SET
+        publications = publications + 1,
+        likes = likes + excluded.likes,
+        comments = comments + excluded.comments,
+        shares = shares + excluded.shares,
+        engagement_total = engagement_total + excluded.engagement_total,
+        premiere_publication = MIN(COALESCE(premiere_publication, excluded.premiere_publication), excluded.premiere_publication),
+        derniere_publication = MAX(COALESCE(derniere_publication, excluded.derniere_publication), excluded.derniere_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_facebook_posts_upd_daily AFTER UPDATE OF likes, comments, shares, engagement_total ON facebook_posts
+WHEN OLD.media_id IS NEW.media_id AND OLD.date_publication IS NEW.date_publication
+    AND NEW.date_publication IS NOT NULL
+BEGIN
+    UPDATE media_daily_stats SET
+        likes = likes + COALESCE(NEW.likes, 0) - COALESCE(OLD.likes, 0),
+        comments = comments + COALESCE(NEW.comments, 0) - COALESCE(OLD.comments, 0),
+        shares = shares + COALESCE(NEW.shares, 0) - COALESCE(OLD.shares, 0),
+        engagement_total = engagement_total + COALESCE(NEW.engagement_total, 0) - COALESCE(OLD.engagement_total, 0)
+    WHERE media_id = NEW.media_id AND plateforme = 'facebook' AND jour = DATE(NEW.date_publication);
+END;
+
+-- twitter_tweets -> media_daily_stats ('twitter')
+CREATE TRIGGER IF NOT EXISTS trg_twitter_tweets_ins_daily AFTER INSERT ON twitter_tweets
+BEGIN
+    INSERT INTO media_daily_stats (media_id, plateforme, jour, publications, retweets, replies, likes, quotes, impressions, engagement_total, premiere_publication, derniere_publication)
+    SELECT NEW.media_id, 'twitter', DATE(NEW.date_publication), 1, COALESCE(NEW.retweets, 0), COALESCE(NEW.replies, 0), COALESCE(NEW.likes, 0), COALESCE(NEW.quotes, 0), COALESCE(NEW.impressions, 0), COALESCE(NEW.engagement_total, 0), NEW.date_publication, NEW.date_publication
+    WHERE NEW.date_publication IS NOT NULL
+    ON CONFLICT (media_id, plateforme, jour) DO UPDATE SET
+        publications = publications + 1,
+        retweets = retweets + excluded.retweets,
+        replies = replies + excluded.replies,
+        likes = likes + excluded.likes,
+        quotes = quotes + excluded.quotes,
+        impressions = impressions + excluded.impressions,
+        engagement_total = engagement_total + excluded.engagement_total,
+        premiere_publication = MIN(COALESCE(premiere_publication, excluded.premiere_publication), excluded.premiere_publication),
+        derniere_publication = MAX(COALESCE(derniere_publication, excluded.derniere_publication), excluded.derniere_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_twitter_tweets_del_daily AFTER DELETE ON twitter_tweets
+WHEN OLD.date_publication IS NOT NULL
+BEGIN
+    UPDATE media_daily_stats SET
+        publications = publications - 1,
+        retweets = retweets - COALESCE(OLD.retweets, 0),
+        replies = replies - COALESCE(OLD.replies, 0),
+        likes = likes - COALESCE(OLD.likes, 0),
+        quotes = quotes - COALESCE(OLD.quotes, 0),
+        impressions = impressions - COALESCE(OLD.impressions, 0),
+        engagement_total = engagement_total - COALESCE(OLD.engagement_total, 0),
+        premiere_publication = (SELECT MIN(date_publication) FROM twitter_tweets WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication)),
+        derniere_publication = (SELECT MAX(date_publication) FROM twitter_tweets WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication))
+    WHERE media_id = OLD.media_id AND plateforme = 'twitter' AND jour = DATE(OLD.date_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_twitter_tweets_move_daily AFTER UPDATE OF media_id, date_publication ON twitter_tweets
+WHEN OLD.media_id IS NOT NEW.media_id OR OLD.date_publication IS NOT NEW.date_publication
+BEGIN
+    UPDATE media_daily_stats SET
+        publications = publications - 1,
+        retweets = retweets - COALESCE(OLD.retweets, 0),
+        replies = replies - COALESCE(OLD.replies, 0),
+        likes = likes - COALESCE(OLD.likes, 0),
+        quotes = quotes - COALESCE(OLD.quotes, 0),
+        impressions = impressions - COALESCE(OLD.impressions, 0),
+        engagement_total = engagement_total - COALESCE(OLD.engagement_total, 0),
+        premiere_publication = (SELECT MIN(date_publication) FROM twitter_tweets WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication)),
+        derniere_publication = (SELECT MAX(date_publication) FROM twitter_tweets WHERE media_id = OLD.media_id
+            AND date_publication >= DATE(OLD.date_publication, '-1 day')
+            AND date_publication < DATE(OLD.date_publication, '+2 day')
+            AND DATE(date_publication) = DATE(OLD.date_publication))
+    WHERE media_id = OLD.media_id AND plateforme = 'twitter' AND jour = DATE(OLD.date_publication)
+        AND OLD.date_publication IS NOT NULL;
+    INSERT INTO media_daily_stats (media_id, plateforme, jour, publications, retweets, replies, likes, quotes, impressions, engagement_total, premiere_publication, derniere_publication)
+    SELECT NEW.media_id, 'twitter', DATE(NEW.date_publication), 1, COALESCE(NEW.retweets, 0), COALESCE(NEW.replies, 0), COALESCE(NEW.likes, 0), COALESCE(NEW.quotes, 0), COALESCE(NEW.impressions, 0), COALESCE(NEW.engagement_total, 0), NEW.date_publication, NEW.date_publication
+    WHERE NEW.date_publication IS NOT NULL
+    ON CONFLICT (media_id, plateforme, jour) DO UPDATE SET
+        publications = publications + 1,
+        retweets = retweets + excluded.retweets,
+        replies = replies + excluded.replies,
+        likes = likes + excluded.likes,
+        quotes = quotes + excluded.quotes,
+        impressions = impressions + excluded.impressions,
+        engagement_total = engagement_total + excluded.engagement_total,
+        premiere_publication = MIN(COALESCE(premiere_publication, excluded.premiere_publication), excluded.premiere_publication),
+        derniere_publication = MAX(COALESCE(derniere_publication, excluded.derniere_publication), excluded.derniere_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_twitter_tweets_upd_daily AFTER UPDATE OF retweets, replies, likes, quotes, impressions, engagement_total ON twitter_tweets
+WHEN OLD.media_id IS NEW.media_id AND OLD.date_publication IS NEW.date_publication
+    AND NEW.date_publication IS NOT NULL
+BEGIN
+    UPDATE media_daily_stats SET
+        retweets = retweets + COALESCE(NEW.retweets, 0) - COALESCE(OLD.retweets, 0),
+        replies = replies + COALESCE(NEW.replies, 0) - COALESCE(OLD.replies, 0),
+        likes = likes + COALESCE(NEW.likes, 0) - COALESCE(OLD.likes, 0),
+        quotes = quotes + COALESCE(NEW.quotes, 0) - COALESCE(OLD.quotes, 0),
+        impressions = impressions + COALESCE(NEW.impressions, 0) - COALESCE(OLD.impressions, 0),
+        engagement_total = engagement_total + COALESCE(NEW.engagement_total, 0) - COALESCE(OLD.engagement_total, 0)
+    WHERE media_id = NEW.media_id AND plateforme = 'twitter' AND jour = DATE(NEW.date_publication);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_medias_del_daily AFTER DELETE ON medias
+BEGIN
+    DELETE FROM media_daily_stats WHERE media_id = OLD.id;
+END;
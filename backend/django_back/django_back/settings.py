@@ -142,10 +142,26 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Taille maximum d'une page des listes (?limit=, pagination par curseur)
+API_MAX_PAGE_SIZE = 500
+
+# Cache des réponses d'agrégation (api/cache.py), invalidé par la version des données
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'media-scan-api',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    }
+}
+API_CACHE_TIMEOUT = 5 * 60  # Durée de vie maximum d'une réponse en cache (secondes)
+
 # CORS Configuration
 CORS_ALLOW_ALL_ORIGINS = True  # Pour le développement
 CORS_ALLOW_CREDENTIALS = True
 
+# En-têtes de pagination et de cache lisibles par le frontend
+CORS_EXPOSE_HEADERS = ['X-Next-Cursor', 'Link', 'ETag']
+
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:8080",
 ]
@@ -159,3 +175,8 @@ SWAGGER_SETTINGS = {
     },
     'USE_SESSION_AUTH': False,
 }
+
+# Tâches de scraping lancées depuis l'API (api/task_runner.py)
+SCRAPING_MAX_CONCURRENT_TASKS = 1  # Scrapings exécutés simultanément
+SCRAPING_MAX_PENDING_TASKS = 3  # Tâches en file ou en cours (au-delà : HTTP 429)
+SCRAPING_TASK_TIMEOUT = 4 * 3600  # Durée maximum d'un scraping (secondes)
@@ -1,54 +1,79 @@
 #!/usr/bin/env python3
 """
-Script de migration pour ajouter les colonnes manquantes à la table content_moderation
+Script de migration pour ajouter les colonnes manquantes aux tables existantes
+(content_moderation, medias...), reconstruire l'agrégat media_daily_stats,
+dédoublonner les snapshots media_metrics et appliquer le plan d'index
 """
 
 import sqlite3
 import os
 
+from database.db_manager import (
+    COLUMN_MIGRATIONS, apply_column_migrations, rebuild_media_daily_stats, dedupe_media_metrics,
+    apply_index_plan
+)
+
 def migrate_database():
-    """Ajoute les colonnes manquantes à la table content_moderation"""
+    """Ajoute les colonnes manquantes aux tables existantes"""
     db_path = 'data/media_scan.db'
-    
+
     if not os.path.exists(db_path):
         print(f"❌ Base de données non trouvée: {db_path}")
         return
-    
+
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+
     try:
-        # Vérifier si les colonnes existent déjà
-        cursor.execute("PRAGMA table_info(content_moderation)")
-        columns = [row[1] for row in cursor.fetchall()]
-        
-        print(f"📊 Colonnes actuelles: {columns}")
-        
+        # Vérifier les colonnes existantes
+        existing = {}
+        for table in sorted({table for table, _, _ in COLUMN_MIGRATIONS}):
+            existing[table] = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+            print(f"📊 Colonnes actuelles ({table}): {existing[table]}")
+
         # Ajouter les colonnes manquantes
-        columns_to_add = [
-            ("toxicity_details", "TEXT"),
-            ("misinformation_details", "TEXT"),
-            ("sensitivity_details", "TEXT"),
-            ("primary_issue", "TEXT DEFAULT 'none'")
-        ]
-        
-        for col_name, col_type in columns_to_add:
-            if col_name not in columns:
-                try:
-                    cursor.execute(f"ALTER TABLE content_moderation ADD COLUMN {col_name} {col_type}")
-                    print(f"✅ Colonne '{col_name}' ajoutée")
-                except sqlite3.OperationalError as e:
-                    print(f"⚠️ Erreur lors de l'ajout de '{col_name}': {e}")
+        added = apply_column_migrations(conn)
+
+        for table, col_name, _ in COLUMN_MIGRATIONS:
+            if f"{table}.{col_name}" in added:
+                print(f"✅ Colonne '{table}.{col_name}' ajoutée")
+            elif not existing[table]:
+                print(f"⚠️ Table '{table}' absente (créée au prochain démarrage)")
             else:
-                print(f"ℹ️ Colonne '{col_name}' existe déjà")
-        
+                print(f"ℹ️ Colonne '{table}.{col_name}' existe déjà")
+
+        # Reconstruire l'agrégat quotidien des analyses d'audience
+        if conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'media_daily_stats'"
+        ).fetchone():
+            rows = rebuild_media_daily_stats(conn)
+            print(f"✅ Agrégat 'media_daily_stats' reconstruit ({rows} lignes)")
+        else:
+            print("⚠️ Table 'media_daily_stats' absente (créée et remplie au prochain démarrage)")
+
+        # Un seul snapshot par (média, période) avant l'index unique
+        if existing.get('media_metrics'):
+            removed = dedupe_media_metrics(conn)
+            print(f"✅ Snapshots 'media_metrics' dédoublonnés ({removed} supprimés)")
+
+        # Index de schema.sql (requêtes de DatabaseManager), suppression des index redondants
+        created, dropped = apply_index_plan(conn)
+        for name in created:
+            print(f"✅ Index '{name}' créé")
+        for name in dropped:
+            print(f"🗑️ Index '{name}' supprimé (redondant ou inutilisé)")
+        if not created and not dropped:
+            print("ℹ️ Plan d'index déjà appliqué")
+
+        # Statistiques du planificateur pour les nouveaux index
+        conn.execute("ANALYZE")
         conn.commit()
+
         print("\n✅ Migration terminée avec succès!")
-        
+
     except Exception as e:
         print(f"❌ Erreur lors de la migration: {e}")
         conn.rollback()
-    
+
     finally:
         conn.close()
 
@@ -6,6 +6,7 @@ Détecte: toxicité, fake news, discours sensibles
 import argparse
 from database.db_manager import DatabaseManager
 from analysis.content_moderator import ContentModerator
+from analysis.llm_cache import LLMCache
 
 
 def moderate_articles(db: DatabaseManager, moderator: ContentModerator, limit: int = 10):
@@ -258,12 +259,14 @@ def main():
     parser.add_argument('--show-flagged', action='store_true', help='Afficher les contenus signalés')
     parser.add_argument('--stats', action='store_true', help='Afficher les statistiques')
     parser.add_argument('--test', action='store_true', help='Tester la connexion à Ollama')
+    parser.add_argument('--no-cache', action='store_true', help='Ignorer le cache LLM (toujours interroger Ollama)')
     
     args = parser.parse_args()
     
     # Initialiser
     db = DatabaseManager()
-    moderator = ContentModerator()
+    cache = None if args.no_cache else LLMCache(db)
+    moderator = ContentModerator(cache=cache)
     
     print("🔧 Initialisation du modérateur de contenu...")
     
@@ -295,6 +298,9 @@ def main():
     if args.type in ['twitter', 'all']:
         moderate_tweets(db, moderator, args.media_id, args.limit)
     
+    if cache is not None:
+        print(f"\n{cache.summary()}")
+    
     # Afficher les statistiques finales
     print("\n" + "=" * 80)
     show_stats(db)
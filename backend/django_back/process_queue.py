@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Script consommateur de la file de travaux (classification, modération)
+Les scrapers mettent les nouveaux articles en file ; ce script les traite
+avec nouveaux essais, délai de visibilité et lettre morte
+"""
+
+import argparse
+from database.db_manager import DatabaseManager
+from analysis.theme_classifier import ThemeClassifier
+from analysis.content_moderator import ContentModerator
+from analysis.classification_pool import default_workers
+from analysis.llm_cache import LLMCache
+from analysis.queue_worker import QueueConsumer, JOB_CLASSIFY, JOB_MODERATE
+
+
+def show_queue_stats(db: DatabaseManager):
+    """Afficher l'état de la file"""
+    stats = db.get_job_queue_stats()
+
+    print("\n" + "="*60)
+    print("📬 FILE DE TRAVAUX")
+    print("="*60 + "\n")
+
+    if not stats:
+        print("✅ File vide")
+        return
+
+    for job_type, counts in sorted(stats.items()):
+        print(f"• {job_type}: {counts['pending']} en attente, "
+              f"{counts['running']} en cours, {counts['dead']} en lettre morte")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Traiter la file de classification / modération')
+    parser.add_argument('--type', choices=['classify', 'moderate', 'all'], default='classify',
+                       help='Travaux à traiter')
+    parser.add_argument('--drain', action='store_true',
+                       help='S\'arrêter quand la file est vide (sinon attendre de nouveaux travaux)')
+    parser.add_argument('--workers', type=int, default=default_workers(),
+                       help='Requêtes Ollama simultanées (défaut: OLLAMA_NUM_PARALLEL ou 4)')
+    parser.add_argument('--timeout', type=int, default=60,
+                       help='Timeout d\'une requête de classification (secondes)')
+    parser.add_argument('--batch-size', type=int, default=20,
+                       help='Nombre de travaux réservés à la fois')
+    parser.add_argument('--visibility-timeout', type=int, default=300,
+                       help='Délai (secondes) avant qu\'un travail non terminé redevienne disponible')
+    parser.add_argument('--enqueue-unclassified', type=int, metavar='N',
+                       help='Mettre en file les N articles non classifiés les plus récents')
+    parser.add_argument('--enqueue-moderation', type=int, metavar='DAYS',
+                       help='Mettre en file la modération des articles des DAYS derniers jours')
+    parser.add_argument('--requeue-dead', action='store_true',
+                       help='Remettre en file les travaux en lettre morte')
+    parser.add_argument('--stats', action='store_true',
+                       help='Afficher uniquement l\'état de la file')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignorer le cache LLM (toujours interroger Ollama)')
+
+    args = parser.parse_args()
+
+    print("🔧 Initialisation de la base de données...")
+    db = DatabaseManager()
+
+    if args.stats:
+        show_queue_stats(db)
+        return
+
+    if args.requeue_dead:
+        count = db.requeue_dead_jobs()
+        print(f"♻️ {count} travaux remis en file")
+
+    if args.enqueue_unclassified:
+        articles = db.get_unclassified_articles(args.enqueue_unclassified)
+        count = db.enqueue_jobs(JOB_CLASSIFY, [a['id'] for a in articles])
+        print(f"📥 {count} articles mis en file de classification")
+
+    if args.enqueue_moderation:
+        articles = db.get_recent_articles(days=args.enqueue_moderation, limit=10000)
+        ids = [a.id for a in articles if not db.get_content_moderation('article', a.id)]
+        count = db.enqueue_jobs(JOB_MODERATE, ids)
+        print(f"📥 {count} articles mis en file de modération")
+
+    cache = None if args.no_cache else LLMCache(db)
+
+    classifier = None
+    if args.type in ['classify', 'all']:
+        classifier = ThemeClassifier(timeout=args.timeout, cache=cache)
+        if not classifier.check_ollama_status():
+            print("❌ Ollama n'est pas accessible!")
+            print("💡 Assurez-vous qu'Ollama est démarré: ollama serve")
+            return
+
+    moderator = None
+    if args.type in ['moderate', 'all']:
+        moderator = ContentModerator(cache=cache)
+        if not moderator.check_ollama_status():
+            print("❌ Ollama n'est pas accessible!")
+            print("💡 Assurez-vous qu'Ollama est démarré: ollama serve")
+            return
+
+    show_queue_stats(db)
+
+    consumer = QueueConsumer(
+        db, classifier=classifier, moderator=moderator, workers=args.workers,
+        batch_size=args.batch_size, visibility_timeout=args.visibility_timeout
+    )
+
+    print(f"\n🚀 Consommateur démarré ({consumer.worker_id})"
+          f"{'' if args.drain else ' - Ctrl+C pour arrêter'}\n")
+
+    try:
+        stats = consumer.run(drain=args.drain)
+    except KeyboardInterrupt:
+        print("\n⚠️ Arrêt demandé (les travaux en cours seront repris après le délai de visibilité)")
+        stats = consumer.stats
+
+    # Résumé
+    print("\n" + "="*60)
+    print("📊 RÉSUMÉ")
+    print("="*60 + "\n")
+
+    print(f"✅ Articles classifiés: {stats['classified']}")
+    print(f"🛡️ Articles modérés: {stats['moderated']}")
+    if stats['retried'] > 0:
+        print(f"🔄 Nouveaux essais programmés: {stats['retried']}")
+    if stats['dead'] > 0:
+        print(f"☠️ Travaux en lettre morte: {stats['dead']}")
+    if cache is not None:
+        print(cache.summary())
+
+    show_queue_stats(db)
+
+
+if __name__ == '__main__':
+    main()
@@ -48,6 +48,20 @@ def main():
         help='Scraper un seul site (URL)'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Nombre de sites scrapés en parallèle (défaut: 8)'
+    )
+    
+    parser.add_argument(
+        '--per-domain',
+        type=int,
+        default=1,
+        help='Nombre maximum de collectes simultanées par domaine (défaut: 1)'
+    )
+    
     parser.add_argument(
         '--stats',
         action='store_true',
@@ -77,7 +91,9 @@ def main():
         # Scraper tous les sites du fichier
         stats = manager.scrape_all_sites(
             sites_file=args.sites_file,
-            days=args.days
+            days=args.days,
+            max_workers=args.workers,
+            per_domain=args.per_domain
         )
         
         # Afficher les stats finales
@@ -95,6 +111,10 @@ def print_stats(db: DatabaseManager):
     
     print(f"\n📰 Total articles: {stats['total_articles']}")
     
+    pending = sum(counts['pending'] + counts['running'] for counts in db.get_job_queue_stats().values())
+    if pending:
+        print(f"📬 {pending} travaux en file (python process_queue.py --drain)")
+    
     print(f"\n📺 Articles par média:")
     for media, count in stats['articles_par_media'].items():
         print(f"   • {media}: {count} articles")
@@ -3,7 +3,7 @@
 """
 Script de scraping complet : Web + Facebook + Twitter
 1. Scrape les articles du site web (RSS/HTML)
-2. Classifie automatiquement les articles
+2. Classifie automatiquement les articles (file de travaux consommée pendant la collecte)
 3. Scrape les posts Facebook avec métriques d'engagement
 4. Scrape les tweets Twitter avec métriques d'engagement
 """
@@ -11,6 +11,8 @@ Script de scraping complet : Web + Facebook + Twitter
 import argparse
 import os
 import sys
+import threading
+from typing import Optional
 
 # Forcer l'encodage UTF-8 pour Windows
 if sys.platform == 'win32':
@@ -21,8 +23,12 @@ if sys.platform == 'win32':
 from dotenv import load_dotenv
 from database.db_manager import DatabaseManager
 from scrapers.scraper_manager import ScraperManager
+from scrapers.crawl_engine import CrawlEngine
 from scrapers.facebook_scraper import FacebookScraper
 from scrapers.twitter_scraper import TwitterScraper
+from analysis.theme_classifier import ThemeClassifier
+from analysis.llm_cache import LLMCache
+from analysis.queue_worker import QueueConsumer
 
 # Charger les variables d'environnement
 load_dotenv()
@@ -40,8 +46,8 @@ def load_config_file(file_path: str) -> dict:
 
 
 def scrape_facebook_for_media(db: DatabaseManager, fb_scraper: FacebookScraper, 
-                              media_id: int, fb_page: str, limit: int = 5):
-    """Scraper Facebook pour un média"""
+                              media_id: int, fb_page: str, limit: int = 5) -> int:
+    """Scraper Facebook pour un média (retourne le nombre de posts sauvegardés)"""
     print(f"\n📘 Scraping Facebook: {fb_page}")
     
     try:
@@ -49,44 +55,31 @@ def scrape_facebook_for_media(db: DatabaseManager, fb_scraper: FacebookScraper,
         
         if result.get('error'):
             print(f"   ❌ Erreur: {result['error']}")
-            return
+            return 0
         
         posts = result.get('posts', [])
         
         if not posts:
             print(f"   ⚠️ Aucun post récupéré")
-            return
+            return 0
         
-        # Sauvegarder les posts
-        saved_count = 0
-        for post in posts:
-            try:
-                db.add_facebook_post(
-                    media_id=media_id,
-                    post_id=post['post_id'],
-                    message=post['message'],
-                    url=post['url'],
-                    image_url=post.get('image_url'),
-                    date_publication=post['date_publication'],
-                    likes=post['likes'],
-                    comments=post['comments'],
-                    shares=post['shares']
-                )
-                saved_count += 1
-            except Exception:
-                continue
+        # Sauvegarder les posts (une seule transaction)
+        saved_count = db.add_facebook_posts_bulk(media_id, posts)
         
         stats = result.get('stats', {})
         print(f"   ✅ {saved_count} posts sauvegardés")
         print(f"   📊 Engagement: {stats.get('total_engagement', 0):,}")
+        return saved_count
     
     except Exception as e:
         print(f"   ❌ Erreur: {e}")
+    
+    return 0
 
 
 def scrape_twitter_for_media(db: DatabaseManager, tw_scraper: TwitterScraper,
-                             media_id: int, tw_account: str, limit: int = 5):
-    """Scraper Twitter pour un média"""
+                             media_id: int, tw_account: str, limit: int = 5) -> int:
+    """Scraper Twitter pour un média (retourne le nombre de tweets sauvegardés)"""
     print(f"\n🐦 Scraping Twitter: @{tw_account}")
     
     try:
@@ -94,41 +87,101 @@ def scrape_twitter_for_media(db: DatabaseManager, tw_scraper: TwitterScraper,
         
         if result.get('error'):
             print(f"   ❌ Erreur: {result['error']}")
-            return
+            return 0
         
         tweets = result.get('tweets', [])
         
         if not tweets:
             print(f"   ⚠️ Aucun tweet récupéré")
-            return
+            return 0
         
-        # Sauvegarder les tweets
-        saved_count = 0
-        for tweet in tweets:
-            try:
-                db.add_twitter_tweet(
-                    media_id=media_id,
-                    tweet_id=tweet['tweet_id'],
-                    text=tweet['text'],
-                    url=tweet['url'],
-                    image_url=tweet.get('image_url'),
-                    date_publication=tweet['date_publication'],
-                    retweets=tweet['retweets'],
-                    replies=tweet['replies'],
-                    likes=tweet['likes'],
-                    quotes=tweet['quotes'],
-                    impressions=tweet['impressions']
-                )
-                saved_count += 1
-            except Exception:
-                continue
+        # Sauvegarder les tweets (une seule transaction)
+        saved_count = db.add_twitter_tweets_bulk(media_id, tweets)
         
         stats = result.get('stats', {})
         print(f"   ✅ {saved_count} tweets sauvegardés")
         print(f"   📊 Engagement: {stats.get('total_engagement', 0):,}")
+        return saved_count
     
     except Exception as e:
         print(f"   ❌ Erreur: {e}")
+    
+    return 0
+
+
+class TaskProgress:
+    """Progression d'une tâche lancée depuis l'API (table scraping_tasks, --task-id)"""
+    
+    def __init__(self, db: DatabaseManager, task_id: Optional[int]):
+        self.db = db
+        self.task_id = task_id
+        self.sites_done = 0
+        self.articles = 0
+        self.fb_posts = 0
+        self.tweets = 0
+        self._lock = threading.Lock()
+    
+    def start(self, sites_total: int):
+        """Nombre de médias à traiter"""
+        if self.task_id:
+            self.db.update_scraping_task_progress(self.task_id, sites_total=sites_total,
+                                                  sites_done=0, status='running')
+    
+    def add(self, articles: int = 0, fb_posts: int = 0, tweets: int = 0):
+        """Comptabiliser des contenus enregistrés (appelé depuis les workers)"""
+        with self._lock:
+            self.articles += articles
+            self.fb_posts += fb_posts
+            self.tweets += tweets
+    
+    def site_done(self, media_name: str):
+        """Un média terminé : enregistrer la progression"""
+        with self._lock:
+            self.sites_done += 1
+            values = (self.sites_done, self.articles, self.fb_posts, self.tweets)
+        
+        if self.task_id:
+            sites_done, articles, fb_posts, tweets = values
+            self.db.update_scraping_task_progress(
+                self.task_id, sites_done=sites_done, current_media=media_name,
+                total_articles=articles, total_fb_posts=fb_posts, total_tweets=tweets
+            )
+    
+    def complete(self):
+        """Clore la tâche avec les totaux de cette exécution"""
+        if self.task_id:
+            self.db.update_scraping_task(
+                self.task_id, 'completed', total_articles=self.articles,
+                total_fb_posts=self.fb_posts, total_tweets=self.tweets
+            )
+
+
+def start_classification_consumer(db: DatabaseManager):
+    """Classifier en arrière-plan les articles mis en file pendant la collecte"""
+    classifier = ThemeClassifier(cache=LLMCache(db))
+    if not classifier.check_ollama_status():
+        print("⚠️ Ollama non accessible, articles laissés en file (python process_queue.py)")
+        return None
+    
+    consumer = QueueConsumer(db, classifier=classifier)
+    consumer.start_background()
+    print("✅ Classification en arrière-plan (file de travaux)")
+    return consumer
+
+
+def finish_classification(consumer):
+    """Arrêter le consommateur puis classifier les articles restant en file"""
+    if consumer is None:
+        return
+    
+    consumer.stop_background()
+    print("\n🤖 Classification des articles restant en file...")
+    stats = consumer.run(drain=True)
+    
+    print(f"   ✅ {stats['classified']} articles classifiés")
+    if stats['retried'] > 0 or stats['dead'] > 0:
+        print(f"   ⚠️ {stats['retried']} nouveaux essais programmés, {stats['dead']} en lettre morte")
+    print(f"   {consumer.classifier.cache.summary()}")
 
 
 def main():
@@ -144,6 +197,12 @@ def main():
                        help='Ignorer le scraping Facebook')
     parser.add_argument('--skip-twitter', action='store_true',
                        help='Ignorer le scraping Twitter')
+    parser.add_argument('--workers', type=int, default=8,
+                       help='Nombre de médias traités en parallèle (avec --all)')
+    parser.add_argument('--per-domain', type=int, default=1,
+                       help='Nombre maximum de collectes simultanées par domaine')
+    parser.add_argument('--task-id', type=int,
+                       help='ID de la tâche scraping_tasks à tenir à jour (lancement depuis l\'API)')
     
     args = parser.parse_args()
     
@@ -151,6 +210,7 @@ def main():
     print("🔧 Initialisation...")
     db = DatabaseManager()
     scraper_manager = ScraperManager(db, auto_classify=True)
+    progress = TaskProgress(db, args.task_id)
     
     # Initialiser le scraper Facebook
     fb_scraper = None
@@ -180,6 +240,9 @@ def main():
         else:
             print("⚠️ Bearer Token Twitter manquant")
     
+    # La classification ne ralentit plus la collecte : elle consomme la file en parallèle
+    consumer = start_classification_consumer(db) if (args.url or args.all) else None
+    
     print()
     
     # Scraper un site spécifique
@@ -188,26 +251,33 @@ def main():
         print(f"🎯 Scraping: {args.url}")
         print("="*60)
         
+        progress.start(1)
+        
         # Scraping web
         count, method, message = scraper_manager.scrape_site(args.url, days=args.days)
         print(message)
+        progress.add(articles=count)
         
         # Récupérer le média
         media = db.get_media_by_url(args.url)
         if media:
             # Scraping Facebook
             if fb_scraper and media.facebook_page:
-                scrape_facebook_for_media(
+                progress.add(fb_posts=scrape_facebook_for_media(
                     db, fb_scraper, media.id, 
                     media.facebook_page, args.fb_posts
-                )
+                ))
             
             # Scraping Twitter
             if tw_scraper and media.twitter_account:
-                scrape_twitter_for_media(
+                progress.add(tweets=scrape_twitter_for_media(
                     db, tw_scraper, media.id,
                     media.twitter_account, args.tweets
-                )
+                ))
+        
+        progress.site_done(media.nom if media else args.url)
+        finish_classification(consumer)
+        progress.complete()
     
     # Scraper tous les sites
     elif args.all:
@@ -220,39 +290,65 @@ def main():
         
         if not medias:
             print("❌ Aucun média trouvé dans la table media")
+            finish_classification(consumer)
+            progress.complete()
             return
         
-        total_articles = 0
+        progress.start(len(medias))
         
-        for i, media in enumerate(medias, 1):
-            print(f"\n[{i}/{len(medias)}] {media.nom} ({media.url})")
-            print("-"*60)
+        def process_media(media):
+            """Collecte Web + Facebook + Twitter d'un média"""
+            count, method, message = 0, 'skipped', "⚠️ Pas d'URL configurée"
             
             # Scraping web
             if media.url:
                 count, method, message = scraper_manager.scrape_site(media.url, days=args.days)
-                total_articles += count
-                print(f"   {message}")
+                progress.add(articles=count)
             
             # Scraping Facebook
             if fb_scraper and media.facebook_page:
-                scrape_facebook_for_media(
+                progress.add(fb_posts=scrape_facebook_for_media(
                     db, fb_scraper, media.id,
                     media.facebook_page, args.fb_posts
-                )
+                ))
             
             # Scraping Twitter
             if tw_scraper and media.twitter_account:
-                scrape_twitter_for_media(
+                progress.add(tweets=scrape_twitter_for_media(
                     db, tw_scraper, media.id,
                     media.twitter_account, args.tweets
-                )
+                ))
+            
+            return count, method, message
+        
+        def on_result(done, total, result):
+            progress.site_done(result.media.nom)
+            print(f"\n[{done}/{total}] {result.media.nom} ({result.media.url}) "
+                  f"terminé en {result.duration:.1f}s")
+            print("-"*60)
+            print(f"   {result.message}")
+        
+        print(f"⚙️ {len(medias)} médias, {args.workers} workers "
+              f"(max {args.per_domain} par domaine)")
+        
+        engine = CrawlEngine(max_workers=args.workers, per_domain=args.per_domain)
+        results, elapsed = engine.run(medias, process_media, on_result=on_result)
+        total_articles = sum(result.count for result in results)
         
         # Résumé
         print("\n" + "="*60)
         print("📊 RÉSUMÉ")
         print("="*60)
         print(f"✅ Total articles: {total_articles}")
+        print(f"⏱️ Durée: {elapsed:.1f}s ({engine.throughput(len(medias), elapsed)} sites/minute)")
+        
+        slowest = sorted(results, key=lambda r: r.duration, reverse=True)[:5]
+        if slowest:
+            print("🐢 Sites les plus lents:")
+            for result in slowest:
+                print(f"   • {result.media.nom}: {result.duration:.1f}s ({result.count} articles)")
+        
+        finish_classification(consumer)
         
         # Afficher le classement
         print("\n" + "="*60)
@@ -271,6 +367,11 @@ def main():
                 print(f"   Total: {media['engagement_total']:,}")
             print()
         
+        # Snapshots des métriques de la période (mis à jour sur place) et rétention
+        snapshots = db.refresh_all_media_metrics(days=args.days)
+        compacted = db.compact_media_metrics()
+        print(f"📸 {len(snapshots)} snapshots de métriques à jour ({compacted} anciens supprimés)")
+        
         # Lancer la modération de contenu
         print("\n" + "="*60)
         print("🛡️ MODÉRATION DE CONTENU")
@@ -278,8 +379,10 @@ def main():
         
         try:
             from analysis.content_moderator import ContentModerator
+            from analysis.llm_cache import LLMCache
             
-            moderator = ContentModerator()
+            # Légendes identiques sur Facebook et Twitter : une seule analyse
+            moderator = ContentModerator(cache=LLMCache(db))
             
             # Vérifier la connexion à Ollama
             if not moderator.check_ollama_status():
@@ -344,10 +447,13 @@ def main():
                 print(f"   Contenus signalés: {flagged}")
                 if analyzed > 0:
                     print(f"   Taux de signalement: {(flagged/analyzed)*100:.1f}%")
+                print(f"   {moderator.cache.summary()}")
         
         except Exception as e:
             print(f"⚠️ Erreur lors de la modération: {e}")
             print("   Le scraping a réussi mais la modération a échoué")
+        
+        progress.complete()
     
     else:
         print("❌ Spécifiez --url ou --all")
@@ -1,9 +1,11 @@
 """
-Module de scraping intelligent (RSS + HTML)
+Module de scraping intelligent (API WordPress + RSS + HTML)
 """
 
 from .rss_scraper import RSScraper
+from .wordpress_scraper import WordPressScraper
 from .smart_html_scraper import SmartHTMLScraper
 from .scraper_manager import ScraperManager
+from .crawl_engine import CrawlEngine
 
-__all__ = ['RSScraper', 'SmartHTMLScraper', 'ScraperManager']
+__all__ = ['RSScraper', 'WordPressScraper', 'SmartHTMLScraper', 'ScraperManager', 'CrawlEngine']
@@ -0,0 +1,514 @@
+"""
+Extraction des champs d'un article (titre, date, contenu, auteur, image)
+en un seul parcours du document : les candidats de tous les champs sont
+collectés d'un coup (balises, classes et attributs des sélecteurs), chaque
+champ retient ensuite le premier candidat valide dans l'ordre de priorité
+de ses sélecteurs.
+Le document n'est pas modifié : les balises retirées des contenus essayés
+(scripts, menus, encarts) sont ignorées à la lecture.
+"""
+
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+from dateutil import parser as date_parser
+
+from .html_parser import HTMLNode
+
+
+# Sélecteurs par champ, du plus spécifique au plus général
+TITLE_SELECTORS = [
+    'article h1',
+    '.entry-title',
+    '.post-title',
+    'h1.title',
+    'h1.article-title',
+    '.article-header h1',
+    'header h1',
+    'h1',
+]
+TITLE_META = 'meta[property="og:title"]'
+TITLE_TAG = 'title'
+
+DATE_META_SELECTORS = [
+    'meta[property="article:published_time"]',
+    'meta[property="og:published_time"]',
+    'meta[name="publish_date"]',
+    'meta[name="date"]',
+    'meta[itemprop="datePublished"]',
+]
+DATE_TIME = 'time[datetime]'
+DATE_TEXT_SELECTORS = [
+    '.entry-date',
+    '.post-date',
+    '.published',
+    '.date',
+    'time',
+    '.article-date',
+    'span.date',
+]
+
+CONTENT_SELECTORS = [
+    'article .entry-content',
+    'article .post-content',
+    'article .content',
+    '.entry-content',
+    '.post-content',
+    '.article-content',
+    'article',
+    '.content',
+]
+
+# Contenu des pages d'articles trouvés dans un flux RSS
+RSS_CONTENT_SELECTORS = [
+    'article .entry-content',
+    'article .post-content',
+    '.article-content',
+    '.post-content',
+    '.entry-content',
+    'article .content',
+    '[itemprop="articleBody"]',
+    '.article-body',
+    'main article',
+]
+PARAGRAPH_FALLBACK = 'article'
+
+AUTHOR_META = 'meta[name="author"]'
+AUTHOR_SELECTORS = [
+    '.author-name',
+    '.author',
+    '.by-author',
+    'span.author',
+    'a[rel="author"]',
+]
+
+IMAGE_META = 'meta[property="og:image"]'
+IMAGE_SELECTORS = [
+    'article img',
+    '.entry-content img',
+    '.post-thumbnail img',
+    '.featured-image img',
+]
+
+# Balises retirées d'un contenu (scripts, styles, menus, encarts)
+REMOVED_TAGS = frozenset({'script', 'style', 'iframe', 'nav', 'aside'})
+
+FIELDS = ('titre', 'date', 'contenu', 'auteur', 'image')
+
+COMPOUND_RE = re.compile(r'^([a-z][a-z0-9]*)?((?:\.[\w-]+)*)(?:\[([\w:-]+)(?:="([^"]*)")?\])?$')
+
+# (balise, classes, attribut, valeur) d'un sélecteur composé
+Compound = Tuple[Optional[str], frozenset, Optional[str], Optional[str]]
+
+
+def _compile_compound(part: str) -> Compound:
+    """Compiler un sélecteur composé : balise, classes et au plus un attribut"""
+    match = COMPOUND_RE.match(part)
+    if not part or not match:
+        raise ValueError(f"Sélecteur non supporté: {part}")
+    tag, classes, attr, value = match.groups()
+    return tag, frozenset(c for c in classes.split('.') if c), attr, value
+
+
+# (balise, classes, attributs, élément) d'un élément visité
+Element = Tuple[str, frozenset, Dict[str, str], HTMLNode]
+
+
+def _element(node: HTMLNode) -> Element:
+    attributes = node.attributes
+    return node.tag, frozenset((attributes.get('class') or '').split()), attributes, node
+
+
+def _compound_matches(compound: Compound, element: Element) -> bool:
+    """Vérifier qu'un élément correspond à un sélecteur composé"""
+    expected_tag, expected_classes, attr, value = compound
+    tag, classes, attributes, _ = element
+    if expected_tag and expected_tag != tag:
+        return False
+    if expected_classes and not expected_classes <= classes:
+        return False
+    if attr:
+        actual = attributes.get(attr)
+        if actual is None or (value is not None and actual != value):
+            return False
+    return True
+
+
+class SimpleSelector:
+    """Sélecteur CSS limité aux formes des listes ci-dessus : « composé » ou « ancêtre composé »"""
+
+    __slots__ = ('css', 'subject', 'ancestor', 'key')
+
+    def __init__(self, css: str):
+        parts = css.split()
+        if not 1 <= len(parts) <= 2:
+            raise ValueError(f"Sélecteur non supporté: {css}")
+
+        self.css = css
+        self.subject = _compile_compound(parts[-1])
+        self.ancestor = _compile_compound(parts[0]) if len(parts) == 2 else None
+
+        # Index des candidats parcourus, du plus sélectif au moins sélectif :
+        # une classe, sinon l'attribut, sinon la balise
+        tag, classes, attr, _ = self.subject
+        self.key = f".{min(classes)}" if classes else f"[{attr}]" if attr else tag
+
+
+class SiteTemplate:
+    """
+    Modèle d'extraction d'un site : sélecteur qui a fonctionné pour chaque champ
+    (table site_templates). Les pages du site requêtent directement ces sélecteurs ;
+    la recherche générique n'a lieu que pour les champs où le modèle ne correspond plus.
+    """
+
+    def __init__(self, selectors: Optional[Dict[str, Optional[str]]] = None):
+        """
+        Args:
+            selectors: Sélecteur par champ (titre, date, contenu, auteur, image)
+        """
+        self.selectors = {field: css for field, css in (selectors or {}).items() if css}
+        # Modifié depuis le chargement : à enregistrer
+        self.changed = False
+
+    def record(self, field: str, css: str):
+        """Retenir le sélecteur trouvé par la recherche générique"""
+        if self.selectors.get(field) != css:
+            self.selectors[field] = css
+            self.changed = True
+
+
+class PageCandidates:
+    """
+    Candidats de tous les champs d'une page, collectés en un seul parcours du document
+    (à la première recherche générique : les sélecteurs d'un modèle de site n'en ont pas besoin)
+    """
+
+    def __init__(self, doc: HTMLNode, keys: Tuple[frozenset, frozenset, frozenset],
+                 template: Optional[SiteTemplate] = None, direct: bool = False):
+        """
+        Args:
+            doc: Document parsé
+            keys: Balises, classes et attributs des sélecteurs (les ancêtres
+                  requis sont vérifiés ensuite sur les seuls candidats)
+            template: Modèle d'extraction du site (None : recherche générique seule)
+            direct: Requêter directement les sélecteurs du modèle (select_one natif)
+        """
+        self.doc = doc
+        self.template = template
+        self._direct = direct
+        self._keys = keys
+        self.nodes: Optional[List[HTMLNode]] = None
+        self._elements: List[Element] = []
+        self._chains: Dict[HTMLNode, List[Element]] = {}
+        self._by_key: Dict[str, List[int]] = defaultdict(list)
+
+        # Contenus essayés : leurs balises REMOVED_TAGS ne comptent plus
+        self.tried = set()
+
+    def _collect(self):
+        tags, class_keys, attrs = self._keys
+        self.nodes = self.doc.find_elements(tags, class_keys, attrs)
+        self._elements = [_element(node) for node in self.nodes]
+
+        for position, (tag, classes, attributes, _) in enumerate(self._elements):
+            self._by_key[tag].append(position)
+            for cls in classes:
+                self._by_key[f".{cls}"].append(position)
+            for attr in attrs.intersection(attributes):
+                self._by_key[f"[{attr}]"].append(position)
+
+    def first(self, selector: SimpleSelector) -> Optional[HTMLNode]:
+        """Premier candidat (ordre du document) correspondant au sélecteur, hors parties retirées"""
+        if self.nodes is None:
+            self._collect()
+        for position in self._by_key.get(selector.key, ()):
+            if self._matches(selector, position) and not self._is_removed(position):
+                return self.nodes[position]
+        return None
+
+    def direct(self, selector: SimpleSelector) -> Optional[HTMLNode]:
+        """
+        Premier élément du sélecteur, requêté directement sans collecter les candidats
+        (None s'il est retiré) ; parmi les candidats si le parcours est de toute façon nécessaire
+        """
+        if not self._direct:
+            return self.first(selector)
+        elem = self.doc.select_one(selector.css)
+        if elem is None or self.is_removed(elem):
+            return None
+        return elem
+
+    def text(self, node: HTMLNode, separator: str = '', strip: bool = False) -> str:
+        """Texte d'un élément, sans les balises retirées s'il appartient à un contenu essayé"""
+        if self.tried and any(ancestor in self.tried for *_, ancestor in self._chain(node)):
+            return node.text(separator=separator, strip=strip, exclude=REMOVED_TAGS)
+        return node.text(separator=separator, strip=strip)
+
+    def is_removed(self, node: HTMLNode) -> bool:
+        """True si l'élément est dans une balise retirée d'un contenu essayé"""
+        return bool(self.tried) and self._removed_in(self._chain(node))
+
+    def _matches(self, selector: SimpleSelector, position: int) -> bool:
+        if not _compound_matches(selector.subject, self._elements[position]):
+            return False
+        if selector.ancestor is None:
+            return True
+        return any(_compound_matches(selector.ancestor, ancestor)
+                   for ancestor in self._chain(self.nodes[position])[1:])
+
+    def _is_removed(self, position: int) -> bool:
+        return bool(self.tried) and self._removed_in(self._chain(self.nodes[position]))
+
+    def _removed_in(self, chain: List[Element]) -> bool:
+        """Chaîne élément -> racine : une balise retirée sous un contenu essayé ?"""
+        in_removed_tag = False
+        for tag, _, _, node in chain:
+            if in_removed_tag and node in self.tried:
+                return True
+            in_removed_tag = in_removed_tag or tag in REMOVED_TAGS
+        return False
+
+    def _chain(self, node: HTMLNode) -> List[Element]:
+        """Chaîne de l'élément jusqu'à la racine (en cache : les ancêtres sont communs aux candidats)"""
+        pending = []
+        while node is not None and node not in self._chains:
+            pending.append(node)
+            node = node.parent
+        chain = self._chains[node] if node is not None else []
+        for node in reversed(pending):
+            chain = [_element(node)] + chain
+            self._chains[node] = chain
+        return chain
+
+
+Reader = Callable[[PageCandidates, HTMLNode], Optional[object]]
+
+
+class ArticleExtractor:
+    """Extraction des champs d'un article en un seul parcours du document"""
+
+    def __init__(self, base_url: str = '', content_selectors: List[str] = None,
+                 content_max_length: Optional[int] = 5000, paragraph_fallback: bool = False):
+        """
+        Initialise l'extracteur
+
+        Args:
+            base_url: URL de base du site (URLs relatives des images)
+            content_selectors: Sélecteurs du contenu, par priorité (défaut: CONTENT_SELECTORS)
+            content_max_length: Longueur maximum du contenu (None = illimitée)
+            paragraph_fallback: À défaut de contenu, assembler les paragraphes du premier <article>
+        """
+        self.base_url = base_url
+        self.content_selectors = content_selectors or CONTENT_SELECTORS
+        self.content_max_length = content_max_length
+        self.paragraph_fallback = paragraph_fallback
+
+        # Par champ : (sélecteur, lecture de la valeur) par priorité ; une lecture
+        # retourne None si l'élément ne convient pas (texte trop court, date invalide...)
+        self._readers: Dict[str, List[Tuple[str, Reader]]] = {
+            'titre': ([(css, self._read_title) for css in TITLE_SELECTORS]
+                      + [(TITLE_META, self._read_meta), (TITLE_TAG, self._read_title_tag)]),
+            'date': ([(css, self._read_meta_date) for css in DATE_META_SELECTORS]
+                     + [(DATE_TIME, self._read_time)]
+                     + [(css, self._read_text_date) for css in DATE_TEXT_SELECTORS]),
+            'contenu': ([(css, self._read_content) for css in self.content_selectors]
+                        + ([(PARAGRAPH_FALLBACK, self._read_paragraphs)] if paragraph_fallback else [])),
+            'auteur': [(AUTHOR_META, self._read_meta)] + [(css, self._read_author) for css in AUTHOR_SELECTORS],
+            'image': [(IMAGE_META, self._read_meta)] + [(css, self._read_image) for css in IMAGE_SELECTORS],
+        }
+        self._selectors = {css: SimpleSelector(css)
+                           for readers in self._readers.values() for css, _ in readers}
+        self._keys: Dict[Tuple[str, ...], Tuple[frozenset, frozenset, frozenset]] = {}
+
+    def collect(self, doc: HTMLNode, fields: Iterable[str] = FIELDS,
+                template: Optional[SiteTemplate] = None) -> PageCandidates:
+        """
+        Préparer la recherche des champs demandés (un seul parcours du document,
+        à la première recherche générique)
+
+        Args:
+            doc: Document parsé
+            fields: Champs à extraire ensuite (titre, date, contenu, auteur, image)
+            template: Modèle d'extraction du site, essayé avant la recherche générique
+                      et mis à jour avec les sélecteurs qu'elle trouve
+
+        Returns:
+            Candidats de la page
+        """
+        fields = tuple(fields)
+        if fields not in self._keys:
+            keys = {self._selectors[css].key for field in fields for css, _ in self._readers[field]}
+            self._keys[fields] = (
+                frozenset(key for key in keys if key[0] not in '.['),
+                frozenset(key[1:] for key in keys if key[0] == '.'),
+                frozenset(key[1:-1] for key in keys if key[0] == '['),
+            )
+
+        # Requêtes directes seulement si le modèle couvre tous les champs : sinon le
+        # parcours a lieu de toute façon et les candidats suffisent
+        direct = (template is not None and doc.fast_select
+                  and all(field in template.selectors for field in fields))
+        return PageCandidates(doc, self._keys[fields], template, direct)
+
+    def _value(self, page: PageCandidates, field: str) -> Optional[object]:
+        """Valeur d'un champ : sélecteur du modèle du site, sinon recherche générique par priorité"""
+        template = page.template
+        if template is not None:
+            css = template.selectors.get(field)
+            read = next((read for known, read in self._readers[field] if known == css), None)
+            if read is not None:
+                elem = page.direct(self._selectors[css])
+                value = read(page, elem) if elem is not None else None
+                if value is not None:
+                    return value
+
+        for css, read in self._readers[field]:
+            elem = page.first(self._selectors[css])
+            if elem is not None:
+                value = read(page, elem)
+                if value is not None:
+                    if template is not None:
+                        template.record(field, css)
+                    return value
+
+        # Champ absent de cette page : le modèle est conservé pour les suivantes
+        return None
+
+    def title(self, page: PageCandidates) -> Optional[str]:
+        """Extraire le titre de l'article"""
+        return self._value(page, 'titre')
+
+    def date(self, page: PageCandidates, url: str) -> Optional[datetime]:
+        """Extraire la date de publication (meta, <time>, texte, puis URL)"""
+        date_obj = self._value(page, 'date')
+        return date_obj if date_obj is not None else date_from_url(url)
+
+    def content(self, page: PageCandidates) -> str:
+        """Extraire le contenu de l'article ('' si aucun contenu significatif)"""
+        return self._value(page, 'contenu') or ""
+
+    def author(self, page: PageCandidates) -> Optional[str]:
+        """Extraire l'auteur de l'article"""
+        return self._value(page, 'auteur')
+
+    def image(self, page: PageCandidates) -> Optional[str]:
+        """Extraire l'image principale de l'article"""
+        return self._value(page, 'image')
+
+    def extract(self, doc: HTMLNode, url: str, template: Optional[SiteTemplate] = None) -> Dict[str, object]:
+        """Extraire tous les champs d'une page (dans l'ordre : titre, date, contenu, auteur, image)"""
+        page = self.collect(doc, template=template)
+        return {
+            'titre': self.title(page),
+            'date': self.date(page, url),
+            'contenu': self.content(page),
+            'auteur': self.author(page),
+            'image': self.image(page),
+        }
+
+    # Lecture des valeurs
+
+    @staticmethod
+    def _read_meta(page: PageCandidates, elem: HTMLNode) -> Optional[str]:
+        return elem.attr('content') or None
+
+    @staticmethod
+    def _read_title(page: PageCandidates, elem: HTMLNode) -> Optional[str]:
+        titre = page.text(elem, strip=True)
+        return titre if titre and len(titre) > 10 else None  # Titre significatif
+
+    @staticmethod
+    def _read_title_tag(page: PageCandidates, elem: HTMLNode) -> str:
+        return page.text(elem, strip=True).split('|')[0].split('-')[0].strip()
+
+    @staticmethod
+    def _read_meta_date(page: PageCandidates, elem: HTMLNode) -> Optional[datetime]:
+        if elem.attr('content'):
+            try:
+                return date_parser.parse(elem.attr('content'))
+            except:
+                pass
+        return None
+
+    @staticmethod
+    def _read_time(page: PageCandidates, elem: HTMLNode) -> Optional[datetime]:
+        try:
+            return date_parser.parse(elem.attr('datetime'))
+        except:
+            return None
+
+    @staticmethod
+    def _read_text_date(page: PageCandidates, elem: HTMLNode) -> Optional[datetime]:
+        return parse_french_date(page.text(elem, strip=True))
+
+    def _read_content(self, page: PageCandidates, elem: HTMLNode) -> Optional[str]:
+        # Scripts, styles, menus et encarts ignorés
+        page.tried.add(elem)
+        content = page.text(elem, separator='\n', strip=True)
+        if content and len(content) > 100:  # Contenu significatif
+            return content[:self.content_max_length] if self.content_max_length else content
+        return None
+
+    @staticmethod
+    def _read_paragraphs(page: PageCandidates, elem: HTMLNode) -> Optional[str]:
+        paragraphs = [page.text(p, strip=True) for p in elem.select('p') if not page.is_removed(p)]
+        text = '\n\n'.join(p for p in paragraphs if len(p) > 20)
+        return text if len(text) > 100 else None
+
+    @staticmethod
+    def _read_author(page: PageCandidates, elem: HTMLNode) -> Optional[str]:
+        author = page.text(elem, strip=True)
+        return author if author and len(author) < 100 else None
+
+    def _read_image(self, page: PageCandidates, elem: HTMLNode) -> Optional[str]:
+        return urljoin(self.base_url, elem.attr('src')) if elem.attr('src') else None
+
+
+def parse_french_date(date_text: str) -> Optional[datetime]:
+    """Parser une date en français"""
+    try:
+        # Nettoyer le texte
+        date_text = date_text.strip()
+
+        # Essayer le parser automatique
+        return date_parser.parse(date_text, fuzzy=True)
+    except:
+        pass
+
+    # Patterns français courants
+    patterns = [
+        r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',  # DD/MM/YYYY ou DD-MM-YYYY
+        r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})',  # YYYY/MM/DD ou YYYY-MM-DD
+    ]
+
+    for pattern in patterns:
+        match = re.search(pattern, date_text)
+        if match:
+            try:
+                groups = match.groups()
+                if len(groups[0]) == 4:  # YYYY-MM-DD
+                    return datetime(int(groups[0]), int(groups[1]), int(groups[2]))
+                else:  # DD-MM-YYYY
+                    return datetime(int(groups[2]), int(groups[1]), int(groups[0]))
+            except:
+                pass
+
+    return None
+
+
+def date_from_url(url: str) -> Optional[datetime]:
+    """Extraire la date depuis l'URL (structure /YYYY/MM/DD/ ou /YYYY/MM/)"""
+    match = re.search(r'/(\d{4})/(\d{2})(?:/(\d{2}))?/', url)
+    if match:
+        try:
+            year = int(match.group(1))
+            month = int(match.group(2))
+            day = int(match.group(3)) if match.group(3) else 1
+            return datetime(year, month, day)
+        except:
+            pass
+
+    return None
@@ -0,0 +1,107 @@
+"""
+Moteur de collecte concurrente multi-sites
+Traite plusieurs médias en parallèle avec une limite globale de workers
+et un plafond de collectes simultanées par domaine
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from database.models import Media
+
+
+@dataclass
+class SiteResult:
+    """Résultat de la collecte d'un média"""
+    media: Media
+    count: int = 0
+    method: str = 'error'
+    message: str = ''
+    duration: float = 0.0  # Temps réel (secondes) passé sur le site
+
+
+class CrawlEngine:
+    """Exécute une tâche de collecte sur plusieurs médias en parallèle"""
+
+    def __init__(self, max_workers: int = 8, per_domain: int = 1):
+        """
+        Initialise le moteur
+
+        Args:
+            max_workers: Nombre maximum de sites traités simultanément
+            per_domain: Nombre maximum de sites traités simultanément pour un même domaine
+        """
+        self.max_workers = max(1, max_workers)
+        self.per_domain = max(1, per_domain)
+        self._domain_slots: Dict[str, threading.Semaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """Domaine normalisé (sans www.) utilisé pour le plafond par domaine"""
+        netloc = urlparse(url or '').netloc.lower()
+        return netloc[4:] if netloc.startswith('www.') else netloc
+
+    def _slot_for(self, url: str) -> threading.Semaphore:
+        """Récupérer (ou créer) le sémaphore associé au domaine d'une URL"""
+        domain = self.domain_of(url)
+        with self._slots_lock:
+            if domain not in self._domain_slots:
+                self._domain_slots[domain] = threading.Semaphore(self.per_domain)
+            return self._domain_slots[domain]
+
+    def _run_one(self, media: Media, task: Callable[[Media], Tuple[int, str, str]]) -> SiteResult:
+        """Exécuter la tâche pour un média en respectant le plafond du domaine"""
+        with self._slot_for(media.url):
+            start = time.perf_counter()
+            try:
+                count, method, message = task(media)
+            except Exception as e:
+                count, method, message = 0, 'error', f"❌ Erreur scraping: {e}"
+            duration = time.perf_counter() - start
+
+        return SiteResult(media=media, count=count, method=method,
+                          message=message, duration=duration)
+
+    def run(self, medias: List[Media], task: Callable[[Media], Tuple[int, str, str]],
+            on_result: Optional[Callable[[int, int, SiteResult], None]] = None) -> Tuple[List[SiteResult], float]:
+        """
+        Lancer la collecte sur tous les médias
+
+        Args:
+            medias: Liste des médias à traiter
+            task: Fonction (media) -> (nombre d'articles, méthode, message)
+            on_result: Callback (rang, total, résultat) appelé à la fin de chaque site
+
+        Returns:
+            Tuple (résultats dans l'ordre des médias, durée totale en secondes)
+        """
+        results: Dict[int, SiteResult] = {}
+        total = len(medias)
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crawl') as executor:
+            futures = {
+                executor.submit(self._run_one, media, task): index
+                for index, media in enumerate(medias)
+            }
+
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results[futures[future]] = result
+                if on_result:
+                    on_result(done, total, result)
+
+        elapsed = time.perf_counter() - start
+        return [results[i] for i in range(total)], elapsed
+
+    @staticmethod
+    def throughput(site_count: int, elapsed: float) -> float:
+        """Débit en sites par minute"""
+        if elapsed <= 0:
+            return 0.0
+        return round(site_count / (elapsed / 60), 2)
@@ -0,0 +1,403 @@
+"""
+Parsing HTML des scrapers, indépendant de la bibliothèque utilisée
+Moteurs par ordre de préférence : selectolax (lexbor), lxml (+ cssselect),
+BeautifulSoup avec l'analyseur lxml, BeautifulSoup avec html.parser.
+Le premier moteur installé est utilisé ; la variable d'environnement
+HTML_PARSER_BACKEND force un moteur.
+"""
+
+import os
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:
+    lxml = None
+
+try:
+    from cssselect import HTMLTranslator
+except ImportError:
+    HTMLTranslator = None
+
+
+BACKENDS = ('selectolax', 'lxml', 'bs4-lxml', 'bs4')
+
+# Éléments dont le texte n'est pas du contenu (même règle que BeautifulSoup.get_text)
+NON_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+
+XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+class HTMLNode(ABC):
+    """Élément HTML : interface commune aux moteurs de parsing"""
+
+    __slots__ = ('_node',)
+
+    # select_one exécuté par le moteur (natif) : moins coûteux qu'un parcours Python du document
+    fast_select = False
+
+    def __init__(self, node):
+        self._node = node
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, HTMLNode) and self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def _key(self):
+        """Identité de l'élément sous-jacent (les enveloppes sont recréées à chaque accès)"""
+        return id(self._node)
+
+    @property
+    @abstractmethod
+    def tag(self) -> str:
+        """Nom de la balise (minuscules)"""
+
+    @property
+    @abstractmethod
+    def parent(self) -> Optional['HTMLNode']:
+        """Élément parent, None pour la racine du document"""
+
+    @abstractmethod
+    def select_one(self, css: str) -> Optional['HTMLNode']:
+        """Premier descendant correspondant au sélecteur CSS, ou None"""
+
+    @abstractmethod
+    def select(self, css: str) -> List['HTMLNode']:
+        """Descendants correspondant au sélecteur CSS (ordre du document)"""
+
+    @abstractmethod
+    def find_elements(self, tags: frozenset, classes: frozenset = frozenset(),
+                      attrs: frozenset = frozenset()) -> List['HTMLNode']:
+        """
+        Descendants ayant une de ces balises, une de ces classes ou un de ces
+        attributs, en un seul parcours du document (ordre du document)
+
+        Args:
+            tags: Noms de balises
+            classes: Classes CSS
+            attrs: Noms d'attributs
+        """
+
+    @abstractmethod
+    def select_attr(self, css: str, name: str) -> List[Optional[str]]:
+        """
+        Valeur d'un attribut pour chaque descendant correspondant au sélecteur
+        CSS (ordre du document), sans créer de nœud par élément
+
+        Args:
+            css: Sélecteur CSS
+            name: Nom de l'attribut
+        """
+
+    @abstractmethod
+    def attr(self, name: str) -> Optional[str]:
+        """Valeur d'un attribut, ou None s'il est absent"""
+
+    @property
+    @abstractmethod
+    def attributes(self) -> Dict[str, str]:
+        """Attributs de l'élément"""
+
+    @abstractmethod
+    def text(self, separator: str = '', strip: bool = False, exclude: Iterable[str] = ()) -> str:
+        """
+        Texte de l'élément (hors scripts et styles)
+
+        Args:
+            separator: Séparateur entre les fragments de texte
+            strip: Supprimer les espaces autour de chaque fragment et ignorer les fragments vides
+            exclude: Balises dont le texte est ignoré (sans modifier le document)
+        """
+
+    @abstractmethod
+    def remove(self, tags: Iterable[str]):
+        """Supprimer les descendants de ces balises (avec leur contenu)"""
+
+
+def _join_text(parts: Iterable[str], separator: str, strip: bool) -> str:
+    """Assembler des fragments de texte comme BeautifulSoup.get_text"""
+    if strip:
+        parts = (part.strip() for part in parts)
+        parts = (part for part in parts if part)
+    return separator.join(parts)
+
+
+class SoupNode(HTMLNode):
+    """Élément BeautifulSoup (sélecteurs soupsieve)"""
+
+    __slots__ = ()
+
+    @property
+    def tag(self) -> str:
+        return self._node.name
+
+    @property
+    def parent(self) -> Optional[HTMLNode]:
+        parent = self._node.parent
+        if parent is None or isinstance(parent, BeautifulSoup):
+            return None
+        return SoupNode(parent)
+
+    def select_one(self, css: str) -> Optional[HTMLNode]:
+        elem = self._node.select_one(css)
+        return SoupNode(elem) if elem is not None else None
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return [SoupNode(elem) for elem in self._node.select(css)]
+
+    def find_elements(self, tags: frozenset, classes: frozenset = frozenset(),
+                      attrs: frozenset = frozenset()) -> List[HTMLNode]:
+        return [SoupNode(elem) for elem in self._node.find_all(True)
+                if elem.name in tags
+                or (classes and not classes.isdisjoint(elem.get('class') or ()))
+                or (attrs and not attrs.isdisjoint(elem.attrs))]
+
+    def select_attr(self, css: str, name: str) -> List[Optional[str]]:
+        values = [elem.get(name) for elem in self._node.select(css)]
+        return [' '.join(value) if isinstance(value, list) else value for value in values]
+
+    def attr(self, name: str) -> Optional[str]:
+        value = self._node.get(name)
+        # Attributs multivalués (class, rel) : liste chez BeautifulSoup
+        return ' '.join(value) if isinstance(value, list) else value
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        return {name: ' '.join(value) if isinstance(value, list) else value
+                for name, value in self._node.attrs.items()}
+
+    def text(self, separator: str = '', strip: bool = False, exclude: Iterable[str] = ()) -> str:
+        if not exclude:
+            return self._node.get_text(separator=separator, strip=strip)
+        return _join_text(_soup_text_parts(self._node, NON_TEXT_TAGS.union(exclude)), separator, strip)
+
+    def remove(self, tags: Iterable[str]):
+        for elem in self._node.find_all(list(tags)):
+            elem.decompose()
+
+
+def _soup_text_parts(node, skip) -> Iterable[str]:
+    """Fragments de texte d'un élément BeautifulSoup, hors balises `skip` (et commentaires)"""
+    for child in node.children:
+        if isinstance(child, Tag):
+            if child.name not in skip:
+                yield from _soup_text_parts(child, skip)
+        elif type(child) in (NavigableString, CData):
+            yield child
+
+
+@lru_cache(maxsize=512)
+def _compile_css(css: str, first: bool):
+    """Sélecteur CSS traduit en XPath compilé (lxml), mis en cache"""
+    xpath = HTMLTranslator().css_to_xpath(css, prefix='descendant::')
+    return etree.XPath(f"({xpath})[1]" if first else xpath)
+
+
+class LxmlNode(HTMLNode):
+    """Élément lxml (sélecteurs cssselect compilés en XPath)"""
+
+    __slots__ = ()
+
+    fast_select = True
+
+    @property
+    def tag(self) -> str:
+        return self._node.tag
+
+    @property
+    def parent(self) -> Optional[HTMLNode]:
+        parent = self._node.getparent()
+        return LxmlNode(parent) if parent is not None else None
+
+    def select_one(self, css: str) -> Optional[HTMLNode]:
+        found = _compile_css(css, True)(self._node)
+        return LxmlNode(found[0]) if found else None
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return [LxmlNode(elem) for elem in _compile_css(css, False)(self._node)]
+
+    def find_elements(self, tags: frozenset, classes: frozenset = frozenset(),
+                      attrs: frozenset = frozenset()) -> List[HTMLNode]:
+        # Parcours Python : un prédicat XPath par classe coûte plus cher que le parcours
+        return [LxmlNode(elem) for elem in self._node.iterdescendants(etree.Element)
+                if elem.tag in tags
+                or (classes and not classes.isdisjoint((elem.get('class') or '').split()))
+                or (attrs and not attrs.isdisjoint(elem.attrib))]
+
+    def select_attr(self, css: str, name: str) -> List[Optional[str]]:
+        return [elem.get(name) for elem in _compile_css(css, False)(self._node)]
+
+    def attr(self, name: str) -> Optional[str]:
+        return self._node.get(name)
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        return dict(self._node.attrib)
+
+    def text(self, separator: str = '', strip: bool = False, exclude: Iterable[str] = ()) -> str:
+        skip = NON_TEXT_TAGS.union(exclude) if exclude else NON_TEXT_TAGS
+        return _join_text(_lxml_text_parts(self._node, skip), separator, strip)
+
+    def remove(self, tags: Iterable[str]):
+        for elem in list(self._node.iterdescendants(*tags)):
+            elem.drop_tree()
+
+
+def _lxml_text_parts(node, skip) -> Iterable[str]:
+    """Fragments de texte d'un élément lxml, hors balises `skip` (et commentaires)"""
+    if node.text:
+        yield node.text
+    for child in node:
+        if isinstance(child.tag, str) and child.tag not in skip:
+            yield from _lxml_text_parts(child, skip)
+        if child.tail:
+            yield child.tail
+
+
+class LexborNode(HTMLNode):
+    """Élément selectolax (moteur lexbor)"""
+
+    __slots__ = ()
+
+    fast_select = True
+
+    def _key(self):
+        return self._node.mem_id
+
+    @property
+    def tag(self) -> str:
+        return self._node.tag
+
+    @property
+    def parent(self) -> Optional[HTMLNode]:
+        parent = self._node.parent
+        return LexborNode(parent) if parent is not None and parent.is_element_node else None
+
+    def select_one(self, css: str) -> Optional[HTMLNode]:
+        elem = self._node.css_first(css)
+        return LexborNode(elem) if elem is not None else None
+
+    def select(self, css: str) -> List[HTMLNode]:
+        return [LexborNode(elem) for elem in self._node.css(css)]
+
+    def find_elements(self, tags: frozenset, classes: frozenset = frozenset(),
+                      attrs: frozenset = frozenset()) -> List[HTMLNode]:
+        # Sélecteur groupé évalué par lexbor : plus rapide qu'un parcours Python
+        css = ', '.join([*sorted(tags), *(f'.{cls}' for cls in sorted(classes)),
+                         *(f'[{attr}]' for attr in sorted(attrs))])
+        if not css:
+            return []
+        # lexbor renvoie un élément une fois par sélecteur du groupe qui lui correspond
+        found, seen = [], set()
+        for elem in self._node.css(css):
+            if elem.mem_id not in seen:
+                seen.add(elem.mem_id)
+                found.append(LexborNode(elem))
+        return found
+
+    def select_attr(self, css: str, name: str) -> List[Optional[str]]:
+        return [elem.attributes.get(name) for elem in self._node.css(css)]
+
+    def attr(self, name: str) -> Optional[str]:
+        return self._node.attributes.get(name)
+
+    @property
+    def attributes(self) -> Dict[str, str]:
+        return self._node.attributes
+
+    def text(self, separator: str = '', strip: bool = False, exclude: Iterable[str] = ()) -> str:
+        node = self._node
+        if exclude:
+            # Copie détachée : le document n'est pas modifié
+            node = node.clone()
+            node.strip_tags(list(exclude))
+        parts = (child.text_content for child in node.traverse(include_text=True)
+                 if child.is_text_node and child.parent.tag not in NON_TEXT_TAGS)
+        return _join_text(parts, separator, strip)
+
+    def remove(self, tags: Iterable[str]):
+        self._node.strip_tags(list(tags))
+
+
+def _parse_selectolax(html: str) -> HTMLNode:
+    return LexborNode(LexborHTMLParser(html).root)
+
+
+def _parse_lxml(html: str) -> HTMLNode:
+    try:
+        return LxmlNode(lxml.html.document_fromstring(html))
+    except ValueError:
+        # Pages XHTML : lxml refuse une déclaration d'encodage dans une chaîne déjà décodée
+        stripped = XML_DECLARATION_RE.sub('', html, count=1)
+        if stripped == html:
+            raise
+        return _parse_lxml(stripped)
+    except etree.ParserError:
+        # Document vide
+        return LxmlNode(lxml.html.document_fromstring('<html></html>'))
+
+
+def _parse_soup_lxml(html: str) -> HTMLNode:
+    return SoupNode(BeautifulSoup(html, 'lxml'))
+
+
+def _parse_soup(html: str) -> HTMLNode:
+    return SoupNode(BeautifulSoup(html, 'html.parser'))
+
+
+PARSERS = {
+    'selectolax': _parse_selectolax,
+    'lxml': _parse_lxml,
+    'bs4-lxml': _parse_soup_lxml,
+    'bs4': _parse_soup,
+}
+
+
+def available_backends() -> List[str]:
+    """Moteurs installés, par ordre de préférence"""
+    installed = {
+        'selectolax': LexborHTMLParser is not None,
+        'lxml': lxml is not None and HTMLTranslator is not None,
+        'bs4-lxml': lxml is not None,
+        'bs4': True,
+    }
+    return [name for name in BACKENDS if installed[name]]
+
+
+@lru_cache(maxsize=1)
+def default_backend() -> str:
+    """Moteur utilisé par défaut (HTML_PARSER_BACKEND, sinon le plus rapide installé)"""
+    available = available_backends()
+    requested = os.getenv('HTML_PARSER_BACKEND')
+    if requested:
+        if requested not in available:
+            raise ValueError(f"Moteur HTML '{requested}' indisponible (installés: {', '.join(available)})")
+        return requested
+    return available[0]
+
+
+def parse_html(html: str, backend: Optional[str] = None) -> HTMLNode:
+    """
+    Parser un document HTML
+
+    Args:
+        html: Code HTML
+        backend: Moteur à utiliser (défaut: default_backend())
+
+    Returns:
+        Élément racine du document
+    """
+    return PARSERS[backend or default_backend()](html or '')
@@ -0,0 +1,303 @@
+"""
+Couche HTTP partagée par les scrapers RSS et HTML
+Connexions keep-alive mutualisées, limitation de débit par hôte
+et téléchargements concurrents bornés (asyncio + httpx)
+"""
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Dict, Iterable, List, Optional, TypeVar
+from urllib.parse import urlparse
+
+import httpx
+
+
+T = TypeVar('T')
+
+
+DEFAULT_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+)
+
+
+@dataclass
+class FetchResult:
+    """Résultat d'un téléchargement"""
+    url: str
+    status_code: int = 0
+    text: str = ''
+    content: bytes = b''
+    headers: Dict[str, str] = field(default_factory=dict)
+    final_url: str = ''
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True si la requête a abouti avec un code 2xx"""
+        return self.error is None and 200 <= self.status_code < 300
+
+    @property
+    def not_modified(self) -> bool:
+        """True si le serveur a répondu 304 (ressource inchangée)"""
+        return self.status_code == 304
+
+    @property
+    def validators(self) -> Optional[Dict[str, str]]:
+        """Validateurs (ETag / Last-Modified) de la réponse, None si absents"""
+        etag = self.headers.get('etag')
+        last_modified = self.headers.get('last-modified')
+        if not etag and not last_modified:
+            return None
+        return {'etag': etag, 'last_modified': last_modified}
+
+
+class HostRateLimiter:
+    """
+    Limiteur de débit par hôte, partagé entre threads et boucles asyncio
+    Un créneau n'est pris qu'au moment de l'envoi : une requête annulée
+    pendant son attente ne retarde pas les suivantes
+    """
+
+    def __init__(self, min_interval: float = 0.25):
+        """
+        Args:
+            min_interval: Intervalle minimum (secondes) entre deux requêtes vers un même hôte
+        """
+        self.min_interval = min_interval
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def try_acquire(self, host: str) -> float:
+        """
+        Prendre le créneau de l'hôte s'il est libre
+
+        Returns:
+            0 si le créneau est pris, sinon le délai (secondes) avant de réessayer
+        """
+        if self.min_interval <= 0:
+            return 0.0
+
+        now = time.monotonic()
+        with self._lock:
+            next_slot = self._next_slot.get(host, 0.0)
+            if now >= next_slot:
+                self._next_slot[host] = now + self.min_interval
+                return 0.0
+        return next_slot - now
+
+    def wait(self, host: str):
+        """Attendre (bloquant) le prochain créneau libre de l'hôte"""
+        delay = self.try_acquire(host)
+        while delay > 0:
+            time.sleep(delay)
+            delay = self.try_acquire(host)
+
+    async def wait_async(self, host: str):
+        """Attendre (asyncio) le prochain créneau libre de l'hôte"""
+        delay = self.try_acquire(host)
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self.try_acquire(host)
+
+
+async def first_in_order(probes: Iterable[Awaitable[Optional[T]]]) -> Optional[T]:
+    """
+    Lancer des sondes simultanément et renvoyer le premier résultat valide par ordre
+    de préférence, dès que toutes les sondes mieux classées ont échoué : une sonde
+    lente moins bien classée ne retarde pas le résultat, et les sondes restantes
+    sont annulées
+
+    Args:
+        probes: Sondes par ordre de préférence (résultat None ou vide = échec)
+
+    Returns:
+        Premier résultat valide ou None
+    """
+    tasks = [asyncio.ensure_future(probe) for probe in probes]
+    try:
+        for task in tasks:
+            result = await task
+            if result:
+                return result
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Limiteur commun à tous les scrapers du processus (collecte multi-sites incluse)
+_shared_rate_limiter = HostRateLimiter()
+
+
+class HttpFetcher:
+    """Client HTTP utilisé par les scrapers (API synchrone et asynchrone)"""
+
+    def __init__(self, timeout: int = 30, max_in_flight: int = 10,
+                 max_connections: int = 20, headers: Optional[Dict[str, str]] = None,
+                 rate_limiter: Optional[HostRateLimiter] = None):
+        """
+        Initialise le client
+
+        Args:
+            timeout: Timeout des requêtes (secondes)
+            max_in_flight: Nombre maximum de requêtes simultanées dans fetch_many
+            max_connections: Taille du pool de connexions keep-alive
+            headers: En-têtes envoyés avec chaque requête
+            rate_limiter: Limiteur par hôte (par défaut, celui partagé par le processus)
+        """
+        self.timeout = timeout
+        self.max_in_flight = max(1, max_in_flight)
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections
+        )
+        self.headers = {'User-Agent': DEFAULT_USER_AGENT}
+        if headers:
+            self.headers.update(headers)
+        self.rate_limiter = rate_limiter or _shared_rate_limiter
+        self._client: Optional[httpx.Client] = None
+
+    # ==================== API SYNCHRONE ====================
+
+    @property
+    def client(self) -> httpx.Client:
+        """Client synchrone (pool keep-alive) créé à la demande"""
+        if self._client is None:
+            self._client = httpx.Client(
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                follow_redirects=True
+            )
+        return self._client
+
+    def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """
+        Télécharger une URL
+
+        Args:
+            url: URL à télécharger
+            headers: En-têtes supplémentaires pour cette requête
+
+        Returns:
+            FetchResult (error renseigné en cas d'échec)
+        """
+        self.rate_limiter.wait(self._host(url))
+
+        try:
+            response = self.client.get(url, headers=headers)
+            return self._to_result(url, response)
+        except Exception as e:
+            return FetchResult(url=url, error=str(e) or e.__class__.__name__)
+
+    def fetch_many(self, urls: List[str], headers: Optional[Dict[str, str]] = None) -> List[FetchResult]:
+        """
+        Télécharger plusieurs URLs en parallèle (attentes réseau superposées)
+
+        Args:
+            urls: URLs à télécharger
+            headers: En-têtes supplémentaires pour ces requêtes
+
+        Returns:
+            Liste de FetchResult dans le même ordre que urls
+        """
+        if not urls:
+            return []
+        return asyncio.run(self._fetch_all(urls, headers))
+
+    def close(self):
+        """Fermer les connexions du pool synchrone"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    # ==================== API ASYNCHRONE ====================
+
+    def async_client(self) -> httpx.AsyncClient:
+        """Créer un client asynchrone configuré comme le client synchrone"""
+        return httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            limits=self.limits,
+            follow_redirects=True
+        )
+
+    async def fetch_async(self, client: httpx.AsyncClient, url: str,
+                          headers: Optional[Dict[str, str]] = None,
+                          semaphore: Optional[asyncio.Semaphore] = None) -> FetchResult:
+        """
+        Télécharger une URL avec un client asynchrone
+        Le créneau de l'hôte est pris juste avant l'envoi, une fois la place obtenue
+        dans le sémaphore : l'attente du sémaphore ne décale pas l'espacement des requêtes
+        """
+        try:
+            if semaphore is None:
+                response = await self._get_async(client, url, headers)
+            else:
+                async with semaphore:
+                    response = await self._get_async(client, url, headers)
+            return self._to_result(url, response)
+        except Exception as e:
+            return FetchResult(url=url, error=str(e) or e.__class__.__name__)
+
+    async def _get_async(self, client: httpx.AsyncClient, url: str,
+                         headers: Optional[Dict[str, str]]) -> httpx.Response:
+        """Attendre le créneau de l'hôte puis envoyer la requête"""
+        await self.rate_limiter.wait_async(self._host(url))
+        return await client.get(url, headers=headers)
+
+    async def _fetch_all(self, urls: List[str], headers: Optional[Dict[str, str]]) -> List[FetchResult]:
+        """Télécharger toutes les URLs avec au plus max_in_flight requêtes en vol"""
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        async with self.async_client() as client:
+            return await asyncio.gather(*(
+                self.fetch_async(client, url, headers, semaphore) for url in urls
+            ))
+
+    # ==================== UTILITAIRES ====================
+
+    @staticmethod
+    def conditional_headers(validators: Optional[Dict[str, str]]) -> Dict[str, str]:
+        """
+        En-têtes de requête conditionnelle à partir des validateurs mémorisés
+
+        Args:
+            validators: Dictionnaire {'etag', 'last_modified'} ou None
+
+        Returns:
+            En-têtes If-None-Match / If-Modified-Since (vide si aucun validateur)
+        """
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return urlparse(url).netloc.lower()
+
+    @staticmethod
+    def _to_result(url: str, response: httpx.Response) -> FetchResult:
+        """Convertir une réponse httpx en FetchResult"""
+        result = FetchResult(
+            url=url,
+            status_code=response.status_code,
+            content=response.content,
+            headers={k.lower(): v for k, v in response.headers.items()},
+            final_url=str(response.url)
+        )
+        try:
+            result.text = response.text
+        except Exception:
+            result.text = response.content.decode('utf-8', errors='replace')
+
+        if response.status_code >= 400:
+            result.error = f"HTTP {response.status_code}"
+        return result
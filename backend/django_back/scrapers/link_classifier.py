@@ -0,0 +1,151 @@
+"""
+Repérage des liens d'articles parmi les liens d'une page d'accueil
+Les portails d'information (lefaso.net...) ont plus de 1 500 liens par page :
+les règles d'exclusion sont compilées en une seule expression régulière,
+l'URL de base est analysée une fois par site et chaque href distinct n'est
+résolu et classé qu'une fois.
+"""
+
+import re
+from typing import Iterable, List, Optional, Set
+from urllib.parse import ParseResult, urljoin, urlparse
+
+
+# Patterns à exclure (pages système, médias, etc.)
+EXCLUDED_PATTERNS = [
+    # Pages système
+    '/wp-admin', '/wp-content', '/wp-includes', '/wp-json',
+    '/feed', '/rss', '/atom',
+    '/cdn-cgi/', '/cgi-bin/',
+
+    # Pages de navigation
+    '/category/', '/categories/', '/tag/', '/tags/',
+    '/author/', '/authors/', '/page/', '/search/',
+    '/archives/', '/archive/',
+
+    # Pages statiques
+    '/contact', '/about', '/a-propos', '/qui-sommes-nous',
+    '/mentions-legales', '/politique', '/privacy',
+    '/conditions', '/terms', '/legal',
+    '/notre-equipe', '/equipe', '/service',
+    '/nous-ecrire', '/mon-compte', '/login', '/register',
+
+    # Fichiers médias
+    '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp',
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx',
+    '.zip', '.rar', '.tar', '.gz',
+    '.mp3', '.mp4', '.avi', '.mov',
+    '.css', '.js', '.json', '.xml',
+
+    # Autres
+    '/comments', '/comment', '/reply',
+    '#comment', '#respond',
+]
+
+# Un seul passage sur l'URL en minuscules : un des patterns exclus, ou une URL
+# d'archive (qui se termine par /YYYY/MM/ ou /YYYY/)
+EXCLUDED_RE = re.compile('|'.join([*(re.escape(pattern) for pattern in EXCLUDED_PATTERNS),
+                                   r'/\d{4}(?:/\d{2})?/?$']))
+
+# Lien absolu ou sans schéma : hôte lu directement dans le href (même découpage
+# que urlsplit ; les href avec espaces ou crochets passent par urljoin)
+HOST_RE = re.compile(r'(?:https?:)?//([^/?#\s\[\]]+)(?=[/?#]|$)')
+
+# Chemin absolu que urljoin recopierait tel quel après l'origine du site : segments
+# non vides, sans paramètres (;) ni espaces, requête et ancre non vides
+ROOT_PATH_RE = re.compile(r'(?:/[^/?#;\s]+)+/?(?:\?[^#\s]+)?(?:#\S+)?')
+
+YEAR_RE = re.compile(r'/\d{4}/')
+YEAR_SEGMENT_RE = re.compile(r'^\d{4}$')
+
+
+class LinkClassifier:
+    """Classement des liens d'un site : URLs internes probablement des articles"""
+
+    def __init__(self, base_url: str):
+        """
+        Args:
+            base_url: URL de base du site (résolution des liens relatifs)
+        """
+        self.base_url = base_url.rstrip('/')
+        parsed = urlparse(base_url)
+        self.domain = parsed.netloc
+        # Origine à laquelle sont ajoutés les chemins absolus (schémas résolus par urljoin)
+        self.origin = f"{parsed.scheme}://{parsed.netloc}" if parsed.scheme in ('http', 'https') else None
+
+    def article_links(self, hrefs: Iterable[Optional[str]], max_links: int = 100) -> List[str]:
+        """
+        Trouver les URLs d'articles parmi les liens d'une page
+
+        Args:
+            hrefs: Attributs href des liens, dans l'ordre de la page
+            max_links: Nombre maximum de liens à retourner
+
+        Returns:
+            URLs absolues des articles, dans l'ordre de la page et sans doublons
+        """
+        links = []
+        accepted: Set[str] = set()
+        # Un href déjà vu donne le même résultat : inutile de le résoudre à nouveau
+        seen_hrefs: Set[str] = set()
+
+        for href in hrefs:
+            if len(links) >= max_links:
+                break
+            if not href or href in seen_hrefs:
+                continue
+            seen_hrefs.add(href)
+
+            # Lien vers un autre site : inutile de le résoudre
+            host = HOST_RE.match(href)
+            if host and host.group(1) != self.domain:
+                continue
+
+            # Convertir en URL absolue
+            if self.origin and ROOT_PATH_RE.fullmatch(href) and '/.' not in href:
+                full_url = self.origin + href
+            else:
+                full_url = urljoin(self.base_url, href)
+            if full_url in accepted:
+                continue
+
+            # Lien interne et probablement un article
+            parsed = urlparse(full_url)
+            if parsed.netloc == self.domain and self._is_article(full_url, parsed):
+                links.append(full_url)
+                accepted.add(full_url)
+
+        return links
+
+    def is_article_url(self, url: str) -> bool:
+        """
+        Vérifier si une URL est probablement un article
+
+        Args:
+            url: URL absolue à vérifier
+
+        Returns:
+            True si c'est probablement un article
+        """
+        return self._is_article(url, urlparse(url))
+
+    @staticmethod
+    def _is_article(url: str, parsed: ParseResult) -> bool:
+        # Pages système, navigation, pages statiques, fichiers et archives
+        if EXCLUDED_RE.search(url.lower()):
+            return False
+
+        # Exclure les URLs trop courtes (juste le domaine)
+        path = parsed.path.strip('/')
+        if not path:
+            return False
+
+        # Si l'URL contient une année, il doit y avoir un segment après (le titre)
+        if YEAR_RE.search(url):
+            segments = [segment for segment in path.split('/') if segment]
+            for i, segment in enumerate(segments):
+                if YEAR_SEGMENT_RE.match(segment):
+                    return i < len(segments) - 1
+
+        return True
+
@@ -4,31 +4,55 @@ Scraper RSS pour récupérer les articles via les flux RSS
 Plus rapide et plus fiable que le scraping HTML pur
 """
 
-import requests
+import asyncio
 import feedparser
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
 
 from database.models import Article
+from .http_fetcher import HttpFetcher, first_in_order
+from .html_parser import parse_html
+from .article_extractor import ArticleExtractor, RSS_CONTENT_SELECTORS
 
 
 class RSScraper:
     """Scraper basé sur les flux RSS"""
     
-    def __init__(self, base_url: str, timeout: int = 30):
+    def __init__(self, base_url: str, timeout: int = 30, feed_url: Optional[str] = None,
+                 validator_store=None,
+                 known_urls_lookup: Optional[Callable[[Iterable[str]], Set[str]]] = None):
         """
         Initialise le scraper RSS
         
         Args:
             base_url: URL de base du site
             timeout: Timeout pour les requêtes HTTP
+            feed_url: Flux mémorisé lors d'une précédente détection
+                      ('' = aucun flux, None = inconnu, détection nécessaire)
+            validator_store: Source des validateurs HTTP mémorisés
+                             (objet exposant get_http_validators, ex: DatabaseManager)
+            known_urls_lookup: Fonction (urls) -> URLs déjà en base, pour ne pas
+                               retélécharger les articles connus
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.domain = urlparse(base_url).netloc
         
+        # Résultat de la détection du flux (à mémoriser par l'appelant si feed_discovered)
+        self.feed_url = feed_url
+        self.feed_discovered = False
+        
+        # Requêtes conditionnelles : not_modified passe à True si le flux a répondu 304,
+        # fresh_validators contient les validateurs reçus (à mémoriser par l'appelant)
+        self.validator_store = validator_store
+        self.not_modified = False
+        self.fresh_validators: Dict[str, Dict[str, str]] = {}
+        
+        # Articles du flux déjà en base (ignorés avant téléchargement)
+        self.known_urls_lookup = known_urls_lookup
+        self.known_count = 0
+        
         # URLs RSS communes
         self.rss_urls = [
             f"{self.base_url}/feed/",
@@ -42,56 +66,98 @@ class RSScraper:
             f"{self.base_url}/spip.php?page=backend",  # Pour SPIP (lefaso.net)
         ]
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        # Client HTTP partagé (keep-alive, limitation par hôte, requêtes parallèles)
+        self.fetcher = HttpFetcher(timeout=timeout)
+        
+        # Contenu des pages articles (un seul parcours, paragraphes de <article> à défaut)
+        self.extractor = ArticleExtractor(self.base_url, content_selectors=RSS_CONTENT_SELECTORS,
+                                          content_max_length=None, paragraph_fallback=True)
     
-    def find_rss_feed(self) -> Optional[str]:
+    def find_rss_feed(self, use_cache: bool = True) -> Optional[str]:
         """
         Trouver automatiquement le flux RSS du site
         
+        Args:
+            use_cache: Utiliser le flux mémorisé s'il est connu
+        
         Returns:
             URL du flux RSS ou None
         """
+        if use_cache and self.feed_url is not None:
+            if self.feed_url:
+                print(f"   ✅ Flux RSS (cache): {self.feed_url}")
+                return self.feed_url
+            print(f"   ℹ️ Aucun flux RSS (cache)")
+            return None
+        
         print(f"   🔍 Recherche du flux RSS...")
         
-        # Tester les URLs RSS communes
-        for rss_url in self.rss_urls:
-            try:
-                response = self.session.get(rss_url, timeout=self.timeout)
-                if response.status_code == 200:
-                    # Vérifier que c'est bien un flux RSS/Atom
-                    content_type = response.headers.get('content-type', '').lower()
-                    if 'xml' in content_type or 'rss' in content_type or 'atom' in content_type:
-                        print(f"   ✅ Flux RSS trouvé: {rss_url}")
-                        return rss_url
-                    
-                    # Vérifier le contenu
-                    if b'<rss' in response.content or b'<feed' in response.content:
-                        print(f"   ✅ Flux RSS trouvé: {rss_url}")
-                        return rss_url
-            except:
-                continue
+        # Tester toutes les URLs candidates en parallèle, la première valide par ordre de préférence l'emporte
+        try:
+            feed_url = asyncio.run(self._discover_feed())
+        except Exception as e:
+            print(f"   ⚠️ Erreur recherche flux RSS: {e}")
+            return None
+        
+        self.feed_url = feed_url or ''
+        self.feed_discovered = True
+        
+        if feed_url:
+            print(f"   ✅ Flux RSS trouvé: {feed_url}")
+        else:
+            print(f"   ❌ Aucun flux RSS trouvé")
+        return feed_url
+    
+    async def _discover_feed(self) -> Optional[str]:
+        """
+        Sonder les URLs RSS communes et la page d'accueil simultanément ;
+        le premier flux valide par ordre de préférence l'emporte et les
+        sondes restantes sont annulées
+        
+        Returns:
+            URL du flux RSS ou None
+        """
+        async with self.fetcher.async_client() as client:
+            probes = [self._probe_feed_url(client, rss_url) for rss_url in self.rss_urls]
+            probes.append(self._probe_homepage(client))
+            return await first_in_order(probes)
+    
+    async def _probe_feed_url(self, client, rss_url: str) -> Optional[str]:
+        """Vérifier qu'une URL candidate renvoie bien un flux RSS/Atom"""
+        response = await self.fetcher.fetch_async(client, rss_url)
+        if response.status_code != 200:
+            return None
+        
+        # Vérifier que c'est bien un flux RSS/Atom
+        content_type = response.headers.get('content-type', '').lower()
+        if 'xml' in content_type or 'rss' in content_type or 'atom' in content_type:
+            return rss_url
+        
+        # Vérifier le contenu
+        if b'<rss' in response.content or b'<feed' in response.content:
+            return rss_url
+        
+        return None
+    
+    async def _probe_homepage(self, client) -> Optional[str]:
+        """Chercher un flux déclaré dans les balises <link> de la page d'accueil"""
+        response = await self.fetcher.fetch_async(client, self.base_url)
+        if response.status_code != 200:
+            return None
         
-        # Chercher dans la page d'accueil
         try:
-            response = self.session.get(self.base_url, timeout=self.timeout)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Chercher les balises <link> avec type RSS/Atom
-                for link in soup.find_all('link', type=['application/rss+xml', 'application/atom+xml']):
-                    href = link.get('href')
-                    if href:
-                        if not href.startswith('http'):
-                            href = f"{self.base_url}{href}" if href.startswith('/') else f"{self.base_url}/{href}"
-                        print(f"   ✅ Flux RSS trouvé dans la page: {href}")
-                        return href
-        except:
+            doc = parse_html(response.text)
+            
+            # Chercher les balises <link> avec type RSS/Atom
+            for link in doc.select('link[type="application/rss+xml"], link[type="application/atom+xml"]'):
+                href = link.attr('href')
+                if href:
+                    if not href.startswith('http'):
+                        href = f"{self.base_url}{href}" if href.startswith('/') else f"{self.base_url}/{href}"
+                    return href
+        except Exception:
             pass
         
-        print(f"   ❌ Aucun flux RSS trouvé")
         return None
     
     def parse_rss_date(self, date_str: str) -> Optional[datetime]:
@@ -133,6 +199,36 @@ class RSScraper:
         
         return None
     
+    def _fetch_feed(self, rss_url: str):
+        """
+        Télécharger et parser un flux avec une requête conditionnelle
+        
+        Args:
+            rss_url: URL du flux
+        
+        Returns:
+            Flux parsé par feedparser, ou None si inchangé (304) ou en erreur
+        """
+        validators = None
+        if self.validator_store is not None:
+            validators = self.validator_store.get_http_validators(rss_url)
+        
+        response = self.fetcher.fetch(rss_url, headers=HttpFetcher.conditional_headers(validators))
+        
+        if response.not_modified:
+            self.not_modified = True
+            print(f"   ♻️ Flux inchangé depuis la dernière collecte (304)")
+            return None
+        
+        if not response.ok:
+            print(f"   ⚠️ Erreur téléchargement flux: {response.error}")
+            return None
+        
+        if response.validators:
+            self.fresh_validators[rss_url] = response.validators
+        
+        return feedparser.parse(response.content, response_headers=response.headers)
+    
     def get_articles_from_rss(self, days: int = 30, max_articles: int = 100) -> List[dict]:
         """
         Récupérer les articles depuis le flux RSS
@@ -152,10 +248,22 @@ class RSScraper:
         print(f"   📡 Lecture du flux RSS...")
         
         try:
-            # Parser le flux RSS
-            feed = feedparser.parse(rss_url)
+            # Télécharger et parser le flux RSS
+            feed = self._fetch_feed(rss_url)
+            if self.not_modified:
+                return []
+            
+            # Flux mémorisé devenu invalide : relancer la détection
+            if (feed is None or not feed.entries) and not self.feed_discovered:
+                print(f"   🔄 Flux mémorisé vide ou invalide, nouvelle détection...")
+                rss_url = self.find_rss_feed(use_cache=False)
+                if not rss_url:
+                    return []
+                feed = self._fetch_feed(rss_url)
+                if self.not_modified:
+                    return []
             
-            if not feed.entries:
+            if feed is None or not feed.entries:
                 print(f"   ⚠️ Aucune entrée dans le flux RSS")
                 return []
             
@@ -196,8 +304,7 @@ class RSScraper:
                     
                     # Nettoyer le HTML du résumé
                     if description:
-                        soup = BeautifulSoup(description, 'html.parser')
-                        description = soup.get_text().strip()
+                        description = parse_html(description).text().strip()
                     
                     # Auteur
                     auteur = None
@@ -252,46 +359,26 @@ class RSScraper:
         Returns:
             Contenu de l'article ou None
         """
-        try:
-            response = self.session.get(url, timeout=self.timeout)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Sélecteurs pour le contenu principal
-            content_selectors = [
-                'article .entry-content',
-                'article .post-content',
-                '.article-content',
-                '.post-content',
-                '.entry-content',
-                'article .content',
-                '[itemprop="articleBody"]',
-                '.article-body',
-                'main article',
-            ]
-            
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # Nettoyer le contenu
-                    for tag in content_elem.find_all(['script', 'style', 'iframe', 'nav', 'aside']):
-                        tag.decompose()
-                    
-                    text = content_elem.get_text(separator='\n', strip=True)
-                    if len(text) > 100:  # Au moins 100 caractères
-                        return text
-            
-            # Fallback: chercher tous les paragraphes dans article
-            article_elem = soup.find('article')
-            if article_elem:
-                paragraphs = article_elem.find_all('p')
-                text = '\n\n'.join([p.get_text(strip=True) for p in paragraphs if len(p.get_text(strip=True)) > 20])
-                if len(text) > 100:
-                    return text
-            
+        response = self.fetcher.fetch(url)
+        if not response.ok:
             return None
         
+        return self._parse_article_content(response.text)
+    
+    def _parse_article_content(self, html: str) -> Optional[str]:
+        """
+        Extraire le contenu principal d'une page article déjà téléchargée
+        
+        Args:
+            html: Code HTML de la page
+        
+        Returns:
+            Contenu de l'article ou None
+        """
+        try:
+            page = self.extractor.collect(parse_html(html), ('contenu',))
+            return self.extractor.content(page) or None
+        
         except Exception as e:
             return None
     
@@ -313,18 +400,33 @@ class RSScraper:
         rss_articles = self.get_articles_from_rss(days, max_articles)
         
         if not rss_articles:
-            print(f"   ⚠️ Aucun article trouvé dans le flux RSS")
+            if not self.not_modified:
+                print(f"   ⚠️ Aucun article trouvé dans le flux RSS")
             return []
         
+        # Ignorer les articles déjà en base avant de télécharger leur contenu
+        if self.known_urls_lookup is not None:
+            known = self.known_urls_lookup([a['url'] for a in rss_articles])
+            if known:
+                rss_articles = [a for a in rss_articles if a['url'] not in known]
+                self.known_count = len(known)
+                print(f"   ⏭️ {self.known_count} articles déjà en base ignorés")
+            
+            if not rss_articles:
+                return []
+        
         articles = []
         
-        print(f"   📄 Scraping du contenu complet...")
-        for i, rss_article in enumerate(rss_articles, 1):
+        # Télécharger toutes les pages en parallèle (requêtes bornées, débit limité par hôte)
+        print(f"   📄 Scraping du contenu complet ({len(rss_articles)} pages)...")
+        pages = self.fetcher.fetch_many([rss_article['url'] for rss_article in rss_articles])
+        
+        for i, (rss_article, page) in enumerate(zip(rss_articles, pages), 1):
             try:
                 print(f"   Article {i}/{len(rss_articles)}: {rss_article['url'][:80]}...")
                 
-                # Scraper le contenu complet
-                contenu = self.scrape_article_content(rss_article['url'])
+                # Extraire le contenu complet
+                contenu = self._parse_article_content(page.text) if page.ok else None
                 
                 # Si pas de contenu, utiliser la description du RSS
                 if not contenu:
@@ -1,21 +1,30 @@
 """
 Gestionnaire principal de scraping avec fallback automatique
-Priorité: RSS > HTML Scraping
-Classification automatique après scraping
+Priorité: API WordPress > RSS > HTML Scraping
+Les nouveaux articles sont mis en file pour la classification (analysis/queue_worker.py)
 """
 
-from typing import List, Tuple
+from datetime import datetime
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse
 
 from database.db_manager import DatabaseManager
-from database.models import Article
+from database.models import Article, Media
+from .wordpress_scraper import WordPressScraper
 from .rss_scraper import RSScraper
 from .smart_html_scraper import SmartHTMLScraper
-from analysis.theme_classifier import ThemeClassifier
+from .crawl_engine import CrawlEngine, SiteResult
+from analysis.queue_worker import JOB_CLASSIFY
 
 
 class ScraperManager:
-    """Gestionnaire de scraping intelligent avec RSS et HTML"""
+    """Gestionnaire de scraping intelligent avec API WordPress, RSS et HTML"""
+    
+    # Durée de validité du flux RSS mémorisé (ou de l'absence de flux)
+    RSS_FEED_TTL_HOURS = 24
+    
+    # Durée de validité de l'API WordPress et du sitemap mémorisés (ou de leur absence)
+    SOURCE_TTL_HOURS = 24
     
     def __init__(self, db_manager: DatabaseManager, auto_classify: bool = True):
         """
@@ -23,27 +32,14 @@ class ScraperManager:
         
         Args:
             db_manager: Instance de DatabaseManager
-            auto_classify: Activer la classification automatique après scraping
+            auto_classify: Mettre les nouveaux articles en file de classification
         """
         self.db = db_manager
         self.auto_classify = auto_classify
-        self.classifier = None
-        
-        # Initialiser le classificateur si activé
-        if self.auto_classify:
-            try:
-                self.classifier = ThemeClassifier()
-                # Vérifier si Ollama est accessible
-                if not self.classifier.check_ollama_status():
-                    print("⚠️ Ollama non accessible, classification désactivée")
-                    self.auto_classify = False
-            except Exception as e:
-                print(f"⚠️ Erreur initialisation classificateur: {e}")
-                self.auto_classify = False
     
     def scrape_site(self, url: str, days: int = 30) -> Tuple[int, str, str]:
         """
-        Scraper un site avec RSS en priorité, sinon HTML
+        Scraper un site via l'API WordPress en priorité, sinon RSS, sinon HTML
         
         Args:
             url: URL du site à scraper
@@ -64,26 +60,71 @@ class ScraperManager:
         print(f"{'='*60}\n")
         
         try:
-            # Essayer d'abord avec RSS
-            print(f"🔄 Tentative 1/2: Scraping RSS...")
-            rss_scraper = RSScraper(url)
+            # Sources mémorisées lors d'une collecte précédente (flux RSS, API WordPress, sitemap)
+            known_media = self.db.get_media_by_url(url)
+            cached_feed = cached_api = cached_sitemap = None
+            if known_media:
+                cached_feed = self.db.get_media_rss_feed(known_media.id, self.RSS_FEED_TTL_HOURS)
+                cached_api = self.db.get_media_wp_api(known_media.id, self.SOURCE_TTL_HOURS)
+                cached_sitemap = self.db.get_media_sitemap(known_media.id, self.SOURCE_TTL_HOURS)
+            
+            # Essayer d'abord l'API WordPress : articles complets en une ou deux requêtes,
+            # seulement ceux modifiés depuis la dernière collecte
+            print(f"🔄 Tentative 1/3: API WordPress...")
+            wp_scraper = WordPressScraper(url, api_url=cached_api,
+                                          known_urls_lookup=self.db.get_existing_article_urls)
+            articles = wp_scraper.scrape(media_id=0, days=days, modified_after=self._last_scrape(known_media))
+            
+            # Si l'API a répondu (même sans nouvel article)
+            if wp_scraper.available:
+                media_id = self.db.add_media(media_name, url, 'wordpress')
+                self._remember_wp_api(media_id, wp_scraper)
+                
+                for article in articles:
+                    article.media_id = media_id
+                
+                saved_count, new_article_ids = self._save_articles(articles)
+                
+                self.db.update_media_last_scrape(media_id)
+                
+                self.db.add_scraping_log(
+                    media_id=media_id,
+                    status='success',
+                    methode='wordpress_api',
+                    articles_collectes=saved_count,
+                    message=f"{saved_count} articles collectés via l'API WordPress"
+                )
+                
+                return saved_count, 'wordpress_api', f"✅ {saved_count} articles collectés via l'API WordPress"
+            
+            # Sinon essayer avec RSS
+            print(f"\n🔄 Tentative 2/3: Scraping RSS...")
+            rss_scraper = RSScraper(url, feed_url=cached_feed, validator_store=self.db,
+                                    known_urls_lookup=self.db.get_existing_article_urls)
             articles = rss_scraper.scrape(media_id=0, days=days)  # media_id temporaire
             
-            # Si RSS a fonctionné
-            if len(articles) > 0:
+            # Flux inchangé (304) : rien de nouveau pour ce média
+            if rss_scraper.not_modified:
+                media_id = self.db.add_media(media_name, url)
+                self._remember_wp_api(media_id, wp_scraper)
+                return self._finish_not_modified(media_id, 'rss_feed')
+            
+            # Si RSS a fonctionné (nouveaux articles, ou flux entièrement déjà collecté)
+            if len(articles) > 0 or rss_scraper.known_count > 0:
                 # Ajouter ou récupérer le média
                 media_id = self.db.add_media(media_name, url)
+                self._remember_rss_feed(media_id, rss_scraper)
+                self._remember_wp_api(media_id, wp_scraper)
                 
                 # Mettre à jour les media_id
                 for article in articles:
                     article.media_id = media_id
                 
-                # Sauvegarder
+                # Sauvegarder (et mettre en file de classification)
                 saved_count, new_article_ids = self._save_articles(articles)
                 
-                # Classification automatique des nouveaux articles
-                if self.auto_classify and new_article_ids:
-                    self._classify_articles(new_article_ids)
+                # Mémoriser les validateurs du flux une fois les articles enregistrés
+                self.db.save_http_validators(rss_scraper.fresh_validators)
                 
                 # Mettre à jour la date de dernière collecte
                 self.db.update_media_last_scrape(media_id)
@@ -100,21 +141,37 @@ class ScraperManager:
                 return saved_count, 'rss_feed', f"✅ {saved_count} articles collectés via RSS"
             
             # Si RSS n'a pas fonctionné, fallback vers HTML
-            print(f"\n🔄 Tentative 2/2: Scraping HTML...")
-            scraper = SmartHTMLScraper(url)
+            print(f"\n🔄 Tentative 3/3: Scraping HTML...")
+            scraper = SmartHTMLScraper(url, validator_store=self.db,
+                                       known_urls_lookup=self.db.get_existing_article_urls,
+                                       template_store=self.db, sitemap_url=cached_sitemap)
             
             # Ajouter/mettre à jour le média
             media_id = self.db.add_media(media_name, url, 'html')
+            self._remember_rss_feed(media_id, rss_scraper)
+            self._remember_wp_api(media_id, wp_scraper)
             
-            # Scraper les articles
+            # Scraper les articles (liens datés du sitemap, sinon liens de la page d'accueil)
             articles = scraper.scrape(media_id, days=days, max_articles=100)
             
-            # Sauvegarder en base
+            # Mémoriser le résultat d'une nouvelle détection du sitemap
+            if scraper.sitemap.sitemap_discovered:
+                self.db.set_media_sitemap(media_id, scraper.sitemap.sitemap_url)
+            
+            # Page d'accueil inchangée (304) : rien de nouveau pour ce média
+            if scraper.not_modified:
+                return self._finish_not_modified(media_id, 'html_scraping')
+            
+            # Sauvegarder en base (et mettre en file de classification)
             saved_count, new_article_ids = self._save_articles(articles)
             
-            # Classification automatique des nouveaux articles
-            if self.auto_classify and new_article_ids:
-                self._classify_articles(new_article_ids)
+            # Mémoriser les validateurs de la page d'accueil une fois les articles enregistrés
+            # (effacés si un article n'a pas pu être téléchargé : page relue à la prochaine collecte)
+            self.db.save_http_validators(scraper.fresh_validators)
+            
+            # Mémoriser le modèle d'extraction appris (sélecteurs qui ont fonctionné)
+            if scraper.template.changed:
+                self.db.save_site_template(scraper.domain, scraper.template.selectors)
             
             # Mettre à jour la date de dernière collecte
             self.db.update_media_last_scrape(media_id)
@@ -146,91 +203,84 @@ class ScraperManager:
             
             return 0, 'error', error_msg
     
-    def _save_articles(self, articles: List[Article]) -> Tuple[int, List[int]]:
+    def _finish_not_modified(self, media_id: int, methode: str) -> Tuple[int, str, str]:
         """
-        Sauvegarder les articles en base de données
+        Clore la collecte d'un média dont la source n'a pas changé (HTTP 304)
         
         Args:
-            articles: Liste d'articles à sauvegarder
+            media_id: ID du média
+            methode: Source interrogée (rss_feed, html_scraping)
         
         Returns:
-            Tuple (nombre d'articles sauvegardés, liste des IDs des nouveaux articles)
+            Tuple (nombre d'articles, méthode utilisée, message)
         """
-        saved_count = 0
-        duplicate_count = 0
-        new_article_ids = []
-        
-        for article in articles:
-            # Vérifier si l'article existe déjà
-            if not self.db.article_exists(article.url):
-                article_id = self.db.add_article(article)
-                if article_id:
-                    saved_count += 1
-                    new_article_ids.append(article_id)
-            else:
-                duplicate_count += 1
+        self.db.update_media_last_scrape(media_id)
+        self.db.add_scraping_log(
+            media_id=media_id,
+            status='success',
+            methode=methode,
+            articles_collectes=0,
+            message="Source inchangée depuis la dernière collecte (HTTP 304)"
+        )
         
-        if duplicate_count > 0:
-            print(f"   💾 {saved_count} nouveaux articles, {duplicate_count} doublons ignorés")
-        
-        return saved_count, new_article_ids
+        return 0, 'not_modified', "♻️ Source inchangée depuis la dernière collecte (HTTP 304)"
+    
+    def _remember_rss_feed(self, media_id: int, rss_scraper: RSScraper):
+        """Mémoriser le résultat d'une nouvelle détection du flux RSS"""
+        if rss_scraper.feed_discovered:
+            self.db.set_media_rss_feed(media_id, rss_scraper.feed_url)
     
-    def _classify_articles(self, article_ids: List[int]):
+    def _remember_wp_api(self, media_id: int, wp_scraper: WordPressScraper):
+        """Mémoriser le résultat d'une nouvelle détection de l'API WordPress"""
+        if wp_scraper.api_discovered:
+            self.db.set_media_wp_api(media_id, wp_scraper.api_url)
+    
+    @staticmethod
+    def _last_scrape(media: Optional[Media]) -> Optional[datetime]:
+        """Date (UTC) de la dernière collecte d'un média, None si jamais collecté"""
+        if not media or not media.derniere_collecte:
+            return None
+        try:
+            return datetime.fromisoformat(str(media.derniere_collecte))
+        except ValueError:
+            return None
+    
+    def _save_articles(self, articles: List[Article]) -> Tuple[int, List[int]]:
         """
-        Classifier automatiquement les articles
+        Sauvegarder les articles en base de données et mettre les nouveaux
+        en file de classification
         
         Args:
-            article_ids: Liste des IDs d'articles à classifier
-        """
-        if not self.classifier or not article_ids:
-            return
-        
-        print(f"\n🤖 Classification automatique de {len(article_ids)} articles...")
+            articles: Liste d'articles à sauvegarder
         
-        classified_count = 0
-        errors = 0
+        Returns:
+            Tuple (nombre d'articles sauvegardés, liste des IDs des nouveaux articles)
+        """
+        # Insertion groupée et mise en file dans la même transaction (doublons ignorés) :
+        # un arrêt après la collecte ne perd aucun travail de classification
+        with self.db.connection():
+            new_article_ids = self.db.add_articles_bulk(articles)
+            if self.auto_classify:
+                self.db.enqueue_jobs(JOB_CLASSIFY, new_article_ids)
+        saved_count = len(new_article_ids)
+        duplicate_count = len(articles) - saved_count
         
-        for article_id in article_ids:
-            try:
-                # Récupérer l'article
-                article = self.db.get_article(article_id)
-                if not article:
-                    continue
-                
-                # Classifier
-                result = self.classifier.classify_article(
-                    article.get('titre', ''),
-                    article.get('contenu', '')
-                )
-                
-                # Sauvegarder la classification
-                self.db.add_classification(
-                    article_id=article_id,
-                    categorie=result['categorie'],
-                    confiance=result['confiance'],
-                    mots_cles=result.get('mots_cles', []),
-                    justification=result.get('justification', ''),
-                    methode=result.get('methode', 'mistral_ollama')
-                )
-                
-                classified_count += 1
-            
-            except Exception as e:
-                errors += 1
-                continue
+        if duplicate_count > 0:
+            print(f"   💾 {saved_count} nouveaux articles, {duplicate_count} doublons ignorés")
         
-        if classified_count > 0:
-            print(f"   ✅ {classified_count} articles classifiés")
-        if errors > 0:
-            print(f"   ⚠️ {errors} erreurs")
+        return saved_count, new_article_ids
     
-    def scrape_all_sites(self, sites_file: str = None, days: int = 30) -> dict:
+    def scrape_all_sites(self, sites_file: str = None, days: int = 30,
+                         max_workers: int = 8, per_domain: int = 1) -> dict:
         """
         Scraper tous les sites depuis la table media (ou fichier en fallback)
+        Les sites sont traités en parallèle par le moteur de collecte concurrente
         
         Args:
             sites_file: [DEPRECATED] Chemin vers le fichier contenant les URLs (pour compatibilité)
             days: Nombre de jours à récupérer
+            max_workers: Nombre maximum de sites scrapés simultanément
+            per_domain: Nombre maximum de sites scrapés simultanément par domaine
         
         Returns:
             Dictionnaire avec les statistiques
@@ -247,7 +297,8 @@ class ScraperManager:
             return {}
         
         print(f"\n📋 {len(medias)} sites à scraper")
-        print(f"📅 Période: {days} derniers jours\n")
+        print(f"📅 Période: {days} derniers jours")
+        print(f"⚙️ Workers: {max_workers} (max {per_domain} par domaine)\n")
         
         # Statistiques
         stats = {
@@ -255,7 +306,9 @@ class ScraperManager:
             'success': 0,
             'errors': 0,
             'total_articles': 0,
+            'unchanged': 0,
             'by_method': {
+                'wordpress_api': 0,
                 'html_scraping': 0,
                 'rss_feed': 0,
                 'error': 0
@@ -263,30 +316,43 @@ class ScraperManager:
             'details': []
         }
         
-        # Scraper chaque site
-        for i, media in enumerate(medias, 1):
-            print(f"\n[{i}/{len(medias)}] Traitement de {media.nom} ({media.url})...")
-            
-            count, method, message = self.scrape_site(media.url, days=days)
-            
-            if count > 0:
+        def on_result(done: int, total: int, result: SiteResult):
+            print(f"\n[{done}/{total}] {result.media.nom} ({result.media.url}) "
+                  f"terminé en {result.duration:.1f}s")
+            print(result.message)
+        
+        # Scraper les sites en parallèle
+        engine = CrawlEngine(max_workers=max_workers, per_domain=per_domain)
+        results, elapsed = engine.run(
+            medias,
+            lambda media: self.scrape_site(media.url, days=days),
+            on_result=on_result
+        )
+        
+        for result in results:
+            if result.count > 0:
+                stats['success'] += 1
+                stats['total_articles'] += result.count
+            elif result.method == 'not_modified':
                 stats['success'] += 1
-                stats['total_articles'] += count
+                stats['unchanged'] += 1
             else:
                 stats['errors'] += 1
             
-            stats['by_method'][method] = stats['by_method'].get(method, 0) + count
+            stats['by_method'][result.method] = stats['by_method'].get(result.method, 0) + result.count
             
             stats['details'].append({
-                'media_id': media.id,
-                'nom': media.nom,
-                'url': media.url,
-                'articles': count,
-                'method': method,
-                'message': message
+                'media_id': result.media.id,
+                'nom': result.media.nom,
+                'url': result.media.url,
+                'articles': result.count,
+                'method': result.method,
+                'message': result.message,
+                'duration': round(result.duration, 2)
             })
-            
-            print(message)
+        
+        stats['duration'] = round(elapsed, 2)
+        stats['sites_per_minute'] = engine.throughput(len(medias), elapsed)
         
         # Afficher le résumé
         self._print_summary(stats)
@@ -301,13 +367,22 @@ class ScraperManager:
         print(f"\n✅ Sites traités: {stats['total_sites']}")
         print(f"   • Succès: {stats['success']}")
         print(f"   • Erreurs: {stats['errors']}")
+        if stats.get('unchanged'):
+            print(f"   • Inchangés (304): {stats['unchanged']}")
         print(f"\n📰 Total articles collectés: {stats['total_articles']}")
         print(f"\n🔧 Par méthode:")
+        print(f"   • API WordPress: {stats['by_method'].get('wordpress_api', 0)} articles")
+        print(f"   • RSS: {stats['by_method'].get('rss_feed', 0)} articles")
         print(f"   • HTML Scraping: {stats['by_method'].get('html_scraping', 0)} articles")
         
+        if 'duration' in stats:
+            print(f"\n⏱️ Durée totale: {stats['duration']:.1f}s "
+                  f"({stats['sites_per_minute']} sites/minute)")
+        
         print(f"\n📋 Détails par site:")
         for detail in stats['details']:
-            status = "✅" if detail['articles'] > 0 else "❌"
-            print(f"   {status} {detail['url']}: {detail['articles']} articles ({detail['method']})")
+            status = "✅" if detail['articles'] > 0 else ("♻️" if detail['method'] == 'not_modified' else "❌")
+            duration = f", {detail['duration']:.1f}s" if 'duration' in detail else ""
+            print(f"   {status} {detail['url']}: {detail['articles']} articles ({detail['method']}{duration})")
         
         print("\n" + "="*60)
@@ -0,0 +1,208 @@
+"""
+Lecture des sitemaps d'un site (news-sitemap.xml, sitemap.xml, index de sitemaps)
+Les URLs d'articles y sont datées (lastmod, date de publication Google News) :
+seuls les articles de la période sont téléchargés, sans passer par les
+liens de la page d'accueil
+"""
+
+import asyncio
+import gzip
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .http_fetcher import HttpFetcher, FetchResult, first_in_order
+
+
+# Sous-sitemaps lus dans un index : les plus récents suffisent pour la période collectée
+MAX_CHILD_SITEMAPS = 3
+
+
+def parse_sitemap(content: bytes) -> Tuple[bool, List[Tuple[str, Optional[datetime]]]]:
+    """
+    Lire un sitemap ou un index de sitemaps
+
+    Args:
+        content: Contenu du fichier (éventuellement compressé gzip)
+
+    Returns:
+        Tuple (index de sitemaps ?, [(URL, date de publication ou de modification en UTC)])
+    """
+    if content[:2] == b'\x1f\x8b':
+        content = gzip.decompress(content)
+
+    root = ET.fromstring(content)
+    entries = []
+    for entry in root:
+        # Champs directs de l'entrée (les <image:loc> imbriqués sont ignorés)
+        loc, date, news_date = None, None, None
+        for field in entry:
+            name = field.tag.rsplit('}', 1)[-1]
+            if name == 'loc' and field.text:
+                loc = field.text.strip()
+            elif name == 'lastmod':
+                date = parse_w3c_date(field.text)
+            elif name == 'news':
+                for news_field in field:
+                    if news_field.tag.rsplit('}', 1)[-1] == 'publication_date':
+                        news_date = parse_w3c_date(news_field.text)
+        if loc:
+            entries.append((loc, news_date or date))
+
+    return root.tag.rsplit('}', 1)[-1] == 'sitemapindex', entries
+
+
+def parse_w3c_date(date_str: Optional[str]) -> Optional[datetime]:
+    """Parser une date W3C (2024-05-01, 2024-05-01T10:00:00+00:00) en datetime UTC naïf"""
+    if not date_str:
+        return None
+    try:
+        date = datetime.fromisoformat(date_str.strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return date.astimezone(timezone.utc).replace(tzinfo=None) if date.tzinfo else date
+
+
+class SitemapReader:
+    """Détection et lecture du sitemap d'un site"""
+
+    def __init__(self, base_url: str, sitemap_url: Optional[str] = None,
+                 fetcher: Optional[HttpFetcher] = None, timeout: int = 30):
+        """
+        Args:
+            base_url: URL de base du site
+            sitemap_url: Sitemap mémorisé lors d'une précédente détection
+                         ('' = aucun sitemap, None = inconnu, détection nécessaire)
+            fetcher: Client HTTP du scraper (partagé)
+            timeout: Timeout des requêtes si aucun client n'est fourni
+        """
+        self.base_url = base_url.rstrip('/')
+        self.domain = urlparse(base_url).netloc
+        self.fetcher = fetcher or HttpFetcher(timeout=timeout)
+
+        # Résultat de la détection (à mémoriser par l'appelant si sitemap_discovered)
+        self.sitemap_url = sitemap_url
+        self.sitemap_discovered = False
+
+        # Emplacements courants, par ordre de préférence (sitemap Google News d'abord)
+        self.sitemap_urls = [
+            f"{self.base_url}/news-sitemap.xml",
+            f"{self.base_url}/sitemap_news.xml",
+            f"{self.base_url}/sitemap.xml",
+            f"{self.base_url}/sitemap_index.xml",
+            f"{self.base_url}/wp-sitemap.xml",
+        ]
+
+    def find_sitemap(self, use_cache: bool = True) -> Optional[str]:
+        """
+        Trouver le sitemap du site (emplacements courants et robots.txt)
+
+        Args:
+            use_cache: Utiliser le sitemap mémorisé s'il est connu
+
+        Returns:
+            URL du sitemap ou None
+        """
+        if use_cache and self.sitemap_url is not None:
+            return self.sitemap_url or None
+
+        print(f"   🔍 Recherche du sitemap...")
+
+        try:
+            sitemap_url = asyncio.run(self._discover_sitemap())
+        except Exception as e:
+            print(f"   ⚠️ Erreur recherche sitemap: {e}")
+            return None
+
+        self.sitemap_url = sitemap_url or ''
+        self.sitemap_discovered = True
+
+        if sitemap_url:
+            print(f"   ✅ Sitemap trouvé: {sitemap_url}")
+        else:
+            print(f"   ❌ Aucun sitemap trouvé")
+        return sitemap_url
+
+    async def _discover_sitemap(self) -> Optional[str]:
+        """
+        Lire robots.txt, puis sonder les sitemaps déclarés et les emplacements
+        courants simultanément ; le premier valide par ordre de préférence l'emporte
+        et les sondes restantes sont annulées
+
+        Returns:
+            URL du sitemap ou None
+        """
+        async with self.fetcher.async_client() as client:
+            robots = await self.fetcher.fetch_async(client, f"{self.base_url}/robots.txt")
+            declared = []
+            if robots.ok:
+                declared = [line.split(':', 1)[1].strip() for line in robots.text.splitlines()
+                            if line.lower().startswith('sitemap:')]
+
+            # Sitemaps Google News déclarés, emplacements courants, autres sitemaps déclarés
+            candidates = ([url for url in declared if 'news' in url.lower()] + self.sitemap_urls
+                          + [url for url in declared if 'news' not in url.lower()])
+            candidates = [url for url in dict.fromkeys(candidates) if urlparse(url).netloc == self.domain]
+
+            return await first_in_order(self._probe_sitemap(client, url) for url in candidates)
+
+    async def _probe_sitemap(self, client, url: str) -> Optional[str]:
+        """Vérifier qu'une URL candidate renvoie bien un sitemap"""
+        response = await self.fetcher.fetch_async(client, url)
+        return url if self._is_sitemap(response) else None
+
+    @staticmethod
+    def _is_sitemap(response: FetchResult) -> bool:
+        """Vérifier qu'une réponse est bien un sitemap ou un index de sitemaps"""
+        if not response.ok:
+            return False
+        try:
+            _, entries = parse_sitemap(response.content)
+        except (ET.ParseError, OSError, EOFError):
+            return False
+        return bool(entries)
+
+    def entries(self, since: datetime) -> List[Tuple[str, datetime]]:
+        """
+        URLs du sitemap publiées ou modifiées depuis une date, les plus récentes d'abord
+
+        Args:
+            since: Date limite (UTC)
+
+        Returns:
+            Liste de (URL, date) ; les URLs sans date sont ignorées
+        """
+        sitemap_url = self.find_sitemap()
+        if not sitemap_url:
+            return []
+
+        response = self.fetcher.fetch(sitemap_url)
+        try:
+            if not response.ok:
+                raise ValueError(response.error)
+            is_index, entries = parse_sitemap(response.content)
+        except (ValueError, ET.ParseError, OSError, EOFError) as e:
+            # Sitemap mémorisé devenu invalide : relancer la détection
+            if not self.sitemap_discovered:
+                print(f"   🔄 Sitemap mémorisé invalide ({e}), nouvelle détection...")
+                return self.entries(since) if self.find_sitemap(use_cache=False) else []
+            print(f"   ⚠️ Erreur lecture sitemap: {e}")
+            return []
+
+        if is_index:
+            # Sous-sitemaps modifiés dans la période (les plus récents, lus en parallèle)
+            children = sorted(((url, date) for url, date in entries if date and date >= since),
+                              key=lambda entry: entry[1], reverse=True)[:MAX_CHILD_SITEMAPS]
+            entries = []
+            for child in self.fetcher.fetch_many([url for url, _ in children]):
+                if not child.ok:
+                    continue
+                try:
+                    entries.extend(parse_sitemap(child.content)[1])
+                except (ET.ParseError, OSError, EOFError):
+                    continue
+
+        recent = [(url, date) for url, date in entries if date and date >= since]
+        recent.sort(key=lambda entry: entry[1], reverse=True)
+        return recent
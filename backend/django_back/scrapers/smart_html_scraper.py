@@ -3,39 +3,73 @@ Scraper HTML intelligent et ultra-performant
 Fonctionne sur n'importe quel site, n'importe quelle technologie
 """
 
-import requests
-from bs4 import BeautifulSoup
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any, Set
-from urllib.parse import urljoin, urlparse
-import time
-import re
-from dateutil import parser as date_parser
+from typing import List, Optional, Dict, Any, Set, Callable, Iterable
+from urllib.parse import urlparse
 import locale
 
 from database.models import Article
+from .http_fetcher import HttpFetcher
+from .html_parser import HTMLNode, parse_html
+from .article_extractor import ArticleExtractor, SiteTemplate
+from .link_classifier import LinkClassifier
+from .sitemap_reader import SitemapReader
 
 
 class SmartHTMLScraper:
     """Scraper HTML intelligent et générique"""
     
-    def __init__(self, base_url: str, timeout: int = 30):
+    def __init__(self, base_url: str, timeout: int = 30, validator_store=None,
+                 known_urls_lookup: Optional[Callable[[Iterable[str]], Set[str]]] = None,
+                 template_store=None, sitemap_url: Optional[str] = None):
         """
         Initialise le scraper HTML intelligent
         
         Args:
             base_url: URL de base du site
             timeout: Timeout pour les requêtes HTTP (en secondes)
+            validator_store: Source des validateurs HTTP mémorisés
+                             (objet exposant get_http_validators, ex: DatabaseManager)
+            known_urls_lookup: Fonction (urls) -> URLs déjà en base, pour ne pas
+                               retélécharger les articles connus
+            template_store: Source des modèles d'extraction appris par domaine
+                            (objet exposant get_site_template, ex: DatabaseManager)
+            sitemap_url: Sitemap mémorisé lors d'une précédente détection
+                         ('' = aucun sitemap, None = inconnu, détection nécessaire)
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.domain = urlparse(base_url).netloc
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        })
+        # Client HTTP partagé (keep-alive, limitation par hôte, requêtes parallèles)
+        self.fetcher = HttpFetcher(timeout=timeout)
+        
+        # Repérage des liens d'articles (règles compilées, URL de base analysée une fois)
+        self.link_classifier = LinkClassifier(self.base_url)
+        
+        # Sitemap du site : liens d'articles datés (sitemap.sitemap_discovered : détection
+        # à mémoriser par l'appelant)
+        self.sitemap = SitemapReader(self.base_url, sitemap_url, fetcher=self.fetcher)
+        
+        # Extraction des champs en un seul parcours de chaque page
+        self.extractor = ArticleExtractor(self.base_url)
+        
+        # Modèle d'extraction du domaine : sélecteurs qui ont fonctionné, requêtés directement
+        # (template.changed : modèle mis à jour, à mémoriser par l'appelant)
+        self.template_store = template_store
+        self.template = SiteTemplate()
+        
+        # Requêtes conditionnelles : not_modified passe à True si la page d'accueil a répondu 304,
+        # fresh_validators contient les validateurs reçus (à mémoriser par l'appelant ; vides
+        # si un article n'a pas pu être téléchargé, pour relire la page à la prochaine collecte)
+        self.validator_store = validator_store
+        self.not_modified = False
+        self.fresh_validators: Dict[str, Dict[str, str]] = {}
+        
+        # Liens d'articles déjà en base (ignorés avant téléchargement)
+        self.known_urls_lookup = known_urls_lookup
+        self.known_count = 0
     
-    def get_page(self, url: str) -> Optional[BeautifulSoup]:
+    def get_page(self, url: str) -> Optional[HTMLNode]:
         """
         Récupérer et parser une page HTML
         
@@ -43,179 +77,94 @@ class SmartHTMLScraper:
             url: URL de la page
         
         Returns:
-            Objet BeautifulSoup ou None
+            Document parsé ou None
         """
-        try:
-            response = self.session.get(url, timeout=self.timeout, allow_redirects=True)
-            response.raise_for_status()
-            # Utiliser response.text au lieu de response.content pour gérer l'encodage
-            soup = BeautifulSoup(response.text, 'html.parser')
-            # Debug: vérifier que le parsing fonctionne
-            test_links = soup.find_all('a')
-            if len(test_links) == 0:
-                print(f"   ⚠️ Warning: Aucun lien trouvé dans le HTML parsé (taille: {len(response.text)} chars)")
-            return soup
-        except Exception as e:
-            print(f"⚠️ Erreur récupération page {url}: {e}")
+        response = self.fetcher.fetch(url)
+        if not response.ok:
+            print(f"⚠️ Erreur récupération page {url}: {response.error}")
             return None
+        
+        return self._parse_page(response.text)
     
-    def find_article_links(self, soup: BeautifulSoup, max_links: int = 100) -> List[str]:
+    def get_homepage(self) -> Optional[HTMLNode]:
+        """
+        Récupérer la page d'accueil avec une requête conditionnelle
+        
+        Returns:
+            Document parsé, ou None si inchangée (304) ou en erreur
+        """
+        validators = None
+        if self.validator_store is not None:
+            validators = self.validator_store.get_http_validators(self.base_url)
+        
+        response = self.fetcher.fetch(self.base_url, headers=HttpFetcher.conditional_headers(validators))
+        
+        if response.not_modified:
+            self.not_modified = True
+            print(f"   ♻️ Page d'accueil inchangée depuis la dernière collecte (304)")
+            return None
+        
+        if not response.ok:
+            print(f"⚠️ Erreur récupération page {self.base_url}: {response.error}")
+            return None
+        
+        if response.validators:
+            self.fresh_validators[self.base_url] = response.validators
+        
+        return self._parse_page(response.text)
+    
+    def _parse_page(self, html: str) -> HTMLNode:
+        """
+        Parser le HTML d'une page déjà téléchargée (moteur de html_parser)
+        
+        Args:
+            html: Code HTML de la page
+        
+        Returns:
+            Document parsé
+        """
+        return parse_html(html)
+    
+    def find_article_links(self, doc: HTMLNode, max_links: int = 100) -> List[str]:
         """
         Trouver intelligemment les liens vers les articles
         
         Args:
-            soup: Objet BeautifulSoup de la page
+            doc: Document parsé de la page
             max_links: Nombre maximum de liens à retourner
         
         Returns:
             Liste d'URLs d'articles
         """
-        links = []
-        seen_urls: Set[str] = set()
-        
-        # Sélecteurs CSS pour trouver les articles (du plus spécifique au plus général)
-        selectors = [
-            # Sélecteurs WordPress et CMS courants
-            'article.post a[href]',
-            'article a.entry-title[href]',
-            '.post-item a[href]',
-            '.entry-title a[href]',
-            '.post-title a[href]',
-            'article h2 a[href]',
-            'article h3 a[href]',
-            
-            # Sélecteurs génériques
-            'article a[href]',
-            '.article a[href]',
-            '.news-item a[href]',
-            '.post a[href]',
-            '.entry a[href]',
-            
-            # Sélecteurs par structure
-            'main article a[href]',
-            '.content article a[href]',
-            '#content article a[href]',
-            
-            # Titres dans des conteneurs d'articles
-            'h2.entry-title a[href]',
-            'h3.entry-title a[href]',
-            'h2 a[href]',
-            'h3 a[href]',
-            
-            # URLs avec dates (structure /YYYY/MM/DD/ ou /YYYY/MM/)
-            'a[href*="/202"]',  # Articles de 2020-2029
-        ]
-        
         print(f"   🔍 Recherche de liens d'articles...")
         
-        # Recherche directe de tous les liens
-        all_links = soup.find_all('a', href=True)
-        print(f"   📊 {len(all_links)} liens trouvés au total")
+        # Tous les href en un seul appel, classés ensuite en un seul passage
+        hrefs = doc.select_attr('a[href]', 'href')
+        print(f"   📊 {len(hrefs)} liens trouvés au total")
         
-        for link in all_links:
-            if len(links) >= max_links:
-                break
-                
-            href = link.get('href')
-            if not href:
-                continue
-            
-            # Convertir en URL absolue
-            full_url = urljoin(self.base_url, href)
-            
-            # Vérifier que c'est un lien interne
-            if urlparse(full_url).netloc != self.domain:
-                continue
-            
-            # Éviter les doublons
-            if full_url in seen_urls:
-                continue
-            
-            # Vérifier que c'est probablement un article
-            if self._is_article_url(full_url):
-                links.append(full_url)
-                seen_urls.add(full_url)
+        links = self.link_classifier.article_links(hrefs, max_links=max_links)
         
         print(f"   ✅ {len(links)} liens d'articles trouvés")
         return links
     
-    def _is_article_url(self, url: str) -> bool:
+    def find_sitemap_links(self, since: datetime, max_links: int = 100) -> List[str]:
         """
-        Vérifier intelligemment si une URL est un article
+        Trouver les liens d'articles récents dans le sitemap du site
         
         Args:
-            url: URL à vérifier
+            since: Date limite de publication ou de modification
+            max_links: Nombre maximum de liens à retourner
         
         Returns:
-            True si c'est probablement un article
+            Liste d'URLs d'articles, les plus récentes d'abord ([] sans sitemap daté)
         """
-        url_lower = url.lower()
-        
-        # Patterns à exclure (pages système, médias, etc.)
-        excluded_patterns = [
-            # Pages système
-            '/wp-admin', '/wp-content', '/wp-includes', '/wp-json',
-            '/feed', '/rss', '/atom',
-            '/cdn-cgi/', '/cgi-bin/',
-            
-            # Pages de navigation
-            '/category/', '/categories/', '/tag/', '/tags/',
-            '/author/', '/authors/', '/page/', '/search/',
-            '/archives/', '/archive/',
-            
-            # Pages statiques
-            '/contact', '/about', '/a-propos', '/qui-sommes-nous',
-            '/mentions-legales', '/politique', '/privacy',
-            '/conditions', '/terms', '/legal',
-            '/notre-equipe', '/equipe', '/service',
-            '/nous-ecrire', '/mon-compte', '/login', '/register',
-            
-            # Fichiers médias
-            '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp',
-            '.pdf', '.doc', '.docx', '.xls', '.xlsx',
-            '.zip', '.rar', '.tar', '.gz',
-            '.mp3', '.mp4', '.avi', '.mov',
-            '.css', '.js', '.json', '.xml',
-            
-            # Autres
-            '/comments', '/comment', '/reply',
-            '#comment', '#respond',
-        ]
-        
-        for pattern in excluded_patterns:
-            if pattern in url_lower:
-                return False
-        
-        # Exclure les URLs d'archives (qui se terminent par /YYYY/MM/ ou /YYYY/)
-        if re.search(r'/\d{4}(/\d{2})?/?$', url):
-            return False
-        
-        # Exclure les URLs trop courtes (juste le domaine)
-        path = urlparse(url).path.strip('/')
-        if not path or path == '':
-            return False
-        
-        # L'URL doit avoir au moins un segment significatif
-        path_segments = [s for s in path.split('/') if s]
-        if len(path_segments) < 1:
-            return False
-        
-        # Si l'URL contient une année, vérifier qu'il y a un titre après
-        if re.search(r'/\d{4}/', url):
-            # Doit avoir au moins 3 segments après l'année: /YYYY/MM/titre/ ou /YYYY/MM/DD/titre/
-            all_segments = [s for s in path.split('/') if s]
-            year_index = -1
-            for i, seg in enumerate(all_segments):
-                if re.match(r'^\d{4}$', seg):
-                    year_index = i
-                    break
-            
-            if year_index >= 0:
-                # Il doit y avoir au moins un segment après l'année (le titre)
-                if year_index >= len(all_segments) - 1:
-                    return False
+        entries = self.sitemap.entries(since)
+        if not entries:
+            return []
         
-        return True
+        links = self.link_classifier.article_links([url for url, _ in entries], max_links=max_links)
+        print(f"   🗺️ {len(links)} liens d'articles récents dans le sitemap")
+        return links
     
     def scrape_article(self, url: str, media_id: int, date_limit: datetime) -> Optional[Article]:
         """
@@ -229,18 +178,37 @@ class SmartHTMLScraper:
         Returns:
             Objet Article ou None
         """
-        soup = self.get_page(url)
-        if not soup:
+        doc = self.get_page(url)
+        if not doc:
             return None
         
+        return self._parse_article(doc, url, media_id, date_limit)
+    
+    def _parse_article(self, doc: HTMLNode, url: str, media_id: int,
+                       date_limit: datetime) -> Optional[Article]:
+        """
+        Extraire un article depuis une page déjà parsée
+        
+        Args:
+            doc: Document parsé de la page article
+            url: URL de l'article
+            media_id: ID du média
+            date_limit: Date limite (30 jours)
+        
+        Returns:
+            Objet Article ou None
+        """
         try:
+            # Sélecteurs du modèle du site, sinon candidats de tous les champs (un seul parcours)
+            page = self.extractor.collect(doc, template=self.template)
+            
             # Extraction du titre
-            titre = self._extract_title(soup)
+            titre = self.extractor.title(page)
             if not titre:
                 return None
             
             # Extraction de la date
-            date_publication = self._extract_date(soup, url)
+            date_publication = self.extractor.date(page, url)
             
             # Vérifier si l'article est dans la période (30 derniers jours)
             if date_publication:
@@ -250,13 +218,13 @@ class SmartHTMLScraper:
                     return None  # Article trop ancien
             
             # Extraction du contenu
-            contenu = self._extract_content(soup)
+            contenu = self.extractor.content(page)
             
             # Extraction de l'auteur
-            auteur = self._extract_author(soup)
+            auteur = self.extractor.author(page)
             
             # Extraction de l'image
-            image_url = self._extract_image(soup)
+            image_url = self.extractor.image(page)
             
             return Article(
                 media_id=media_id,
@@ -273,212 +241,6 @@ class SmartHTMLScraper:
             print(f"   ⚠️ Erreur extraction article {url}: {e}")
             return None
     
-    def _extract_title(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extraire le titre de l'article"""
-        # Sélecteurs pour le titre (du plus spécifique au plus général)
-        selectors = [
-            'article h1',
-            '.entry-title',
-            '.post-title',
-            'h1.title',
-            'h1.article-title',
-            '.article-header h1',
-            'header h1',
-            'h1',
-        ]
-        
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                titre = elem.get_text(strip=True)
-                if titre and len(titre) > 10:  # Titre significatif
-                    return titre
-        
-        # Fallback: meta title ou title
-        meta_title = soup.find('meta', property='og:title')
-        if meta_title and meta_title.get('content'):
-            return meta_title['content']
-        
-        title_tag = soup.find('title')
-        if title_tag:
-            return title_tag.get_text(strip=True).split('|')[0].split('-')[0].strip()
-        
-        return None
-    
-    def _extract_date(self, soup: BeautifulSoup, url: str) -> Optional[datetime]:
-        """Extraire intelligemment la date de publication"""
-        
-        # 1. Chercher dans les meta tags
-        meta_selectors = [
-            ('meta', 'property', 'article:published_time'),
-            ('meta', 'property', 'og:published_time'),
-            ('meta', 'name', 'publish_date'),
-            ('meta', 'name', 'date'),
-            ('meta', 'itemprop', 'datePublished'),
-        ]
-        
-        for tag, attr, value in meta_selectors:
-            elem = soup.find(tag, {attr: value})
-            if elem and elem.get('content'):
-                try:
-                    return date_parser.parse(elem['content'])
-                except:
-                    pass
-        
-        # 2. Chercher dans les éléments time
-        time_elem = soup.find('time', datetime=True)
-        if time_elem:
-            try:
-                return date_parser.parse(time_elem['datetime'])
-            except:
-                pass
-        
-        # 3. Chercher dans les classes/IDs courants
-        date_selectors = [
-            '.entry-date',
-            '.post-date',
-            '.published',
-            '.date',
-            'time',
-            '.article-date',
-            'span.date',
-        ]
-        
-        for selector in date_selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                date_text = elem.get_text(strip=True)
-                date_obj = self._parse_french_date(date_text)
-                if date_obj:
-                    return date_obj
-        
-        # 4. Extraire de l'URL (structure /YYYY/MM/DD/)
-        url_date = self._extract_date_from_url(url)
-        if url_date:
-            return url_date
-        
-        return None
-    
-    def _parse_french_date(self, date_text: str) -> Optional[datetime]:
-        """Parser une date en français"""
-        try:
-            # Nettoyer le texte
-            date_text = date_text.strip()
-            
-            # Essayer le parser automatique
-            return date_parser.parse(date_text, fuzzy=True)
-        except:
-            pass
-        
-        # Patterns français courants
-        patterns = [
-            r'(\d{1,2})[/-](\d{1,2})[/-](\d{4})',  # DD/MM/YYYY ou DD-MM-YYYY
-            r'(\d{4})[/-](\d{1,2})[/-](\d{1,2})',  # YYYY/MM/DD ou YYYY-MM-DD
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, date_text)
-            if match:
-                try:
-                    groups = match.groups()
-                    if len(groups[0]) == 4:  # YYYY-MM-DD
-                        return datetime(int(groups[0]), int(groups[1]), int(groups[2]))
-                    else:  # DD-MM-YYYY
-                        return datetime(int(groups[2]), int(groups[1]), int(groups[0]))
-                except:
-                    pass
-        
-        return None
-    
-    def _extract_date_from_url(self, url: str) -> Optional[datetime]:
-        """Extraire la date depuis l'URL"""
-        # Pattern: /YYYY/MM/DD/ ou /YYYY/MM/
-        match = re.search(r'/(\d{4})/(\d{2})(?:/(\d{2}))?/', url)
-        if match:
-            try:
-                year = int(match.group(1))
-                month = int(match.group(2))
-                day = int(match.group(3)) if match.group(3) else 1
-                return datetime(year, month, day)
-            except:
-                pass
-        
-        return None
-    
-    def _extract_content(self, soup: BeautifulSoup) -> str:
-        """Extraire le contenu de l'article"""
-        # Sélecteurs pour le contenu
-        selectors = [
-            'article .entry-content',
-            'article .post-content',
-            'article .content',
-            '.entry-content',
-            '.post-content',
-            '.article-content',
-            'article',
-            '.content',
-        ]
-        
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                # Supprimer les scripts, styles, etc.
-                for tag in elem.find_all(['script', 'style', 'iframe', 'nav', 'aside']):
-                    tag.decompose()
-                
-                content = elem.get_text(separator='\n', strip=True)
-                if content and len(content) > 100:  # Contenu significatif
-                    return content[:5000]  # Limiter à 5000 caractères
-        
-        return ""
-    
-    def _extract_author(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extraire l'auteur de l'article"""
-        # Meta tags
-        meta_author = soup.find('meta', attrs={'name': 'author'})
-        if meta_author and meta_author.get('content'):
-            return meta_author['content']
-        
-        # Sélecteurs courants
-        selectors = [
-            '.author-name',
-            '.author',
-            '.by-author',
-            'span.author',
-            'a[rel="author"]',
-        ]
-        
-        for selector in selectors:
-            elem = soup.select_one(selector)
-            if elem:
-                author = elem.get_text(strip=True)
-                if author and len(author) < 100:
-                    return author
-        
-        return None
-    
-    def _extract_image(self, soup: BeautifulSoup) -> Optional[str]:
-        """Extraire l'image principale de l'article"""
-        # Meta tags Open Graph
-        og_image = soup.find('meta', property='og:image')
-        if og_image and og_image.get('content'):
-            return og_image['content']
-        
-        # Image dans l'article
-        selectors = [
-            'article img',
-            '.entry-content img',
-            '.post-thumbnail img',
-            '.featured-image img',
-        ]
-        
-        for selector in selectors:
-            img = soup.select_one(selector)
-            if img and img.get('src'):
-                return urljoin(self.base_url, img['src'])
-        
-        return None
-    
     def scrape(self, media_id: int, days: int = 30, max_articles: int = 100) -> List[Article]:
         """
         Scraper le site complet
@@ -496,29 +258,60 @@ class SmartHTMLScraper:
         # Date limite
         date_limit = datetime.now() - timedelta(days=days)
         
-        # Récupérer la page d'accueil
-        soup = self.get_page(self.base_url)
-        if not soup:
-            return []
+        # Liens datés du sitemap (seulement les articles de la période) : le sitemap évolue
+        # indépendamment de la page d'accueil, il est lu avant toute requête conditionnelle
+        article_links = self.find_sitemap_links(date_limit, max_links=max_articles)
         
-        # Trouver les liens d'articles
-        article_links = self.find_article_links(soup, max_links=max_articles)
+        # Sinon liens de la page d'accueil (304 : rien de nouveau, inutile d'aller plus loin)
+        if not article_links:
+            doc = self.get_homepage()
+            if not doc:
+                return []
+            article_links = self.find_article_links(doc, max_links=max_articles)
+        
+        # Modèle d'extraction appris lors des collectes précédentes
+        if self.template_store is not None:
+            self.template = SiteTemplate(self.template_store.get_site_template(self.domain))
+            if self.template.selectors:
+                print(f"   🧩 Modèle d'extraction connu pour {self.domain}")
         
         if not article_links:
             print("   ⚠️ Aucun lien d'article trouvé")
             return []
         
-        # Scraper chaque article
+        # Ignorer les articles déjà en base avant de les télécharger
+        if self.known_urls_lookup is not None:
+            known = self.known_urls_lookup(article_links)
+            if known:
+                article_links = [link for link in article_links if link not in known]
+                self.known_count = len(known)
+                print(f"   ⏭️ {self.known_count} articles déjà en base ignorés")
+            
+            if not article_links:
+                print(f"✅ Aucun nouvel article")
+                return []
+        
+        # Télécharger toutes les pages en parallèle
+        # (requêtes bornées, débit limité par hôte au lieu d'une pause fixe)
+        pages = self.fetcher.fetch_many(article_links)
+        
+        # Article non téléchargé : oublier les validateurs de la page d'accueil, sinon la
+        # prochaine collecte s'arrêterait sur un 304 sans jamais le réessayer
+        if any(not page.ok for page in pages):
+            self.fresh_validators[self.base_url] = {'etag': None, 'last_modified': None}
+        
+        # Extraire chaque article
         articles = []
-        for i, url in enumerate(article_links, 1):
+        for i, (url, page) in enumerate(zip(article_links, pages), 1):
             print(f"   Article {i}/{len(article_links)}: {url[:80]}...")
             
-            article = self.scrape_article(url, media_id, date_limit)
+            if not page.ok:
+                print(f"⚠️ Erreur récupération page {url}: {page.error}")
+                continue
+            
+            article = self._parse_article(self._parse_page(page.text), url, media_id, date_limit)
             if article:
                 articles.append(article)
-            
-            # Pause pour ne pas surcharger le serveur
-            time.sleep(0.5)
         
         print(f"✅ {len(articles)} articles scrapés avec succès")
         return articles
@@ -0,0 +1,337 @@
+"""
+Scraper basé sur l'API REST WordPress (/wp-json/wp/v2/posts)
+Titre, contenu, date, auteur, catégories et image sont lus dans les
+réponses de l'API : une ou deux requêtes par collecte au lieu d'une
+page HTML par article
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlencode, urlparse
+
+from database.models import Article
+from .http_fetcher import HttpFetcher, first_in_order
+from .html_parser import parse_html
+
+
+class WordPressScraper:
+    """Scraper basé sur l'API REST WordPress"""
+
+    # Articles par page de l'API (maximum accepté par WordPress)
+    PER_PAGE = 100
+
+    # Marge sur la date de dernière collecte (fuseau horaire du site, horloges décalées) :
+    # les articles déjà en base sont ignorés de toute façon
+    MODIFIED_OVERLAP_HOURS = 24
+
+    # Objets liés inclus dans la réponse (auteur, catégories et tags, image à la une)
+    EMBED = 'author,wp:term,wp:featuredmedia'
+
+    def __init__(self, base_url: str, timeout: int = 30, api_url: Optional[str] = None,
+                 known_urls_lookup: Optional[Callable[[Iterable[str]], Set[str]]] = None):
+        """
+        Initialise le scraper WordPress
+
+        Args:
+            base_url: URL de base du site
+            timeout: Timeout pour les requêtes HTTP
+            api_url: Liste des articles de l'API mémorisée lors d'une précédente détection
+                     ('' = aucune API, None = inconnue, détection nécessaire)
+            known_urls_lookup: Fonction (urls) -> URLs déjà en base, pour ne pas
+                               recréer les articles connus
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.domain = urlparse(base_url).netloc
+
+        # Résultat de la détection de l'API (à mémoriser par l'appelant si api_discovered)
+        self.api_url = api_url
+        self.api_discovered = False
+
+        # available passe à True dès que l'API a répondu : la collecte est alors complète,
+        # même sans nouvel article
+        self.available = False
+
+        # Articles de l'API déjà en base
+        self.known_urls_lookup = known_urls_lookup
+        self.known_count = 0
+
+        # Emplacements de l'API (permaliens activés, sinon paramètre rest_route)
+        self.api_urls = [
+            f"{self.base_url}/wp-json/wp/v2/posts",
+            f"{self.base_url}/?rest_route=/wp/v2/posts",
+        ]
+
+        # Client HTTP partagé (keep-alive, limitation par hôte, requêtes parallèles)
+        self.fetcher = HttpFetcher(timeout=timeout)
+
+    def find_api(self, use_cache: bool = True) -> Optional[str]:
+        """
+        Trouver l'API REST WordPress du site
+
+        Args:
+            use_cache: Utiliser l'API mémorisée si elle est connue
+
+        Returns:
+            URL de la liste des articles de l'API ou None
+        """
+        if use_cache and self.api_url is not None:
+            if self.api_url:
+                print(f"   ✅ API WordPress (cache): {self.api_url}")
+                return self.api_url
+            print(f"   ℹ️ Aucune API WordPress (cache)")
+            return None
+
+        print(f"   🔍 Recherche de l'API WordPress...")
+
+        # Tester les emplacements connus et la page d'accueil en parallèle
+        try:
+            api_url = asyncio.run(self._discover_api())
+        except Exception as e:
+            print(f"   ⚠️ Erreur recherche API WordPress: {e}")
+            return None
+
+        self.api_url = api_url or ''
+        self.api_discovered = True
+
+        if api_url:
+            print(f"   ✅ API WordPress trouvée: {api_url}")
+        else:
+            print(f"   ❌ Aucune API WordPress trouvée")
+        return api_url
+
+    async def _discover_api(self) -> Optional[str]:
+        """
+        Sonder les emplacements de l'API et la page d'accueil simultanément ;
+        la première API valide par ordre de préférence l'emporte et les
+        sondes restantes sont annulées
+
+        Returns:
+            URL de la liste des articles de l'API ou None
+        """
+        async with self.fetcher.async_client() as client:
+            probes = [self._probe_api_url(client, api_url) for api_url in self.api_urls]
+            probes.append(self._probe_homepage(client))
+            return await first_in_order(probes)
+
+    async def _probe_api_url(self, client, api_url: str) -> Optional[str]:
+        """Vérifier qu'une URL candidate renvoie bien une liste d'articles"""
+        response = await self.fetcher.fetch_async(client, self._page_url(api_url, {'per_page': 1, '_fields': 'id'}))
+        if not response.ok:
+            return None
+
+        try:
+            return api_url if isinstance(json.loads(response.text), list) else None
+        except ValueError:
+            return None
+
+    async def _probe_homepage(self, client) -> Optional[str]:
+        """Chercher la racine de l'API déclarée dans la page d'accueil (<link rel="https://api.w.org/">)"""
+        response = await self.fetcher.fetch_async(client, self.base_url)
+        if response.status_code != 200:
+            return None
+
+        try:
+            link = parse_html(response.text).select_one('link[rel="https://api.w.org/"]')
+            root = link.attr('href') if link else None
+            if not root or urlparse(root).netloc != self.domain:
+                return None
+            return await self._probe_api_url(client, f"{root.rstrip('/')}/wp/v2/posts")
+        except Exception:
+            return None
+
+    def get_posts(self, days: int = 30, max_articles: int = 100,
+                  modified_after: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Récupérer les articles publiés dans la période et modifiés depuis la dernière collecte
+
+        Args:
+            days: Nombre de jours dans le passé
+            max_articles: Nombre maximum d'articles
+            modified_after: Date de la dernière collecte (UTC), None pour tout récupérer
+
+        Returns:
+            Articles bruts de l'API (objets liés inclus)
+        """
+        api_url = self.find_api()
+        if not api_url:
+            return []
+
+        print(f"   📡 Lecture de l'API WordPress...")
+
+        params = {
+            'per_page': min(self.PER_PAGE, max_articles),
+            'after': self._api_date(datetime.now(timezone.utc) - timedelta(days=days)),
+            '_embed': self.EMBED,
+        }
+        if modified_after:
+            params['modified_after'] = self._api_date(modified_after - timedelta(hours=self.MODIFIED_OVERLAP_HOURS))
+
+        posts = []
+        page = 1
+        while len(posts) < max_articles:
+            response = self.fetcher.fetch(self._page_url(api_url, {**params, 'page': page}))
+
+            if not response.ok:
+                # API mémorisée devenue indisponible : relancer la détection
+                if page == 1 and not self.api_discovered:
+                    print(f"   🔄 API mémorisée indisponible ({response.error}), nouvelle détection...")
+                    api_url = self.find_api(use_cache=False)
+                    if api_url:
+                        continue
+                    return []
+                print(f"   ⚠️ Erreur lecture API WordPress: {response.error}")
+                break
+
+            try:
+                batch = json.loads(response.text)
+            except ValueError:
+                print(f"   ⚠️ Réponse invalide de l'API WordPress")
+                break
+            if not isinstance(batch, list):
+                break
+
+            self.available = True
+            posts.extend(batch)
+
+            # Dernière page : moins d'articles que demandé, ou nombre de pages annoncé atteint
+            total_pages = response.headers.get('x-wp-totalpages')
+            if len(batch) < params['per_page'] or (total_pages and total_pages.isdigit() and page >= int(total_pages)):
+                break
+            page += 1
+
+        print(f"   📊 {len(posts)} articles récents dans l'API ({page} requête(s))")
+        return posts[:max_articles]
+
+    def scrape(self, media_id: int, days: int = 30, max_articles: int = 100,
+               modified_after: Optional[datetime] = None) -> List[Article]:
+        """
+        Scraper les articles via l'API REST WordPress
+
+        Args:
+            media_id: ID du média en base de données
+            days: Nombre de jours dans le passé
+            max_articles: Nombre maximum d'articles
+            modified_after: Date de la dernière collecte (UTC), None pour tout récupérer
+
+        Returns:
+            Liste d'objets Article
+        """
+        print(f"🌐 Scraping API WordPress depuis {self.base_url}...")
+
+        posts = self.get_posts(days, max_articles, modified_after)
+        if not posts:
+            return []
+
+        # Articles modifiés mais déjà en base
+        if self.known_urls_lookup is not None:
+            known = self.known_urls_lookup([post.get('link') for post in posts if post.get('link')])
+            if known:
+                posts = [post for post in posts if post.get('link') not in known]
+                self.known_count = len(known)
+                print(f"   ⏭️ {self.known_count} articles déjà en base ignorés")
+
+        articles = []
+        for post in posts:
+            try:
+                article = self._post_to_article(post, media_id)
+            except Exception as e:
+                print(f"   ⚠️ Erreur lecture article {post.get('link')}: {e}")
+                continue
+
+            if article:
+                articles.append(article)
+
+        print(f"✅ {len(articles)} articles collectés via l'API")
+        return articles
+
+    def _post_to_article(self, post: Dict[str, Any], media_id: int) -> Optional[Article]:
+        """
+        Convertir un article de l'API en Article
+
+        Args:
+            post: Article brut de l'API (objets liés inclus)
+            media_id: ID du média
+
+        Returns:
+            Objet Article, ou None si le titre ou le contenu manque
+        """
+        url = post.get('link')
+        titre = self._rendered_text(post.get('title'))
+        if not url or not titre:
+            return None
+
+        # Contenu protégé par mot de passe : seul l'extrait est public
+        content = post.get('content') or {}
+        contenu = '' if content.get('protected') else self._rendered_text(content, separator='\n')
+        extrait = self._rendered_text(post.get('excerpt'))
+        if not contenu:
+            contenu = extrait
+        if not contenu or len(contenu) < 50:
+            print(f"      ⚠️ Contenu trop court, ignoré: {url[:80]}")
+            return None
+
+        embedded = post.get('_embedded') or {}
+
+        # Auteur
+        authors = embedded.get('author') or []
+        auteur = authors[0].get('name') if authors and isinstance(authors[0], dict) else None
+
+        # Catégories et tags (une liste de termes par taxonomie)
+        categories, tags = [], []
+        for terms in embedded.get('wp:term') or []:
+            for term in terms if isinstance(terms, list) else []:
+                if term.get('taxonomy') == 'category':
+                    categories.append(term.get('name'))
+                elif term.get('taxonomy') == 'post_tag':
+                    tags.append(term.get('name'))
+
+        # Image à la une
+        media = embedded.get('wp:featuredmedia') or []
+        image_url = media[0].get('source_url') if media and isinstance(media[0], dict) else None
+
+        return Article(
+            media_id=media_id,
+            titre=titre,
+            contenu=contenu,
+            extrait=extrait,
+            url=url,
+            date_publication=self._post_date(post) or datetime.now(),
+            auteur=auteur,
+            image_url=image_url,
+            categories=[name for name in categories if name] or None,
+            tags=[name for name in tags if name] or None,
+            source_type='wordpress_api'
+        )
+
+    @staticmethod
+    def _rendered_text(field: Optional[Dict[str, Any]], separator: str = '') -> str:
+        """Texte d'un champ HTML de l'API ({'rendered': ...})"""
+        rendered = field.get('rendered') if isinstance(field, dict) else None
+        if not rendered:
+            return ''
+        return parse_html(rendered).text(separator=separator, strip=bool(separator)).strip()
+
+    @staticmethod
+    def _post_date(post: Dict[str, Any]) -> Optional[datetime]:
+        """Date de publication (UTC, comme les dates des flux RSS)"""
+        for key in ('date_gmt', 'date'):
+            try:
+                return datetime.fromisoformat(post[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return None
+
+    @staticmethod
+    def _api_date(date: datetime) -> str:
+        """Date au format ISO 8601 attendu par les filtres de l'API (UTC)"""
+        if date.tzinfo:
+            date = date.astimezone(timezone.utc).replace(tzinfo=None)
+        return date.strftime('%Y-%m-%dT%H:%M:%S')
+
+    @staticmethod
+    def _page_url(api_url: str, params: Dict[str, Any]) -> str:
+        """URL d'une requête de l'API (rest_route porte déjà une query string)"""
+        return f"{api_url}{'&' if '?' in api_url else '?'}{urlencode(params)}"
@@ -5,7 +5,7 @@ Afficher l'analyse d'audience par plateforme
 
 import argparse
 from database.db_manager import DatabaseManager
-from analysis.audience_analyzer import AudienceAnalyzer
+from analysis.audience_analyzer import AudienceAnalyzer, AudienceTable
 
 
 def print_separator(char="=", length=80):
@@ -13,14 +13,14 @@ def print_separator(char="=", length=80):
     print(char * length)
 
 
-def print_web_audience(analyzer: AudienceAnalyzer, days: int):
+def print_web_audience(table: AudienceTable, days: int):
     """Affiche l'audience Web"""
     print_separator()
     print(f"📰 AUDIENCE WEB - ARTICLES ({days} derniers jours)")
     print_separator()
     print()
     
-    medias = analyzer.analyze_web_audience(days)
+    medias = table.rows(days, 'web')
     
     if not medias:
         print("⚠️ Aucune donnée disponible")
@@ -44,14 +44,14 @@ def print_web_audience(analyzer: AudienceAnalyzer, days: int):
         print()
 
 
-def print_facebook_audience(analyzer: AudienceAnalyzer, days: int):
+def print_facebook_audience(table: AudienceTable, days: int):
     """Affiche l'audience Facebook"""
     print_separator()
     print(f"📘 AUDIENCE FACEBOOK ({days} derniers jours)")
     print_separator()
     print()
     
-    medias = analyzer.analyze_facebook_audience(days)
+    medias = table.rows(days, 'facebook')
     
     if not medias:
         print("⚠️ Aucune donnée disponible")
@@ -82,14 +82,14 @@ def print_facebook_audience(analyzer: AudienceAnalyzer, days: int):
         print()
 
 
-def print_twitter_audience(analyzer: AudienceAnalyzer, days: int):
+def print_twitter_audience(table: AudienceTable, days: int):
     """Affiche l'audience Twitter"""
     print_separator()
     print(f"🐦 AUDIENCE TWITTER ({days} derniers jours)")
     print_separator()
     print()
     
-    medias = analyzer.analyze_twitter_audience(days)
+    medias = table.rows(days, 'twitter')
     
     if not medias:
         print("⚠️ Aucune donnée disponible")
@@ -123,14 +123,14 @@ def print_twitter_audience(analyzer: AudienceAnalyzer, days: int):
         print()
 
 
-def print_global_audience(analyzer: AudienceAnalyzer, days: int):
+def print_global_audience(table: AudienceTable, days: int):
     """Affiche l'audience globale"""
     print_separator()
     print(f"🏆 CLASSEMENT GLOBAL PAR INFLUENCE ({days} derniers jours)")
     print_separator()
     print()
     
-    medias = analyzer.analyze_global_audience(days)
+    medias = table.rows(days, 'global')
     
     if not medias:
         print("⚠️ Aucune donnée disponible")
@@ -149,7 +149,7 @@ def print_global_audience(analyzer: AudienceAnalyzer, days: int):
         web = media['web']
         if web:
             print(f"   📰 Web: {web.get('total_articles', 0)} articles")
-            print(f"      Fréquence: {web.get('articles_par_jour', 0)} articles/jour")
+            print(f"      Fréquence: {web.get('articles_par_jour_moyen', 0)} articles/jour")
         
         # Facebook
         fb = media['facebook']
@@ -168,14 +168,14 @@ def print_global_audience(analyzer: AudienceAnalyzer, days: int):
         print()
 
 
-def print_inactive_medias(analyzer: AudienceAnalyzer, days_threshold: int):
+def print_inactive_medias(table: AudienceTable, days_threshold: int):
     """Affiche les médias inactifs"""
     print_separator()
     print(f"🔴 MÉDIAS INACTIFS (>{days_threshold} jours sans publication)")
     print_separator()
     print()
     
-    inactive = analyzer.get_inactive_medias(days_threshold)
+    inactive = table.inactive(30, days_threshold)
     
     # Web
     if inactive['web']:
@@ -218,24 +218,28 @@ def main():
     print("🔧 Initialisation de l'analyse...")
     db = DatabaseManager()
     analyzer = AudienceAnalyzer(db)
+    
+    # Toutes les plateformes (et la fenêtre des médias inactifs) en une lecture
+    windows = {args.days, 30} if args.inactive else {args.days}
+    table = analyzer.compute_audience(windows)
     print()
     
     # Afficher selon la plateforme
     if args.platform == 'web' or args.platform == 'all':
-        print_web_audience(analyzer, args.days)
+        print_web_audience(table, args.days)
     
     if args.platform == 'facebook' or args.platform == 'all':
-        print_facebook_audience(analyzer, args.days)
+        print_facebook_audience(table, args.days)
     
     if args.platform == 'twitter' or args.platform == 'all':
-        print_twitter_audience(analyzer, args.days)
+        print_twitter_audience(table, args.days)
     
     if args.platform == 'global' or args.platform == 'all':
-        print_global_audience(analyzer, args.days)
+        print_global_audience(table, args.days)
     
     # Afficher les médias inactifs
     if args.inactive:
-        print_inactive_medias(analyzer, args.inactive)
+        print_inactive_medias(table, args.inactive)
     
     print_separator()
     print("✅ Analyse terminée")
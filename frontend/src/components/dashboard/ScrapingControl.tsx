@@ -64,10 +64,10 @@ const ScrapingControl = () => {
       {
         onSuccess: (result) => {
           toast({
-            title: "Scraping terminé",
-            description: `${
-              result?.total_articles || 0
-            } articles collectés avec succès.`,
+            title: "Scraping lancé",
+            description:
+              result?.message ||
+              "Le scraping s'exécute en arrière-plan, suivez sa progression dans l'historique.",
           });
         },
       }
@@ -80,6 +80,13 @@ const ScrapingControl = () => {
 
   const getStatusBadge = (status: string) => {
     switch (status) {
+      case "queued":
+        return (
+          <Badge variant="outline" className="gap-1">
+            <Loader2 className="h-3 w-3 animate-spin" />
+            En attente
+          </Badge>
+        );
       case "running":
         return (
           <Badge variant="outline" className="gap-1">
@@ -237,7 +244,11 @@ const ScrapingControl = () => {
                   </TableCell>
                   <TableCell>{getStatusBadge(task.status)}</TableCell>
                   <TableCell className="text-right font-medium">
-                    {task.status === "running" ? "-" : task.total_articles}
+                    {task.status === "running" && task.sites_total
+                      ? `${task.total_articles} (${task.sites_done}/${task.sites_total} sites)`
+                      : task.status === "queued"
+                      ? "-"
+                      : task.total_articles}
                   </TableCell>
                 </TableRow>
               ))}
@@ -194,11 +194,9 @@ const SensitiveContent = () => {
     try {
       // Charger les détails de l'article si c'est un article
       if (alert.content_type === "article") {
-        const articleResponse = await articleService.getRecent(30, 1000);
+        const articleResponse = await articleService.getById(alert.content_id);
         if (articleResponse.data) {
-          const article = articleResponse.data.find(
-            (a) => a.id === alert.content_id
-          );
+          const article = articleResponse.data;
           setArticleDetails(article);
 
           // Charger les détails du média
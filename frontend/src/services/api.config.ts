@@ -20,6 +20,7 @@ export const API_ENDPOINTS = {
   
   // Articles
   ARTICLES: '/api/articles/',
+  ARTICLE_DETAIL: (id: number) => `/api/articles/${id}/`,
   
   // Classifications
   CLASSIFICATIONS: '/api/classifications/',
@@ -33,6 +34,7 @@ export const API_ENDPOINTS = {
   TWITTER_TWEETS: '/api/twitter/tweets/',
   
   // Audience
+  AUDIENCE: '/api/audience/',
   AUDIENCE_WEB: '/api/audience/web/',
   AUDIENCE_FACEBOOK: '/api/audience/facebook/',
   AUDIENCE_TWITTER: '/api/audience/twitter/',
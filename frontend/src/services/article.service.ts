@@ -10,6 +10,7 @@ export interface ArticleParams {
   media_id?: number;
   days?: number;
   limit?: number;
+  fields?: string; // summary (défaut), all, ou liste de champs séparés par des virgules
 }
 
 export const articleService = {
@@ -30,6 +31,13 @@ export const articleService = {
     });
   },
 
+  /**
+   * Récupérer un article complet (avec son contenu)
+   */
+  async getById(id: number): Promise<ApiResponse<Article>> {
+    return apiClient.get<Article>(API_ENDPOINTS.ARTICLE_DETAIL(id));
+  },
+
   /**
    * Récupérer les articles récents
    */
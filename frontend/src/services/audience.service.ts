@@ -10,9 +10,19 @@ import {
   AudienceTwitter,
   AudienceGlobal,
   InactiveMedias,
+  AudienceTable,
 } from './types';
 
 export const audienceService = {
+  /**
+   * Récupérer l'audience de toutes les plateformes pour plusieurs fenêtres (en colonnes)
+   */
+  async getTable(windows: number[] = [7, 30, 90]): Promise<ApiResponse<AudienceTable>> {
+    return apiClient.get<AudienceTable>(API_ENDPOINTS.AUDIENCE, {
+      windows: windows.join(','),
+    });
+  },
+
   /**
    * Récupérer l'audience Web
    */
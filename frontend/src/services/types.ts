@@ -20,7 +20,7 @@ export interface Article {
   id: number;
   media_id: number;
   titre: string;
-  contenu: string;
+  contenu?: string; // Uniquement dans le détail d'un article
   extrait: string;
   url: string;
   auteur?: string;
@@ -33,6 +33,7 @@ export interface Article {
   commentaires: number;
   scraped_at: string;
   created_at: string;
+  categorie?: string | null;
 }
 
 // Classifications
@@ -164,6 +165,21 @@ export interface InactiveMedias {
   twitter: InactiveMedia[];
 }
 
+// Audience en colonnes (un tableau par métrique, aligné sur medias.id)
+export type AudienceColumns = Record<string, (number | string | null)[]>;
+
+export interface AudienceTable {
+  windows: number[];
+  medias: {
+    id: number[];
+    nom: string[];
+    url: string[];
+    facebook_page: (string | null)[];
+    twitter_account: (string | null)[];
+  };
+  metrics: Record<string, Record<'web' | 'facebook' | 'twitter' | 'global', AudienceColumns>>;
+}
+
 // Classement
 export interface Ranking {
   id: number;
@@ -200,9 +216,12 @@ export interface ScrapingRequest {
 export interface ScrapingResponse {
   status: string;
   message: string;
-  total_articles: number;
-  total_fb_posts: number;
-  total_tweets: number;
+  task_id?: number;
+  task_url?: string;
+  stream_url?: string;
+  total_articles?: number;
+  total_fb_posts?: number;
+  total_tweets?: number;
 }
 
 export interface ScrapingSchedule {
@@ -227,13 +246,17 @@ export interface ScrapingScheduleResponse {
 export interface ScrapingTask {
   id: number;
   type: 'manual' | 'scheduled';
-  status: 'running' | 'completed' | 'failed';
+  status: 'queued' | 'running' | 'completed' | 'failed';
   started_at: string;
   completed_at?: string;
   total_articles: number;
   total_fb_posts: number;
   total_tweets: number;
   error_message?: string;
+  sites_total?: number;
+  sites_done?: number;
+  current_media?: string;
+  updated_at?: string;
 }
 
 export interface ScrapingHistory {